@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: .github/scripts/monitor-rollout.py
-# version: 1.1.1
+# version: 1.2.0
 # guid: 7f1a3b2c-4d5e-6f7a-8b9c-0d1e2f3a4b5c
 
 """Monitor rollout across target repositories:
@@ -16,6 +16,16 @@ Optional flags:
   --per-page N       Number of recent runs to inspect per repo (default 10)
   --since-hours H    Only consider runs started within the last H hours (default 72)
   --repos "owner/repo ..."  Override repo list
+  --workers N        Repositories polled concurrently (default 8)
+  --watch            Keep re-polling repos whose runs are still queued/in progress
+  --interval S       Seconds between watch rounds (default 60)
+  --max-wait M       Give up watching after M minutes (default 60)
+
+Repositories are polled concurrently over pooled keep-alive connections, runs
+are filtered server-side with ``created>=cutoff``, and each response is
+classified in a single pass. In watch mode only repos that are still pending
+are re-polled, with ETag revalidation so unchanged lists cost a 304 and do not
+count against the rate limit.
 
 Auth:
   - Uses JF_CI_GH_PAT or GITHUB_TOKEN from environment
@@ -23,12 +33,21 @@ Auth:
 
 import argparse
 import datetime as dt
+import http.client
 import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib import error, request
+from urllib.parse import urlencode, urlsplit
 
 API_BASE = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+DEFAULT_WORKERS = 8
+REQUEST_TIMEOUT = 30
+PENDING_STATUSES = ("in_progress", "queued", "waiting", "requested", "pending")
+WORKFLOW_KEYS = ("security", "release", "sync_receiver")
 
 
 def get_token() -> str | None:
@@ -66,6 +85,82 @@ def http_get(url: str) -> tuple[int, dict]:
         return 0, {"error": str(e)}
 
 
+class RunsClient:
+    """Pooled, ETag-aware HTTP client for the workflow runs endpoint.
+
+    Each worker thread keeps one persistent connection to the API host.
+    Responses are cached by path with their ETag; re-polling an unchanged
+    list gets a 304, which GitHub does not count against the rate limit.
+    """
+
+    def __init__(self, token: str | None, api_url: str = API_BASE) -> None:
+        self.token = token
+        parsed = urlsplit(api_url)
+        self._scheme = parsed.scheme or "https"
+        self._netloc = parsed.netloc
+        self._base_path = parsed.path.rstrip("/")
+        self._local = threading.local()
+        self._etags: dict[str, tuple[str, dict]] = {}
+        self._etag_lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_class = (
+                http.client.HTTPSConnection
+                if self._scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = conn_class(self._netloc, timeout=REQUEST_TIMEOUT)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def get_json(self, path: str) -> tuple[int, dict]:
+        """GET ``path`` (relative to the API base) and return ``(status, payload)``."""
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "ghcommon-monitor-rollout",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        with self._etag_lock:
+            cached = self._etags.get(path)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        conn = self._connection()
+        try:
+            conn.request("GET", self._base_path + path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._reset()
+            return 0, {"error": str(e)}
+        if response.will_close:
+            self._reset()
+        with self._etag_lock:
+            self.requests += 1
+            if response.status == 304 and cached:
+                self.not_modified += 1
+                return 200, cached[1]
+        try:
+            payload = json.loads(body.decode("utf-8")) if body else {}
+        except json.JSONDecodeError:
+            payload = {}
+        etag = response.getheader("ETag")
+        if response.status == 200 and etag:
+            with self._etag_lock:
+                self._etags[path] = (etag, payload)
+        return response.status, payload
+
+
 def now_utc() -> dt.datetime:
     return dt.datetime.now(dt.timezone.utc)
 
@@ -102,9 +197,20 @@ def load_target_repos(explicit: str | None) -> list[str]:
     return repos
 
 
-def list_recent_runs(repo: str, per_page: int) -> list[dict]:
-    url = f"{API_BASE}/repos/{repo}/actions/runs?per_page={per_page}"
-    status, payload = http_get(url)
+def list_recent_runs(
+    repo: str,
+    per_page: int,
+    created_since: dt.datetime | None = None,
+    client: RunsClient | None = None,
+) -> list[dict]:
+    params: dict[str, object] = {"per_page": per_page}
+    if created_since is not None:
+        params["created"] = ">=" + created_since.strftime("%Y-%m-%dT%H:%M:%SZ")
+    path = f"/repos/{repo}/actions/runs?{urlencode(params)}"
+    if client is not None:
+        status, payload = client.get_json(path)
+    else:
+        status, payload = http_get(API_BASE + path)
     if status != 200:
         return []
     return payload.get("workflow_runs", []) or []
@@ -122,38 +228,138 @@ def pick_latest(
     return None
 
 
-def summarize_repo(repo: str, per_page: int, since_hours: int) -> dict:
-    runs = list_recent_runs(repo, per_page)
-    cutoff = now_utc() - dt.timedelta(hours=since_hours)
-    sec = pick_latest(runs, ["security"], cutoff)
-    rel = pick_latest(runs, ["release"], cutoff)
-    # Match various names for the sync receiver workflow
-    sync = pick_latest(runs, ["sync", "receiver"], cutoff) or pick_latest(
-        runs, ["repo", "sync"], cutoff
-    )
+def classify_runs(runs: list[dict], since_cutoff: dt.datetime) -> dict[str, dict | None]:
+    """Return the latest security, release and sync receiver runs in one scan.
 
-    def status_of(run: dict | None) -> str:
-        if not run:
-            return "missing"
-        # conclusion may be None while in progress
-        return run.get("conclusion") or run.get("status") or "unknown"
+    Equivalent to calling :func:`pick_latest` per workflow (a "sync receiver"
+    run is preferred over a "repo sync" run), but each run is parsed once and
+    the scan stops as soon as every bucket is filled.
+    """
+    found: dict[str, dict | None] = {
+        "security": None,
+        "release": None,
+        "sync_receiver": None,
+        "repo_sync": None,
+    }
+    for run in runs:
+        n = (run.get("name") or "").lower()
+        wanted = [
+            key
+            for key, matched in (
+                ("security", "security" in n),
+                ("release", "release" in n),
+                ("sync_receiver", "sync" in n and "receiver" in n),
+                ("repo_sync", "repo" in n and "sync" in n),
+            )
+            if matched and found[key] is None
+        ]
+        if not wanted:
+            continue
+        created_at = parse_iso8601(run.get("created_at") or run.get("run_started_at") or "")
+        if not created_at or created_at < since_cutoff:
+            continue
+        for key in wanted:
+            found[key] = run
+        if found["security"] and found["release"] and found["sync_receiver"]:
+            break
+    return {
+        "security": found["security"],
+        "release": found["release"],
+        "sync_receiver": found["sync_receiver"] or found["repo_sync"],
+    }
+
+
+def status_of(run: dict | None) -> str:
+    if not run:
+        return "missing"
+    # conclusion may be None while in progress
+    return run.get("conclusion") or run.get("status") or "unknown"
+
+
+def summarize_repo(
+    repo: str,
+    per_page: int,
+    since_hours: int,
+    client: RunsClient | None = None,
+    cutoff: dt.datetime | None = None,
+) -> dict:
+    if cutoff is None:
+        cutoff = now_utc() - dt.timedelta(hours=since_hours)
+    runs = list_recent_runs(repo, per_page, cutoff, client)
+    latest = classify_runs(runs, cutoff)
+    result: dict = {"repo": repo}
+    for key in WORKFLOW_KEYS:
+        run = latest[key]
+        result[key] = {
+            "status": status_of(run),
+            "url": run.get("html_url") if run else None,
+        }
+    return result
 
-    result = {
+
+def error_result(repo: str, exc: Exception) -> dict:
+    return {
         "repo": repo,
-        "security": {
-            "status": status_of(sec),
-            "url": sec.get("html_url") if sec else None,
-        },
-        "release": {
-            "status": status_of(rel),
-            "url": rel.get("html_url") if rel else None,
-        },
-        "sync_receiver": {
-            "status": status_of(sync),
-            "url": sync.get("html_url") if sync else None,
-        },
+        "security": {"status": f"error: {exc}", "url": None},
+        "release": {"status": "unknown", "url": None},
+        "sync_receiver": {"status": "unknown", "url": None},
     }
-    return result
+
+
+def is_pending(result: dict) -> bool:
+    return any(result[key]["status"] in PENDING_STATUSES for key in WORKFLOW_KEYS)
+
+
+def summarize_repos(
+    repos: list[str],
+    per_page: int,
+    since_hours: int,
+    client: RunsClient,
+    workers: int = DEFAULT_WORKERS,
+    cutoff: dt.datetime | None = None,
+) -> list[dict]:
+    """Summarize ``repos`` concurrently; results keep the input order."""
+    if cutoff is None:
+        cutoff = now_utc() - dt.timedelta(hours=since_hours)
+
+    def summarize(repo: str) -> dict:
+        try:
+            return summarize_repo(repo, per_page, since_hours, client, cutoff)
+        except Exception as e:
+            return error_result(repo, e)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(repos) or 1))) as executor:
+        return list(executor.map(summarize, repos))
+
+
+def watch_rollout(
+    repos: list[str],
+    per_page: int,
+    since_hours: int,
+    client: RunsClient,
+    workers: int = DEFAULT_WORKERS,
+    interval: float = 60,
+    max_wait: float = 3600,
+) -> list[dict]:
+    """Poll until no repo has a queued or in-progress run, or ``max_wait`` passes.
+
+    The cutoff is fixed for the whole watch so request URLs stay stable and
+    ETag revalidation works; only pending repos are re-polled each round.
+    """
+    cutoff = now_utc() - dt.timedelta(hours=since_hours)
+    results = summarize_repos(repos, per_page, since_hours, client, workers, cutoff)
+    deadline = time.monotonic() + max_wait
+    while True:
+        pending = [index for index, result in enumerate(results) if is_pending(result)]
+        print(f"Watch: {len(pending)} of {len(repos)} repositories still running")
+        if not pending or time.monotonic() + interval > deadline:
+            return results
+        time.sleep(interval)
+        refreshed = summarize_repos(
+            [repos[index] for index in pending], per_page, since_hours, client, workers, cutoff
+        )
+        for index, result in zip(pending, refreshed):
+            results[index] = result
 
 
 def write_step_summary(md: str) -> None:
@@ -217,6 +423,10 @@ def main():
     parser.add_argument("--per-page", type=int, default=10)
     parser.add_argument("--since-hours", type=int, default=72)
     parser.add_argument("--repos", type=str, default="")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--interval", type=float, default=60)
+    parser.add_argument("--max-wait", type=float, default=60, help="Minutes to keep watching")
     args = parser.parse_args()
 
     repos = load_target_repos(args.repos)
@@ -226,19 +436,23 @@ def main():
     if not get_token():
         print("Warning: No token provided (JF_CI_GH_PAT/GITHUB_TOKEN). You may hit rate limits.")
 
-    results: list[dict] = []
-    for repo in repos:
-        try:
-            results.append(summarize_repo(repo, args.per_page, args.since_hours))
-        except Exception as e:
-            results.append(
-                {
-                    "repo": repo,
-                    "security": {"status": f"error: {e}", "url": None},
-                    "release": {"status": "unknown", "url": None},
-                    "sync_receiver": {"status": "unknown", "url": None},
-                }
-            )
+    client = RunsClient(get_token())
+    if args.watch:
+        results = watch_rollout(
+            repos,
+            args.per_page,
+            args.since_hours,
+            client,
+            workers=args.workers,
+            interval=args.interval,
+            max_wait=args.max_wait * 60,
+        )
+    else:
+        results = summarize_repos(repos, args.per_page, args.since_hours, client, args.workers)
+    print(
+        f"API requests: {client.requests} ({client.not_modified} not modified, "
+        "not counted against the rate limit)"
+    )
 
     md = build_markdown(results)
     write_step_summary(md)
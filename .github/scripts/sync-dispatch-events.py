@@ -1,16 +1,55 @@
 #!/usr/bin/env python3
 # file: .github/scripts/sync-dispatch-events.py
-# version: 1.1.1
+# version: 1.4.0
 # guid: b2c3d4e5-f6a7-8b9c-0d1e-2f3a4b5c6d7e
 
-"""Dispatch repository events to target repositories for synchronization."""
+"""Dispatch repository events to target repositories for synchronization.
+
+Dispatches run concurrently over pooled keep-alive connections, so the total
+time of a fan-out is bounded by the slowest repository rather than the sum of
+all calls. 5xx responses and rate limits are retried with jittered backoff.
+The payload carries the sync type and the section digest of this checkout for
+that type, so receivers that already hold the same content skip the sync
+without checking it out.
+
+Environment:
+    EVENT_TYPE: Event type to dispatch (default: sync-from-ghcommon).
+    SYNC_TYPE: Sync type requested from receivers (default: all).
+    DISPATCH_WORKERS: Maximum concurrent dispatches (default: 10).
+    DISPATCH_MAX_ATTEMPTS: Attempts per repository (default: 4).
+    DISPATCH_RESULTS_FILE: JSON file receiving per-repo status and latency
+        (default: dispatch-results.json).
+    GITHUB_API_URL: API base URL (default: https://api.github.com).
+"""
+
+from __future__ import annotations
 
 import contextlib
+import http.client
 import json
 import os
-import subprocess
+import random
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "workflows" / "scripts"))
+
+import sync_manifest  # noqa: E402
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_WORKERS = 10
+MAX_ATTEMPTS = 4
+REQUEST_TIMEOUT = 30
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+DEFAULT_RESULTS_FILE = "dispatch-results.json"
+
+_print_lock = threading.Lock()
 
 
 def get_target_repos():
@@ -36,68 +75,169 @@ def get_target_repos():
     return repos
 
 
-def dispatch_event(repo, event_type, client_payload):
-    """Dispatch a repository event to a target repository."""
-    token = os.getenv("JF_CI_GH_PAT") or os.getenv("GITHUB_TOKEN")
+@dataclass
+class DispatchResult:
+    """Outcome of dispatching an event to one repository."""
 
-    if not token:
-        print(
-            "Error: No GitHub token found (JF_CI_GH_PAT or GITHUB_TOKEN)",
-            file=sys.stderr,
+    repo: str
+    ok: bool
+    status: int | None = None
+    attempts: int = 0
+    latency_ms: float = 0.0
+    error: str | None = None
+
+
+class DispatchClient:
+    """Pooled HTTP client for the dispatches endpoint.
+
+    Each worker thread keeps one persistent connection to the API host, so a
+    fan-out to many repositories reuses a handful of TLS sessions instead of
+    starting a fresh ``curl`` process per repository.
+    """
+
+    def __init__(self, token, api_url=DEFAULT_API_URL, timeout=REQUEST_TIMEOUT):
+        self.token = token
+        self.timeout = timeout
+        parsed = urlsplit(api_url)
+        self._scheme = parsed.scheme or "https"
+        self._netloc = parsed.netloc
+        self._base_path = parsed.path.rstrip("/")
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_class = (
+                http.client.HTTPSConnection
+                if self._scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = conn_class(self._netloc, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def post_json(self, path, payload):
+        """POST ``payload`` and return ``(status, headers, body)``."""
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self.token}",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "Content-Type": "application/json",
+            "User-Agent": "ghcommon-sync-dispatch",
+        }
+        conn = self._connection()
+        try:
+            conn.request("POST", self._base_path + path, body=json.dumps(payload), headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            self._reset()
+            raise
+        if response.will_close:
+            self._reset()
+        return response.status, response.headers, body.decode("utf-8", errors="replace")
+
+
+def _is_retryable(status, headers, body):
+    """Return True for 5xx responses and primary/secondary rate limits."""
+    if status >= 500 or status == 429:
+        return True
+    if status == 403:
+        return (
+            "retry-after" in headers
+            or headers.get("x-ratelimit-remaining") == "0"
+            or "secondary rate limit" in body.lower()
         )
-        return False
+    return False
 
-    # Construct GitHub API URL
-    api_url = f"https://api.github.com/repos/{repo}/dispatches"
 
-    # Prepare payload
-    payload = {"event_type": event_type, "client_payload": client_payload}
+def _retry_delay(attempt, headers=None):
+    """Full-jitter exponential backoff, never shorter than Retry-After."""
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+    retry_after = (headers or {}).get("retry-after")
+    if retry_after:
+        with contextlib.suppress(ValueError):
+            delay = max(delay, min(float(retry_after), RETRY_MAX_DELAY))
+    return delay
 
-    # Use curl for the API call (more reliable than requests in CI)
-    curl_cmd = [
-        "curl",
-        "-X",
-        "POST",
-        "-H",
-        "Accept: application/vnd.github+json",
-        "-H",
-        f"Authorization: Bearer {token}",
-        "-H",
-        "X-GitHub-Api-Version: 2022-11-28",
-        "-sS",
-        "-o",
-        "/dev/null",
-        "-w",
-        "%{http_code}",
-        api_url,
-        "-d",
-        json.dumps(payload),
-    ]
 
-    try:
-        result = subprocess.run(curl_cmd, check=False, capture_output=True, text=True, timeout=30)
+def dispatch_event(repo, event_type, client_payload, client, max_attempts=MAX_ATTEMPTS):
+    """Dispatch a repository event to a target repository.
+
+    Returns:
+        DispatchResult with the final HTTP status, attempts and latency.
+    """
+    payload = {"event_type": event_type, "client_payload": client_payload}
+    result = DispatchResult(repo=repo, ok=False)
+    started = time.monotonic()
+
+    for attempt in range(max_attempts):
+        result.attempts = attempt + 1
+        headers = None
+        try:
+            status, headers, body = client.post_json(f"/repos/{repo}/dispatches", payload)
+        except TimeoutError:
+            result.error = "timeout"
+        except (OSError, http.client.HTTPException) as exc:
+            result.error = str(exc) or exc.__class__.__name__
+        else:
+            result.status = status
+            if status in (200, 204):
+                result.ok = True
+                result.error = None
+                break
+            result.error = f"HTTP {status}"
+            if not _is_retryable(status, headers, body):
+                break
+        if attempt + 1 < max_attempts:
+            time.sleep(_retry_delay(attempt, headers))
 
-        if result.returncode == 0:
-            status = (result.stdout or "").strip()
-            if status == "204" or status == "200":
-                print(f"✅ Dispatched '{payload.get('event_type')}' to {repo}")
-                return True
+    result.latency_ms = round((time.monotonic() - started) * 1000, 1)
+    with _print_lock:
+        if result.ok:
+            print(f"✅ Dispatched '{event_type}' to {repo} ({result.latency_ms:.0f} ms)")
+        else:
             print(
-                f"❌ Dispatch to {repo} returned HTTP {status}",
+                f"❌ Failed to dispatch event to {repo}: {result.error} "
+                f"after {result.attempts} attempt(s)",
                 file=sys.stderr,
             )
-            return False
-        print(
-            f"❌ Failed to dispatch event to {repo}: {result.stderr}",
-            file=sys.stderr,
+    return result
+
+
+def dispatch_all(
+    repos,
+    event_type,
+    client_payload,
+    client,
+    workers=DEFAULT_WORKERS,
+    max_attempts=MAX_ATTEMPTS,
+):
+    """Dispatch to every repository concurrently, preserving input order."""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(repos)))) as executor:
+        return list(
+            executor.map(
+                lambda repo: dispatch_event(repo, event_type, client_payload, client, max_attempts),
+                repos,
+            )
         )
-        return False
-    except subprocess.TimeoutExpired:
-        print(f"❌ Timeout dispatching event to {repo}", file=sys.stderr)
-        return False
-    except Exception as e:
-        print(f"❌ Error dispatching event to {repo}: {e}", file=sys.stderr)
-        return False
+
+
+def write_results(path, results, elapsed_ms):
+    """Write per-repository dispatch results as JSON."""
+    report = {
+        "elapsed_ms": round(elapsed_ms, 1),
+        "successful": sum(1 for result in results if result.ok),
+        "failed": sum(1 for result in results if not result.ok),
+        "results": [asdict(result) for result in results],
+    }
+    Path(path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
 
 
 def main():
@@ -109,6 +249,7 @@ def main():
     source_repo = os.getenv("GITHUB_REPOSITORY", "jdfalk/ghcommon")
     source_sha = os.getenv("GITHUB_SHA", "unknown")
     source_ref = os.getenv("GITHUB_REF", "refs/heads/main")
+    sync_type = os.getenv("SYNC_TYPE", "").strip() or "all"
 
     # Create client payload
     client_payload = {
@@ -116,6 +257,8 @@ def main():
         "source_sha": source_sha,
         "source_ref": source_ref,
         "dispatch_time": os.getenv("GITHUB_RUN_ID", "unknown"),
+        "sync_type": sync_type,
+        "manifest_digest": sync_manifest.source_digest(Path("."), sync_type),
     }
 
     print(f"Dispatching '{event_type}' events to target repositories...")
@@ -129,16 +272,33 @@ def main():
         print("No target repositories found")
         sys.exit(1)
 
-    successful = 0
-    failed = 0
+    token = os.getenv("JF_CI_GH_PAT") or os.getenv("GITHUB_TOKEN")
+    if not token:
+        print(
+            "Error: No GitHub token found (JF_CI_GH_PAT or GITHUB_TOKEN)",
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
-    for repo in target_repos:
-        if dispatch_event(repo, event_type, client_payload):
-            successful += 1
-        else:
-            failed += 1
+    client = DispatchClient(token, os.getenv("GITHUB_API_URL") or DEFAULT_API_URL)
+    workers = int(os.getenv("DISPATCH_WORKERS") or DEFAULT_WORKERS)
+    max_attempts = max(1, int(os.getenv("DISPATCH_MAX_ATTEMPTS") or MAX_ATTEMPTS))
+
+    started = time.monotonic()
+    results = dispatch_all(target_repos, event_type, client_payload, client, workers, max_attempts)
+    elapsed_ms = (time.monotonic() - started) * 1000
+
+    results_file = os.getenv("DISPATCH_RESULTS_FILE") or DEFAULT_RESULTS_FILE
+    try:
+        write_results(results_file, results, elapsed_ms)
+        print(f"Dispatch results written to {results_file}")
+    except OSError as e:
+        print(f"Warning: could not write {results_file}: {e}", file=sys.stderr)
+
+    successful = sum(1 for result in results if result.ok)
+    failed = len(results) - successful
 
-    print(f"✅ Successfully dispatched to {successful} repositories")
+    print(f"✅ Successfully dispatched to {successful} repositories in {elapsed_ms:.0f} ms")
     if failed > 0:
         print(f"❌ Failed to dispatch to {failed} repositories", file=sys.stderr)
         sys.exit(1)
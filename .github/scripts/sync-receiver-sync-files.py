@@ -2,14 +2,21 @@
 # file: .github/scripts/sync-receiver-sync-files.py
 #!/usr/bin/env python3
 # file: .github/scripts/sync-receiver-sync-files.py
-# version: 3.0.0
+# version: 3.2.0
 # guid: 8d9e1f2a-3b4c-5d6e-7f8a-9b0c1d2e3f4a
 
 """Sync receiver script for copying files from ghcommon to target repositories.
 This script performs the actual file copying operations based on sync_type.
 Now reads workflow-config.yaml to determine what files to sync.
+
+Copies are delta-based: a file is only written when its hash differs from the
+receiver's cached manifest (.github/sync-receiver-manifest.json), which is
+updated at the end of the run. The manifest helpers live under
+.github/workflows/scripts, which a receiver may not have; without them every
+file is copied.
 """
 
+import os
 import shutil
 import stat
 import subprocess
@@ -18,6 +25,25 @@ from pathlib import Path
 
 import yaml
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "workflows" / "scripts"))
+
+try:
+    import sync_manifest  # noqa: E402
+except ImportError:  # receiver without the manifest helpers: plain copies
+    sync_manifest = None
+
+SOURCE_ROOT = "ghcommon-source"
+_delta = None
+
+
+def get_delta():
+    """Return the delta copier for this run, or None without sync_manifest."""
+    global _delta
+    if _delta is None and sync_manifest is not None:
+        force = os.environ.get("FORCE_SYNC", "false").lower() == "true"
+        _delta = sync_manifest.DeltaSync(SOURCE_ROOT, force=force)
+    return _delta
+
 
 def load_sync_config():
     """Load sync configuration from workflow-config.yaml."""
@@ -52,12 +78,20 @@ def ensure_directory(path):
 
 
 def copy_file_safe(src, dst):
-    """Copy a file safely, creating directories as needed."""
+    """Copy a file safely, creating directories as needed.
+
+    Files whose hash matches the cached manifest are left untouched.
+    """
     try:
-        dst_path = Path(dst)
-        ensure_directory(dst_path.parent)
-        shutil.copy2(src, dst)
-        print(f"✅ Copied {src} -> {dst}")
+        delta = get_delta()
+        if delta is None:
+            ensure_directory(Path(dst).parent)
+            shutil.copy2(src, dst)
+            print(f"✅ Copied {src} -> {dst}")
+        elif delta.copy(src, dst):
+            print(f"✅ Copied {src} -> {dst}")
+        else:
+            print(f"⏭️  Unchanged {dst}")
         return True
     except FileNotFoundError:
         print(f"⚠️  Source file not found: {src}")
@@ -68,21 +102,25 @@ def copy_file_safe(src, dst):
 
 
 def copy_directory_safe(src, dst):
-    """Copy a directory safely."""
+    """Mirror a directory safely, writing only files whose hash changed."""
     try:
         src_path = Path(src)
         if not src_path.exists():
             print(f"⚠️  Source directory not found: {src}")
             return False
 
-        dst_path = Path(dst)
-        ensure_directory(dst_path.parent)
-
-        if dst_path.exists():
-            shutil.rmtree(dst_path)
+        delta = get_delta()
+        if delta is None:
+            dst_path = Path(dst)
+            ensure_directory(dst_path.parent)
+            if dst_path.exists():
+                shutil.rmtree(dst_path)
+            shutil.copytree(src, dst)
+            print(f"✅ Copied directory {src} -> {dst}")
+            return True
 
-        shutil.copytree(src, dst)
-        print(f"✅ Copied directory {src} -> {dst}")
+        changed = delta.mirror_directory(src_path, Path(dst))
+        print(f"✅ Synced directory {src} -> {dst} ({len(changed)} files changed)")
         return True
     except Exception as e:
         print(f"❌ Error copying directory {src} -> {dst}: {e}")
@@ -456,6 +494,14 @@ def main():
     if sync_type == "all":
         sync_other_files()
 
+    delta = get_delta()
+    if delta is not None:
+        delta.save(
+            sync_type,
+            os.environ.get("SYNC_SOURCE_DIGEST", ""),
+            os.environ.get("SYNC_DISPATCH_DIGEST", ""),
+        )
+        print(f"📊 {len(delta.copied)} files written, {len(delta.unchanged)} unchanged")
     print(f"✅ Sync completed for type: {sync_type}")
 
 
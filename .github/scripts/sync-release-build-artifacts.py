@@ -1,24 +1,44 @@
 #!/usr/bin/env python3
 # file: .github/scripts/sync-release-build-artifacts.py
-# version: 1.0.0
+# version: 1.2.1
 # guid: f2a3b4c5-d6e7-8f9a-0b1c-2d3e4f5a6b7c
 
 """Build Artifacts Script
 
 Handles building release artifacts for different programming languages.
 Replaces embedded bash build scripts with reliable Python-based build logic.
+
+Release archives are written by the shared ``archive_builder`` module, which
+produces byte-reproducible tar.gz/zip files on every platform (no dependency on
+``tar``, ``zip`` or PowerShell being installed).
+
+Set ``RUST_BUILD_MODE=batch`` to install every Rust target with one ``rustup``
+call, build them all in a single ``cargo build`` (so the dependency graph is
+scheduled once), package the outputs in parallel, and write
+``releases/build-manifest.json`` in the same format as ``build_go_release.py``.
 """
 
+from __future__ import annotations
+
 import json
 import os
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "workflows" / "scripts"))
+
+from archive_builder import ArchiveError, ArchiveResult, build_archive  # noqa: E402
+
+_log_lock = threading.Lock()
+
 
 def log(message: str, level: str = "INFO") -> None:
     """Log a message with timestamp and level."""
-    print(f"[{level}] {message}")
+    with _log_lock:
+        print(f"[{level}] {message}")
 
 
 def run_command(cmd: list, cwd: str = None, env: dict = None) -> tuple:
@@ -30,44 +50,142 @@ def run_command(cmd: list, cwd: str = None, env: dict = None) -> tuple:
         return False, "", str(e)
 
 
+def create_archive(binary_path: Path, archive_path: Path) -> ArchiveResult | None:
+    """Package a single binary into a reproducible archive.
+
+    Returns the archive's path, sha256 and size, or None if it could not be written.
+    """
+    try:
+        result = build_archive([(binary_path, binary_path.name)], archive_path)
+    except (ArchiveError, OSError) as e:
+        log(f"Failed to create archive {archive_path.name}: {e}", "ERROR")
+        return None
+    log(f"Created archive: {archive_path.name} (sha256:{result.sha256})")
+    return result
+
+
+# Standard Rust targets for cross-compilation
+RUST_TARGETS = [
+    "x86_64-unknown-linux-gnu",
+    "x86_64-unknown-linux-musl",
+    "aarch64-unknown-linux-gnu",
+    "x86_64-apple-darwin",
+    "aarch64-apple-darwin",
+    "x86_64-pc-windows-gnu",
+]
+
+
+def read_cargo_manifest(path: Path = Path("Cargo.toml")) -> dict:
+    """Parse Cargo.toml, returning an empty dict when it is missing or invalid."""
+    try:
+        import tomllib
+    except ModuleNotFoundError:  # pragma: no cover
+        import tomli as tomllib  # type: ignore[import-not-found]
+    try:
+        return tomllib.loads(path.read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        log(f"Could not parse {path}: {e}", "WARN")
+        return {}
+
+
+def rust_binary_name(manifest: dict) -> str:
+    """Return the first [[bin]] name, falling back to the package name."""
+    for binary in manifest.get("bin", []):
+        if isinstance(binary, dict) and binary.get("name"):
+            return str(binary["name"])
+    package = manifest.get("package", {})
+    return str(package.get("name") or "unknown")
+
+
+def rust_archive_name(binary_name: str, target: str) -> str:
+    """Return the release archive name for a target."""
+    suffix = ".zip" if "windows" in target else ".tar.gz"
+    return f"{binary_name}-{target}{suffix}"
+
+
+def package_rust_target(binary_name: str, target: str, releases_dir: Path) -> dict | None:
+    """Archive one target's binary and write its sha256 checksum file."""
+    binary_path = Path("target") / target / "release" / binary_name
+    if "windows" in target:
+        binary_path = binary_path.with_name(binary_path.name + ".exe")
+    if not binary_path.exists():
+        log(f"Binary not found at {binary_path}", "WARN")
+        return None
+
+    result = create_archive(binary_path, releases_dir / rust_archive_name(binary_name, target))
+    if result is None:
+        return None
+    checksum_path = result.path.with_name(result.path.name + ".sha256")
+    checksum_path.write_text(f"{result.sha256}  {result.path.name}\n", encoding="utf-8")
+    return {"binary": result.path.name, "checksum": checksum_path.name, "size": result.size}
+
+
+def build_rust_artifacts_batch(targets: list | None = None) -> bool:
+    """Build every Rust target with one rustup and one cargo invocation."""
+    requested = list(targets or RUST_TARGETS)
+    targets = requested
+    manifest = read_cargo_manifest()
+    binary_name = rust_binary_name(manifest)
+    version = str(manifest.get("package", {}).get("version") or "unknown")
+    log(f"Building binary: {binary_name} for {len(targets)} targets in one invocation")
+
+    releases_dir = Path("releases")
+    releases_dir.mkdir(exist_ok=True)
+
+    install_success, _, stderr = run_command(["rustup", "target", "add", *targets])
+    if not install_success:
+        log(f"Failed to install targets, trying per target: {stderr}", "WARN")
+        targets = [t for t in targets if run_command(["rustup", "target", "add", t])[0]]
+
+    build_cmd = ["cargo", "build", "--release"]
+    for target in targets:
+        build_cmd += ["--target", target]
+    built = targets
+    build_success, _, stderr = run_command(build_cmd)
+    if not build_success:
+        # One broken target fails the whole invocation; find the ones that build.
+        log(f"Multi-target build failed, retrying per target: {stderr}", "WARN")
+        built = [
+            t for t in targets if run_command(["cargo", "build", "--release", "--target", t])[0]
+        ]
+
+    with ThreadPoolExecutor(max_workers=max(1, len(built))) as executor:
+        packaged = dict(
+            zip(
+                built,
+                executor.map(lambda t: package_rust_target(binary_name, t, releases_dir), built),
+            )
+        )
+
+    platforms = {target: info for target, info in packaged.items() if info}
+    successful = [target for target in requested if target in platforms]
+    failed = [target for target in requested if target not in platforms]
+    manifest_data = {
+        "binary_name": binary_name,
+        "version": version,
+        "platforms": platforms,
+        "successful_builds": successful,
+        "failed_builds": failed,
+        "total_platforms": len(requested),
+        "successful_count": len(successful),
+        "failed_count": len(failed),
+    }
+    manifest_path = releases_dir / "build-manifest.json"
+    manifest_path.write_text(json.dumps(manifest_data, indent=2), encoding="utf-8")
+    log(f"Build manifest: {manifest_path}")
+    log(f"Built successfully for {len(successful)}/{len(requested)} targets")
+    return bool(successful)
+
+
 def build_rust_artifacts() -> bool:
     """Build Rust artifacts for multiple targets."""
-    log("Building Rust artifacts...")
+    if os.environ.get("RUST_BUILD_MODE", "").lower() == "batch":
+        return build_rust_artifacts_batch()
 
-    # Standard Rust targets for cross-compilation
-    targets = [
-        "x86_64-unknown-linux-gnu",
-        "x86_64-unknown-linux-musl",
-        "aarch64-unknown-linux-gnu",
-        "x86_64-apple-darwin",
-        "aarch64-apple-darwin",
-        "x86_64-pc-windows-gnu",
-    ]
-
-    # Get binary name from Cargo.toml
-    binary_name = "unknown"
-    try:
-        with open("Cargo.toml") as f:
-            content = f.read()
-            # Look for [[bin]] section first
-            if "[[bin]]" in content:
-                lines = content.split("\n")
-                in_bin_section = False
-                for line in lines:
-                    if "[[bin]]" in line:
-                        in_bin_section = True
-                    elif in_bin_section and line.startswith("name"):
-                        binary_name = line.split("=")[1].strip().strip('"')
-                        break
-            else:
-                # Fall back to package name
-                for line in content.split("\n"):
-                    if line.startswith("name"):
-                        binary_name = line.split("=")[1].strip().strip('"')
-                        break
-    except Exception as e:
-        log(f"Could not determine binary name: {e}", "WARN")
+    log("Building Rust artifacts...")
+    targets = RUST_TARGETS
 
+    binary_name = rust_binary_name(read_cargo_manifest())
     log(f"Building binary: {binary_name}")
 
     # Create releases directory
@@ -99,31 +217,8 @@ def build_rust_artifacts() -> bool:
                 binary_path += ".exe"
 
             if Path(binary_path).exists():
-                # Create appropriate archive
-                if target.endswith("windows-gnu"):
-                    archive_name = f"{binary_name}-{target}.zip"
-                    # Use PowerShell for Windows
-                    run_command(
-                        [
-                            "powershell",
-                            "-Command",
-                            f"Compress-Archive -Path {binary_path} -DestinationPath releases/{archive_name}",
-                        ]
-                    )
-                else:
-                    archive_name = f"{binary_name}-{target}.tar.gz"
-                    run_command(
-                        [
-                            "tar",
-                            "-czf",
-                            f"releases/{archive_name}",
-                            "-C",
-                            f"target/{target}/release",
-                            binary_name,
-                        ]
-                    )
-
-                log(f"Created archive: {archive_name}")
+                suffix = ".zip" if target.endswith("windows-gnu") else ".tar.gz"
+                create_archive(Path(binary_path), releases_dir / f"{binary_name}-{target}{suffix}")
             else:
                 log(f"Binary not found at {binary_path}", "WARN")
         else:
@@ -183,31 +278,14 @@ def build_go_artifacts() -> bool:
             success_count += 1
 
             # Create archive
-            if goos == "windows":
-                archive_name = f"{module_name}-{goos}-{goarch}.zip"
-                run_command(
-                    [
-                        "zip",
-                        f"releases/{archive_name}",
-                        f"releases/{binary_name}",
-                    ]
-                )
-            else:
-                archive_name = f"{module_name}-{goos}-{goarch}.tar.gz"
-                run_command(
-                    [
-                        "tar",
-                        "-czf",
-                        f"releases/{archive_name}",
-                        "-C",
-                        "releases",
-                        binary_name,
-                    ]
-                )
+            suffix = ".zip" if goos == "windows" else ".tar.gz"
+            create_archive(
+                releases_dir / binary_name,
+                releases_dir / f"{module_name}-{goos}-{goarch}{suffix}",
+            )
 
             # Remove the binary (keep only archive)
             Path(f"releases/{binary_name}").unlink(missing_ok=True)
-            log(f"Created archive: {archive_name}")
         else:
             log(f"Failed to build for {goos}/{goarch}: {stderr}", "ERROR")
 
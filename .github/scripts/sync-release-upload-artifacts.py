@@ -1,34 +1,50 @@
 #!/usr/bin/env python3
 # file: .github/scripts/sync-release-upload-artifacts.py
-# version: 1.0.0
+# version: 1.1.1
 # guid: c4d5e6f7-a8b9-c0d1-e2f3-a4b5c6d7e8f9
 
-"""Upload release artifacts to GitHub release."""
+"""Upload release artifacts to GitHub release.
+
+Artifacts are streamed to the release concurrently by the shared
+``release_asset_uploader`` module. Assets already attached with the same size
+and digest are skipped, so re-running a failed job only uploads what is
+missing. When that module or a token is unavailable, each artifact is uploaded
+with ``gh release upload`` as before.
+
+Environment:
+    GH_TOKEN / GITHUB_TOKEN: Token used for the REST API.
+    UPLOAD_WORKERS: Concurrent uploads (default: 4).
+    UPLOAD_CLOBBER: Replace assets whose content differs when "true".
+"""
 
 import os
 import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "workflows" / "scripts"))
 
-def upload_artifacts(release_id, artifacts_dir):
-    """Upload artifacts to GitHub release."""
-    artifacts_path = Path(artifacts_dir)
+try:
+    import release_asset_uploader
+except ImportError:  # pragma: no cover - ghcommon workflow scripts not synced
+    release_asset_uploader = None
+
+ARTIFACT_PATTERNS = ["*.tar.gz", "*.zip", "*.whl", "*.tgz"]
 
-    if not artifacts_path.exists():
-        print(f"Artifacts directory {artifacts_dir} does not exist")
-        return
 
-    # Find all artifact files
+def find_artifacts(artifacts_path):
+    """Return artifact files in upload order, without duplicates."""
     artifact_files = []
-    for pattern in ["*.tar.gz", "*.zip", "*.whl", "*.tgz"]:
-        artifact_files.extend(artifacts_path.glob(pattern))
+    for pattern in ARTIFACT_PATTERNS:
+        for artifact in sorted(artifacts_path.glob(pattern)):
+            if artifact not in artifact_files:
+                artifact_files.append(artifact)
+    return artifact_files
 
-    if not artifact_files:
-        print("No artifacts found to upload")
-        return
 
-    # Upload each artifact
+def upload_with_gh(release_id, artifact_files):
+    """Upload artifacts one at a time with the GitHub CLI."""
+    failed = 0
     for artifact in artifact_files:
         print(f"Uploading {artifact.name}...")
         cmd = [
@@ -45,7 +61,61 @@ def upload_artifacts(release_id, artifacts_dir):
         if result.returncode == 0:
             print(f"  ✓ Uploaded {artifact.name}")
         else:
+            failed += 1
             print(f"  ✗ Failed to upload {artifact.name}: {result.stderr}")
+    return failed
+
+
+def upload_natively(release_id, artifact_files, token):
+    """Upload artifacts concurrently through the REST API."""
+    client = release_asset_uploader.GitHubClient(token)
+    try:
+        results = release_asset_uploader.upload_release_assets(
+            client,
+            os.environ.get("GITHUB_REPOSITORY", ""),
+            release_id,
+            artifact_files,
+            workers=int(os.environ.get("UPLOAD_WORKERS") or release_asset_uploader.DEFAULT_WORKERS),
+            clobber=os.environ.get("UPLOAD_CLOBBER", "").lower() == "true",
+        )
+    except release_asset_uploader.UploadError as exc:
+        print(f"  ✗ {exc}")
+        return len(artifact_files)
+
+    failed = 0
+    for result in results:
+        if result.status == "uploaded":
+            print(f"  ✓ Uploaded {result.name}")
+        elif result.status == "skipped":
+            print(f"  = Skipped {result.name} (already uploaded)")
+        else:
+            failed += 1
+            print(f"  ✗ Failed to upload {result.name}: {result.error}")
+    return failed
+
+
+def upload_artifacts(release_id, artifacts_dir):
+    """Upload artifacts to GitHub release.
+
+    Returns:
+        Number of artifacts that failed to upload.
+    """
+    artifacts_path = Path(artifacts_dir)
+
+    if not artifacts_path.exists():
+        print(f"Artifacts directory {artifacts_dir} does not exist")
+        return 0
+
+    artifact_files = find_artifacts(artifacts_path)
+    if not artifact_files:
+        print("No artifacts found to upload")
+        return 0
+
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if release_asset_uploader is None or not token:
+        return upload_with_gh(release_id, artifact_files)
+    print(f"Uploading {len(artifact_files)} artifacts...")
+    return upload_natively(release_id, artifact_files, token)
 
 
 def main():
@@ -57,7 +127,7 @@ def main():
     release_id = sys.argv[1]
     artifacts_dir = sys.argv[2]
 
-    upload_artifacts(release_id, artifacts_dir)
+    sys.exit(1 if upload_artifacts(release_id, artifacts_dir) else 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/archive_builder.py
+# version: 1.0.0
+# guid: b9ebc802-661d-4513-8069-9c74cbc0e92c
+
+"""Reproducible, multi-threaded tar.gz / tar.zst / zip archive builder.
+
+Archives built here are byte-for-byte reproducible: entries are sorted, owner
+and group are zeroed, permissions are normalized to 0644/0755, and every
+timestamp is ``SOURCE_DATE_EPOCH`` (or 1980-01-01). Identical inputs therefore
+yield identical SHA-256 digests, which lets callers skip unchanged packages.
+
+gzip output is compressed pigz-style: the tar stream is cut into fixed-size
+blocks that are deflated on a thread pool (zlib releases the GIL), each primed
+with the previous block's last 32 KiB as dictionary, and the raw deflate
+streams are concatenated into a single gzip member. Block boundaries do not
+depend on the worker count, so the output is identical on any machine.
+
+zstd output needs the optional ``zstandard`` package (or Python 3.14's
+``compression.zstd``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import stat
+import struct
+import tarfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+DEFAULT_MTIME = 315532800  # 1980-01-01T00:00:00Z, the earliest zip timestamp
+DEFAULT_LEVEL = 6
+GZIP_BLOCK_SIZE = 1024 * 1024
+DICTIONARY_SIZE = 32 * 1024
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ArchiveError(RuntimeError):
+    """Raised when an archive cannot be built."""
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """A file system object to store in an archive."""
+
+    arcname: str
+    path: Path
+    kind: str  # file | dir | symlink
+    mode: int
+
+
+@dataclass(frozen=True)
+class ArchiveResult:
+    """A finished archive and its digest."""
+
+    path: Path
+    sha256: str
+    size: int
+
+
+def source_date_epoch() -> int:
+    """Return the normalized timestamp for archive entries."""
+    value = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    try:
+        return max(int(value), DEFAULT_MTIME) if value else DEFAULT_MTIME
+    except ValueError:
+        return DEFAULT_MTIME
+
+
+def _entry(path: Path, arcname: str) -> ArchiveEntry:
+    info = path.lstat()
+    if stat.S_ISLNK(info.st_mode):
+        return ArchiveEntry(arcname, path, "symlink", 0o777)
+    if stat.S_ISDIR(info.st_mode):
+        return ArchiveEntry(arcname, path, "dir", 0o755)
+    mode = 0o755 if info.st_mode & 0o111 else 0o644
+    return ArchiveEntry(arcname, path, "file", mode)
+
+
+def collect_entries(sources: Iterable[tuple[Path | str, str]]) -> list[ArchiveEntry]:
+    """Expand ``(path, arcname)`` pairs recursively into sorted entries.
+
+    Symlinks are stored as links and never followed.
+    """
+    entries: dict[str, ArchiveEntry] = {}
+    for source, arcname in sources:
+        source = Path(source)
+        arcname = arcname.strip("/")
+        top = _entry(source, arcname)
+        entries[arcname] = top
+        if top.kind != "dir":
+            continue
+        for dirpath, dirnames, filenames in os.walk(source):
+            rel = os.path.relpath(dirpath, source)
+            prefix = arcname if rel == "." else f"{arcname}/{rel.replace(os.sep, '/')}"
+            for name in dirnames + filenames:
+                entry = _entry(Path(dirpath) / name, f"{prefix}/{name}")
+                entries[entry.arcname] = entry
+    return [entries[name] for name in sorted(entries)]
+
+
+def _compress_block(data: bytes, dictionary: bytes, level: int, last: bool) -> bytes:
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+class ParallelGzipWriter:
+    """Write-only file object producing a single, reproducible gzip member."""
+
+    def __init__(
+        self,
+        raw: BinaryIO,
+        level: int = DEFAULT_LEVEL,
+        workers: int | None = None,
+        block_size: int = GZIP_BLOCK_SIZE,
+    ) -> None:
+        """Wrap ``raw``; ``workers`` defaults to the CPU count."""
+        self._raw = raw
+        self._level = level
+        self._block_size = block_size
+        self._workers = max(1, workers or os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        self._pending: deque[Future[bytes]] = deque()
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._crc = 0
+        self._size = 0
+        self._closed = False
+        # Fixed header: no name, mtime 0, unknown OS, so output never varies.
+        self._raw.write(b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff")
+
+    def writable(self) -> bool:
+        """Report that the stream accepts writes."""
+        return True
+
+    def _submit(self, block: bytes, last: bool) -> None:
+        self._pending.append(
+            self._executor.submit(_compress_block, block, self._dictionary, self._level, last)
+        )
+        self._dictionary = block[-DICTIONARY_SIZE:]
+        while len(self._pending) > self._workers * 2:
+            self._raw.write(self._pending.popleft().result())
+
+    def write(self, data: bytes) -> int:
+        """Buffer ``data`` and compress every complete block."""
+        if self._closed:
+            raise ValueError("write to closed ParallelGzipWriter")
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        self._buffer += data
+        while len(self._buffer) > self._block_size:
+            block = bytes(self._buffer[: self._block_size])
+            del self._buffer[: self._block_size]
+            self._submit(block, last=False)
+        return len(data)
+
+    def close(self) -> None:
+        """Flush the final block and write the gzip trailer."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._submit(bytes(self._buffer), last=True)
+            self._buffer.clear()
+            while self._pending:
+                self._raw.write(self._pending.popleft().result())
+            self._raw.write(struct.pack("<II", self._crc & 0xFFFFFFFF, self._size & 0xFFFFFFFF))
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> ParallelGzipWriter:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+def _zstd_writer(raw: BinaryIO, level: int, workers: int | None):
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    if zstandard is not None:
+        # Multi-threaded zstd output does not depend on the thread count.
+        threads = max(1, workers or os.cpu_count() or 1)
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads, write_checksum=True)
+        return compressor.stream_writer(raw, closefd=False)
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+    except ImportError as exc:
+        raise ArchiveError("zstd archives require the 'zstandard' package") from exc
+    return zstd.ZstdFile(raw, "w", level=level)
+
+
+def _tar_info(entry: ArchiveEntry, mtime: int) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(entry.arcname)
+    info.mtime = mtime
+    info.mode = entry.mode
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    if entry.kind == "dir":
+        info.type = tarfile.DIRTYPE
+    elif entry.kind == "symlink":
+        info.type = tarfile.SYMTYPE
+        info.linkname = os.readlink(entry.path)
+    else:
+        info.size = entry.path.stat().st_size
+    return info
+
+
+def _write_tar(entries: list[ArchiveEntry], stream: BinaryIO, mtime: int) -> None:
+    with tarfile.open(fileobj=stream, mode="w|", format=tarfile.GNU_FORMAT) as archive:
+        for entry in entries:
+            info = _tar_info(entry, mtime)
+            if entry.kind == "file":
+                with entry.path.open("rb") as handle:
+                    archive.addfile(info, handle)
+            else:
+                archive.addfile(info)
+
+
+def _write_zip(entries: list[ArchiveEntry], output: Path, mtime: int, level: int) -> None:
+    date_time = _zip_date_time(mtime)
+    with zipfile.ZipFile(output, "w") as archive:
+        for entry in entries:
+            if entry.kind == "dir":
+                info = zipfile.ZipInfo(f"{entry.arcname}/", date_time)
+                info.external_attr = ((stat.S_IFDIR | entry.mode) << 16) | 0x10
+                info.create_system = 3
+                archive.writestr(info, b"")
+                continue
+            info = zipfile.ZipInfo(entry.arcname, date_time)
+            info.create_system = 3
+            if entry.kind == "symlink":
+                info.external_attr = (stat.S_IFLNK | entry.mode) << 16
+                archive.writestr(info, os.readlink(entry.path))
+                continue
+            info.external_attr = (stat.S_IFREG | entry.mode) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info._compresslevel = level  # pylint: disable=protected-access
+            size = entry.path.stat().st_size
+            zip64 = size > zipfile.ZIP64_LIMIT
+            with entry.path.open("rb") as src, archive.open(info, "w", force_zip64=zip64) as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
+def _zip_date_time(mtime: int) -> tuple[int, int, int, int, int, int]:
+    parts = time.gmtime(mtime)
+    return (parts.tm_year, parts.tm_mon, parts.tm_mday, parts.tm_hour, parts.tm_min, parts.tm_sec)
+
+
+def archive_format(path: Path | str) -> str:
+    """Infer the archive format (tar.gz, tar.zst, zip) from a file name."""
+    name = str(path).lower()
+    if name.endswith((".tar.gz", ".tgz")):
+        return "tar.gz"
+    if name.endswith((".tar.zst", ".tzst")):
+        return "tar.zst"
+    if name.endswith(".zip"):
+        return "zip"
+    raise ArchiveError(f"Unsupported archive type: {path}")
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of ``path``."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(COPY_BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_archive(
+    sources: Iterable[tuple[Path | str, str]],
+    output: Path | str,
+    *,
+    level: int | None = None,
+    workers: int | None = None,
+) -> ArchiveResult:
+    """Build a reproducible archive of ``sources`` at ``output``.
+
+    Args:
+        sources: ``(path, arcname)`` pairs; directories are added recursively.
+        output: Destination; the format is inferred from the suffix.
+        level: Compression level (defaults: 6 for gzip/zip, 3 for zstd).
+        workers: Compression threads (defaults to the CPU count).
+
+    Raises:
+        ArchiveError: If the format is unsupported or a source is missing.
+    """
+    output = Path(output)
+    kind = archive_format(output)
+    try:
+        entries = collect_entries(sources)
+    except FileNotFoundError as exc:
+        raise ArchiveError(f"Archive source not found: {exc.filename}") from exc
+    mtime = source_date_epoch()
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f".{output.name}.tmp")
+    try:
+        if kind == "zip":
+            _write_zip(entries, tmp_path, mtime, DEFAULT_LEVEL if level is None else level)
+        else:
+            with tmp_path.open("wb") as raw:
+                if kind == "tar.gz":
+                    stream = ParallelGzipWriter(
+                        raw, DEFAULT_LEVEL if level is None else level, workers
+                    )
+                else:
+                    stream = _zstd_writer(raw, 3 if level is None else level, workers)
+                with stream:
+                    _write_tar(entries, stream, mtime)
+        tmp_path.replace(output)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return ArchiveResult(path=output, sha256=file_sha256(output), size=output.stat().st_size)
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: .github/workflows/scripts/automation_workflow.py
-# version: 1.2.1
+# version: 1.7.3
 # guid: b2c3d4e5-f6a7-8b9c-0d1e-2f3a4b5c6d7e
 
 """Advanced automation workflow helper.
@@ -10,6 +10,12 @@ performance optimization, workflow analytics, and self-healing capabilities.
 
 The API is intentionally modular so GitHub Actions steps and reusable workflow
 helpers can compose the pieces they need without relying on shell scripts.
+``jwt`` and ``requests`` are imported inside the functions that call the
+GitHub API, so cache and metrics subcommands start without loading them.
+
+``cache-pack`` and ``cache-unpack`` keep cache directories in a local
+content-defined chunk store (see :mod:`cache_chunks`), so restoring from a
+nearby key only writes the chunks and files that changed.
 """
 
 from __future__ import annotations
@@ -18,19 +24,33 @@ import argparse
 import hashlib
 import json
 import os
+import sys
+from array import array
 from collections import defaultdict
-from collections.abc import Mapping, Sequence
-from dataclasses import dataclass, field
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Final
+from typing import TYPE_CHECKING, Any, Final
 
-import jwt
-import requests
 import workflow_common
+from quantile_sketch import TDigest
+
+if TYPE_CHECKING:
+    import requests
 
 DEFAULT_CACHE_RESTORE_SLICES: Final[tuple[int, ...]] = (32, 24, 16)
 DEFAULT_GITHUB_API_URL: Final[str] = "https://api.github.com"
+DEFAULT_FETCH_WORKERS: Final[int] = 4
+DEFAULT_RECENT_RUNS: Final[int] = 20
+DURATION_PERCENTILES: Final[tuple[int, ...]] = (50, 90, 99)
+FAILED_CONCLUSIONS: Final[frozenset[str]] = frozenset({"failure", "timed_out", "cancelled"})
+OUTCOME_OTHER, OUTCOME_SUCCESS, OUTCOME_FAILED = 0, 1, 2
+CACHE_UNKNOWN: Final[int] = -1
+MISSING_TIMESTAMP: Final[int] = -(2**63)
+_EPOCH: Final[datetime] = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH: Final[datetime] = datetime(1970, 1, 1)
+_MICROSECOND: Final[timedelta] = timedelta(microseconds=1)
 CACHE_PROFILES: Final[dict[str, dict[str, tuple[str, ...]]]] = {
     "go": {
         "files": ("go.mod", "go.sum"),
@@ -107,8 +127,12 @@ class WorkflowRun:
         )
         status = str(data.get("status", "completed")).lower()
         conclusion = str(data.get("conclusion", status)).lower()
-        started_at = _parse_datetime(data.get("run_started_at") or data.get("started_at"))
-        completed_at = _parse_datetime(data.get("updated_at") or data.get("completed_at"))
+        started_at = workflow_common.parse_datetime(
+            data.get("run_started_at") or data.get("started_at")
+        )
+        completed_at = workflow_common.parse_datetime(
+            data.get("updated_at") or data.get("completed_at")
+        )
         duration_seconds = _resolve_duration_seconds(data, started_at, completed_at)
         cache_hit: bool | None = None
         cache_info = data.get("cache")
@@ -134,7 +158,103 @@ class WorkflowRun:
     @property
     def failed(self) -> bool:
         """Return True if the run concluded with a failure."""
-        return self.conclusion in {"failure", "timed_out", "cancelled"}
+        return self.conclusion in FAILED_CONCLUSIONS
+
+
+@dataclass(slots=True)
+class WorkflowRunColumns:
+    """Workflow runs stored column-wise for fast aggregation.
+
+    Workflow names, statuses and conclusions are interned into integer codes,
+    timestamps are epoch microseconds (``MISSING_TIMESTAMP`` when absent) and
+    cache hits are ``1``/``0``/``CACHE_UNKNOWN``. Fields are resolved exactly
+    as :meth:`WorkflowRun.from_dict` does.
+    """
+
+    workflows: list[str] = field(default_factory=list)
+    labels: list[str] = field(default_factory=list)
+    workflow: array = field(default_factory=lambda: array("i"))
+    status: array = field(default_factory=lambda: array("i"))
+    conclusion: array = field(default_factory=lambda: array("i"))
+    outcome: array = field(default_factory=lambda: array("b"))
+    started: array = field(default_factory=lambda: array("q"))
+    completed: array = field(default_factory=lambda: array("q"))
+    duration: array = field(default_factory=lambda: array("d"))
+    cache_hit: array = field(default_factory=lambda: array("b"))
+
+    def __len__(self) -> int:
+        return len(self.workflow)
+
+    @classmethod
+    def from_dicts(cls, runs_data: Iterable[Mapping[str, Any]]) -> WorkflowRunColumns:
+        """Parse raw workflow run payloads into columns in a single pass."""
+        columns = cls()
+        workflow_codes: dict[str, int] = {}
+        label_codes: dict[str, int] = {}
+
+        def intern(codes: dict[str, int], values: list[str], value: str) -> int:
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(values)
+                values.append(value)
+            return code
+
+        workflows, labels = columns.workflows, columns.labels
+        append_workflow, append_status = columns.workflow.append, columns.status.append
+        append_conclusion, append_outcome = columns.conclusion.append, columns.outcome.append
+        append_started, append_completed = columns.started.append, columns.completed.append
+        append_duration, append_cache = columns.duration.append, columns.cache_hit.append
+        for data in runs_data:
+            name = str(
+                data.get("name") or data.get("workflow_name") or data.get("workflow") or "unknown"
+            )
+            status = str(data.get("status", "completed")).lower()
+            conclusion = str(data.get("conclusion", status)).lower()
+            started = _timestamp_micros(data.get("run_started_at") or data.get("started_at"))
+            completed = _timestamp_micros(data.get("updated_at") or data.get("completed_at"))
+            if "duration_seconds" in data:
+                duration = float(data["duration_seconds"])
+            elif "run_duration_ms" in data:
+                duration = float(data["run_duration_ms"]) / 1000.0
+            elif started != MISSING_TIMESTAMP and completed != MISSING_TIMESTAMP:
+                duration = max((completed - started) / 1_000_000, 0.0)
+            else:
+                duration = 0.0
+            cache_info = data.get("cache")
+            if isinstance(cache_info, Mapping):
+                cache_hit = _coerce_bool(cache_info.get("hit"))
+            elif "cache_hit" in data:
+                cache_hit = _coerce_bool(data.get("cache_hit"))
+            else:
+                cache_hit = None
+
+            append_workflow(intern(workflow_codes, workflows, name))
+            append_status(intern(label_codes, labels, status))
+            append_conclusion(intern(label_codes, labels, conclusion))
+            if conclusion == "success":
+                append_outcome(OUTCOME_SUCCESS)
+            elif conclusion in FAILED_CONCLUSIONS:
+                append_outcome(OUTCOME_FAILED)
+            else:
+                append_outcome(OUTCOME_OTHER)
+            append_started(started)
+            append_completed(completed)
+            append_duration(duration)
+            append_cache(CACHE_UNKNOWN if cache_hit is None else int(cache_hit))
+        return columns
+
+    def run(self, index: int) -> WorkflowRun:
+        """Materialize the run at ``index``."""
+        cache_hit = self.cache_hit[index]
+        return WorkflowRun(
+            workflow=self.workflows[self.workflow[index]],
+            status=self.labels[self.status[index]],
+            conclusion=self.labels[self.conclusion[index]],
+            started_at=_from_micros(self.started[index]),
+            completed_at=_from_micros(self.completed[index]),
+            duration_seconds=self.duration[index],
+            cache_hit=None if cache_hit == CACHE_UNKNOWN else bool(cache_hit),
+        )
 
 
 @dataclass(slots=True)
@@ -149,6 +269,9 @@ class WorkflowSummary:
     cache_hit_rate: float | None
     consecutive_failures: int
     last_run: WorkflowRun | None
+    duration_sketch: TDigest | None = None
+    baseline_sketch: TDigest | None = None
+    recent_sketch: TDigest | None = None
 
     @property
     def success_rate(self) -> float:
@@ -157,6 +280,12 @@ class WorkflowSummary:
             return 0.0
         return self.successes / self.runs
 
+    def duration_percentile(self, percentile: float) -> float | None:
+        """Return the estimated duration percentile (0-100) in seconds."""
+        if self.duration_sketch is None:
+            return None
+        return self.duration_sketch.quantile(percentile / 100)
+
 
 @dataclass(slots=True)
 class WorkflowMetrics:
@@ -188,6 +317,13 @@ class WorkflowMetrics:
                     "cache_hit_rate": summary.cache_hit_rate,
                     "consecutive_failures": summary.consecutive_failures,
                     "last_run": _serialize_run(summary.last_run),
+                    **{
+                        f"p{percentile}_duration": summary.duration_percentile(percentile)
+                        for percentile in DURATION_PERCENTILES
+                    },
+                    "duration_sketch": (
+                        summary.duration_sketch.to_dict() if summary.duration_sketch else None
+                    ),
                 }
                 for name, summary in self.workflows.items()
             },
@@ -236,6 +372,8 @@ def build_app_jwt(
         "exp": int(expires_at.timestamp()),
         "iss": str(app_id),
     }
+    import jwt
+
     token = jwt.encode(payload, private_key, algorithm="RS256")
     return token if isinstance(token, str) else token.decode("utf-8")
 
@@ -252,7 +390,11 @@ def get_installation_access_token(
     """Return an installation access token for the GitHub App."""
     token = build_app_jwt(app_id, private_key, expires_in=expires_in)
     url = f"{api_url.rstrip('/')}/app/installations/{installation_id}/access_tokens"
-    client = session or requests.Session()
+    if session is None:
+        import requests
+
+        session = requests.Session()
+    client = session
     headers = {
         "Authorization": f"Bearer {token}",
         "Accept": "application/vnd.github+json",
@@ -366,6 +508,21 @@ def build_cache_plan(
     )
 
 
+def build_duration_sketches(
+    durations: Sequence[float],
+    recent_runs: int = DEFAULT_RECENT_RUNS,
+) -> tuple[TDigest, TDigest, TDigest]:
+    """Return ``(all, baseline, recent)`` duration sketches for time-ordered runs.
+
+    The recent window is the last ``recent_runs`` durations (at most half of
+    them); the baseline is everything before it.
+    """
+    split = len(durations) - min(recent_runs, len(durations) // 2)
+    baseline = TDigest().update(durations[:split])
+    recent = TDigest().update(durations[split:])
+    return baseline.copy().merge(recent), baseline, recent
+
+
 def collect_workflow_metrics(
     runs_data: Sequence[Mapping[str, Any]],
 ) -> WorkflowMetrics:
@@ -408,6 +565,9 @@ def collect_workflow_metrics(
         )
         consecutive_failures = _calculate_consecutive_failures(sorted_runs)
         last_run = sorted_runs[-1] if sorted_runs else None
+        duration_sketch, baseline_sketch, recent_sketch = build_duration_sketches(
+            [item.duration_seconds for item in sorted_runs]
+        )
         for item in sorted_runs:
             if item.started_at:
                 timestamps.append(item.started_at)
@@ -422,6 +582,9 @@ def collect_workflow_metrics(
             cache_hit_rate=cache_hit_rate,
             consecutive_failures=consecutive_failures,
             last_run=last_run,
+            duration_sketch=duration_sketch,
+            baseline_sketch=baseline_sketch,
+            recent_sketch=recent_sketch,
         )
 
     total_runs = len(runs)
@@ -441,6 +604,107 @@ def collect_workflow_metrics(
     )
 
 
+def collect_workflow_metrics_columnar(
+    runs_data: Iterable[Mapping[str, Any]] | WorkflowRunColumns,
+) -> WorkflowMetrics:
+    """Columnar equivalent of :func:`collect_workflow_metrics`.
+
+    Runs are parsed once into :class:`WorkflowRunColumns`, bucketed by
+    workflow code in one pass, and each bucket is aggregated with C-level
+    list operations instead of per-run dataclasses. The result serializes
+    identically to the dataclass path, but ``WorkflowMetrics.runs`` is left
+    empty to avoid materializing every run.
+    """
+    columns = (
+        runs_data
+        if isinstance(runs_data, WorkflowRunColumns)
+        else WorkflowRunColumns.from_dicts(runs_data)
+    )
+    if not len(columns):
+        return WorkflowMetrics(
+            total_runs=0,
+            success_rate=0.0,
+            average_duration=0.0,
+            workflows={},
+            start_time=None,
+            end_time=None,
+            runs=(),
+        )
+
+    now = _to_micros(datetime.now(timezone.utc))
+    sort_keys = array(
+        "q",
+        (
+            started
+            if started != MISSING_TIMESTAMP
+            else (completed if completed != MISSING_TIMESTAMP else now)
+            for started, completed in zip(columns.started, columns.completed)
+        ),
+    )
+    buckets = [array("l") for _ in columns.workflows]
+    for index, code in enumerate(columns.workflow):
+        buckets[code].append(index)
+
+    outcome, duration, cache_hit = columns.outcome, columns.duration, columns.cache_hit
+    workflow_summaries: dict[str, WorkflowSummary] = {}
+    overall_duration = 0.0
+    overall_success = 0
+    for code, bucket in enumerate(buckets):
+        indices = sorted(bucket, key=sort_keys.__getitem__)
+        buckets[code] = array("l")  # only one group's index list is alive at a time
+        runs_count = len(indices)
+        outcomes = [outcome[index] for index in indices]
+        durations = [duration[index] for index in indices]
+        hits = [cache_hit[index] for index in indices]
+        successes = outcomes.count(OUTCOME_SUCCESS)
+        duration_sum = sum(durations)
+        overall_duration += duration_sum
+        overall_success += successes
+        known_hits = runs_count - hits.count(CACHE_UNKNOWN)
+        streak = 0
+        for value in reversed(outcomes):
+            if value != OUTCOME_FAILED:
+                break
+            streak += 1
+        duration_sketch, baseline_sketch, recent_sketch = build_duration_sketches(durations)
+        name = columns.workflows[code]
+        workflow_summaries[name] = WorkflowSummary(
+            name=name,
+            runs=runs_count,
+            successes=successes,
+            failures=outcomes.count(OUTCOME_FAILED),
+            average_duration=duration_sum / runs_count,
+            cache_hit_rate=hits.count(1) / known_hits if known_hits else None,
+            consecutive_failures=streak,
+            last_run=columns.run(indices[-1]),
+            duration_sketch=duration_sketch,
+            baseline_sketch=baseline_sketch,
+            recent_sketch=recent_sketch,
+        )
+
+    total_runs = len(columns)
+    # MISSING_TIMESTAMP is the smallest int64, so max() needs no filtering.
+    latest = max(max(columns.started), max(columns.completed))
+    earliest = min(
+        (
+            value
+            for column in (columns.started, columns.completed)
+            for value in column
+            if value != MISSING_TIMESTAMP
+        ),
+        default=MISSING_TIMESTAMP,
+    )
+    return WorkflowMetrics(
+        total_runs=total_runs,
+        success_rate=overall_success / total_runs,
+        average_duration=overall_duration / total_runs,
+        workflows=workflow_summaries,
+        start_time=_from_micros(earliest),
+        end_time=_from_micros(latest),
+        runs=(),
+    )
+
+
 def detect_self_healing_actions(
     metrics: WorkflowMetrics,
     *,
@@ -448,8 +712,18 @@ def detect_self_healing_actions(
     failure_streak_threshold: int = 3,
     min_runs_for_success_rate: int = 5,
     cache_hit_threshold: float = 0.5,
+    tail_percentile: float = 90,
+    tail_regression_ratio: float = 1.5,
+    min_tail_shift_seconds: float = 60.0,
+    min_runs_for_tail: int = 10,
 ) -> list[SelfHealingAction]:
-    """Return recommended remediation steps based on metrics."""
+    """Return recommended remediation steps based on metrics.
+
+    Besides success rate, failure streaks and cache hit rate, this compares
+    each workflow's tail duration (``tail_percentile``) over its most recent
+    runs against the baseline before them and flags a regression when it
+    grew by ``tail_regression_ratio`` and at least ``min_tail_shift_seconds``.
+    """
     actions: list[SelfHealingAction] = []
 
     if metrics.total_runs >= min_runs_for_success_rate and metrics.success_rate < overall_threshold:
@@ -488,9 +762,49 @@ def detect_self_healing_actions(
                     severity="medium",
                 )
             )
+        regression = _detect_tail_regression(
+            summary,
+            tail_percentile,
+            ratio=tail_regression_ratio,
+            min_shift=min_tail_shift_seconds,
+            min_runs=min_runs_for_tail,
+        )
+        if regression is not None:
+            actions.append(regression)
     return actions
 
 
+def _detect_tail_regression(
+    summary: WorkflowSummary,
+    percentile: float,
+    *,
+    ratio: float,
+    min_shift: float,
+    min_runs: int,
+) -> SelfHealingAction | None:
+    baseline, recent = summary.baseline_sketch, summary.recent_sketch
+    if baseline is None or recent is None:
+        return None
+    if len(baseline) < min_runs or len(recent) < max(1, min_runs // 2):
+        return None
+    before = baseline.quantile(percentile / 100)
+    after = recent.quantile(percentile / 100)
+    if before is None or after is None:
+        return None
+    if after < before * ratio or after - before < min_shift:
+        return None
+    label = f"p{percentile:g}"
+    return SelfHealingAction(
+        slug=f"{summary.name}-tail-latency-regression",
+        description=(
+            f"{summary.name} {label} duration rose from {before:.0f}s to {after:.0f}s "
+            f"over the last {len(recent)} runs. "
+            "Recommend profiling the slowest jobs or bisecting recent workflow changes."
+        ),
+        severity="high" if after >= 2 * before else "medium",
+    )
+
+
 def fetch_recent_workflow_runs(
     repo: str,
     *,
@@ -499,8 +813,20 @@ def fetch_recent_workflow_runs(
     pages: int = 1,
     base_url: str = DEFAULT_GITHUB_API_URL,
     session: requests.Session | None = None,
+    created: str | None = None,
+    workers: int = DEFAULT_FETCH_WORKERS,
 ) -> list[dict[str, Any]]:
-    """Fetch workflow run data from the GitHub REST API."""
+    """Fetch workflow run data from the GitHub REST API.
+
+    The first page is fetched on its own to learn ``total_count``; the
+    remaining pages (up to ``pages``) are then fetched concurrently and
+    returned in page order.
+
+    Args:
+        created: Optional ``created`` search qualifier such as
+            ``">=2024-01-01T00:00:00Z"`` to fetch only newer runs.
+        workers: Maximum number of concurrent page requests.
+    """
     if per_page <= 0 or per_page > 100:
         msg = "per_page must be between 1 and 100"
         raise ValueError(msg)
@@ -513,24 +839,48 @@ def fetch_recent_workflow_runs(
         "Authorization": f"Bearer {token}",
         "Accept": "application/vnd.github+json",
     }
-    client = session or requests.Session()
-    runs: list[dict[str, Any]] = []
-    for page in range(1, pages + 1):
-        response = client.get(
-            url,
-            headers=headers,
-            params={"per_page": per_page, "page": page},
-            timeout=30,
-        )
+    if session is None:
+        import requests
+
+        session = requests.Session()
+    client = session
+
+    def fetch_page(page: int) -> dict[str, Any] | None:
+        params: dict[str, Any] = {"per_page": per_page, "page": page}
+        if created:
+            params["created"] = created
+        response = client.get(url, headers=headers, params=params, timeout=30)
         if response.status_code != 200:
             workflow_common.log_warning(
                 f"Unable to fetch workflow runs (status={response.status_code}, page={page})",
             )
-            break
-        payload = response.json()
-        runs.extend(payload.get("workflow_runs", []))
-        if len(payload.get("workflow_runs", [])) < per_page:
-            break
+            return None
+        return response.json()
+
+    first = fetch_page(1)
+    if first is None:
+        return []
+    runs: list[dict[str, Any]] = list(first.get("workflow_runs", []))
+    if len(runs) < per_page or pages == 1:
+        return runs
+
+    last_page = pages
+    total_count = first.get("total_count")
+    if isinstance(total_count, int):
+        last_page = min(pages, -(-total_count // per_page))
+    remaining = range(2, last_page + 1)
+    if not remaining:
+        return runs
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(remaining)))) as executor:
+        for payload in executor.map(fetch_page, remaining):
+            if payload is None:
+                break
+            page_runs = payload.get("workflow_runs", [])
+            runs.extend(page_runs)
+            if len(page_runs) < per_page:
+                break
     return runs
 
 
@@ -563,7 +913,7 @@ def filter_runs_by_lookback(
     cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=lookback_days)
     filtered: list[Mapping[str, Any]] = []
     for item in runs_data:
-        timestamp = _parse_datetime(
+        timestamp = workflow_common.parse_datetime(
             item.get("run_started_at")
             or item.get("started_at")
             or item.get("created_at")
@@ -592,23 +942,26 @@ def _sanitize_branch(value: str) -> str:
     return sanitized.lower()
 
 
-def _parse_datetime(value: Any) -> datetime | None:
+def _to_micros(value: datetime | None) -> int:
     if value is None:
-        return None
-    if isinstance(value, datetime):
-        return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
-    if isinstance(value, str):
-        text = value.strip()
-        if not text:
-            return None
-        if text.endswith("Z"):
-            text = text[:-1] + "+00:00"
+        return MISSING_TIMESTAMP
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _timestamp_micros(value: Any) -> int:
+    """Return epoch microseconds for a timestamp, with a fast path for API values."""
+    if isinstance(value, str) and len(value) == 20 and value[19] == "Z":
         try:
-            parsed = datetime.fromisoformat(text)
+            return (datetime.fromisoformat(value[:19]) - _NAIVE_EPOCH) // _MICROSECOND
         except ValueError:
-            return None
-        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
-    return None
+            pass
+    return _to_micros(workflow_common.parse_datetime(value))
+
+
+def _from_micros(value: int) -> datetime | None:
+    if value == MISSING_TIMESTAMP:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
 
 
 def _resolve_duration_seconds(
@@ -764,6 +1117,40 @@ def _create_arg_parser() -> argparse.ArgumentParser:
         help="Emit GitHub Action outputs (files, paths).",
     )
 
+    pack_parser = subparsers.add_parser(
+        "cache-pack",
+        help="Store cache paths as content-defined chunks under a key.",
+    )
+    pack_parser.add_argument("--store", required=True, help="Chunk store directory.")
+    pack_parser.add_argument("--key", required=True, help="Cache key to record.")
+    pack_parser.add_argument(
+        "--paths",
+        required=True,
+        help="Comma or newline separated cache paths.",
+    )
+    pack_parser.add_argument(
+        "--restore-keys",
+        default="",
+        help="Newline separated key prefixes whose manifest seeds unchanged files.",
+    )
+    pack_parser.add_argument(
+        "--keep",
+        type=int,
+        help="Keep only the N newest manifests and drop chunks no longer used.",
+    )
+
+    unpack_parser = subparsers.add_parser(
+        "cache-unpack",
+        help="Restore cache paths from a chunk store.",
+    )
+    unpack_parser.add_argument("--store", required=True, help="Chunk store directory.")
+    unpack_parser.add_argument("--key", required=True, help="Cache key to restore.")
+    unpack_parser.add_argument(
+        "--restore-keys",
+        default="",
+        help="Newline separated key prefixes to fall back to, newest match first.",
+    )
+
     metrics_parser = subparsers.add_parser(
         "collect-metrics",
         help="Collect workflow metrics from JSON or GitHub API.",
@@ -801,6 +1188,19 @@ def _create_arg_parser() -> argparse.ArgumentParser:
         type=int,
         help="Only include workflow runs from the last N days.",
     )
+    metrics_parser.add_argument(
+        "--store",
+        help=(
+            "Path to a SQLite metrics store. Runs are ingested incrementally "
+            "and metrics are computed from the stored history."
+        ),
+    )
+    metrics_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_FETCH_WORKERS,
+        help="Concurrent page requests (API mode).",
+    )
     return parser
 
 
@@ -873,22 +1273,71 @@ def _handle_cache_plan(args: argparse.Namespace) -> int:
     return 0
 
 
+def _split_values(value: str) -> list[str]:
+    return [item.strip() for item in value.replace("\n", ",").split(",") if item.strip()]
+
+
+def _handle_cache_pack(args: argparse.Namespace) -> int:
+    import cache_chunks
+
+    store = cache_chunks.ChunkStore(args.store)
+    stats = cache_chunks.pack(
+        store,
+        args.key,
+        _split_values(args.paths),
+        _split_values(args.restore_keys),
+    )
+    if not stats.saved:
+        workflow_common.log_warning(
+            f"{args.key}: contents unchanged since {stats.base_key}; not recording the key",
+        )
+    workflow_common.write_output("cache-saved", str(stats.saved).lower())
+    workflow_common.write_output("cache-new-chunks", str(stats.new_chunks))
+    workflow_common.write_output("cache-new-bytes", str(stats.new_bytes))
+    payload: dict[str, Any] = {"pack": asdict(stats)}
+    if args.keep is not None:
+        manifests, chunks = store.prune(max(args.keep, 1))
+        payload["pruned"] = {"manifests": manifests, "chunks": chunks}
+    print(json.dumps(payload, indent=2))
+    return 0
+
+
+def _handle_cache_unpack(args: argparse.Namespace) -> int:
+    import cache_chunks
+
+    store = cache_chunks.ChunkStore(args.store)
+    try:
+        stats = cache_chunks.unpack(store, args.key, _split_values(args.restore_keys))
+    except cache_chunks.CacheStoreError as exc:
+        workflow_common.log_warning(f"chunk store restore failed: {exc}")
+        stats = cache_chunks.UnpackStats(key=None)
+    workflow_common.write_output("cache-hit", str(stats.exact).lower())
+    workflow_common.write_output("cache-matched-key", stats.key or "")
+    workflow_common.write_output("cache-written-bytes", str(stats.written_bytes))
+    print(json.dumps(asdict(stats), indent=2))
+    return 0
+
+
 def _handle_collect_metrics(args: argparse.Namespace) -> int:
-    if args.input:
-        runs = _load_runs_from_file(args.input)
+    if args.store:
+        metrics = _collect_metrics_from_store(args)
     else:
-        if not args.repo or not args.token:
-            msg = "--repo and --token are required when --input is not provided"
-            raise ValueError(msg)
-        runs = fetch_recent_workflow_runs(
-            args.repo,
-            token=args.token,
-            per_page=args.per_page,
-            pages=args.pages,
-        )
-    if args.lookback_days:
-        runs = filter_runs_by_lookback(runs, args.lookback_days)
-    metrics = collect_workflow_metrics(runs)
+        if args.input:
+            runs = _load_runs_from_file(args.input)
+        else:
+            if not args.repo or not args.token:
+                msg = "--repo and --token are required when --input is not provided"
+                raise ValueError(msg)
+            runs = fetch_recent_workflow_runs(
+                args.repo,
+                token=args.token,
+                per_page=args.per_page,
+                pages=args.pages,
+                workers=args.workers,
+            )
+        if args.lookback_days:
+            runs = filter_runs_by_lookback(runs, args.lookback_days)
+        metrics = collect_workflow_metrics_columnar(runs)
     payload = {
         "metrics": metrics.to_dict(),
         "self_healing_actions": [
@@ -901,6 +1350,33 @@ def _handle_collect_metrics(args: argparse.Namespace) -> int:
     return 0
 
 
+def _collect_metrics_from_store(args: argparse.Namespace) -> WorkflowMetrics:
+    import workflow_metrics_store
+
+    with workflow_metrics_store.MetricsStore(args.store) as store:
+        if args.input:
+            store.ingest(args.repo or "local", _load_runs_from_file(args.input))
+        elif args.repo and args.token:
+            ingested = workflow_metrics_store.sync_repository(
+                store,
+                args.repo,
+                token=args.token,
+                per_page=args.per_page,
+                pages=args.pages,
+                lookback_days=args.lookback_days or workflow_metrics_store.DEFAULT_LOOKBACK_DAYS,
+                workers=args.workers,
+            )
+            # stdout carries only the JSON payload.
+            print(
+                f"Ingested {ingested} workflow runs for {args.repo} into {args.store}",
+                file=sys.stderr,
+            )
+        since = None
+        if args.lookback_days:
+            since = datetime.now(timezone.utc) - timedelta(days=args.lookback_days)
+        return store.metrics(repos=[args.repo] if args.repo else None, since=since)
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     """Entry point for CLI usage."""
     parser = _create_arg_parser()
@@ -911,6 +1387,10 @@ def main(argv: Sequence[str] | None = None) -> int:
         return _handle_cache_key(args)
     if args.command == "cache-plan":
         return _handle_cache_plan(args)
+    if args.command == "cache-pack":
+        return _handle_cache_pack(args)
+    if args.command == "cache-unpack":
+        return _handle_cache_unpack(args)
     if args.command == "collect-metrics":
         return _handle_collect_metrics(args)
     parser.print_help()
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/cache_chunks.py
+# version: 1.1.0
+# guid: de8045b9-988b-4ca8-b59e-373594585317
+
+"""Content-defined chunk store for CI cache directories.
+
+:func:`pack` splits every file under the cache paths into content-defined
+chunks, writes chunks the store does not already hold to
+``<store>/chunks/ab/cdef...`` (named by their BLAKE2b digest), and records the
+file list in a small JSON manifest per cache key. :func:`unpack` resolves a key
+(or the newest manifest matching a restore-key prefix, like
+``actions/cache``) and writes only the files whose size, mode or mtime differ
+from what is already on disk, so moving between nearby keys touches only the
+chunks that changed.
+
+Chunk boundaries come from a rolling hash computed with C-speed primitives:
+bytes are mapped through a permutation table, the block is read as one big
+integer and multiplied by a 128-bit odd constant. Byte ``i`` of the product
+depends on input bytes ``i-15..i`` (plus rare carries), so an edit only moves
+the boundaries next to it. Zero hash bytes are found with ``bytes.find`` and
+accepted with a stricter test before the average chunk size and a looser one
+after it (FastCDC's normalized chunking).
+
+Unchanged files are not even read on the next pack: a file whose size, mode
+and mtime match the base manifest reuses its chunk list, and :func:`unpack`
+restores mtimes so that this holds after a restore.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+from urllib.parse import quote, unquote
+
+MANIFEST_VERSION = 1
+MIN_CHUNK = 16 * 1024
+AVG_CHUNK = 64 * 1024
+MAX_CHUNK = 256 * 1024
+CHUNKER = f"mul128/{MIN_CHUNK}/{AVG_CHUNK}/{MAX_CHUNK}"
+READ_SIZE = 8 * 1024 * 1024
+_HASH_BLOCK = 1024 * 1024
+_HASH_OVERLAP = 32
+_TABLE = bytes(
+    sorted(
+        range(256),
+        key=lambda value: hashlib.blake2b(bytes([value]), digest_size=8, person=b"cdc").digest(),
+    )
+)
+_MULTIPLIER = int.from_bytes(hashlib.blake2b(b"cdc-multiplier", digest_size=16).digest(), "little")
+_MULTIPLIER |= 1
+
+
+class CacheStoreError(RuntimeError):
+    """Raised when a manifest or chunk is missing or unreadable."""
+
+
+def rolling_hash(data: bytes) -> bytes:
+    """Return one hash byte per byte of ``data``, each a function of the 16 bytes ending there."""
+    parts = []
+    for start in range(0, len(data), _HASH_BLOCK):
+        low = max(start - _HASH_OVERLAP, 0)
+        block = data[low : start + _HASH_BLOCK]
+        size = len(block)
+        product = int.from_bytes(block.translate(_TABLE), "little") * _MULTIPLIER
+        parts.append((product & ((1 << (8 * size)) - 1)).to_bytes(size, "little")[start - low :])
+    return b"".join(parts)
+
+
+def cut_points(data: bytes, final: bool = True) -> list[int]:
+    """Return the chunk end offsets in ``data``.
+
+    Unless ``final``, the tail after the last cut is left for the caller to
+    prepend to the next read, since a later boundary may still fall in it.
+    """
+    size = len(data)
+    reserve = MIN_CHUNK if final else MAX_CHUNK
+    if size <= reserve:
+        return [size] if final and size else []
+    digest = rolling_hash(data)
+    cuts = []
+    start = 0
+    while size - start > reserve:
+        end = min(start + MAX_CHUNK, size)
+        normal = min(start + AVG_CHUNK, end)
+        cut = end
+        position = digest.find(0, start + MIN_CHUNK, end)
+        while position != -1:
+            if position < normal:
+                accept = digest[position - 1] == 0 and digest[position - 2] < 64  # ~2**-18
+            else:
+                accept = digest[position - 1] < 4  # ~2**-14
+            if accept:
+                cut = position + 1
+                break
+            position = digest.find(0, position + 1, end)
+        cuts.append(cut)
+        start = cut
+    if final and start < size:
+        cuts.append(size)
+    return cuts
+
+
+def iter_chunks(handle: BinaryIO, read_size: int = READ_SIZE) -> Iterator[bytes]:
+    """Yield the content-defined chunks of a binary stream."""
+    pending = b""
+    while True:
+        block = handle.read(read_size)
+        final = not block
+        data = pending + block if pending else block
+        previous = 0
+        for cut in cut_points(data, final):
+            yield data[previous:cut]
+            previous = cut
+        pending = data[previous:]
+        if final:
+            return
+
+
+def chunk_id(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ChunkStore:
+    """Chunks and manifests under one directory."""
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root).expanduser()
+        self.chunks = self.root / "chunks"
+        self.manifests = self.root / "manifests"
+        self._directories: set[Path] = set()
+
+    def chunk_path(self, identifier: str) -> Path:
+        return self.chunks / identifier[:2] / identifier[2:]
+
+    def put(self, data: bytes) -> tuple[str, bool]:
+        """Store ``data``; return its id and whether it was new."""
+        identifier = chunk_id(data)
+        path = self.chunk_path(identifier)
+        if path.exists():
+            return identifier, False
+        if path.parent not in self._directories:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._directories.add(path.parent)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+        return identifier, True
+
+    def get(self, identifier: str) -> bytes:
+        try:
+            return self.chunk_path(identifier).read_bytes()
+        except FileNotFoundError:
+            raise CacheStoreError(f"chunk {identifier} is missing from {self.root}") from None
+
+    def manifest_path(self, key: str) -> Path:
+        return self.manifests / f"{quote(key, safe='')}.json"
+
+    def load_manifest(self, key: str) -> dict[str, Any] | None:
+        path = self.manifest_path(key)
+        if not path.is_file():
+            return None
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise CacheStoreError(f"unreadable manifest {path}: {exc}") from exc
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def save_manifest(self, manifest: dict[str, Any]) -> Path:
+        path = self.manifest_path(manifest["key"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(manifest, separators=(",", ":")), encoding="utf-8")
+        os.replace(temporary, path)
+        return path
+
+    def keys(self) -> list[str]:
+        """Return stored keys, newest first."""
+        if not self.manifests.is_dir():
+            return []
+        paths = [path for path in self.manifests.glob("*.json") if not path.name.startswith(".")]
+        paths.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+        return [unquote(path.name[: -len(".json")]) for path in paths]
+
+    def resolve(self, key: str, restore_keys: Sequence[str] = ()) -> str | None:
+        """Return ``key`` if stored, else the newest key starting with a restore key."""
+        keys = self.keys()
+        if key in keys:
+            return key
+        for prefix in restore_keys:
+            for candidate in keys:
+                if candidate.startswith(prefix):
+                    return candidate
+        return None
+
+    def prune(self, keep: int) -> tuple[int, int]:
+        """Keep the ``keep`` newest manifests and the chunks they use.
+
+        Returns the number of manifests and chunks removed.
+        """
+        keys = self.keys()
+        for key in keys[keep:]:
+            self.manifest_path(key).unlink(missing_ok=True)
+        referenced = set()
+        for key in keys[:keep]:
+            manifest = self.load_manifest(key) or {}
+            for entry in manifest.get("files", ()):
+                referenced.update(entry[5])
+        removed = 0
+        if self.chunks.is_dir():
+            for directory in self.chunks.iterdir():
+                for path in directory.iterdir():
+                    if path.name.startswith("."):  # a chunk being written
+                        continue
+                    if directory.name + path.name not in referenced:
+                        path.unlink()
+                        removed += 1
+        return len(keys[keep:]), removed
+
+
+@dataclass
+class PackStats:
+    """What :func:`pack` read and stored."""
+
+    key: str
+    base_key: str | None = None
+    files: int = 0
+    bytes: int = 0
+    reused_files: int = 0
+    chunks: int = 0
+    new_chunks: int = 0
+    new_bytes: int = 0
+    saved: bool = True
+
+
+@dataclass
+class UnpackStats:
+    """What :func:`unpack` restored."""
+
+    key: str | None
+    exact: bool = False
+    files: int = 0
+    written_files: int = 0
+    skipped_files: int = 0
+    written_bytes: int = 0
+
+
+def _walk(root: Path) -> Iterator[tuple[str, os.stat_result]]:
+    """Yield ``(relative path, lstat)`` for directories, files and symlinks below ``root``."""
+    stack = [""]
+    while stack:
+        relative = stack.pop()
+        with os.scandir(root / relative if relative else root) as entries:
+            for entry in entries:
+                path = f"{relative}/{entry.name}" if relative else entry.name
+                info = entry.stat(follow_symlinks=False)
+                if stat.S_ISDIR(info.st_mode):
+                    stack.append(path)
+                elif not (stat.S_ISREG(info.st_mode) or stat.S_ISLNK(info.st_mode)):
+                    continue  # sockets, fifos and devices
+                yield path, info
+
+
+def _entries(root: Path) -> Iterator[tuple[str, os.stat_result]]:
+    info = os.lstat(root)
+    if stat.S_ISDIR(info.st_mode):
+        yield from sorted(_walk(root))
+    else:
+        yield ".", info
+
+
+def pack(
+    store: ChunkStore,
+    key: str,
+    paths: Sequence[str],
+    restore_keys: Sequence[str] = (),
+) -> PackStats:
+    """Chunk ``paths`` into ``store`` and record them under ``key``.
+
+    Files unchanged since the base manifest (``key`` itself, else the newest
+    match of ``restore_keys``) keep their chunk lists without being read.
+    If nothing changed since a base stored under another key, no manifest is
+    written (``saved`` is False): recording the restored content under
+    ``key`` would make later runs take it for an exact hit.
+    """
+    base_key = store.resolve(key, restore_keys)
+    base = store.load_manifest(base_key) if base_key else None
+    previous: dict[tuple[str, str], list[Any]] = {}
+    if base:
+        base_roots = base["roots"]
+        previous = {(base_roots[entry[0]], entry[1]): entry for entry in base["files"]}
+
+    stats = PackStats(key=key, base_key=base_key)
+    files: list[list[Any]] = []
+    links: list[list[Any]] = []
+    directories: list[list[Any]] = []
+    roots = list(dict.fromkeys(paths))
+    for index, root in enumerate(roots):
+        location = Path(root).expanduser()
+        if not os.path.lexists(location):
+            continue
+        for relative, info in _entries(location):
+            path = location if relative == "." else location / relative
+            mode = stat.S_IMODE(info.st_mode)
+            if stat.S_ISDIR(info.st_mode):
+                if not mode & stat.S_IWUSR:
+                    directories.append([index, relative, mode])
+                continue
+            if stat.S_ISLNK(info.st_mode):
+                links.append([index, relative, os.readlink(path)])
+                continue
+            stats.files += 1
+            stats.bytes += info.st_size
+            old = previous.get((root, relative))
+            if old and old[2:5] == [mode, info.st_size, info.st_mtime_ns]:
+                stats.reused_files += 1
+                stats.chunks += len(old[5])
+                files.append([index, relative, mode, info.st_size, info.st_mtime_ns, old[5]])
+                continue
+            identifiers = []
+            with open(path, "rb") as handle:
+                for chunk in iter_chunks(handle):
+                    identifier, new = store.put(chunk)
+                    identifiers.append(identifier)
+                    if new:
+                        stats.new_chunks += 1
+                        stats.new_bytes += len(chunk)
+            stats.chunks += len(identifiers)
+            files.append([index, relative, mode, info.st_size, info.st_mtime_ns, identifiers])
+
+    if (
+        base
+        and base_key != key
+        and base["roots"] == roots
+        and base["files"] == files
+        and base.get("links", []) == links
+        and base.get("directories", []) == directories
+    ):
+        stats.saved = False
+        return stats
+
+    store.save_manifest(
+        {
+            "version": MANIFEST_VERSION,
+            "key": key,
+            "chunker": CHUNKER,
+            "created": int(time.time()),
+            "roots": roots,
+            "files": files,
+            "links": links,
+            "directories": directories,
+        }
+    )
+    return stats
+
+
+def _make_writable(directory: Path, modes: dict[Path, int | None]) -> None:
+    """Give the owner write access to ``directory`` (Go's module cache is read-only).
+
+    ``modes`` remembers checked directories; original modes to put back are
+    the values that are not None.
+    """
+    if directory in modes:
+        return
+    mode = stat.S_IMODE(directory.stat().st_mode)
+    if mode & stat.S_IWUSR:
+        modes[directory] = None
+    else:
+        modes[directory] = mode
+        directory.chmod(mode | stat.S_IWUSR)
+
+
+def _prepare(path: Path, modes: dict[Path, int | None]) -> None:
+    """Create ``path``'s parent directories and clear a directory in the way of ``path``."""
+    parent = path.parent
+    missing = []
+    while parent not in modes and not parent.is_dir():
+        missing.append(parent)
+        parent = parent.parent
+    for directory in reversed(missing):
+        _make_writable(directory.parent, modes)
+        if os.path.lexists(directory):  # a file or dangling link where a directory goes
+            directory.unlink()
+        directory.mkdir()
+        modes[directory] = None
+    _make_writable(path.parent, modes)
+    if not path.is_symlink() and path.is_dir():
+        shutil.rmtree(path)
+
+
+def unpack(
+    store: ChunkStore,
+    key: str,
+    restore_keys: Sequence[str] = (),
+) -> UnpackStats:
+    """Restore ``key`` (or the best restore-key match) from ``store``.
+
+    Files already on disk with the recorded size, mode and mtime are left
+    alone; other files are written from their chunks. Files that are not in
+    the manifest are kept, as with ``actions/cache``. Read-only directories
+    get their mode back once everything below them is written.
+    """
+    matched = store.resolve(key, restore_keys)
+    stats = UnpackStats(key=matched, exact=matched == key)
+    manifest = store.load_manifest(matched) if matched else None
+    if manifest is None:
+        return stats
+
+    roots = [Path(root).expanduser() for root in manifest["roots"]]
+    modes: dict[Path, int | None] = {}
+    try:
+        for index, relative, mode, size, mtime_ns, identifiers in manifest["files"]:
+            stats.files += 1
+            path = roots[index] if relative == "." else roots[index] / relative
+            try:
+                info = os.lstat(path)
+            except FileNotFoundError:
+                info = None
+            if (
+                info is not None
+                and stat.S_ISREG(info.st_mode)
+                and (stat.S_IMODE(info.st_mode), info.st_size, info.st_mtime_ns)
+                == (mode, size, mtime_ns)
+            ):
+                stats.skipped_files += 1
+                continue
+            _prepare(path, modes)
+            temporary = path.with_name(f".{path.name}.{os.getpid()}.unpack")
+            with open(temporary, "wb") as handle:
+                for identifier in identifiers:
+                    handle.write(store.get(identifier))
+            os.chmod(temporary, mode)
+            os.utime(temporary, ns=(mtime_ns, mtime_ns))
+            os.replace(temporary, path)
+            stats.written_files += 1
+            stats.written_bytes += size
+
+        for index, relative, target in manifest.get("links", ()):
+            path = roots[index] if relative == "." else roots[index] / relative
+            if path.is_symlink() and os.readlink(path) == target:
+                continue
+            _prepare(path, modes)
+            if os.path.lexists(path):
+                path.unlink()
+            os.symlink(target, path)
+
+        for index, relative, mode in manifest.get("directories", ()):
+            path = roots[index] / relative
+            if not path.is_dir():
+                _prepare(path, modes)
+                path.mkdir()
+            modes[path] = mode
+    finally:
+        for directory, mode in modes.items():
+            if mode is not None:
+                directory.chmod(mode)
+    return stats
@@ -1,72 +1,112 @@
 #!/usr/bin/env python3
 # file: .github/workflows/scripts/ci_workflow.py
-# version: 1.2.0
+# version: 1.9.4
 # guid: d9c2b3a4-5e6f-47a8-9b0c-1d2e3f4a5b6c
 """Helper utilities invoked from GitHub Actions CI workflows."""
 
 from __future__ import annotations
 
 import argparse
+import fnmatch
 import json
 import os
+import random
 import re
 import shutil
 import subprocess
 import sys
 import textwrap
 import time
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-try:
-    import requests  # type: ignore[import-untyped]
-except ModuleNotFoundError:  # pragma: no cover - fallback when requests unavailable
-    requests = None
+import helper_batch
+
+if TYPE_CHECKING:
+    from email.message import Message
+
+
+class _HTTPResponse:
+    """Minimal response wrapper mirroring requests.Response.
+
+    ``headers`` keeps urllib's message object, so lookups are
+    case-insensitive like requests' headers.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        payload: dict[str, Any],
+        headers: Mapping[str, str] | Message | None = None,
+    ) -> None:
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+def _urllib_get(
+    url: str,
+    headers: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+    timeout: int = 30,
+) -> _HTTPResponse:
+    from urllib.error import HTTPError
     from urllib.parse import urlencode
     from urllib.request import Request, urlopen
 
-    class _HTTPResponse:
-        """Minimal response wrapper mirroring requests.Response."""
-
-        def __init__(self, status_code: int, payload: dict[str, Any]) -> None:
-            self.status_code = status_code
-            self._payload = payload
-
-        def json(self) -> dict[str, Any]:
-            return self._payload
-
-    def _http_get(
-        url: str,
-        headers: dict[str, str] | None = None,
-        params: dict[str, Any] | None = None,
-        timeout: int = 30,
-    ) -> _HTTPResponse:
-        if params:
-            query = urlencode(params)
-            url = f"{url}?{query}"
-        req = Request(url, headers=headers or {})
+    if params:
+        query = urlencode(params)
+        url = f"{url}?{query}"
+    req = Request(url, headers=headers or {})
+    try:
         with urlopen(req, timeout=timeout) as resp:
             status_code = resp.getcode()
+            response_headers = resp.headers
             body = resp.read().decode("utf-8")
+    except HTTPError as exc:
+        # 304 Not Modified and API errors still carry useful status/headers.
+        return _HTTPResponse(exc.code, {}, exc.headers)
+    try:
+        payload = json.loads(body or "{}")
+    except json.JSONDecodeError:
+        payload = {}
+    return _HTTPResponse(status_code, payload, response_headers)
+
+
+def _http_get(
+    url: str,
+    headers: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+    timeout: int = 30,
+):
+    """GET ``url`` with requests, or urllib when requests is unavailable.
+
+    requests is imported on first use so subcommands that never call the
+    API do not pay for it at startup. The session is kept for the life of
+    the process, so batched subcommands reuse its connections.
+    """
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
         try:
-            payload = json.loads(body or "{}")
-        except json.JSONDecodeError:
-            payload = {}
-        return _HTTPResponse(status_code, payload)
-
-else:  # pragma: no cover - exercised in runtime environments with requests installed
-
-    def _http_get(
-        url: str,
-        headers: dict[str, str] | None = None,
-        params: dict[str, Any] | None = None,
-        timeout: int = 30,
-    ):
-        return requests.get(url, headers=headers, params=params, timeout=timeout)
+            import requests  # type: ignore[import-untyped]
+        except ModuleNotFoundError:  # pragma: no cover - fallback when requests unavailable
+            return _urllib_get(url, headers=headers, params=params, timeout=timeout)
+        _HTTP_SESSION = requests.Session()
+    return _HTTP_SESSION.get(url, headers=headers, params=params, timeout=timeout)
 
 
+_HTTP_SESSION: Any = None
 _CONFIG_CACHE: dict[str, Any] | None = None
+_CONFIG_SOURCE: str | None = None
+_TREE_FILES: dict[str, list[Path]] = {}
+_SKIPPED_TREE_DIRS = {".git"}
+# Served helpers outlive steps that create files, so the walk is per subcommand.
+helper_batch.reset_per_command(_TREE_FILES.clear)
 
 
 def append_to_file(path_env: str, content: str) -> None:
@@ -92,11 +132,13 @@ def append_summary(text: str) -> None:
 
 
 def get_repository_config() -> dict[str, Any]:
-    global _CONFIG_CACHE
-    if _CONFIG_CACHE is not None:
+    """Return the parsed ``REPOSITORY_CONFIG``, parsing it once per distinct value."""
+    global _CONFIG_CACHE, _CONFIG_SOURCE
+    raw = os.environ.get("REPOSITORY_CONFIG", "")
+    if _CONFIG_CACHE is not None and raw == _CONFIG_SOURCE:
         return _CONFIG_CACHE
 
-    raw = os.environ.get("REPOSITORY_CONFIG")
+    _CONFIG_SOURCE = raw
     if not raw:
         _CONFIG_CACHE = {}
         return _CONFIG_CACHE
@@ -109,6 +151,23 @@ def get_repository_config() -> dict[str, Any]:
     return _CONFIG_CACHE
 
 
+def _tree_files() -> list[Path]:
+    """Return every file below the working directory, walking it once per subcommand.
+
+    Paths are relative, like ``Path(".").rglob`` results.
+    """
+    cwd = os.getcwd()
+    files = _TREE_FILES.get(cwd)
+    if files is None:
+        files = []
+        for dirpath, dirnames, filenames in os.walk("."):
+            dirnames[:] = [name for name in dirnames if name not in _SKIPPED_TREE_DIRS]
+            base = Path(dirpath)
+            files.extend(base / name for name in filenames)
+        _TREE_FILES[cwd] = files
+    return files
+
+
 def _config_path(default: Any, *path: str) -> Any:
     current: Any = get_repository_config()
     for key in path:
@@ -152,13 +211,94 @@ def determine_execution(_: argparse.Namespace) -> None:
     write_output("should_test_docker", os.environ.get("CI_DOCKER_FILES", "false"))
 
 
+MAX_WAIT_DELAY = 60.0
+HISTORY_RUNS = 20
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _run_durations(runs: Iterable[dict[str, Any]]) -> list[float]:
+    """Return wall-clock durations in seconds of completed ``runs``."""
+    durations = []
+    for run in runs:
+        started = _parse_timestamp(run.get("run_started_at") or run.get("created_at"))
+        finished = _parse_timestamp(run.get("updated_at"))
+        if run.get("status") == "completed" and started and finished and finished > started:
+            durations.append((finished - started).total_seconds())
+    return durations
+
+
+def _expected_remaining(
+    run: dict[str, Any], durations: list[float], now: datetime | None = None
+) -> float | None:
+    """Estimate seconds until ``run`` finishes from the median historical duration."""
+    started = _parse_timestamp(run.get("run_started_at") or run.get("created_at"))
+    if not durations or started is None:
+        return None
+    ordered = sorted(durations)
+    median = ordered[len(ordered) // 2]
+    elapsed = ((now or datetime.now(timezone.utc)) - started).total_seconds()
+    return median - elapsed
+
+
+def _wait_delay(
+    poll: int,
+    base: float,
+    expected_remaining: float | None = None,
+    max_delay: float = MAX_WAIT_DELAY,
+    rng: random.Random | None = None,
+) -> float:
+    """Return the sleep before the next poll.
+
+    The delay doubles per poll (equal jitter, capped at ``max_delay``). While
+    the run is expected to finish soon it is further capped by the expected
+    remaining time, so completion is noticed promptly; once the run is overdue
+    polling falls back to ``base``.
+    """
+    ceiling = min(base * 2**poll, max_delay)
+    delay = ceiling / 2 + (rng or random).uniform(0, ceiling / 2)
+    if expected_remaining is not None:
+        delay = min(delay, max(expected_remaining, base))
+    return max(delay, 1.0)
+
+
+def _workflow_durations(repo: str, workflow_id: Any, headers: dict[str, str]) -> list[float]:
+    url = f"https://api.github.com/repos/{repo}/actions/workflows/{workflow_id}/runs"
+    params = {"status": "success", "per_page": HISTORY_RUNS}
+    try:
+        response = _http_get(url, headers=headers, params=params, timeout=30)
+    except Exception:  # pragma: no cover - history is only a hint
+        return []
+    if response.status_code != 200:
+        return []
+    return _run_durations(response.json().get("workflow_runs", []))
+
+
 def wait_for_pr_automation(_: argparse.Namespace) -> None:
+    """Wait for the PR automation run on ``TARGET_SHA`` to complete.
+
+    Runs are filtered server-side by ``head_sha`` (and by workflow file when
+    ``WORKFLOW_FILE`` is set). Polls send ``If-None-Match`` so an unchanged
+    run list costs a 304, and back off exponentially with jitter, capped by
+    the expected remaining duration from recent successful runs. The total
+    wait is bounded by ``MAX_WAIT_SECONDS`` (default ``MAX_ATTEMPTS`` x
+    ``SLEEP_SECONDS``) and by ``MAX_ATTEMPTS`` polls.
+    """
     repo = os.environ.get("GITHUB_REPOSITORY")
     token = os.environ.get("GITHUB_TOKEN")
     target_sha = os.environ.get("TARGET_SHA")
     workflow_name = os.environ.get("WORKFLOW_NAME", "PR Automation")
+    workflow_file = os.environ.get("WORKFLOW_FILE", "")
     max_attempts = int(os.environ.get("MAX_ATTEMPTS", "60"))
     sleep_seconds = int(os.environ.get("SLEEP_SECONDS", "10"))
+    max_wait = float(os.environ.get("MAX_WAIT_SECONDS") or max_attempts * sleep_seconds)
 
     if not (repo and token and target_sha):
         print("Missing required environment values; skipping PR automation wait")
@@ -168,40 +308,62 @@ def wait_for_pr_automation(_: argparse.Namespace) -> None:
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json",
     }
-    url = f"https://api.github.com/repos/{repo}/actions/runs"
+    if workflow_file:
+        url = f"https://api.github.com/repos/{repo}/actions/workflows/{workflow_file}/runs"
+    else:
+        url = f"https://api.github.com/repos/{repo}/actions/runs"
+    params = {"head_sha": target_sha, "per_page": 20}
 
     print("🔄 Waiting for PR automation to complete...")
+    deadline = time.monotonic() + max_wait
+    etag = ""
+    status = ""
+    run: dict[str, Any] | None = None
+    durations: list[float] | None = None
     for attempt in range(max_attempts):
+        if attempt:
+            remaining = _expected_remaining(run, durations or []) if run else None
+            delay = _wait_delay(attempt - 1, sleep_seconds, remaining)
+            delay = min(delay, deadline - time.monotonic())
+            if delay <= 0:
+                break
+            time.sleep(delay)
+
         print(f"Checking for PR automation completion (attempt {attempt + 1}/{max_attempts})...")
+        request_headers = {**headers, "If-None-Match": etag} if etag else headers
         try:
-            response = _http_get(url, headers=headers, params={"per_page": 100}, timeout=30)
+            response = _http_get(url, headers=request_headers, params=params, timeout=30)
         except Exception as exc:  # pragma: no cover - network issues during CI
             print(f"::warning::Unable to query workflow runs: {exc}")
-            time.sleep(sleep_seconds)
+            continue
+        if response.status_code == 304:
+            print(f"⏳ PR automation status: {status or 'unknown'} (unchanged), waiting...")
             continue
         if response.status_code != 200:
             print(f"::warning::Unable to query workflow runs: {response.status_code}")
-            time.sleep(sleep_seconds)
             continue
+        etag = (getattr(response, "headers", None) or {}).get("ETag", "")
 
         runs = response.json().get("workflow_runs", [])
         matching_runs = [
-            run
-            for run in runs
-            if run.get("head_sha") == target_sha and run.get("name") == workflow_name
+            candidate
+            for candidate in runs
+            if candidate.get("head_sha") == target_sha and candidate.get("name") == workflow_name
         ]
 
         if not matching_runs:
             print("ℹ️  No PR automation workflow found, proceeding with CI")
             return
 
-        status = matching_runs[0].get("status", "")
+        run = matching_runs[0]
+        status = run.get("status", "")
         if status == "completed":
             print("✅ PR automation has completed, proceeding with CI")
             return
+        if durations is None and run.get("workflow_id") is not None:
+            durations = _workflow_durations(repo, run["workflow_id"], headers)
 
         print(f"⏳ PR automation status: {status or 'unknown'}, waiting...")
-        time.sleep(sleep_seconds)
 
     print("⚠️  Timeout waiting for PR automation, proceeding with CI anyway")
 
@@ -278,12 +440,53 @@ def go_setup(_: argparse.Namespace) -> None:
     subprocess.run(["go", "build", "-v", "./..."], check=True)
 
 
-def _parse_go_coverage(total_line: str) -> float:
-    parts = total_line.strip().split()
-    if not parts:
-        raise ValueError("Unable to parse go coverage output")
-    percentage = parts[-1].rstrip("%")
-    return float(percentage)
+def _report_go_coverage(profiles: list[str], html_output: str, threshold: float) -> None:
+    """Check Go coverage natively and write the HTML report.
+
+    Several profiles (e.g. from sharded test runs) are merged first. The
+    only ``go`` subprocess left is ``go tool cover -html``, which is skipped
+    when ``html_output`` is empty. A per-package table, plus the change
+    against ``BASE_COVERAGE_FILE`` when one exists, goes to the step summary.
+    """
+    import go_coverage
+
+    for path in profiles:
+        if not Path(path).is_file():
+            raise FileNotFoundError(f"{path} not found")
+    profile = go_coverage.CoverageProfile.from_files(profiles)
+    profile_path = profiles[0]
+    if len(profiles) > 1:
+        profile_path = os.environ.get("COVERAGE_MERGED_FILE", "coverage.merged.out")
+        profile.write(profile_path)
+        print(f"Merged {len(profiles)} coverage profiles into {profile_path}")
+
+    if html_output:
+        go_binary = shutil.which("go") or "go"
+        subprocess.run(
+            [go_binary, "tool", "cover", f"-html={profile_path}", "-o", html_output],
+            check=True,
+        )
+
+    summary = ["## Go coverage", "", "| Package | Coverage |", "| --- | ---: |"]
+    summary.extend(
+        f"| `{package}` | {totals.percent:.1f}% |"
+        for package, totals in profile.by_package().items()
+    )
+    base_file = os.environ.get("BASE_COVERAGE_FILE", "")
+    if base_file and Path(base_file).is_file():
+        base = go_coverage.CoverageProfile.from_files([base_file])
+        summary.extend(["", "### Change from base", ""])
+        summary.append(
+            go_coverage.format_delta_markdown(go_coverage.coverage_delta(base, profile)).rstrip()
+        )
+    append_summary("\n".join(summary) + "\n\n")
+
+    # Rounded like the total line of ``go tool cover -func``.
+    coverage = round(profile.totals().percent, 1)
+    print(f"Coverage: {coverage}%")
+    if coverage < threshold:
+        raise SystemExit(f"Coverage {coverage}% is below threshold {threshold}%")
+    print(f"✅ Coverage {coverage}% meets threshold {threshold}%")
 
 
 def go_test(_: argparse.Namespace) -> None:
@@ -309,84 +512,22 @@ def go_test(_: argparse.Namespace) -> None:
         ],
         check=True,
     )
-
-    go_binary = shutil.which("go") or "go"
-    subprocess.run(
-        [
-            go_binary,
-            "tool",
-            "cover",
-            f"-html={coverage_file}",
-            "-o",
-            coverage_html,
-        ],
-        check=True,
-    )
-    result = subprocess.run(
-        [go_binary, "tool", "cover", "-func", coverage_file],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
-
-    total_line = ""
-    for line in result.stdout.splitlines():
-        if line.startswith("total:"):
-            total_line = line
-            break
-
-    if not total_line:
-        raise ValueError("Total coverage line not found in go tool output")
-
-    coverage = _parse_go_coverage(total_line)
-    print(f"Coverage: {coverage}%")
-    if coverage < threshold:
-        raise SystemExit(f"Coverage {coverage}% is below threshold {threshold}%")
-    print(f"✅ Coverage {coverage}% meets threshold {threshold}%")
+    _report_go_coverage([coverage_file], coverage_html, threshold)
 
 
 def check_go_coverage(_: argparse.Namespace) -> None:
-    coverage_file = Path(os.environ.get("COVERAGE_FILE", "coverage.out"))
-    html_output = Path(os.environ.get("COVERAGE_HTML", "coverage.html"))
-    threshold = float(os.environ.get("COVERAGE_THRESHOLD", "0"))
-
-    if not coverage_file.is_file():
-        raise FileNotFoundError(f"{coverage_file} not found")
-
-    go_binary = shutil.which("go") or "go"
-
-    subprocess.run(
-        [
-            go_binary,
-            "tool",
-            "cover",
-            f"-html={coverage_file}",
-            "-o",
-            str(html_output),
-        ],
-        check=True,
-    )
-    result = subprocess.run(
-        [go_binary, "tool", "cover", "-func", str(coverage_file)],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
+    """Check one coverage profile, or merge several.
 
-    total_line = ""
-    for line in result.stdout.splitlines():
-        if line.startswith("total:"):
-            total_line = line
-            break
+    ``COVERAGE_FILE`` may list several whitespace-separated paths or globs.
+    """
+    import go_coverage
 
-    if not total_line:
-        raise ValueError("Total coverage line not found in go tool output")
-
-    coverage = _parse_go_coverage(total_line)
-    print(f"Coverage: {coverage}%")
-    if coverage < threshold:
-        raise SystemExit(f"Coverage {coverage}% is below threshold {threshold}%")
-    print(f"✅ Coverage {coverage}% meets threshold {threshold}%")
+    profiles = go_coverage.expand_profiles(os.environ.get("COVERAGE_FILE", "coverage.out").split())
+    html_output = os.environ.get("COVERAGE_HTML", "coverage.html")
+    threshold = float(os.environ.get("COVERAGE_THRESHOLD", "0"))
+    if not profiles:
+        raise FileNotFoundError("No coverage profiles match COVERAGE_FILE")
+    _report_go_coverage(profiles, html_output, threshold)
 
 
 def _run_command(command: Iterable[str], check: bool = True) -> subprocess.CompletedProcess[str]:
@@ -448,42 +589,216 @@ def frontend_run(_: argparse.Namespace) -> None:
         os.chdir(original_dir)
 
 
+PYTHON_TEST_PACKAGES = ("pytest", "pytest-cov")
+
+
+def _restore_python_env(pip: list[str], archive: Path) -> bool:
+    """Install every pinned dependency from a wheelhouse archive.
+
+    Index pins install offline from the archived wheels; direct references
+    are fetched from their URL.
+    """
+    import tarfile
+    import tempfile
+
+    import python_env
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="python-env-") as scratch:
+            requirements = python_env.unpack_wheelhouse(archive, scratch)
+            wheelhouse = requirements.parent / python_env.WHEELHOUSE_DIR
+            subprocess.run(
+                [*pip, "install", "--no-index", "--find-links", str(wheelhouse)]
+                + ["-r", str(requirements)],
+                check=True,
+            )
+    except (OSError, tarfile.TarError, subprocess.CalledProcessError) as exc:
+        print(f"::warning::Unable to restore {archive.name}; installing from scratch: {exc}")
+        return False
+    return True
+
+
+def _pack_python_env(pip: list[str], index: list[str], archive: Path, key: str) -> None:
+    """Build wheels for the installed dependencies and archive them as ``key``."""
+    import tempfile
+
+    import archive_builder
+    import python_env
+
+    freeze = subprocess.run(
+        [*pip, "freeze", "--exclude-editable"], check=False, capture_output=True, text=True
+    )
+    pins = python_env.frozen_requirements(freeze.stdout or "")
+    if freeze.returncode or not pins:
+        print("ℹ️ Nothing to cache for this Python environment")
+        return
+    indexed = [pin for pin in pins if not python_env.is_direct_reference(pin)]
+    try:
+        with tempfile.TemporaryDirectory(prefix="python-env-") as scratch:
+            requirements = Path(scratch) / python_env.REQUIREMENTS_NAME
+            requirements.write_text("\n".join(pins) + "\n", encoding="utf-8")
+            wheels = Path(scratch) / python_env.WHEELHOUSE_DIR
+            wheels.mkdir()
+            if indexed:
+                to_build = Path(scratch) / "indexed.txt"
+                to_build.write_text("\n".join(indexed) + "\n", encoding="utf-8")
+                # Already-installed distributions come from pip's cache, not the network.
+                subprocess.run(
+                    [*pip, "wheel", *index, "--no-deps", "--wheel-dir", str(wheels)]
+                    + ["-r", str(to_build)],
+                    check=True,
+                )
+            count = python_env.pack_wheelhouse(wheels, requirements, archive)
+    except (OSError, archive_builder.ArchiveError, subprocess.CalledProcessError) as exc:
+        print(f"::warning::Unable to cache the Python environment: {exc}")
+        return
+    python_env.prune(archive.parent, key)
+    print(f"📦 Cached {count} wheels as {archive}")
+
+
 def python_install(_: argparse.Namespace) -> None:
-    python = sys.executable
-    subprocess.run([python, "-m", "pip", "install", "--upgrade", "pip"], check=True)
+    """Install the project, its requirements and the test tools.
+
+    Everything is resolved in one pip run. When ``PYTHON_ENV_CACHE_DIR`` is
+    set (a directory persisted between jobs, e.g. by ``actions/cache`` keyed
+    on the ``python-env-key`` output), dependencies come from a wheelhouse
+    archive there keyed by the dependency manifests and interpreter, and a
+    miss archives the environment for the next job. Without it nothing is
+    packed, since the archive would be thrown away with the runner.
+    ``PYTHON_WHEEL_DIR`` makes pip install only from that directory.
+    """
+    import python_env
 
-    if Path("requirements.txt").is_file():
-        subprocess.run(
-            [python, "-m", "pip", "install", "-r", "requirements.txt"],
-            check=True,
+    python = sys.executable
+    pip = [python, "-m", "pip"]
+    index = python_env.index_options(os.environ.get("PYTHON_WHEEL_DIR"))
+    key = python_env.environment_key(".", PYTHON_TEST_PACKAGES)
+    cache_dir = os.environ.get("PYTHON_ENV_CACHE_DIR")
+    archive = python_env.archive_path(cache_dir, key) if cache_dir else None
+    write_output("python-env-key", key)
+
+    has_project = Path("pyproject.toml").is_file()
+    restored = archive is not None and archive.is_file() and _restore_python_env(pip, archive)
+    if restored:
+        print(f"♻️ Restored Python dependencies from {archive}")
+        if has_project:
+            subprocess.run([*pip, "install", *index, "--no-deps", "-e", "."], check=True)
+    else:
+        targets: list[str] = []
+        if Path("requirements.txt").is_file():
+            targets += ["-r", "requirements.txt"]
+        if has_project:
+            targets += ["-e", "."]
+        subprocess.run([*pip, "install", *index, *targets, *PYTHON_TEST_PACKAGES], check=True)
+        if archive is not None:
+            _pack_python_env(pip, index, archive, key)
+    write_output("python-env-cache-hit", "true" if restored else "false")
+
+
+def _python_test_impact_enabled() -> bool:
+    value = os.environ.get("PYTHON_TEST_IMPACT")
+    if value:
+        return value.lower() == "true"
+    return bool(_config_path(False, "testing", "python", "test_impact"))
+
+
+def _select_python_tests(impact: bool, shard: str) -> list[str] | None:
+    """Return the test files to pass to pytest, or None to let pytest collect.
+
+    With ``impact``, only test files that import (transitively) a file changed
+    since ``DIFF_BASE`` are kept. With ``shard`` (``INDEX/TOTAL``), the files
+    are split by their durations in ``PYTHON_TEST_DURATIONS`` JUnit reports.
+    """
+    import python_test_impact
+
+    files = python_test_impact.python_files(_tree_files())
+    tests = [path for path in files if python_test_impact.is_test_file(path)]
+    mode = "all"
+    base = os.environ.get("DIFF_BASE", "")
+    if not base and os.environ.get("GITHUB_BASE_REF"):
+        base = f"origin/{os.environ['GITHUB_BASE_REF']}"
+    if impact and not base:
+        print("ℹ️ No DIFF_BASE or pull request base; running every test")
+    elif impact:
+        try:
+            changed = python_test_impact.changed_files(base)
+        except subprocess.CalledProcessError as exc:
+            print(
+                f"::warning::Unable to diff against {base}; running every test: "
+                f"{(exc.stderr or '').strip()}"
+            )
+            changed = None
+        reason = None if changed is None else python_test_impact.needs_full_run(changed)
+        if reason:
+            print(f"ℹ️ {reason} changed; running every test")
+        elif changed is not None:
+            cache = os.environ.get("PYTHON_IMPORT_GRAPH_CACHE", python_test_impact.DEFAULT_CACHE)
+            graph = python_test_impact.build_graph(files, cache_path=cache)
+            print(f"Import graph: {graph.parsed} files parsed, {graph.cached} from cache")
+            tests = python_test_impact.select_tests(graph, changed)
+            mode = "impact"
+            print(f"Selected {len(tests)} test files affected by {len(changed)} changed files")
+
+    if shard:
+        try:
+            index, total = python_test_impact.parse_shard(shard)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid PYTHON_TEST_SHARD: {exc}") from None
+        reports = python_test_impact.expand_reports(
+            os.environ.get("PYTHON_TEST_DURATIONS", "").split()
         )
+        durations = python_test_impact.junit_durations(reports, tests)
+        tests = python_test_impact.shard_tests(tests, total, durations)[index - 1]
+        expected = sum(durations.get(path, 0.0) for path in tests)
+        print(f"Shard {index}/{total}: {len(tests)} test files, {expected:.1f}s recorded")
 
-    if Path("pyproject.toml").is_file():
-        subprocess.run([python, "-m", "pip", "install", "-e", "."], check=True)
-
-    subprocess.run([python, "-m", "pip", "install", "pytest", "pytest-cov"], check=True)
+    write_output("python-test-mode", mode)
+    write_output("python-test-files", str(len(tests)))
+    if mode == "all" and not shard:
+        return None
+    return tests
 
 
 def python_run_tests(_: argparse.Namespace) -> None:
+    """Run pytest with coverage.
+
+    ``PYTHON_TEST_IMPACT=true`` (or ``testing.python.test_impact``) runs only the
+    tests affected by the change; ``PYTHON_TEST_SHARD=INDEX/TOTAL`` runs one
+    duration-balanced shard. Either writes a JUnit report to
+    ``PYTHON_JUNIT_XML`` for the next run's shard balancing.
+    """
+
     def has_tests() -> bool:
-        return any(any(Path(".").rglob(pattern)) for pattern in ("test_*.py", "*_test.py"))
+        return any(
+            fnmatch.fnmatch(path.name, pattern)
+            for path in _tree_files()
+            for pattern in ("test_*.py", "*_test.py")
+        )
 
     if not has_tests():
         print("ℹ️ No Python tests found")
         return
 
     python = sys.executable
-    subprocess.run(
-        [
-            python,
-            "-m",
-            "pytest",
-            "--cov=.",
-            "--cov-report=xml",
-            "--cov-report=html",
-        ],
-        check=True,
-    )
+    command = [
+        python,
+        "-m",
+        "pytest",
+        "--cov=.",
+        "--cov-report=xml",
+        "--cov-report=html",
+    ]
+    impact = _python_test_impact_enabled()
+    shard = os.environ.get("PYTHON_TEST_SHARD", "").strip()
+    if impact or shard:
+        selected = _select_python_tests(impact, shard)
+        if selected is not None:
+            if not selected:
+                print("ℹ️ No Python tests selected for this change or shard")
+                return
+            command.extend(selected)
+        command.append(f"--junitxml={os.environ.get('PYTHON_JUNIT_XML', 'pytest-junit.xml')}")
+    subprocess.run(command, check=True)
 
 
 def python_lint(_: argparse.Namespace) -> None:
@@ -536,8 +851,8 @@ def python_lint(_: argparse.Namespace) -> None:
 
     python_sources = [
         path
-        for path in Path(".").rglob("*.py")
-        if ".venv" not in path.parts and "site-packages" not in path.parts
+        for path in _tree_files()
+        if path.suffix == ".py" and ".venv" not in path.parts and "site-packages" not in path.parts
     ]
     if not python_sources:
         print("ℹ️ No Python sources detected for linting.")
@@ -674,11 +989,12 @@ def compute_rust_coverage(_: argparse.Namespace) -> None:
 
     total = 0
     covered = 0
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if line.startswith("LF:"):
-            total += int(line.split(":", 1)[1])
-        elif line.startswith("LH:"):
-            covered += int(line.split(":", 1)[1])
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.startswith("LF:"):
+                total += int(line[3:])
+            elif line.startswith("LH:"):
+                covered += int(line[3:])
 
     if total == 0:
         write_output("percent", "0")
@@ -701,6 +1017,68 @@ def enforce_coverage_threshold(_: argparse.Namespace) -> None:
     print(f"✅ Coverage {percent}% meets threshold {threshold}%")
 
 
+def _diff_coverage_threshold() -> float:
+    value = os.environ.get("DIFF_COVERAGE_THRESHOLD")
+    if value:
+        return float(value)
+    configured = _config_path(None, "testing", "coverage", "diff_threshold")
+    if configured is None:
+        configured = _config_path(0, "testing", "coverage", "threshold")
+    return float(configured or 0)
+
+
+def check_diff_coverage(_: argparse.Namespace) -> None:
+    """Gate on coverage of the lines changed since ``DIFF_BASE``.
+
+    ``COVERAGE_FILES`` lists lcov tracefiles and/or Go profiles (paths or
+    globs; default: whichever of ``lcov.info`` and ``coverage.out`` exist).
+    ``DIFF_BASE`` defaults to ``origin/$GITHUB_BASE_REF`` on pull requests.
+    """
+    import diff_coverage
+    import go_coverage
+
+    base = os.environ.get("DIFF_BASE", "")
+    if not base and os.environ.get("GITHUB_BASE_REF"):
+        base = f"origin/{os.environ['GITHUB_BASE_REF']}"
+    if not base:
+        print("ℹ️ No DIFF_BASE or pull request base; skipping diff coverage")
+        return
+
+    patterns = os.environ.get("COVERAGE_FILES", "").split() or [
+        name for name in ("lcov.info", "coverage.out") if Path(name).is_file()
+    ]
+    profiles = [path for path in go_coverage.expand_profiles(patterns) if Path(path).is_file()]
+    if not profiles:
+        raise FileNotFoundError("No coverage files found for diff coverage")
+
+    try:
+        changes = diff_coverage.git_changes(base)
+    except subprocess.CalledProcessError as exc:
+        print(
+            f"::warning::Unable to diff against {base} (is the checkout shallow?): "
+            f"{(exc.stderr or '').strip()}"
+        )
+        return
+
+    threshold = _diff_coverage_threshold()
+    coverage = diff_coverage.read_coverage(profiles, only=set(changes))
+    report = diff_coverage.diff_report(coverage, changes)
+    append_summary(diff_coverage.format_markdown(report, threshold) + "\n")
+    write_output("diff-lines", str(report.lines))
+    write_output("diff-covered-lines", str(report.covered))
+
+    percent = report.percent
+    if percent is None:
+        write_output("diff-percent", "")
+        print("ℹ️ No instrumented lines changed")
+        return
+    write_output("diff-percent", f"{percent:.2f}")
+    print(f"Diff coverage: {percent:.2f}% of {report.lines} changed lines")
+    if percent < threshold:
+        raise SystemExit(f"Diff coverage {percent:.2f}% is below threshold {threshold}%")
+    print(f"✅ Diff coverage {percent:.2f}% meets threshold {threshold}%")
+
+
 def docker_build(_: argparse.Namespace) -> None:
     dockerfile = Path(os.environ.get("DOCKERFILE_PATH", "Dockerfile"))
     image_name = os.environ.get("DOCKER_IMAGE", "test-image")
@@ -731,7 +1109,9 @@ def docs_validate_structure(_: argparse.Namespace) -> None:
 
 def run_benchmarks(_: argparse.Namespace) -> None:
     has_benchmarks = False
-    for path in Path(".").rglob("*_test.go"):
+    for path in _tree_files():
+        if not path.name.endswith("_test.go"):
+            continue
         try:
             if "Benchmark" in path.read_text(encoding="utf-8"):
                 has_benchmarks = True
@@ -798,6 +1178,15 @@ def generate_matrices(_: argparse.Namespace) -> None:
     coverage_threshold = _config_path(fallback_threshold, "testing", "coverage", "threshold")
     write_output("coverage-threshold", str(coverage_threshold))
 
+    shards = int(
+        os.environ.get("PYTHON_TEST_SHARDS") or _config_path(1, "testing", "python", "shards") or 1
+    )
+    shard_matrix = [{"shard": f"{index}/{shards}"} for index in range(1, max(shards, 1) + 1)]
+    write_output(
+        "python-shard-matrix",
+        json.dumps({"include": shard_matrix}, separators=(",", ":")),
+    )
+
 
 def generate_ci_summary(_: argparse.Namespace) -> None:
     primary_language = os.environ.get("PRIMARY_LANGUAGE", "unknown")
@@ -911,6 +1300,7 @@ def build_parser() -> argparse.ArgumentParser:
         "generate-rust-html": generate_rust_html,
         "compute-rust-coverage": compute_rust_coverage,
         "enforce-coverage-threshold": enforce_coverage_threshold,
+        "diff-coverage": check_diff_coverage,
         "docker-build": docker_build,
         "docker-test-compose": docker_test_compose,
         "docs-check-links": docs_check_links,
@@ -922,6 +1312,7 @@ def build_parser() -> argparse.ArgumentParser:
 
     for command, handler in commands.items():
         subparsers.add_parser(command).set_defaults(handler=handler)
+    helper_batch.add_batch_commands(subparsers, build_parser)
     return parser
 
 
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/diff_coverage.py
+# version: 1.0.1
+# guid: 630e9f77-db03-4de9-a7ac-d795eb3f8e42
+
+"""Coverage of the lines a change touches.
+
+The changed line ranges of a ``git diff --unified=0`` are read first
+(:func:`parse_diff`). lcov tracefiles (``SF:``/``DA:`` records) and Go
+``-coverprofile`` files are then streamed into per-file :class:`LineBitmap`
+objects, keeping only the files the diff touches, and intersected with the
+changed lines (:func:`diff_report`).
+
+Go profiles name files by import path; these are mapped back to repository
+paths through the ``go.mod`` files in the tree. A line covered by several Go
+blocks counts as covered if any of them ran, so ``if cond {`` is covered when
+the condition was evaluated even if the body was not.
+
+Usage::
+
+    python3 diff_coverage.py --base origin/main lcov.info coverage.out [--threshold 80]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+
+_SKIPPED_DIRS = {".git", "node_modules", "vendor", "target"}
+
+
+class LineBitmap:
+    """Bit-packed sets of the instrumented and the covered lines of one file."""
+
+    __slots__ = ("instrumented", "covered")
+
+    def __init__(self) -> None:
+        self.instrumented = bytearray()
+        self.covered = bytearray()
+
+    def mark(self, line: int, hit: bool) -> None:
+        """Record ``line`` as instrumented, and as covered if ``hit``."""
+        index, bit = line >> 3, 1 << (line & 7)
+        if index >= len(self.instrumented):
+            grow = index + 1 - len(self.instrumented)
+            self.instrumented.extend(bytes(grow))
+            self.covered.extend(bytes(grow))
+        self.instrumented[index] |= bit
+        if hit:
+            self.covered[index] |= bit
+
+    def mark_range(self, start: int, end: int, hit: bool) -> None:
+        """Record lines ``start`` to ``end`` inclusive."""
+        for line in range(start, end + 1):
+            self.mark(line, hit)
+
+    def state(self, line: int) -> bool | None:
+        """Return None if ``line`` is not instrumented, else whether it is covered."""
+        index, bit = line >> 3, 1 << (line & 7)
+        if index >= len(self.instrumented) or not self.instrumented[index] & bit:
+            return None
+        return bool(self.covered[index] & bit)
+
+
+Coverage = dict[str, LineBitmap]
+Changes = dict[str, list[tuple[int, int]]]
+
+
+def parse_diff(lines: Iterable[str]) -> Changes:
+    """Return the added/modified line ranges per file of a unified diff.
+
+    Ranges are inclusive and taken from the new side of each ``@@`` hunk.
+    Deleted files are skipped.
+    """
+    changes: Changes = {}
+    current: list[tuple[int, int]] | None = None
+    for line in lines:
+        if line.startswith("+++ "):
+            path = _diff_path(line[4:].rstrip("\n"))
+            current = None if path is None else changes.setdefault(path, [])
+        elif line.startswith("@@ ") and current is not None:
+            new_side = line.split(" ", 3)[2]  # "+start[,count]"
+            start, _, count = new_side[1:].partition(",")
+            length = int(count) if count else 1
+            if length:
+                current.append((int(start), int(start) + length - 1))
+    return {path: ranges for path, ranges in changes.items() if ranges}
+
+
+def _diff_path(spec: str) -> str | None:
+    spec = spec.split("\t", 1)[0]
+    if spec.startswith('"') and spec.endswith('"'):
+        # C-style quoting, used for paths with tabs, quotes or backslashes.
+        escaped = spec[1:-1].encode("utf-8").decode("unicode_escape")
+        spec = escaped.encode("latin-1").decode("utf-8", "replace")
+    if spec == "/dev/null":
+        return None
+    return spec[2:] if spec.startswith("b/") else spec
+
+
+def git_changes(base: str, root: Path | str = ".") -> Changes:
+    """Return the lines changed between the merge base of ``base`` and ``HEAD``."""
+    result = subprocess.run(
+        [
+            "git",
+            "-c",
+            "core.quotePath=false",
+            "diff",
+            "--unified=0",
+            "--no-color",
+            "--no-ext-diff",
+            "--find-renames",
+            "--diff-filter=d",
+            f"{base}...HEAD",
+        ],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return parse_diff(result.stdout.splitlines())
+
+
+def _relative(path: str, root: Path) -> str:
+    if os.path.isabs(path):
+        try:
+            return Path(path).resolve().relative_to(root.resolve()).as_posix()
+        except ValueError:
+            return path
+    return path[2:] if path.startswith("./") else path
+
+
+def read_lcov(
+    lines: Iterable[str], coverage: Coverage, only: set[str] | None = None, root: Path | str = "."
+) -> Coverage:
+    """Stream lcov records into ``coverage``, skipping files not in ``only``."""
+    root = Path(root)
+    bitmap: LineBitmap | None = None
+    for line in lines:
+        if line.startswith("DA:"):
+            if bitmap is not None:
+                number, _, rest = line[3:].partition(",")
+                hits = rest.split(",", 1)[0]
+                bitmap.mark(int(number), int(hits) > 0)
+        elif line.startswith("SF:"):
+            path = _relative(line[3:].strip(), root)
+            wanted = only is None or path in only
+            bitmap = coverage.setdefault(path, LineBitmap()) if wanted else None
+        elif line.startswith("end_of_record"):
+            bitmap = None
+    return coverage
+
+
+def go_modules(root: Path | str = ".") -> list[tuple[str, str]]:
+    """Return ``(module path, directory)`` pairs for every go.mod, longest first."""
+    root = Path(root)
+    modules = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in _SKIPPED_DIRS]
+        if "go.mod" not in filenames:
+            continue
+        with open(os.path.join(dirpath, "go.mod"), encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("module "):
+                    module = line.split()[1].strip('"')
+                    directory = Path(dirpath).relative_to(root).as_posix()
+                    modules.append((module, "" if directory == "." else directory))
+                    break
+    return sorted(modules, key=lambda item: len(item[0]), reverse=True)
+
+
+def go_file_path(name: str, modules: Sequence[tuple[str, str]], root: Path | str = ".") -> str:
+    """Map a Go profile file name (an import path) to a repository path."""
+    for module, directory in modules:
+        if name.startswith(module + "/"):
+            relative = name[len(module) + 1 :]
+            return f"{directory}/{relative}" if directory else relative
+    if name.startswith("_/"):  # packages outside any module
+        return _relative(name[1:], Path(root))
+    return _relative(name, Path(root))
+
+
+def read_go_profile(
+    lines: Iterable[str],
+    coverage: Coverage,
+    only: set[str] | None = None,
+    modules: Sequence[tuple[str, str]] = (),
+    root: Path | str = ".",
+) -> Coverage:
+    """Stream a Go coverage profile into ``coverage``, skipping files not in ``only``."""
+    paths: dict[str, LineBitmap | None] = {}
+    for line in lines:
+        if line.startswith("mode:") or not line.strip():
+            continue
+        key, statements, count = line.rsplit(" ", 2)
+        if statements == "0":
+            continue
+        name, _, span = key.rpartition(":")
+        if name in paths:
+            bitmap = paths[name]
+        else:
+            path = go_file_path(name, modules, root)
+            wanted = only is None or path in only
+            bitmap = paths[name] = coverage.setdefault(path, LineBitmap()) if wanted else None
+        if bitmap is None:
+            continue
+        start, _, end = span.partition(",")
+        bitmap.mark_range(int(start.partition(".")[0]), int(end.partition(".")[0]), int(count) > 0)
+    return coverage
+
+
+def read_coverage(
+    paths: Iterable[Path | str], only: set[str] | None = None, root: Path | str = "."
+) -> Coverage:
+    """Read lcov and Go profiles (told apart by a leading ``mode:`` line)."""
+    coverage: Coverage = {}
+    modules: list[tuple[str, str]] | None = None
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            first = handle.readline()
+            if first.startswith("mode:"):
+                if modules is None:
+                    modules = go_modules(root)
+                read_go_profile(handle, coverage, only, modules, root)
+            else:
+                read_lcov(chain([first], handle), coverage, only, root)
+    return coverage
+
+
+@dataclass
+class FileDiffCoverage:
+    """Changed lines of one file, split by coverage."""
+
+    path: str
+    covered: list[int] = field(default_factory=list)
+    uncovered: list[int] = field(default_factory=list)
+
+
+@dataclass
+class DiffCoverageReport:
+    """Coverage of changed, instrumented lines."""
+
+    files: list[FileDiffCoverage]
+
+    @property
+    def covered(self) -> int:
+        return sum(len(item.covered) for item in self.files)
+
+    @property
+    def lines(self) -> int:
+        return sum(len(item.covered) + len(item.uncovered) for item in self.files)
+
+    @property
+    def percent(self) -> float | None:
+        """Covered share of changed lines, or None when no changed line is instrumented."""
+        return 100.0 * self.covered / self.lines if self.lines else None
+
+
+def diff_report(coverage: Coverage, changes: Changes) -> DiffCoverageReport:
+    """Intersect ``coverage`` with the changed line ranges."""
+    files = []
+    for path in sorted(changes):
+        bitmap = coverage.get(path)
+        if bitmap is None:
+            continue
+        result = FileDiffCoverage(path)
+        for start, end in changes[path]:
+            for line in range(start, end + 1):
+                state = bitmap.state(line)
+                if state is not None:
+                    (result.covered if state else result.uncovered).append(line)
+        if result.covered or result.uncovered:
+            files.append(result)
+    return DiffCoverageReport(files)
+
+
+def format_ranges(lines: Sequence[int]) -> str:
+    """Render sorted line numbers compactly, e.g. ``3-5, 9``."""
+    parts = []
+    start = previous = None
+    for line in [*lines, None]:
+        if start is not None and (line is None or line != previous + 1):
+            parts.append(str(start) if start == previous else f"{start}-{previous}")
+            start = None
+        if line is not None and start is None:
+            start = line
+        previous = line
+    return ", ".join(parts)
+
+
+def format_markdown(report: DiffCoverageReport, threshold: float) -> str:
+    """Render ``report`` for a step summary."""
+    percent = report.percent
+    if percent is None:
+        return "## Diff coverage\n\nNo changed lines are instrumented.\n"
+    lines = [
+        "## Diff coverage",
+        "",
+        f"**{percent:.1f}%** of {report.lines} changed lines covered (threshold {threshold:g}%).",
+        "",
+        "| File | Covered | Uncovered lines |",
+        "| --- | ---: | --- |",
+    ]
+    for item in report.files:
+        total = len(item.covered) + len(item.uncovered)
+        lines.append(
+            f"| `{item.path}` | {len(item.covered)}/{total} | {format_ranges(item.uncovered)} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Coverage of changed lines.")
+    parser.add_argument("coverage", nargs="+", help="lcov tracefiles and/or Go profiles")
+    parser.add_argument("--base", required=True, help="Git ref to diff against")
+    parser.add_argument("--threshold", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    changes = git_changes(args.base)
+    report = diff_report(read_coverage(args.coverage, set(changes)), changes)
+    print(format_markdown(report, args.threshold), end="")
+    percent = report.percent
+    return 1 if percent is not None and percent < args.threshold else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: .github/workflows/scripts/docs_workflow.py
-# version: 1.0.1
+# version: 1.0.3
 # guid: e4f5a6b7-c8d9-0e1f-2a3b-4c5d6e7f8a9b
 
 """Documentation generation workflow helper.
@@ -30,14 +30,13 @@ import argparse
 import ast
 import json
 import os
-import re
 import sys
 from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import yaml
+from header_metadata import read_header
 from workflow_common import (
     append_summary_line,
     config_path,
@@ -138,11 +137,7 @@ def _format_args(args: ast.arguments) -> str:
 
 def _extract_version(path: Path) -> str:
     """Extract module version from header comment."""
-    for line in path.read_text(encoding="utf-8").splitlines()[:5]:
-        match = re.search(r"#\s*version:\s*([0-9]+\.[0-9]+\.[0-9]+)", line, re.IGNORECASE)
-        if match:
-            return match.group(1)
-    return "0.0.0"
+    return read_header(path).version or "0.0.0"
 
 
 def parse_python_module(path: Path) -> DocModule:
@@ -252,6 +247,8 @@ def generate_api_docs(source_dirs: list[str], output_dir: Path) -> list[Path]:
 
 def parse_workflow(path: Path) -> WorkflowDoc:
     """Parse a workflow YAML file into documentation structure."""
+    import yaml
+
     data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
     name = data.get("name", path.stem)
     triggers = list(data.get("on", {}))
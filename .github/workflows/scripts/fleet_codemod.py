@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/fleet_codemod.py
+# version: 1.0.0
+# guid: b4419e62-0828-4b82-9491-6a0a7033e99d
+
+"""Run file transforms across a fleet of local repositories.
+
+The multi-repo fixer scripts all follow the same walk-transform-commit
+pattern. This module provides it once:
+
+* a pruned ``os.walk`` that never descends into ``.git``, ``node_modules`` or
+  ``target`` (instead of ``rglob`` followed by filtering);
+* per-file transforms executed on a process pool, so regex-heavy rewrites use
+  every core;
+* independent repositories processed on a thread pool;
+* a single ``git add`` + ``git commit`` per repository.
+
+A transform is a top-level (picklable) function ``(relpath, text) -> str |
+None`` returning the new file content, or None to leave the file alone.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import subprocess
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFAULT_PRUNE = frozenset({".git", "node_modules", "target"})
+PREVIEW_LINES = 6
+TRANSFORM_CHUNK_SIZE = 16
+
+Transform = Callable[[str, str], "str | None"]
+
+
+@dataclass(frozen=True)
+class Codemod:
+    """Description of a fleet-wide file transform.
+
+    Args:
+        name: Short name used in log output.
+        transform: Top-level function ``(relpath, text) -> new text | None``.
+        patterns: Globs selecting files to transform. A pattern without ``/``
+            matches the file name, otherwise the repo-relative POSIX path.
+        roots: Repo-relative directories to walk (``""`` is the repo root).
+        paths: Repo-relative files to transform even when they do not exist
+            yet; missing files are passed to the transform as ``""``.
+        commit_message: Message used by :func:`commit_changes`.
+        prune: Directory names that are never descended into.
+    """
+
+    name: str
+    transform: Transform
+    patterns: tuple[str, ...] = ()
+    roots: tuple[str, ...] = ("",)
+    paths: tuple[str, ...] = ()
+    commit_message: str = ""
+    prune: frozenset[str] = DEFAULT_PRUNE
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """A file rewritten (or, in dry-run mode, that would be rewritten)."""
+
+    path: str
+    created: bool = False
+    head_before: tuple[str, ...] = ()
+    head_after: tuple[str, ...] = ()
+
+
+@dataclass
+class RepoResult:
+    """Outcome of running a codemod against one repository."""
+
+    repo: Path
+    changes: list[FileChange] = field(default_factory=list)
+    outcome: Any = None
+    error: str | None = None
+
+
+def iter_repos(base_dirs: Iterable[Path]) -> Iterator[Path]:
+    """Yield git repositories directly below each of ``base_dirs``."""
+    for base_dir in base_dirs:
+        if not base_dir.is_dir():
+            continue
+        for child in sorted(base_dir.iterdir()):
+            if child.is_dir() and (child / ".git").exists():
+                yield child
+
+
+def _matches(relpath: str, patterns: tuple[str, ...]) -> bool:
+    name = relpath.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        target = relpath if "/" in pattern else name
+        if fnmatch.fnmatchcase(target, pattern):
+            return True
+    return False
+
+
+def walk_files(repo: Path, codemod: Codemod) -> list[str]:
+    """Return repo-relative paths selected by ``codemod``, sorted."""
+    selected: set[str] = set(codemod.paths)
+    if codemod.patterns:
+        for root in codemod.roots:
+            top = repo / root if root else repo
+            for dirpath, dirnames, filenames in os.walk(top):
+                dirnames[:] = [name for name in dirnames if name not in codemod.prune]
+                rel_dir = os.path.relpath(dirpath, repo).replace(os.sep, "/")
+                prefix = "" if rel_dir == "." else f"{rel_dir}/"
+                for filename in filenames:
+                    relpath = prefix + filename
+                    if _matches(relpath, codemod.patterns):
+                        selected.add(relpath)
+    return sorted(selected)
+
+
+def apply_transform(
+    transform: Transform, repo: str, relpath: str, apply: bool
+) -> FileChange | None:
+    """Run ``transform`` on one file, writing the result when ``apply`` is set.
+
+    Runs inside pool worker processes. Files that are not valid UTF-8 are
+    skipped. Line endings are preserved exactly.
+    """
+    path = os.path.join(repo, relpath)
+    created = not os.path.exists(path)
+    original = ""
+    if not created:
+        try:
+            with open(path, encoding="utf-8", newline="") as handle:
+                original = handle.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    updated = transform(relpath, original)
+    if updated is None or updated == original:
+        return None
+
+    if apply:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            handle.write(updated)
+    return FileChange(
+        path=relpath,
+        created=created,
+        head_before=tuple(original.splitlines(keepends=True)[:PREVIEW_LINES]),
+        head_after=tuple(updated.splitlines(keepends=True)[:PREVIEW_LINES]),
+    )
+
+
+def transform_repo(
+    repo: Path,
+    codemod: Codemod,
+    apply: bool,
+    executor: Executor | None = None,
+) -> list[FileChange]:
+    """Transform every selected file in ``repo`` and return the changes."""
+    relpaths = walk_files(repo, codemod)
+    if not relpaths:
+        return []
+    repo_str = str(repo)
+    if executor is None:
+        results = [apply_transform(codemod.transform, repo_str, rel, apply) for rel in relpaths]
+    else:
+        count = len(relpaths)
+        results = executor.map(
+            apply_transform,
+            [codemod.transform] * count,
+            [repo_str] * count,
+            relpaths,
+            [apply] * count,
+            chunksize=TRANSFORM_CHUNK_SIZE,
+        )
+    return [change for change in results if change is not None]
+
+
+def _git(repo: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=repo, check=check, capture_output=True, text=True)
+
+
+def commit_changes(repo: Path, changes: list[FileChange], message: str) -> str | None:
+    """Stage and commit ``changes`` in one ``git add`` and one ``git commit``.
+
+    Returns:
+        The new commit id, or None if nothing ended up staged.
+
+    Raises:
+        subprocess.CalledProcessError: If a git command fails.
+    """
+    if not changes:
+        return None
+    _git(repo, "add", "--", *(change.path for change in changes))
+    if _git(repo, "diff", "--cached", "--quiet", check=False).returncode == 0:
+        return None
+    _git(repo, "commit", "-m", message)
+    return _git(repo, "rev-parse", "HEAD").stdout.strip()
+
+
+def run_codemod(
+    repos: Iterable[Path],
+    codemod: Codemod,
+    *,
+    apply: bool = False,
+    finalize: Callable[[Path, list[FileChange]], Any] | None = None,
+    workers: int = 4,
+    processes: int | None = None,
+) -> list[RepoResult]:
+    """Run ``codemod`` over ``repos`` and return one result per repository.
+
+    Args:
+        repos: Repository directories to process.
+        codemod: The transform to run.
+        apply: Write changes to disk (otherwise report only).
+        finalize: Called as ``finalize(repo, changes)`` for repos with
+            changes when ``apply`` is set, typically to commit or open a PR.
+            Its return value is stored in :attr:`RepoResult.outcome`.
+        workers: Number of repositories processed concurrently.
+        processes: Size of the transform process pool (``os.cpu_count()``
+            by default; ``1`` runs transforms in the calling thread).
+    """
+    processes = processes or os.cpu_count() or 1
+    process_pool = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+
+    def process(repo: Path) -> RepoResult:
+        result = RepoResult(repo=repo)
+        try:
+            result.changes = transform_repo(repo, codemod, apply, process_pool)
+            if apply and result.changes and finalize is not None:
+                result.outcome = finalize(repo, result.changes)
+        except subprocess.CalledProcessError as exc:
+            output = exc.stderr or exc.stdout or str(exc)
+            if isinstance(output, bytes):
+                output = output.decode("utf-8", errors="replace")
+            result.error = output.strip()
+        except OSError as exc:
+            result.error = str(exc)
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return list(executor.map(process, list(repos)))
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: .github/workflows/scripts/generate_workflow_analytics_summary.py
-# version: 1.0.0
+# version: 1.1.0
 # guid: a1b2c3d4-e5f6-4a7b-8c9d-0e1f2a3b4c5d
 
 """Generate workflow analytics summary from collected metrics."""
@@ -18,19 +18,27 @@ def pct(value: float) -> str:
     return f"{value * 100:.1f}%" if isinstance(value, (float, int)) else "N/A"
 
 
+def seconds(value: Any) -> str:
+    return f"{value:.1f} s" if isinstance(value, (float, int)) else "N/A"
+
+
 def format_top_workflows(workflows: dict[str, Any], limit: int = 5) -> list[str]:
     lines: list[str] = []
     top = sorted(workflows.items(), key=lambda item: item[1].get("runs", 0), reverse=True)[:limit]
     if top:
-        lines.append("| Workflow | Runs | Success Rate | Avg Duration | Cache Hit Rate |")
-        lines.append("| --- | --- | --- | --- | --- |")
+        lines.append(
+            "| Workflow | Runs | Success Rate | Avg Duration | P50 | P90 | P99 | Cache Hit Rate |"
+        )
+        lines.append("| --- | --- | --- | --- | --- | --- | --- | --- |")
         for name, data in top:
             cache_hit = data.get("cache_hit_rate")
             cache_text = pct(cache_hit) if isinstance(cache_hit, (float, int)) else "N/A"
             success = pct(data.get("success_rate", 0.0))
-            duration = f"{data.get('average_duration', 0.0):.1f} s"
+            duration = seconds(data.get("average_duration", 0.0))
+            tails = " | ".join(seconds(data.get(f"p{p}_duration")) for p in (50, 90, 99))
             lines.append(
-                f"| {name} | {data.get('runs', 0)} | {success} | {duration} | {cache_text} |"
+                f"| {name} | {data.get('runs', 0)} | {success} | {duration} | {tails} "
+                f"| {cache_text} |"
             )
     else:
         lines.append("No workflow runs found in the selected window.")
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/go_coverage.py
+# version: 1.0.1
+# guid: eb9e41a9-de54-43a3-904a-6c79e3a9fe13
+
+"""Streaming parser for Go ``-coverprofile`` files.
+
+A profile is a ``mode:`` line followed by one line per basic block::
+
+    mode: set
+    example.com/mod/pkg/file.go:10.2,12.16 2 1
+
+``<file>:<start>,<end> <statements> <count>``. :class:`CoverageProfile`
+streams profiles in chunks of lines, parsed with one ``str.split`` per chunk
+(line by line when a chunk has blank lines or file names with spaces), and
+keys blocks by ``<file>:<start>,<end>``, so
+blocks repeated across profiles (sharded ``go test`` runs, ``-coverpkg``)
+are merged the way ``go tool cover`` merges them. In ``set`` mode a block is
+covered if any profile covered it; in ``count`` and ``atomic`` mode the
+counts are added.
+
+Totals match the ``total:`` line of ``go tool cover -func``: covered
+statements over all statements. No ``go`` subprocess is needed.
+
+Usage::
+
+    python3 go_coverage.py summary coverage.out [more.out ...] [--by package|file] [--json]
+    python3 go_coverage.py merge shard-*.out --output coverage.out
+    python3 go_coverage.py delta --base base.out --head coverage.out
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import re
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from itertools import compress, groupby, islice, repeat
+from operator import mul
+from pathlib import Path
+
+MODES = ("set", "count", "atomic")
+# <file>:<line>.<col>,<line>.<col> <statements> <count>
+_BLOCK = re.compile(r"^(.+:\d+\.\d+,\d+\.\d+) (\d+) (\d+)\r?$", re.MULTILINE)
+_CHUNK_LINES = 1 << 16
+_COLON = repeat(":")
+
+
+class CoverageError(ValueError):
+    """Raised for malformed or incompatible coverage profiles."""
+
+
+@dataclass(frozen=True)
+class CoverageTotals:
+    """Covered and total statement counts."""
+
+    covered: int
+    statements: int
+
+    @property
+    def percent(self) -> float:
+        """Covered percentage; 0.0 when there are no statements, like ``go tool cover``."""
+        return 100.0 * self.covered / self.statements if self.statements else 0.0
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "covered": self.covered,
+            "statements": self.statements,
+            "percent": round(self.percent, 2),
+        }
+
+
+@dataclass(frozen=True)
+class PackageDelta:
+    """Coverage of one package in a base and a head profile."""
+
+    package: str
+    base: CoverageTotals | None
+    head: CoverageTotals | None
+
+    @property
+    def delta(self) -> float:
+        """Percentage-point change; a package missing on one side counts as 0%."""
+        head = self.head.percent if self.head else 0.0
+        base = self.base.percent if self.base else 0.0
+        return head - base
+
+
+class CoverageProfile:
+    """Merged basic blocks from one or more Go coverage profiles.
+
+    Statement counts and hit counts are kept in two dicts keyed by block, so
+    a chunk of parsed lines merges with a couple of dict updates.
+    """
+
+    __slots__ = ("mode", "_statements", "_hits")
+
+    def __init__(self, mode: str = "") -> None:
+        """Create an empty profile; ``mode`` is taken from the first profile read."""
+        self.mode = mode
+        self._statements: dict[str, int] = {}
+        self._hits: dict[str, int] = {}  # covered blocks only
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    @classmethod
+    def from_files(cls, paths: Iterable[Path | str]) -> CoverageProfile:
+        """Parse and merge every profile in ``paths``."""
+        profile = cls()
+        for path in paths:
+            profile.read(path)
+        return profile
+
+    def read(self, path: Path | str) -> CoverageProfile:
+        """Merge the profile at ``path`` into this one, a chunk of lines at a time."""
+        with open(path, encoding="utf-8") as handle:
+            return self._add_stream(handle, str(path))
+
+    def add_lines(self, lines: Iterable[str], source: str = "<profile>") -> CoverageProfile:
+        """Merge profile text, given as an iterable of lines."""
+        stream = (line if line.endswith("\n") else line + "\n" for line in lines)
+        return self._add_stream(stream, source)
+
+    def _add_stream(self, stream: Iterable[str], source: str) -> CoverageProfile:
+        lines = iter(stream)
+        number = 0
+        for line in lines:
+            number += 1
+            if line.strip():
+                self._set_mode(line, source, number)
+                break
+        else:
+            return self
+        while True:
+            chunk = list(islice(lines, _CHUNK_LINES))
+            if not chunk:
+                return self
+            # One split per chunk yields a flat list of strings: no per-line
+            # tuples for the cyclic GC to scan, and the merge stays in C.
+            fields = "".join(chunk).split()
+            keys, counts = fields[0::3], fields[2::3]
+            try:
+                if len(fields) != 3 * len(chunk) or not all(map(str.__contains__, keys, _COLON)):
+                    raise ValueError
+                statements = list(map(int, fields[1::3]))
+                if not all(map(str.isdigit, counts)):
+                    raise ValueError
+            except ValueError:
+                # Blank lines or file names with spaces misalign the fields:
+                # parse this chunk line by line, raising for a malformed line.
+                keys, statements, counts = _parse_chunk(chunk, source, number)
+            self._merge_fields(keys, statements, counts)
+            number += len(chunk)
+
+    def _set_mode(self, line: str, source: str, number: int) -> None:
+        name, _, mode = line.partition(":")
+        mode = mode.strip()
+        if name != "mode" or mode not in MODES:
+            raise CoverageError(f"{source}:{number}: expected 'mode: set|count|atomic'")
+        if self.mode and self.mode != mode:
+            raise CoverageError(f"{source}: cannot merge {mode!r} into {self.mode!r} profile")
+        self.mode = mode
+
+    def _merge_fields(self, keys: list[str], statements: list[int], counts: list[str]) -> None:
+        self._statements.update(zip(keys, statements))
+        hits = self._hits
+        if self.mode == "set":
+            hits.update(zip(compress(keys, map("0".__ne__, counts)), repeat(1)))
+            return
+        for key, count in zip(keys, counts):
+            if count != "0":
+                hits[key] = hits.get(key, 0) + int(count)
+
+    def merge(self, other: CoverageProfile) -> CoverageProfile:
+        """Fold ``other`` into this profile and return it."""
+        if other.mode and self.mode and other.mode != self.mode:
+            raise CoverageError(f"cannot merge {other.mode!r} into {self.mode!r} profile")
+        self.mode = self.mode or other.mode
+        for key, statements in other._statements.items():
+            self._statements.setdefault(key, statements)
+        if self.mode == "set":
+            self._hits.update(other._hits)
+        else:
+            for key, hits in other._hits.items():
+                self._hits[key] = self._hits.get(key, 0) + hits
+        return self
+
+    def totals(self) -> CoverageTotals:
+        """Return coverage over every block."""
+        statements = self._statements
+        covered = sum(statements[key] for key in self._hits)
+        return CoverageTotals(covered, sum(statements.values()))
+
+    def by_file(self) -> dict[str, CoverageTotals]:
+        """Return coverage per source file, keyed by import path."""
+        keys = list(self._statements)
+        statements = list(self._statements.values())
+        covered = list(map(mul, statements, map(self._hits.__contains__, keys)))
+        sums: dict[str, list[int]] = {}
+        # Blocks of one file are (nearly always) adjacent: sum each run by slicing.
+        start = 0
+        for name, run in groupby(key[: key.rindex(":")] for key in keys):
+            end = start + len(list(run))
+            entry = sums.setdefault(name, [0, 0])
+            entry[0] += sum(covered[start:end])
+            entry[1] += sum(statements[start:end])
+            start = end
+        return {name: CoverageTotals(*sums[name]) for name in sorted(sums)}
+
+    def by_package(self) -> dict[str, CoverageTotals]:
+        """Return coverage per package (the directory of each file's import path)."""
+        sums: dict[str, list[int]] = {}
+        for name, totals in self.by_file().items():
+            package = name.rpartition("/")[0] or name
+            entry = sums.setdefault(package, [0, 0])
+            entry[0] += totals.covered
+            entry[1] += totals.statements
+        return {package: CoverageTotals(*sums[package]) for package in sorted(sums)}
+
+    def write(self, path: Path | str) -> None:
+        """Write the merged profile in ``-coverprofile`` format."""
+        hits = self._hits
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(f"mode: {self.mode or 'set'}\n")
+            handle.writelines(
+                f"{key} {statements} {hits.get(key, 0)}\n"
+                for key, statements in self._statements.items()
+            )
+
+
+def _parse_chunk(
+    chunk: list[str], source: str, first_line: int
+) -> tuple[list[str], list[int], list[str]]:
+    """Parse ``chunk`` one line at a time, skipping blank lines.
+
+    Slower than splitting the whole chunk, but the block key may contain spaces.
+    Raises for the first non-blank line that is not a block.
+    """
+    keys: list[str] = []
+    statements: list[int] = []
+    counts: list[str] = []
+    for offset, line in enumerate(chunk, 1):
+        if not line.strip():
+            continue
+        match = _BLOCK.fullmatch(line.rstrip("\r\n"))
+        if match is None:
+            raise CoverageError(f"{source}:{first_line + offset}: malformed block {line!r}")
+        keys.append(match[1])
+        statements.append(int(match[2]))
+        counts.append(match[3])
+    return keys, statements, counts
+
+
+def coverage_delta(base: CoverageProfile, head: CoverageProfile) -> list[PackageDelta]:
+    """Return per-package coverage changes from ``base`` to ``head``."""
+    base_packages = base.by_package()
+    head_packages = head.by_package()
+    return [
+        PackageDelta(package, base_packages.get(package), head_packages.get(package))
+        for package in sorted(base_packages.keys() | head_packages.keys())
+    ]
+
+
+def _percent(totals: CoverageTotals | None) -> str:
+    return f"{totals.percent:.1f}%" if totals else "—"
+
+
+def format_delta_markdown(deltas: Sequence[PackageDelta], changed_only: bool = True) -> str:
+    """Render ``deltas`` as a Markdown table."""
+    rows = [delta for delta in deltas if not changed_only or abs(delta.delta) >= 0.05]
+    if not rows:
+        return "No per-package coverage changes.\n"
+    lines = ["| Package | Base | Head | Δ |", "| --- | ---: | ---: | ---: |"]
+    lines.extend(
+        f"| `{delta.package}` | {_percent(delta.base)} | {_percent(delta.head)} "
+        f"| {delta.delta:+.1f} |"
+        for delta in rows
+    )
+    return "\n".join(lines) + "\n"
+
+
+def expand_profiles(patterns: Iterable[str]) -> list[str]:
+    """Expand globs in ``patterns``; literal paths are kept even if missing."""
+    paths: list[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(matches)
+    return paths
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize Go coverage profiles.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary = subparsers.add_parser("summary", help="Print total and per-package coverage")
+    summary.add_argument("profiles", nargs="+")
+    summary.add_argument("--by", choices=("package", "file"), default="package")
+    summary.add_argument("--json", action="store_true", help="Emit JSON instead of text")
+    merge = subparsers.add_parser("merge", help="Merge profiles into one")
+    merge.add_argument("profiles", nargs="+")
+    merge.add_argument("--output", required=True)
+    delta = subparsers.add_parser("delta", help="Per-package change from base to head")
+    delta.add_argument("--base", nargs="+", required=True)
+    delta.add_argument("--head", nargs="+", required=True)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "delta":
+            base = CoverageProfile.from_files(expand_profiles(args.base))
+            head = CoverageProfile.from_files(expand_profiles(args.head))
+            deltas = coverage_delta(base, head)
+            print(format_delta_markdown(deltas), end="")
+            print(f"Total: {base.totals().percent:.1f}% → {head.totals().percent:.1f}%")
+            return 0
+        profile = CoverageProfile.from_files(expand_profiles(args.profiles))
+    except (OSError, CoverageError) as exc:
+        print(f"::error::{exc}", file=sys.stderr)
+        return 1
+
+    if args.command == "merge":
+        profile.write(args.output)
+        print(f"Merged {len(profile)} blocks into {args.output}")
+        return 0
+
+    groups = profile.by_package() if args.by == "package" else profile.by_file()
+    total = profile.totals()
+    if args.json:
+        payload = {
+            "mode": profile.mode,
+            "total": total.to_dict(),
+            args.by: {name: totals.to_dict() for name, totals in groups.items()},
+        }
+        print(json.dumps(payload, indent=2))
+        return 0
+    width = max((len(name) for name in groups), default=0)
+    for name, totals in groups.items():
+        print(f"{name:<{width}}  {totals.percent:5.1f}%")
+    print(f"total: (statements) {total.percent:.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
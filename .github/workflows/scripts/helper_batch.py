@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/helper_batch.py
+# version: 1.1.0
+# guid: 500c9ae0-0110-4e13-a52c-5791543d0160
+
+"""Run several workflow-helper subcommands in one interpreter.
+
+Helpers register two extra subcommands with :func:`add_batch_commands`:
+
+``batch [FILE]``
+    Run one subcommand per line of ``FILE`` (or stdin), in order, stopping at
+    the first failure unless ``--keep-going`` is given. Lines are split like a
+    shell command and may start with ``NAME=value`` environment assignments
+    that apply to that line only; blank lines and ``#`` comments are ignored::
+
+        debug-filter
+        CI_GO_FILES=true determine-execution
+        generate-matrices
+
+``serve --socket PATH``
+    Keep the interpreter alive for the rest of a job and run subcommands sent
+    over a Unix socket by ``helper_client.py``. The client forwards its
+    environment, working directory and stdout/stderr descriptors, so each
+    step keeps its own ``GITHUB_OUTPUT`` file and log::
+
+        python3 ci_workflow.py serve --socket "$RUNNER_TEMP/ci.sock" &
+        python3 -S helper_client.py "$RUNNER_TEMP/ci.sock" determine-execution
+        python3 -S helper_client.py "$RUNNER_TEMP/ci.sock" --stop
+
+Every subcommand runs exactly as it would on its own, with the same outputs.
+The difference is that imports, parsed ``REPOSITORY_CONFIG`` and HTTP
+sessions are shared between them. Caches of the working tree must not be:
+earlier steps may create files, so helpers register them with
+:func:`reset_per_command` and they are dropped before every subcommand.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shlex
+import sys
+import traceback
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ParserFactory = Callable[[], argparse.ArgumentParser]
+
+BATCH_COMMANDS = frozenset({"batch", "serve"})
+DEFAULT_IDLE_TIMEOUT = 3600.0
+_ASSIGNMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+_MAX_REQUEST_BYTES = 16 * 1024 * 1024
+_COMMAND_RESETS: list[Callable[[], None]] = []
+
+
+@dataclass(frozen=True)
+class BatchCommand:
+    """One subcommand line with its environment overrides."""
+
+    argv: tuple[str, ...]
+    env: dict[str, str] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        assignments = [f"{name}={shlex.quote(value)}" for name, value in self.env.items()]
+        return " ".join([*assignments, *map(shlex.quote, self.argv)])
+
+
+def parse_batch(text: str) -> list[BatchCommand]:
+    """Parse batch file contents into commands."""
+    commands = []
+    for line in text.splitlines():
+        tokens = shlex.split(line, comments=True)
+        env: dict[str, str] = {}
+        while tokens and _ASSIGNMENT.match(tokens[0]):
+            name, _, value = tokens.pop(0).partition("=")
+            env[name] = value
+        if tokens:
+            commands.append(BatchCommand(tuple(tokens), env))
+        elif env:
+            raise ValueError(f"batch line sets variables without a command: {line.strip()}")
+    return commands
+
+
+def _exit_code(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def reset_per_command(callback: Callable[[], None]) -> None:
+    """Call ``callback`` before every batched or served subcommand."""
+    _COMMAND_RESETS.append(callback)
+
+
+def run_command(build_parser: ParserFactory, argv: Sequence[str]) -> int:
+    """Run one subcommand in-process and return its exit status."""
+    for reset in _COMMAND_RESETS:
+        reset()
+    if argv and argv[0] in BATCH_COMMANDS:
+        print(f"::error::{argv[0]} cannot be nested in a batch", file=sys.stderr)
+        return 2
+    parser = build_parser()
+    try:
+        args = parser.parse_args(list(argv))
+        handler = getattr(args, "handler", None)
+        if handler is None:
+            parser.print_help()
+            return 1
+        handler(args)
+    except SystemExit as exc:
+        return _exit_code(exc.code)
+    except Exception:  # noqa: BLE001 - report like an uncaught error, keep serving
+        traceback.print_exc()
+        return 1
+    finally:
+        _flush()
+    return 0
+
+
+@contextmanager
+def _environment(
+    env: dict[str, str] | None = None,
+    overrides: dict[str, str] | None = None,
+    cwd: str | None = None,
+) -> Iterator[None]:
+    """Temporarily replace or extend ``os.environ`` and the working directory."""
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+    try:
+        if env is not None:
+            os.environ.clear()
+            os.environ.update(env)
+        os.environ.update(overrides or {})
+        if cwd:
+            os.chdir(cwd)
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def run_batch(
+    build_parser: ParserFactory,
+    commands: Iterable[BatchCommand],
+    keep_going: bool = False,
+) -> int:
+    """Run ``commands`` in order and return the first non-zero status."""
+    status = 0
+    for command in commands:
+        with _environment(overrides=command.env):
+            code = run_command(build_parser, command.argv)
+        if code:
+            print(f"::error::batch command `{command}` exited with {code}", file=sys.stderr)
+            status = status or code
+            if not keep_going:
+                break
+    return status
+
+
+def _flush() -> None:
+    # A client that went away loses its output; the server keeps running.
+    for stream in (sys.stdout, sys.stderr):
+        with suppress(OSError):
+            stream.flush()
+
+
+@contextmanager
+def _redirected(fds: Sequence[int]) -> Iterator[None]:
+    """Point this process's stdout/stderr at a client's descriptors."""
+    _flush()
+    saved = [os.dup(1), os.dup(2)]
+    try:
+        for target, fd in zip((1, 2), fds):
+            os.dup2(fd, target)
+        yield
+    finally:
+        _flush()
+        for target, fd in zip((1, 2), saved):
+            os.dup2(fd, target)
+        for fd in (*saved, *fds):
+            os.close(fd)
+
+
+def _read_request(conn) -> tuple[dict, list[int]]:
+    import socket
+
+    data, fds, _, _ = socket.recv_fds(conn, 65536, 2)
+    buffer = bytearray(data)
+    while not buffer.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk or len(buffer) > _MAX_REQUEST_BYTES:
+            break
+        buffer.extend(chunk)
+    return json.loads(buffer or b"{}"), list(fds)
+
+
+def serve(
+    build_parser: ParserFactory,
+    socket_path: str,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> int:
+    """Serve subcommands on ``socket_path`` until stopped or idle."""
+    import socket
+
+    path = Path(socket_path)
+    path.unlink(missing_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(str(path))
+        server.listen()
+        server.settimeout(idle_timeout)
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                print(f"ℹ️ No requests for {idle_timeout:.0f}s; stopping helper server")
+                return 0
+            with conn:
+                conn.settimeout(None)
+                request, fds = _read_request(conn)
+                if request.get("stop"):
+                    for fd in fds:
+                        os.close(fd)
+                    conn.sendall(b'{"returncode": 0}\n')
+                    return 0
+                with _environment(env=request.get("env"), cwd=request.get("cwd")):
+                    if len(fds) == 2:
+                        with _redirected(fds):
+                            code = run_command(build_parser, request.get("argv", []))
+                    else:
+                        for fd in fds:
+                            os.close(fd)
+                        code = run_command(build_parser, request.get("argv", []))
+                conn.sendall(json.dumps({"returncode": code}).encode() + b"\n")
+    finally:
+        server.close()
+        path.unlink(missing_ok=True)
+
+
+def add_batch_commands(subparsers: argparse._SubParsersAction, build_parser: ParserFactory) -> None:
+    """Register ``batch`` and ``serve`` on a helper's subcommand parser."""
+    batch = subparsers.add_parser("batch", help="Run subcommands listed in a file")
+    batch.add_argument("file", nargs="?", default="-", help="Batch file (default: stdin)")
+    batch.add_argument(
+        "--keep-going", action="store_true", help="Run remaining commands after a failure"
+    )
+    batch.set_defaults(handler=lambda args: _batch_handler(args, build_parser))
+
+    server = subparsers.add_parser("serve", help="Serve subcommands over a Unix socket")
+    server.add_argument("--socket", required=True, help="Unix socket path")
+    server.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Stop after this many seconds without requests",
+    )
+    server.set_defaults(handler=lambda args: _serve_handler(args, build_parser))
+
+
+def _batch_handler(args: argparse.Namespace, build_parser: ParserFactory) -> None:
+    text = sys.stdin.read() if args.file == "-" else Path(args.file).read_text(encoding="utf-8")
+    status = run_batch(build_parser, parse_batch(text), keep_going=args.keep_going)
+    if status:
+        raise SystemExit(status)
+
+
+def _serve_handler(args: argparse.Namespace, build_parser: ParserFactory) -> None:
+    raise SystemExit(serve(build_parser, args.socket, args.idle_timeout))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/helper_client.py
+# version: 1.0.0
+# guid: fab2d4e1-44ae-4a15-84e0-112b4f7c8609
+
+"""Send one subcommand to a workflow helper started with ``serve``.
+
+Usage::
+
+    python3 -S helper_client.py SOCKET COMMAND [ARGS...]
+    python3 -S helper_client.py SOCKET --stop
+
+The client only imports what it needs to talk to the socket, and ``-S``
+skips ``site``, so a step pays for little more than the interpreter itself.
+The exit status is that of the subcommand. See ``helper_batch.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import time
+
+CONNECT_TIMEOUT = 10.0
+USAGE = "usage: helper_client.py SOCKET (COMMAND [ARGS...] | --stop)"
+
+
+def call(
+    socket_path: str,
+    argv: list[str] | tuple[str, ...] = (),
+    connect_timeout: float = CONNECT_TIMEOUT,
+    stop: bool = False,
+) -> int:
+    """Run ``argv`` on a helper server and return its exit status.
+
+    Connection attempts are retried for ``connect_timeout`` seconds so a
+    client may start right after the server was launched in the background.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(socket_path)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            client.close()
+            if time.monotonic() >= deadline:
+                print(f"::error::No helper server listening on {socket_path}", file=sys.stderr)
+                return 1
+            time.sleep(0.05)
+
+    if stop:
+        request = {"stop": True}
+    else:
+        request = {"argv": list(argv), "env": dict(os.environ), "cwd": os.getcwd()}
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with client:
+        socket.send_fds(client, [json.dumps(request).encode() + b"\n"], [1, 2])
+        response = bytearray()
+        while not response.endswith(b"\n"):
+            chunk = client.recv(4096)
+            if not chunk:
+                print("::error::Helper server closed the connection", file=sys.stderr)
+                return 1
+            response.extend(chunk)
+    return int(json.loads(response)["returncode"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else list(argv)
+    if len(args) < 2 or args[0].startswith("-"):
+        print(USAGE, file=sys.stderr)
+        return 2
+    socket_path, command = args[0], args[1:]
+    if command == ["--stop"]:
+        return call(socket_path, connect_timeout=1.0, stop=True)
+    if command[0] == "--":
+        command = command[1:]
+    return call(socket_path, command)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 # file: .github/workflows/scripts/publish_to_github_packages.py
-# version: 1.0.0
+# version: 1.2.0
 # guid: 56c78875-9e49-4f08-bfab-3a6d6a327f65
 
-"""Publish build artifacts to GitHub Packages as generic packages."""
+"""Publish build artifacts to GitHub Packages as generic packages.
+
+The tarball is built reproducibly by ``archive_builder`` (sorted entries,
+normalized metadata, parallel gzip), so unchanged artifacts always produce the
+same digest; pass ``--previous-digest`` to skip re-publishing them. The tarball
+is streamed to the API with retries by ``release_asset_uploader`` when a token
+is available, falling back to ``gh api --input`` otherwise.
+"""
 
 from __future__ import annotations
 
@@ -12,10 +19,11 @@ import os
 import shutil
 import subprocess
 import sys
-import tarfile
 import tempfile
 from pathlib import Path
 
+from archive_builder import ArchiveResult, build_archive
+from release_asset_uploader import GitHubClient, upload_generic_package
 from workflow_common import (
     append_summary_line,
     format_summary_table,
@@ -23,6 +31,7 @@ from workflow_common import (
     log_notice,
     log_warning,
     registry_enabled,
+    write_output,
 )
 
 
@@ -55,13 +64,11 @@ def _build_package_name(language: str, branch: str, is_stable: bool) -> str:
     return base
 
 
-def _create_tarball(source_dir: Path, package_name: str, version: str) -> Path:
-    """Create a tarball containing the artifacts directory."""
+def _create_tarball(source_dir: Path, package_name: str, version: str) -> ArchiveResult:
+    """Create a reproducible tarball containing the artifacts directory."""
     temp_dir = Path(tempfile.mkdtemp(prefix="ghpkg-"))
     tarball_path = temp_dir / f"{package_name}-{version}.tar.gz"
-    with tarfile.open(tarball_path, "w:gz") as archive:
-        archive.add(source_dir, arcname=package_name)
-    return tarball_path
+    return build_archive([(source_dir, package_name)], tarball_path)
 
 
 def _run_gh_api(
@@ -99,6 +106,30 @@ def _run_gh_api(
         raise SystemExit(result.returncode)
 
 
+def _upload_package(
+    repository: str,
+    package_name: str,
+    version: str,
+    tarball: Path,
+) -> None:
+    """Stream tarball to GitHub Packages, retrying transient failures."""
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if not token:
+        _run_gh_api(repository, package_name, version, tarball)
+        return
+
+    result = upload_generic_package(
+        GitHubClient(token),
+        repository,
+        package_name,
+        version,
+        tarball,
+    )
+    if result.status != "uploaded":
+        print(f"::error::Failed to upload package: {result.error}")
+        raise SystemExit(1)
+
+
 def publish_github_package(
     *,
     repository: str,
@@ -107,15 +138,27 @@ def publish_github_package(
     branch: str,
     is_stable: bool,
     artifacts_dir: Path,
+    previous_digest: str = "",
 ) -> None:
-    """Publish artifacts directory as a GitHub Packages generic package."""
+    """Publish artifacts directory as a GitHub Packages generic package.
+
+    When ``previous_digest`` matches the freshly built tarball the upload is
+    skipped.
+    """
     _ensure_has_artifacts(artifacts_dir)
     version = _sanitize_version(tag)
     package_name = _build_package_name(language, branch, is_stable)
-    tarball = _create_tarball(artifacts_dir, package_name, version)
+    archive = _create_tarball(artifacts_dir, package_name, version)
+    tarball = archive.path
+    write_output("package-digest", f"sha256:{archive.sha256}")
+
+    if previous_digest and previous_digest.removeprefix("sha256:") == archive.sha256:
+        shutil.rmtree(tarball.parent, ignore_errors=True)
+        log_notice(f"{package_name} {version} is unchanged (sha256:{archive.sha256}); skipping")
+        return
 
     try:
-        _run_gh_api(repository, package_name, version, tarball)
+        _upload_package(repository, package_name, version, tarball)
     finally:
         shutil.rmtree(tarball.parent, ignore_errors=True)
 
@@ -125,6 +168,7 @@ def publish_github_package(
                 ("Package", f"`{package_name}`"),
                 ("Version", f"`{version}`"),
                 ("Source", f"`{artifacts_dir}`"),
+                ("SHA-256", f"`{archive.sha256}`"),
             )
         )
     )
@@ -148,6 +192,11 @@ def main() -> None:
         default=os.environ.get("GITHUB_REPOSITORY", ""),
     )
     parser.add_argument("--require-github", action="store_true")
+    parser.add_argument(
+        "--previous-digest",
+        default=os.environ.get("PREVIOUS_PACKAGE_DIGEST", ""),
+        help="Skip the upload when the package tarball has this sha256 digest",
+    )
     args = parser.parse_args()
 
     # Prime configuration cache for helper consumers.
@@ -174,6 +223,7 @@ def main() -> None:
         branch=args.branch,
         is_stable=args.is_stable,
         artifacts_dir=artifacts_dir,
+        previous_digest=args.previous_digest.strip(),
     )
 
 
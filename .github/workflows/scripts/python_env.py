@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/python_env.py
+# version: 1.1.0
+# guid: b61c7230-63f3-4810-aeab-957442d9162b
+
+"""Hash-keyed wheelhouse archives for Python dependency installs.
+
+:func:`environment_key` digests the dependency manifests in a checkout
+(``requirements*.txt``, ``pyproject.toml``, ``setup.cfg``/``setup.py``, lock
+files), the extra packages to install, and the interpreter: implementation,
+version and platform. Two jobs with the same key resolve to the same packages.
+
+A wheelhouse archive (:func:`pack_wheelhouse`) holds a wheel for every
+distribution installed from an index plus the ``pip freeze`` pins. It is
+stored as ``<cache dir>/<key>.tar.gz``. Restoring it (:func:`unpack_wheelhouse`)
+lets pip install those with ``--no-index``, without resolving or downloading
+anything. Direct references (``name @ url``) are pinned as they are and
+installed from their URL again, since an index could not tell which artifact
+they were.
+
+The editable project itself is not archived: its sources change with every
+commit, so it is reinstalled with ``--no-deps``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import platform
+import sys
+import sysconfig
+import tarfile
+from collections.abc import Iterable, Sequence
+from pathlib import Path, PurePosixPath
+
+KEY_VERSION = "1"
+MANIFEST_PATTERNS = (
+    "requirements*.txt",
+    "requirements/*.txt",
+    "constraints*.txt",
+    "pyproject.toml",
+    "setup.cfg",
+    "setup.py",
+    "poetry.lock",
+    "pdm.lock",
+    "uv.lock",
+    "Pipfile.lock",
+)
+REQUIREMENTS_NAME = "requirements.txt"
+WHEELHOUSE_DIR = "wheelhouse"
+
+
+def manifest_files(root: Path | str = ".") -> list[Path]:
+    """Return the dependency manifests present in ``root``, sorted."""
+    root = Path(root)
+    found = {path for pattern in MANIFEST_PATTERNS for path in root.glob(pattern)}
+    return sorted(path for path in found if path.is_file())
+
+
+def environment_key(root: Path | str = ".", packages: Sequence[str] = ()) -> str:
+    """Return a cache key for the environment ``root``'s manifests resolve to."""
+    root = Path(root)
+    digest = hashlib.sha256()
+    interpreter = (
+        KEY_VERSION,
+        sys.implementation.name,
+        platform.python_version(),
+        sysconfig.get_platform(),
+        *packages,
+    )
+    digest.update("\0".join(interpreter).encode())
+    for path in manifest_files(root):
+        digest.update(b"\0" + path.relative_to(root).as_posix().encode() + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return f"{sys.implementation.cache_tag}-{digest.hexdigest()[:32]}"
+
+
+def archive_path(cache_dir: Path | str, key: str) -> Path:
+    return Path(cache_dir).expanduser() / f"{key}.tar.gz"
+
+
+def index_options(wheel_dir: str | None) -> list[str]:
+    """pip options that install only from ``wheel_dir`` when it is set."""
+    return ["--no-index", "--find-links", wheel_dir] if wheel_dir else []
+
+
+def frozen_requirements(freeze_output: str) -> list[str]:
+    """Turn ``pip freeze`` output into requirement lines for the archive.
+
+    ``name @ url`` lines (VCS or local installs) are kept as they are; editable
+    installs and comments are dropped.
+    """
+    pins = []
+    for line in freeze_output.splitlines():
+        line = line.strip()
+        if not line or line.startswith(("#", "-e", "--")):
+            continue
+        pins.append(line)
+    return pins
+
+
+def is_direct_reference(pin: str) -> bool:
+    """Return True for a ``name @ url`` pin, which is not built into the wheelhouse."""
+    return " @ " in pin
+
+
+def pack_wheelhouse(wheel_dir: Path | str, requirements: Path | str, archive: Path | str) -> int:
+    """Archive the wheels in ``wheel_dir`` with their pins; return the wheel count."""
+    import archive_builder
+
+    wheels = sorted(Path(wheel_dir).glob("*.whl"))
+    sources: list[tuple[Path | str, str]] = [(requirements, REQUIREMENTS_NAME)]
+    sources.extend((wheel, f"{WHEELHOUSE_DIR}/{wheel.name}") for wheel in wheels)
+    archive_builder.build_archive(sources, archive, level=1)  # wheels are compressed
+    return len(wheels)
+
+
+def _safe_members(archive: tarfile.TarFile) -> Iterable[tarfile.TarInfo]:
+    for member in archive.getmembers():
+        path = PurePosixPath(member.name)
+        if path.is_absolute() or ".." in path.parts or not (member.isfile() or member.isdir()):
+            raise tarfile.TarError(f"unexpected archive member {member.name!r}")
+        yield member
+
+
+def unpack_wheelhouse(archive: Path | str, destination: Path | str) -> Path:
+    """Extract ``archive`` into ``destination``; return its pinned requirements file.
+
+    Wheels end up next to the requirements file, under ``wheelhouse/``.
+    """
+    destination = Path(destination)
+    with tarfile.open(archive, "r:gz") as handle:
+        members = list(_safe_members(handle))
+        if sys.version_info >= (3, 12):
+            handle.extractall(destination, members, filter="data")
+        else:  # pragma: no cover - members are checked above
+            handle.extractall(destination, members)
+    requirements = destination / REQUIREMENTS_NAME
+    if not requirements.is_file():
+        raise tarfile.TarError(f"{archive} has no {REQUIREMENTS_NAME}")
+    return requirements
+
+
+def prune(cache_dir: Path | str, keep: str) -> list[Path]:
+    """Delete older archives for ``keep``'s interpreter; return them.
+
+    Archives for other interpreters (other matrix jobs) are left alone.
+    """
+    cache = Path(cache_dir).expanduser()
+    kept = archive_path(cache, keep)
+    removed = []
+    for path in cache.glob(f"{keep.rpartition('-')[0]}-*.tar.gz"):
+        if path != kept:
+            path.unlink(missing_ok=True)
+            removed.append(path)
+    return removed
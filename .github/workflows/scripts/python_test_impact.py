@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/python_test_impact.py
+# version: 1.0.0
+# guid: ea14b05b-ea23-4e84-8be8-a8fd3b91cde3
+
+"""Pick the Python test files a change can affect and split them into shards.
+
+:func:`build_graph` parses the ``import`` statements of every Python file into
+a file-level dependency graph. Parse results are cached in a JSON file keyed
+by a hash of each file's contents, so a warm run only re-parses what changed.
+Each file also depends on the ``__init__.py`` of its packages and, for test
+files, on every ``conftest.py`` above it.
+
+:func:`select_tests` walks the graph backwards from the changed files and
+keeps the test files it reaches. :func:`needs_full_run` rules selection out
+when a change cannot be attributed to modules: deleted or renamed files,
+``setup.py``, and any non-Python file other than docs (packaging and pytest
+configuration, fixtures, data).
+
+:func:`shard_tests` splits the selection into shards of similar total
+duration (longest first, each file to the lightest shard), using test times
+from earlier JUnit XML reports. Files without history count as the median.
+
+Module names are resolved the way the files could be imported: from the top
+of their package, and from each directory above it (``sys.path`` entries added
+by ``conftest.py``, namespace packages). An ambiguous name maps to every file
+it could mean, so selection errs towards running more tests.
+
+Usage::
+
+    python3 python_test_impact.py --base origin/main [--shard 1/4] [--durations 'junit*.xml']
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import fnmatch
+import glob
+import hashlib
+import heapq
+import json
+import os
+import statistics
+import subprocess
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = ".pytest_cache/ci-import-graph.json"
+TEST_PATTERNS = ("test_*.py", "*_test.py")
+# Python files that configure the build rather than being imported.
+FULL_RUN_FILES = ("setup.py", "noxfile.py")
+IGNORED_SUFFIXES = (".md", ".rst")
+_SKIPPED_DIRS = {
+    ".git",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    "node_modules",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    "build",
+    "dist",
+}
+
+
+def _clean(path: str) -> str:
+    return path[2:] if path.startswith("./") else path
+
+
+def is_test_file(path: str) -> bool:
+    name = PurePosixPath(path).name
+    return any(fnmatch.fnmatch(name, pattern) for pattern in TEST_PATTERNS)
+
+
+def python_files(paths: Iterable[Path | str]) -> list[str]:
+    """Return the ``.py`` files of ``paths`` as sorted POSIX paths, minus tool dirs."""
+    files = set()
+    for path in paths:
+        posix = PurePosixPath(Path(path).as_posix())
+        if posix.suffix == ".py" and not _SKIPPED_DIRS.intersection(posix.parts[:-1]):
+            files.add(_clean(str(posix)))
+    return sorted(files)
+
+
+def walk_python_files(root: Path | str = ".") -> list[str]:
+    """Return every Python file below ``root``, relative to it."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in _SKIPPED_DIRS]
+        relative = Path(dirpath).relative_to(root)
+        found.extend(relative / name for name in filenames if name.endswith(".py"))
+    return python_files(found)
+
+
+def _package_parts(path: str, files: set[str]) -> tuple[list[str], int]:
+    """Return the dotted parts of ``path`` and the index where its package starts."""
+    parts = list(PurePosixPath(path).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    directory = PurePosixPath(path).parent
+    start = len(PurePosixPath(path).parent.parts)
+    while start and str(directory / "__init__.py") in files:
+        directory = directory.parent
+        start -= 1
+    return parts, start
+
+
+def module_names(path: str, files: set[str]) -> list[str]:
+    """Return every dotted name ``path`` could be imported as, package-anchored first."""
+    parts, start = _package_parts(path, files)
+    return [".".join(parts[index:]) for index in range(start, -1, -1) if parts[index:]]
+
+
+def parse_imports(source: bytes | str, module: str, is_package: bool) -> list[str]:
+    """Return the absolute module names imported by ``source``.
+
+    ``from pkg import name`` yields both ``pkg`` and ``pkg.name``, since
+    ``name`` may be a submodule. Unparseable files import nothing.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    package = module if is_package else module.rpartition(".")[0]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                anchor = package.split(".") if package else []
+                del anchor[max(len(anchor) - node.level + 1, 0) :]
+                base = ".".join([*anchor, node.module] if node.module else anchor)
+            else:
+                base = node.module or ""
+            if base:
+                names.add(base)
+            names.update(f"{base}.{alias.name}" if base else alias.name for alias in node.names)
+    names.discard("")
+    return sorted(names)
+
+
+@dataclass
+class ImportGraph:
+    """File-level dependencies: ``depends[file]`` is the set of files it imports."""
+
+    depends: dict[str, set[str]] = field(default_factory=dict)
+    parsed: int = 0
+    cached: int = 0
+
+    def impacted(self, changed: Iterable[str]) -> set[str]:
+        """Return ``changed`` plus every file that transitively imports one of them."""
+        dependents: dict[str, list[str]] = {}
+        for path, targets in self.depends.items():
+            for target in targets:
+                dependents.setdefault(target, []).append(path)
+        seen = set(changed)
+        stack = list(seen)
+        while stack:
+            for dependent in dependents.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return seen
+
+
+def _load_cache(path: Path | None) -> dict[str, list]:
+    if path is None or not path.is_file():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return {}
+    return payload.get("files") or {}
+
+
+def _save_cache(path: Path, entries: dict[str, list]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(
+        json.dumps({"version": CACHE_VERSION, "files": entries}, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    os.replace(temporary, path)
+
+
+def build_graph(
+    files: Sequence[str], root: Path | str = ".", cache_path: Path | str | None = None
+) -> ImportGraph:
+    """Parse the imports of ``files`` (relative to ``root``) into an :class:`ImportGraph`."""
+    root = Path(root)
+    cache_file = Path(cache_path) if cache_path else None
+    cache = _load_cache(cache_file)
+    known = set(files)
+    index: dict[str, list[str]] = {}
+    anchored: dict[str, str] = {}
+    for path in files:
+        names = module_names(path, known)
+        anchored[path] = names[0] if names else ""
+        for name in names:
+            index.setdefault(name, []).append(path)
+
+    graph = ImportGraph()
+    entries: dict[str, list] = {}
+    for path in files:
+        data = (root / path).read_bytes()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        entry = cache.get(path)
+        if entry and entry[0] == digest:
+            imports = entry[1]
+            graph.cached += 1
+        else:
+            imports = parse_imports(data, anchored[path], path.endswith("__init__.py"))
+            graph.parsed += 1
+        entries[path] = [digest, imports]
+
+        targets: set[str] = set()
+        for name in imports:
+            # Importing a.b.c runs a/__init__.py and a/b/__init__.py too.
+            parts = name.split(".")
+            for length in range(1, len(parts) + 1):
+                targets.update(index.get(".".join(parts[:length]), ()))
+        directory = PurePosixPath(path).parent
+        while str(directory / "__init__.py") in known:
+            targets.add(_clean(str(directory / "__init__.py")))
+            directory = directory.parent
+        if is_test_file(path):
+            for parent in PurePosixPath(path).parents:
+                conftest = _clean(str(parent / "conftest.py"))
+                if conftest in known:
+                    targets.add(conftest)
+        targets.discard(path)
+        graph.depends[path] = targets
+
+    if cache_file is not None and graph.parsed:
+        _save_cache(cache_file, entries)
+    return graph
+
+
+def changed_files(base: str, root: Path | str = ".") -> list[str]:
+    """Return the paths changed between the merge base of ``base`` and ``HEAD``.
+
+    Renames are reported as a deletion plus an addition.
+    """
+    result = subprocess.run(
+        ["git", "-c", "core.quotePath=false", "diff", "--name-only", "--no-renames"]
+        + [f"{base}...HEAD"],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def needs_full_run(changed: Iterable[str], root: Path | str = ".") -> str | None:
+    """Return the first changed path that rules out selection, if any."""
+    root = Path(root)
+    for path in changed:
+        if not (root / path).exists() or PurePosixPath(path).name in FULL_RUN_FILES:
+            return path
+        if not path.endswith(".py") and not path.endswith(IGNORED_SUFFIXES):
+            return path
+    return None
+
+
+def select_tests(graph: ImportGraph, changed: Iterable[str]) -> list[str]:
+    """Return the test files of ``graph`` affected by the changed Python files."""
+    changed_python = [path for path in changed if path in graph.depends]
+    return sorted(path for path in graph.impacted(changed_python) if is_test_file(path))
+
+
+def _dotted(path: str) -> str:
+    return ".".join(PurePosixPath(path).with_suffix("").parts)
+
+
+def junit_durations(reports: Iterable[Path | str], test_files: Sequence[str]) -> dict[str, float]:
+    """Sum ``<testcase time>`` per test file from JUnit XML ``reports``.
+
+    Test cases are attributed by their ``file`` attribute when pytest wrote
+    one, else by the longest ``classname`` prefix naming a test file.
+    """
+    import xml.etree.ElementTree as ET
+
+    known = set(test_files)
+    by_name: dict[str, str] = {}
+    for path in test_files:
+        for name in [_dotted(path), *module_names(path, known)]:
+            by_name.setdefault(name, path)
+    durations: dict[str, float] = {}
+    for report in reports:
+        try:
+            for _, element in ET.iterparse(str(report)):
+                if element.tag != "testcase":
+                    continue
+                path = _clean(element.get("file") or "")
+                if path not in known:
+                    parts = (element.get("classname") or "").split(".")
+                    path = next(
+                        (
+                            by_name[".".join(parts[:length])]
+                            for length in range(len(parts), 0, -1)
+                            if ".".join(parts[:length]) in by_name
+                        ),
+                        "",
+                    )
+                if path:
+                    try:
+                        seconds = float(element.get("time") or 0)
+                    except ValueError:
+                        seconds = 0.0
+                    durations[path] = durations.get(path, 0.0) + seconds
+                element.clear()
+        except (OSError, ET.ParseError) as exc:
+            print(f"::warning::Skipping unreadable JUnit report {report}: {exc}")
+    return durations
+
+
+def shard_tests(
+    test_files: Sequence[str], total: int, durations: dict[str, float] | None = None
+) -> list[list[str]]:
+    """Split ``test_files`` into ``total`` shards of similar expected duration."""
+    durations = durations or {}
+    known = [durations[path] for path in test_files if path in durations]
+    default = statistics.median(known) if known else 1.0
+    weighted = sorted(
+        ((durations.get(path, default), path) for path in test_files),
+        key=lambda item: (-item[0], item[1]),
+    )
+    heap = [(0.0, index) for index in range(max(total, 1))]
+    shards: list[list[str]] = [[] for _ in heap]
+    for seconds, path in weighted:
+        load, index = heapq.heappop(heap)
+        shards[index].append(path)
+        heapq.heappush(heap, (load + seconds, index))
+    return [sorted(shard) for shard in shards]
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse ``"INDEX/TOTAL"`` (1-based) into a pair."""
+    index, _, total = value.partition("/")
+    try:
+        shard, count = int(index), int(total)
+    except ValueError:
+        raise ValueError(f"shard must look like 1/4, got {value!r}") from None
+    if not 1 <= shard <= count:
+        raise ValueError(f"shard {value!r} is out of range")
+    return shard, count
+
+
+def expand_reports(patterns: Iterable[str]) -> list[str]:
+    """Expand globs in ``patterns``, keeping existing files only."""
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])
+    return [path for path in paths if Path(path).is_file()]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Select and shard impacted Python tests.")
+    parser.add_argument("--base", help="Git ref to diff against (default: run every test)")
+    parser.add_argument("--shard", help="INDEX/TOTAL shard to print, e.g. 1/4")
+    parser.add_argument("--durations", nargs="*", default=[], help="JUnit XML reports or globs")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Import graph cache file")
+    args = parser.parse_args(argv)
+
+    files = walk_python_files()
+    tests = [path for path in files if is_test_file(path)]
+    if args.base:
+        changed = changed_files(args.base)
+        if needs_full_run(changed) is None:
+            tests = select_tests(build_graph(files, cache_path=args.cache), changed)
+    if args.shard:
+        index, total = parse_shard(args.shard)
+        durations = junit_durations(expand_reports(args.durations), tests)
+        tests = shard_tests(tests, total, durations)[index - 1]
+    print("\n".join(tests))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/quantile_sketch.py
+# version: 1.1.0
+# guid: 1dfb28d2-320f-4092-9d6d-44c3a410b1b3
+
+"""Mergeable streaming quantile sketch (merging t-digest).
+
+A :class:`TDigest` summarizes any number of values in about a hundred weighted
+centroids. Centroids are kept small near both tails (``k1`` scale function),
+so p90/p99 stay accurate even though memory is bounded by ``compression``.
+Digests built for different repositories or time windows can be merged, and
+round-trip through JSON via :meth:`TDigest.to_dict` / :meth:`TDigest.from_dict`.
+
+Reference: Dunning & Ertl, "Computing Extremely Accurate Quantiles Using
+t-Digests" (2019).
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from collections.abc import Iterable
+from itertools import accumulate, repeat, starmap
+from operator import itemgetter, mul
+from typing import Any
+
+DEFAULT_COMPRESSION = 200.0
+BUFFER_FACTOR = 5
+
+
+class TDigest:
+    """Streaming quantile estimator over weighted float values."""
+
+    __slots__ = ("compression", "count", "min", "max", "_centroids", "_buffer")
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION) -> None:
+        """Create an empty digest; larger ``compression`` means more centroids."""
+        self.compression = float(compression)
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._centroids: list[tuple[float, float]] = []
+        self._buffer: list[tuple[float, float]] = []
+
+    def __len__(self) -> int:
+        return int(self.count)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add ``value`` with ``weight``."""
+        value = float(value)
+        self._buffer.append((value, float(weight)))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= BUFFER_FACTOR * self.compression:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> TDigest:
+        """Add every value in ``values`` (unit weight) and return the digest.
+
+        Values are buffered a slice at a time, so memory stays bounded by
+        ``compression`` however many values are added.
+        """
+        floats = [float(value) for value in values]
+        capacity = int(BUFFER_FACTOR * self.compression)
+        for start in range(0, len(floats), capacity):
+            chunk = floats[start : start + capacity]
+            self._buffer.extend(zip(chunk, repeat(1.0)))
+            self.count += len(chunk)
+            self.min = min(self.min, min(chunk))
+            self.max = max(self.max, max(chunk))
+            if len(self._buffer) >= capacity:
+                self._compress()
+        return self
+
+    def copy(self) -> TDigest:
+        """Return an independent copy of the digest."""
+        clone = TDigest(self.compression)
+        clone.count, clone.min, clone.max = self.count, self.min, self.max
+        clone._centroids = self.centroids()
+        return clone
+
+    def merge(self, other: TDigest) -> TDigest:
+        """Fold ``other`` into this digest and return it."""
+        if other.count:
+            self._buffer.extend(other.centroids())
+            self.count += other.count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress()
+        return self
+
+    @classmethod
+    def merged(cls, digests: Iterable[TDigest]) -> TDigest:
+        """Return a new digest combining ``digests``."""
+        result = cls()
+        for digest in digests:
+            result.merge(digest)
+        return result
+
+    def centroids(self) -> list[tuple[float, float]]:
+        """Return ``(mean, weight)`` centroids in ascending order."""
+        self._compress()
+        return list(self._centroids)
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k: float) -> float:
+        angle = max(-math.pi / 2, min(math.pi / 2, k * 2 * math.pi / self.compression))
+        return (math.sin(angle) + 1) / 2
+
+    def _compress(self) -> None:
+        """Merge buffered values into centroids.
+
+        Centroid boundaries are found by bisecting the cumulative weights, so
+        the Python-level work is proportional to the number of centroids, not
+        the number of buffered values.
+        """
+        if not self._buffer:
+            return
+        items = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        weights = list(accumulate(map(itemgetter(1), items)))
+        moments = list(accumulate(starmap(mul, items)))
+        total = self.count
+        last = len(items) - 1
+        merged: list[tuple[float, float]] = []
+        start = 0
+        seen = seen_moment = 0.0
+        while start <= last:
+            limit = self._k_inverse(self._k(seen / total) + 1)
+            end = bisect_right(weights, limit * total, start) - 1
+            while end < last and weights[end + 1] / total <= limit:
+                end += 1
+            while end > start and weights[end] / total > limit:
+                end -= 1
+            end = max(end, start)
+            if end == start:
+                merged.append(items[start])
+            else:
+                weight = weights[end] - seen
+                merged.append(((moments[end] - seen_moment) / weight, weight))
+            seen, seen_moment = weights[end], moments[end]
+            start = end + 1
+        self._centroids = merged
+
+    def quantile(self, q: float) -> float | None:
+        """Return the estimated ``q`` quantile (0 <= q <= 1), or None if empty."""
+        centroids = self.centroids()
+        if not centroids:
+            return None
+        if len(centroids) == 1:
+            return centroids[0][0]
+        target = min(max(q, 0.0), 1.0) * self.count
+        cumulative = 0.0
+        previous_mean, previous_center = self.min, 0.0
+        for mean, weight in centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                if span <= 0:
+                    return mean
+                return previous_mean + (mean - previous_mean) * (target - previous_center) / span
+            previous_mean, previous_center = mean, center
+            cumulative += weight
+        span = self.count - previous_center
+        if span <= 0:
+            return self.max
+        return previous_mean + (self.max - previous_mean) * (target - previous_center) / span
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable representation."""
+        return {
+            "compression": self.compression,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "centroids": [[mean, weight] for mean, weight in self.centroids()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TDigest:
+        """Rebuild a digest produced by :meth:`to_dict`."""
+        digest = cls(data.get("compression", DEFAULT_COMPRESSION))
+        centroids = [(float(mean), float(weight)) for mean, weight in data.get("centroids", [])]
+        if centroids:
+            digest._centroids = centroids
+            digest.count = sum(weight for _, weight in centroids)
+            digest.min = float(data.get("min", centroids[0][0]))
+            digest.max = float(data.get("max", centroids[-1][0]))
+        return digest
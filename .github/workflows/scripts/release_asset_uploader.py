@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/release_asset_uploader.py
+# version: 1.0.0
+# guid: 167c96f5-0ef0-4ac8-acf4-1d8285c63225
+
+"""Parallel, resumable uploads of release assets and generic packages.
+
+Instead of one blocking ``gh release upload`` / ``gh api --input`` process
+per file, this module talks to the REST API directly:
+
+* files are streamed from disk with an explicit ``Content-Length``, so they are
+  never buffered in memory;
+* the release is listed once, and assets already present with a matching size
+  (and SHA-256 digest, when the API reports one) are skipped, so re-running a
+  failed job only uploads what is missing;
+* N assets upload concurrently, each worker thread reusing one keep-alive
+  connection per host;
+* individual failures are retried with jittered exponential backoff.
+
+``api_url`` and ``uploads_url`` default to ``GITHUB_API_URL`` and
+``https://uploads.github.com`` so tests can point them at a local server.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, urlsplit
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_UPLOADS_URL = "https://uploads.github.com"
+DEFAULT_WORKERS = 4
+MAX_ATTEMPTS = 4
+REQUEST_TIMEOUT = 300
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+
+class UploadError(RuntimeError):
+    """Raised when an API request fails permanently."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Record the HTTP status alongside the message."""
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class RemoteAsset:
+    """An asset already attached to a release."""
+
+    id: int
+    name: str
+    size: int
+    state: str = "uploaded"
+    digest: str | None = None
+
+
+@dataclass
+class UploadResult:
+    """Outcome of uploading one file."""
+
+    name: str
+    status: str  # uploaded | skipped | failed
+    attempts: int = 0
+    error: str | None = None
+
+
+def _is_retryable(status: int | None) -> bool:
+    return status is None or status >= 500 or status == 429
+
+
+def _retry_delay(attempt: int) -> float:
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of ``path``, read in bounded blocks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(STREAM_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class GitHubClient:
+    """Minimal REST client with per-thread keep-alive connections."""
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str | None = None,
+        uploads_url: str | None = None,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> None:
+        """Create a client for ``api_url`` and ``uploads_url``."""
+        self.token = token
+        self.api_url = (api_url or os.environ.get("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+        self.uploads_url = (uploads_url or DEFAULT_UPLOADS_URL).rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get((scheme, netloc))
+        if conn is None:
+            conn_class = (
+                http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            )
+            conn = conn_class(netloc, timeout=self.timeout, blocksize=STREAM_BLOCK_SIZE)
+            connections[(scheme, netloc)] = conn
+        return conn
+
+    def _drop(self, scheme: str, netloc: str) -> None:
+        conn = self._local.connections.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Any = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, Any]:
+        """Send one request and return ``(status, decoded JSON or None)``.
+
+        Raises:
+            OSError, http.client.HTTPException: On transport failures.
+        """
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        request_headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self.token}",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "ghcommon-release-uploader",
+        }
+        request_headers.update(headers or {})
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+
+        conn = self._connection(parts.scheme, parts.netloc)
+        try:
+            conn.request(method, path, body=body, headers=request_headers)
+            response = conn.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            self._drop(parts.scheme, parts.netloc)
+            raise
+        if response.will_close:
+            self._drop(parts.scheme, parts.netloc)
+        try:
+            decoded = json.loads(payload) if payload else None
+        except json.JSONDecodeError:
+            decoded = None
+        return response.status, decoded
+
+    def upload_file(self, method: str, url: str, path: Path) -> tuple[int, Any]:
+        """Stream ``path`` as the request body of ``method url``."""
+        size = path.stat().st_size
+        with path.open("rb") as handle:
+            return self.request(
+                method,
+                url,
+                body=handle,
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "Content-Length": str(size),
+                },
+            )
+
+
+def _with_retries(action, max_attempts: int) -> tuple[int, Any, int]:
+    """Run ``action`` until it succeeds or fails permanently.
+
+    Returns:
+        ``(status, payload, attempts)`` of the last attempt.
+    """
+    status: int | None = None
+    payload: Any = None
+    for attempt in range(max_attempts):
+        try:
+            status, payload = action()
+        except (OSError, http.client.HTTPException) as exc:
+            status, payload = None, {"message": str(exc) or exc.__class__.__name__}
+        if status is not None and status < 400:
+            return status, payload, attempt + 1
+        if not _is_retryable(status) or attempt + 1 == max_attempts:
+            return status or 0, payload, attempt + 1
+        time.sleep(_retry_delay(attempt))
+    return status or 0, payload, max_attempts
+
+
+def _error_message(status: int, payload: Any) -> str:
+    message = payload.get("message") if isinstance(payload, dict) else None
+    return f"HTTP {status}: {message}" if message else f"HTTP {status}"
+
+
+def get_release(client: GitHubClient, repository: str, tag_or_id: str) -> dict[str, Any]:
+    """Look up a release by tag, falling back to a numeric release id."""
+    status, payload, _ = _with_retries(
+        lambda: client.request(
+            "GET", f"{client.api_url}/repos/{repository}/releases/tags/{quote(tag_or_id)}"
+        ),
+        MAX_ATTEMPTS,
+    )
+    if status == 404 and tag_or_id.isdigit():
+        status, payload, _ = _with_retries(
+            lambda: client.request(
+                "GET", f"{client.api_url}/repos/{repository}/releases/{tag_or_id}"
+            ),
+            MAX_ATTEMPTS,
+        )
+    if status != 200 or not isinstance(payload, dict):
+        raise UploadError(
+            f"Release {tag_or_id} not found in {repository}: {_error_message(status, payload)}",
+            status,
+        )
+    return payload
+
+
+def list_release_assets(
+    client: GitHubClient, repository: str, release_id: int
+) -> dict[str, RemoteAsset]:
+    """Return the assets of a release keyed by name."""
+    assets: dict[str, RemoteAsset] = {}
+    page = 1
+    while True:
+        url = f"{client.api_url}/repos/{repository}/releases/{release_id}/assets"
+        status, payload, _ = _with_retries(
+            lambda url=url, page=page: client.request("GET", f"{url}?per_page=100&page={page}"),
+            MAX_ATTEMPTS,
+        )
+        if status != 200 or not isinstance(payload, list):
+            raise UploadError(
+                f"Could not list assets of release {release_id}: {_error_message(status, payload)}",
+                status,
+            )
+        for item in payload:
+            digest = item.get("digest") or None
+            if digest and digest.startswith("sha256:"):
+                digest = digest.split(":", 1)[1]
+            assets[item["name"]] = RemoteAsset(
+                id=int(item["id"]),
+                name=item["name"],
+                size=int(item.get("size", -1)),
+                state=item.get("state", "uploaded"),
+                digest=digest,
+            )
+        if len(payload) < 100:
+            return assets
+        page += 1
+
+
+def asset_matches(remote: RemoteAsset, path: Path) -> bool:
+    """Return True when ``remote`` is a complete copy of ``path``."""
+    if remote.state != "uploaded" or remote.size != path.stat().st_size:
+        return False
+    return remote.digest is None or remote.digest == file_sha256(path)
+
+
+def _delete_asset(client: GitHubClient, repository: str, asset_id: int) -> None:
+    status, payload, _ = _with_retries(
+        lambda: client.request(
+            "DELETE", f"{client.api_url}/repos/{repository}/releases/assets/{asset_id}"
+        ),
+        MAX_ATTEMPTS,
+    )
+    if status not in (204, 404):
+        raise UploadError(
+            f"Could not delete asset {asset_id}: {_error_message(status, payload)}", status
+        )
+
+
+def upload_release_asset(
+    client: GitHubClient,
+    repository: str,
+    release_id: int,
+    path: Path,
+    existing: RemoteAsset | None = None,
+    *,
+    clobber: bool = False,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> UploadResult:
+    """Upload one file unless an identical asset is already attached."""
+    if existing is not None:
+        if asset_matches(existing, path):
+            return UploadResult(path.name, "skipped")
+        if existing.state == "uploaded" and not clobber:
+            return UploadResult(
+                path.name, "failed", error="asset exists with different content (use clobber)"
+            )
+        _delete_asset(client, repository, existing.id)
+
+    url = (
+        f"{client.uploads_url}/repos/{repository}/releases/{release_id}/assets"
+        f"?name={quote(path.name)}"
+    )
+    attempts = 0
+    error = "retries exhausted"
+    while attempts < max_attempts:
+        status, payload, used = _with_retries(
+            lambda: client.upload_file("POST", url, path), max_attempts - attempts
+        )
+        attempts += used
+        if status in (200, 201):
+            return UploadResult(path.name, "uploaded", attempts)
+        error = _error_message(status, payload)
+        if status != 422:
+            break
+        # A previous attempt left a (possibly partial) asset behind; re-check it.
+        current = list_release_assets(client, repository, release_id).get(path.name)
+        if current is not None:
+            if asset_matches(current, path):
+                return UploadResult(path.name, "uploaded", attempts)
+            _delete_asset(client, repository, current.id)
+    return UploadResult(path.name, "failed", attempts, error)
+
+
+def upload_release_assets(
+    client: GitHubClient,
+    repository: str,
+    tag_or_id: str,
+    files: Iterable[Path],
+    *,
+    workers: int = DEFAULT_WORKERS,
+    clobber: bool = False,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> list[UploadResult]:
+    """Upload ``files`` to a release concurrently, skipping ones already present.
+
+    Raises:
+        UploadError: If the release cannot be found or listed.
+    """
+    files = list(files)
+    if not files:
+        return []
+    release = get_release(client, repository, tag_or_id)
+    release_id = int(release["id"])
+    existing = list_release_assets(client, repository, release_id)
+
+    def upload(path: Path) -> UploadResult:
+        try:
+            return upload_release_asset(
+                client,
+                repository,
+                release_id,
+                path,
+                existing.get(path.name),
+                clobber=clobber,
+                max_attempts=max_attempts,
+            )
+        except (UploadError, OSError) as exc:
+            return UploadResult(path.name, "failed", error=str(exc))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as executor:
+        return list(executor.map(upload, files))
+
+
+def upload_generic_package(
+    client: GitHubClient,
+    repository: str,
+    package_name: str,
+    version: str,
+    path: Path,
+    *,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> UploadResult:
+    """Stream ``path`` to the generic packages endpoint with retries."""
+    url = (
+        f"{client.api_url}/repos/{repository}/packages/generic/"
+        f"{quote(package_name)}/{quote(version)}/{quote(path.name)}"
+    )
+    status, payload, attempts = _with_retries(
+        lambda: client.upload_file("PUT", url, path), max_attempts
+    )
+    if 200 <= status < 300:
+        return UploadResult(path.name, "uploaded", attempts)
+    return UploadResult(path.name, "failed", attempts, _error_message(status, payload))
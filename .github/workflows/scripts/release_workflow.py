@@ -12,7 +12,6 @@ from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
 
-import requests
 from workflow_common import (
     append_to_file,
     config_path,
@@ -238,6 +237,8 @@ def _latest_tag_from_api() -> str:
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github+json",
     }
+    import requests
+
     try:
         response = requests.get(url, headers=headers, timeout=15)
     except requests.RequestException:
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/startup_profile.py
+# version: 1.0.0
+# guid: cfdf5c0f-ade2-49a1-aad1-ef8e76141d2b
+
+"""Import-time profiling and startup budgets for the workflow helper CLIs.
+
+Every Actions step starts a fresh interpreter, so module-level imports are
+paid on each helper invocation. Each :class:`StartupCheck` runs one real,
+side-effect-free subcommand under ``python -X importtime`` and checks that
+
+* none of its ``forbidden`` heavy modules (``jwt``, ``requests``, ``yaml``,
+  ...) were imported, and
+* the helper's own imports (everything after interpreter start-up) stayed
+  within ``budget_ms``.
+
+Budgets are deliberately generous, covering a cold run without cached
+bytecode on a slow runner; the forbidden-module check is the strict guard.
+
+Usage::
+
+    python3 .github/workflows/scripts/startup_profile.py [--repeat 3] [--output results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+HEAVY_MODULES = ("jwt", "requests", "urllib3", "cryptography", "yaml")
+DEFAULT_BUDGET_MS = 100.0
+_STARTUP_MODULES = frozenset({"site"})
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass(frozen=True)
+class StartupCheck:
+    """A helper subcommand with a startup budget.
+
+    ``argv`` may reference ``{tmp}``, a scratch directory populated by
+    :func:`prepare_fixtures`.
+    """
+
+    name: str
+    script: str
+    argv: tuple[str, ...]
+    budget_ms: float = DEFAULT_BUDGET_MS
+    forbidden: tuple[str, ...] = HEAVY_MODULES
+    env: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass
+class StartupProfile:
+    """Measured imports for one check."""
+
+    check: StartupCheck
+    records: list[ImportRecord]
+    returncode: int
+    violations: list[str] = field(default_factory=list)
+
+    @property
+    def modules(self) -> set[str]:
+        return {record.module for record in self.records}
+
+    @property
+    def import_ms(self) -> float:
+        """Total import time attributable to the helper, in milliseconds."""
+        return sum(record.cumulative_us for record in self.records if record.depth == 0) / 1000
+
+
+STARTUP_CHECKS: tuple[StartupCheck, ...] = (
+    StartupCheck(
+        "automation cache-key",
+        "automation_workflow.py",
+        ("cache-key", "--prefix", "bench", "--files", "{tmp}/lock.txt"),
+    ),
+    StartupCheck(
+        "automation cache-plan", "automation_workflow.py", ("cache-plan", "--language", "python")
+    ),
+    StartupCheck("ci debug-filter", "ci_workflow.py", ("debug-filter",)),
+    StartupCheck("ci determine-execution", "ci_workflow.py", ("determine-execution",)),
+    StartupCheck(
+        "release release-strategy",
+        "release_workflow.py",
+        ("release-strategy",),
+        env=(("BRANCH_NAME", "main"),),
+    ),
+    StartupCheck(
+        "docs generate-api",
+        "docs_workflow.py",
+        ("generate-api", "--source", "{tmp}/src", "--output", "{tmp}/api"),
+    ),
+    StartupCheck(
+        "maintenance summarize-stale",
+        "maintenance_workflow.py",
+        ("summarize-stale", "--input", "{tmp}/stale.json"),
+    ),
+)
+
+
+def parse_importtime(text: str) -> list[ImportRecord]:
+    """Parse ``-X importtime`` stderr into records, in completion order."""
+    records = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, int(parts[0]), int(parts[1]), max(depth, 0)))
+    return records
+
+
+def helper_imports(records: Sequence[ImportRecord]) -> list[ImportRecord]:
+    """Drop interpreter start-up imports (``site`` and everything before it)."""
+    start = 0
+    for index, record in enumerate(records):
+        if record.depth == 0 and record.module in _STARTUP_MODULES:
+            start = index + 1
+    return list(records[start:])
+
+
+def prepare_fixtures(tmp: Path) -> None:
+    """Create the small inputs the budgeted subcommands read."""
+    (tmp / "src").mkdir(parents=True, exist_ok=True)
+    (tmp / "src" / "sample.py").write_text('"""Sample."""\n\n\ndef f():\n    """F."""\n')
+    (tmp / "lock.txt").write_text("lock\n")
+    (tmp / "stale.json").write_text("[]\n")
+
+
+def forbidden_imports(modules: Iterable[str], forbidden: Iterable[str]) -> list[str]:
+    """Return the forbidden packages that appear in ``modules``."""
+    imported = set(modules)
+    return sorted(
+        package
+        for package in forbidden
+        if any(module == package or module.startswith(package + ".") for module in imported)
+    )
+
+
+def profile_check(check: StartupCheck, tmp: Path, repeat: int = 1) -> StartupProfile:
+    """Run ``check`` ``repeat`` times and keep the fastest run."""
+    env = {**os.environ, **dict(check.env)}
+    for name in ("GITHUB_OUTPUT", "GITHUB_ENV", "GITHUB_STEP_SUMMARY"):
+        env[name] = str(tmp / name.lower())
+    argv = [arg.format(tmp=tmp) for arg in check.argv]
+    command = [sys.executable, "-X", "importtime", str(SCRIPTS_DIR / check.script), *argv]
+    best: StartupProfile | None = None
+    for _ in range(max(repeat, 1)):
+        result = subprocess.run(
+            command, cwd=tmp, env=env, capture_output=True, text=True, check=False
+        )
+        profile = StartupProfile(
+            check, helper_imports(parse_importtime(result.stderr)), result.returncode
+        )
+        if best is None or profile.import_ms < best.import_ms:
+            best = profile
+    assert best is not None
+    if best.returncode != 0:
+        best.violations.append(f"exited with {best.returncode}")
+    heavy = forbidden_imports(best.modules, check.forbidden)
+    if heavy:
+        best.violations.append("imported " + ", ".join(heavy))
+    if best.import_ms > check.budget_ms:
+        best.violations.append(f"{best.import_ms:.1f} ms exceeds {check.budget_ms:.0f} ms budget")
+    return best
+
+
+def run_checks(
+    checks: Sequence[StartupCheck] = STARTUP_CHECKS, repeat: int = 1
+) -> list[StartupProfile]:
+    """Profile every check in a shared scratch directory."""
+    with tempfile.TemporaryDirectory(prefix="startup-profile-") as scratch:
+        tmp = Path(scratch)
+        prepare_fixtures(tmp)
+        return [profile_check(check, tmp, repeat) for check in checks]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check helper CLI startup budgets.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per check (default: 3).")
+    parser.add_argument("--output", help="Optional customSmallerIsBetter JSON output path.")
+    args = parser.parse_args(argv)
+
+    profiles = run_checks(repeat=args.repeat)
+    print(f"{'check':<30} {'imports':>9} {'budget':>8}  status")
+    for profile in profiles:
+        status = "; ".join(profile.violations) or "ok"
+        print(
+            f"{profile.check.name:<30} {profile.import_ms:>7.1f}ms "
+            f"{profile.check.budget_ms:>6.0f}ms  {status}"
+        )
+    if args.output:
+        results = [
+            {"name": f"{p.check.name} import time", "unit": "ms", "value": round(p.import_ms, 3)}
+            for p in profiles
+        ]
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 1 if any(profile.violations for profile in profiles) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/sync_manifest.py
+# version: 1.3.0
+# guid: 2c960599-b24c-4f89-89ca-4ccc0e29ef86
+
+"""Content-hash manifests for delta syncs from ghcommon.
+
+Nothing is published by ghcommon: digests are computed on the fly from a
+checkout, hashing only the files they cover (:func:`hash_files`). The
+dispatcher sends the digest over the sections of the sync type
+(:func:`source_digest`). Receivers digest only the files their own
+``sync_paths`` select (:func:`receiver_digests`) and keep both digests, plus
+the ``path -> {sha256, version, guid}`` entries they last wrote, in a cached
+manifest. A dispatch whose section digest matches the cache is skipped before
+ghcommon is checked out, a checkout whose selected files are unchanged is
+skipped before anything is copied, and otherwise only files whose hash changed
+are written (:class:`DeltaSync`).
+
+Usage (source side)::
+
+    python3 .github/workflows/scripts/sync_manifest.py digest --sync-type scripts
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from header_metadata import HEADER_READ_BYTES, parse_header
+
+MANIFEST_VERSION = 1
+RECEIVER_MANIFEST = ".github/sync-receiver-manifest.json"
+CONFIG_FILE = ".github/workflow-config.yaml"
+# Never synced: VCS metadata and interpreter caches.
+SKIPPED_DIRECTORIES = {".git", "__pycache__"}
+SECTION_PREFIXES: dict[str, tuple[str, ...]] = {
+    "workflows": (".github/workflows/",),
+    "instructions": (".github/copilot-instructions.md", ".github/instructions/"),
+    "prompts": (".github/prompts/",),
+    "scripts": ("scripts/", ".github/scripts/"),
+    "github-scripts": (".github/scripts/",),
+    "linters": (".github/linters/",),
+    "labels": ("labels.json", "labels.md", "scripts/sync-github-labels.py"),
+}
+# Every section at once; also used for sync types without their own section.
+ALL_PREFIXES = tuple(dict.fromkeys(p for prefixes in SECTION_PREFIXES.values() for p in prefixes))
+# Directories the receiver mirrors whole once any sync_paths entry is under them.
+MIRRORED_DIRECTORIES = ("scripts/", ".github/scripts/")
+_EXCLUDED_FILES = {RECEIVER_MANIFEST}
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_entry(path: Path) -> dict[str, str]:
+    """Return the manifest entry (sha256 and header version/guid) for ``path``."""
+    digest = hashlib.sha256()
+    prefix = b""
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            if not prefix:
+                prefix = chunk[:HEADER_READ_BYTES]
+            digest.update(chunk)
+    entry = {"sha256": digest.hexdigest()}
+    header = parse_header(prefix.decode("utf-8", errors="replace"))
+    if header.version:
+        entry["version"] = header.version
+    if header.guid:
+        entry["guid"] = header.guid
+    return entry
+
+
+def collect_files(root: Path) -> list[str]:
+    """Return root-relative paths of every file a receiver may sync.
+
+    Receivers can list any source path in their ``sync_paths`` (for example
+    ``.vscode/settings.json``), so every file outside
+    :data:`SKIPPED_DIRECTORIES` is listed; only the files a digest covers are
+    hashed (:func:`hash_files`).
+    """
+    paths: set[str] = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIPPED_DIRECTORIES]
+        for name in filenames:
+            paths.add((Path(dirpath) / name).relative_to(root).as_posix())
+    return sorted(paths - _EXCLUDED_FILES)
+
+
+def section_paths(paths: Iterable[str], sync_type: str) -> list[str]:
+    """Return the subset of ``paths`` the sections of ``sync_type`` cover."""
+    prefixes = SECTION_PREFIXES.get(sync_type, ALL_PREFIXES)
+    return sorted(path for path in paths if path.startswith(prefixes))
+
+
+def _selected(path: str, sync_paths: list[str]) -> bool:
+    if path in sync_paths:
+        return True
+    if any(entry.endswith("/") and path.startswith(entry) for entry in sync_paths):
+        return True
+    return any(
+        path.startswith(directory) and any(entry.startswith(directory) for entry in sync_paths)
+        for directory in MIRRORED_DIRECTORIES
+    )
+
+
+def synced_paths(paths: Iterable[str], sync_type: str, sync_paths: list[str] | None) -> list[str]:
+    """Return the subset of ``paths`` a receiver with ``sync_paths`` copies.
+
+    Within the sections of ``sync_type`` a file is selected when it is listed,
+    lies under a listed directory, or lies in a mirrored directory the
+    receiver syncs at all; an ``all`` sync also copies listed files outside
+    the sections. ``None`` (selection unknown) selects the whole sections.
+    """
+    paths = set(paths)
+    candidates = section_paths(paths, sync_type)
+    if sync_paths is None:
+        return candidates
+    selected = {path for path in candidates if _selected(path, sync_paths)}
+    if sync_type == "all":
+        selected.update(path for path in sync_paths if path in paths)
+    return sorted(selected)
+
+
+def paths_digest(files: dict[str, dict[str, str]], paths: Iterable[str]) -> str:
+    """Reduce the entries for ``paths`` to a single hash."""
+    hasher = hashlib.sha256()
+    for path in sorted(paths):
+        hasher.update(f"{path}\0{files[path]['sha256']}\n".encode())
+    return hasher.hexdigest()
+
+
+def digest(files: dict[str, dict[str, str]], sync_type: str) -> str:
+    """Reduce the entries covered by ``sync_type`` to a single hash."""
+    return paths_digest(files, section_paths(files, sync_type))
+
+
+def hash_files(root: Path | str, paths: Iterable[str]) -> dict[str, dict[str, str]]:
+    """Return the manifest entries for ``paths`` under ``root``."""
+    root = Path(root)
+    return {path: file_entry(root / path) for path in sorted(set(paths))}
+
+
+def load_manifest(path: Path | str) -> dict[str, Any] | None:
+    """Load a manifest, or None if it is missing, unreadable or outdated."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("manifest_version") != MANIFEST_VERSION:
+        return None
+    return data
+
+
+def write_manifest(path: Path | str, manifest: dict[str, Any]) -> None:
+    """Write ``manifest`` as stable, sorted JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def config_sha256(target_root: Path | str = ".") -> str:
+    """Return the hash of the receiver's sync configuration (empty if absent)."""
+    config = Path(target_root) / CONFIG_FILE
+    return file_entry(config)["sha256"] if config.is_file() else ""
+
+
+def load_sync_paths(target_root: Path | str = ".") -> list[str] | None:
+    """Return the receiver's configured ``sync_paths``.
+
+    Returns None when the selection is unknown: no configuration file, or
+    PyYAML is not installed (the sync script then falls back to copying whole
+    sections as well).
+    """
+    config_file = Path(target_root) / CONFIG_FILE
+    try:
+        import yaml
+    except ImportError:
+        return None
+    try:
+        config = yaml.safe_load(config_file.read_text(encoding="utf-8"))
+    except (OSError, yaml.YAMLError):
+        return None
+    if not isinstance(config, dict):
+        return []
+    sync_paths = (config.get("sync") or {}).get("sync_paths") or []
+    return [str(path) for path in sync_paths]
+
+
+def receiver_digests(
+    source_root: Path | str, sync_type: str, target_root: Path | str = "."
+) -> tuple[str, str]:
+    """Return the receiver's synced digest and dispatch digest for ``sync_type``.
+
+    The synced digest covers exactly the files this receiver copies. The
+    dispatch digest is the section digest a dispatch carries; it is empty
+    when the receiver copies files outside the sections, since a change to
+    those would not move it.
+    """
+    source_root = Path(source_root)
+    paths = collect_files(source_root) if source_root.is_dir() else []
+    if not paths:
+        return "", ""
+    selected = synced_paths(paths, sync_type, load_sync_paths(target_root))
+    sections = section_paths(paths, sync_type)
+    covered = set(selected) <= set(sections)
+    files = hash_files(source_root, sections if covered else selected)
+    dispatch = digest(files, sync_type) if covered else ""
+    return paths_digest(files, selected), dispatch
+
+
+def is_up_to_date(
+    sync_type: str,
+    source_digest: str,
+    target_root: Path | str = ".",
+    dispatched: bool = False,
+) -> bool:
+    """Return True if the receiver already synced ``source_digest``.
+
+    ``dispatched`` compares against the recorded dispatch (section) digest
+    instead of the synced digest. The receiver's own sync configuration is
+    part of the check, since it decides which source files are copied.
+    """
+    cached = load_manifest(Path(target_root) / RECEIVER_MANIFEST)
+    if not cached or not source_digest:
+        return False
+    if cached.get("config_sha256") != config_sha256(target_root):
+        return False
+    key = "dispatch_digests" if dispatched else "digests"
+    return cached.get(key, {}).get(sync_type) == source_digest
+
+
+class DeltaSync:
+    """Copy source files into the receiver only when their hash changed.
+
+    Source files are hashed when they are consulted. Destination hashes come
+    from the receiver's cached manifest, so unchanged destinations are never
+    read.
+    """
+
+    def __init__(
+        self,
+        source_root: Path | str,
+        target_root: Path | str = ".",
+        force: bool = False,
+    ) -> None:
+        """Load the receiver's cached manifest."""
+        self.source_root = Path(source_root)
+        self.target_root = Path(target_root)
+        self.cache_path = self.target_root / RECEIVER_MANIFEST
+        self.force = force
+        cached = load_manifest(self.cache_path) or {}
+        self._cached: dict[str, dict[str, str]] = cached.get("files", {})
+        self.files: dict[str, dict[str, str]] = dict(self._cached)
+        self.copied: list[str] = []
+        self.unchanged: list[str] = []
+
+    def source_entry(self, source: Path) -> dict[str, str]:
+        """Return the manifest entry for a file in the source checkout."""
+        return file_entry(source)
+
+    def copy(self, source: Path | str, destination: Path | str) -> bool:
+        """Copy ``source`` to ``destination`` unless it is known to be identical.
+
+        Returns True if the file was written.
+        """
+        source, destination = Path(source), Path(destination)
+        key = self._key(destination)
+        entry = self.source_entry(source)
+        cached = self._cached.get(key)
+        self.files[key] = entry
+        if (
+            not self.force
+            and cached
+            and cached.get("sha256") == entry["sha256"]
+            and destination.is_file()
+        ):
+            self.unchanged.append(key)
+            return False
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, destination)
+        self.copied.append(key)
+        return True
+
+    def mirror_directory(self, source: Path | str, destination: Path | str) -> list[str]:
+        """Make ``destination`` match ``source`` file by file.
+
+        Changed files are copied, unchanged ones are left alone, and files
+        that no longer exist in ``source`` are removed. Returns the
+        destination paths that were written or removed.
+        """
+        source, destination = Path(source), Path(destination)
+        wanted: set[Path] = set()
+        changed: list[str] = []
+        for dirpath, _, filenames in os.walk(source):
+            for name in sorted(filenames):
+                file = Path(dirpath) / name
+                target = destination / file.relative_to(source)
+                wanted.add(target)
+                if self.copy(file, target):
+                    changed.append(target.as_posix())
+        for dirpath, _, filenames in os.walk(destination):
+            for name in filenames:
+                target = Path(dirpath) / name
+                if target not in wanted:
+                    target.unlink()
+                    self.files.pop(self._key(target), None)
+                    changed.append(target.as_posix())
+        return changed
+
+    def _key(self, destination: Path) -> str:
+        return Path(os.path.relpath(destination, self.target_root)).as_posix()
+
+    def save(self, sync_type: str, source_digest: str = "", dispatch_digest: str = "") -> None:
+        """Record what the receiver now holds in the cached manifest.
+
+        ``source_digest`` and ``dispatch_digest`` are the two digests from
+        :func:`receiver_digests`; an empty one is forgotten.
+        """
+        cached = load_manifest(self.cache_path) or {}
+        recorded = {}
+        for key, value in (("digests", source_digest), ("dispatch_digests", dispatch_digest)):
+            recorded[key] = dict(cached.get(key, {}))
+            if value:
+                recorded[key][sync_type] = value
+            else:
+                recorded[key].pop(sync_type, None)
+        write_manifest(
+            self.cache_path,
+            {
+                "manifest_version": MANIFEST_VERSION,
+                "config_sha256": config_sha256(self.target_root),
+                **recorded,
+                "files": self.files,
+            },
+        )
+
+
+def source_digest(source_root: Path | str, sync_type: str) -> str:
+    """Return the section digest for ``sync_type`` of a source checkout.
+
+    This is the digest a dispatch of ``sync_type`` carries.
+    """
+    source_root = Path(source_root)
+    paths = collect_files(source_root) if source_root.is_dir() else []
+    if not paths:
+        return ""
+    return digest(hash_files(source_root, section_paths(paths, sync_type)), sync_type)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compute ghcommon sync digests.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    digest_parser = subparsers.add_parser(
+        "digest", help="Print the dispatch digest for one sync type"
+    )
+    digest_parser.add_argument("--root", default=".")
+    digest_parser.add_argument("--sync-type", default="all")
+    args = parser.parse_args(argv)
+
+    print(source_digest(args.root, args.sync_type))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
-"""Utilities for the sync-receiver workflow."""
+"""Utilities for the sync-receiver workflow.
+
+sync-receiver.yml runs the target repository's own copy of this script, so it
+must start with only the standard library: the sibling modules it can use
+(``sync_manifest``, ``git_tree_patcher``, ``helper_batch``) are imported where
+needed and are optional, letting a receiver that lacks them still sync them in.
+"""
 
 from __future__ import annotations
 
@@ -9,6 +15,17 @@ import shutil
 import subprocess
 import time
 from pathlib import Path
+from types import ModuleType
+
+# Same path as sync_manifest.RECEIVER_MANIFEST, which may not be importable.
+RECEIVER_MANIFEST = ".github/sync-receiver-manifest.json"
+
+ROOT_LINTER_FILES = {
+    "rustfmt.toml",
+    "clippy.toml",
+    ".markdownlint.json",
+    ".yaml-lint.yml",
+}
 
 
 def append_to_file(path_env: str, content: str) -> None:
@@ -24,26 +41,69 @@ def write_output(name: str, value: str) -> None:
     append_to_file("GITHUB_OUTPUT", f"{name}={value}\n")
 
 
+def load_sync_manifest() -> ModuleType | None:
+    """Return the ``sync_manifest`` module, or None if this receiver lacks it."""
+    try:
+        import sync_manifest
+    except ImportError:
+        print("⚠️  sync_manifest.py not available; running a full sync")
+        return None
+    return sync_manifest
+
+
+def load_tree_patcher() -> ModuleType | None:
+    """Return the ``git_tree_patcher`` module, or None if this receiver lacks it."""
+    try:
+        import git_tree_patcher
+    except ImportError:
+        print("⚠️  git_tree_patcher.py not available; committing from the working tree")
+        return None
+    return git_tree_patcher
+
+
 def set_parameters(_: argparse.Namespace) -> None:
     event_name = os.environ.get("GITHUB_EVENT_NAME", "")
     if event_name == "repository_dispatch":
-        sync_type = os.environ.get("CLIENT_PAYLOAD_SYNC_TYPE", "all")
+        sync_type = os.environ.get("CLIENT_PAYLOAD_SYNC_TYPE") or "all"
         source_repo = os.environ.get("CLIENT_PAYLOAD_SOURCE_REPO", "")
         source_sha = os.environ.get("CLIENT_PAYLOAD_SOURCE_SHA", "")
         force_sync = os.environ.get("CLIENT_PAYLOAD_FORCE_SYNC", "false")
         verbose_logging = os.environ.get("CLIENT_PAYLOAD_VERBOSE_LOGGING", "true")
+        manifest_digest = os.environ.get("CLIENT_PAYLOAD_MANIFEST_DIGEST", "")
     else:
         sync_type = os.environ.get("INPUT_SYNC_TYPE", "all")
         source_repo = os.environ.get("INPUT_SOURCE_REPO", "jdfalk/ghcommon")
         source_sha = os.environ.get("INPUT_SOURCE_SHA", "manual-dispatch")
         force_sync = os.environ.get("INPUT_FORCE_SYNC", "false")
         verbose_logging = os.environ.get("INPUT_VERBOSE_LOGGING", "true")
+        manifest_digest = ""
 
     write_output("sync_type", sync_type)
     write_output("source_repo", source_repo or "jdfalk/ghcommon")
     write_output("source_sha", source_sha or "manual-dispatch")
     write_output("force_sync", force_sync)
     write_output("verbose_logging", verbose_logging)
+    write_output("manifest_digest", manifest_digest)
+
+
+def check_manifest(_: argparse.Namespace) -> None:
+    """Skip the sync when the dispatched section digest was already applied."""
+    sync_type = os.environ.get("SYNC_TYPE", "all")
+    digest = os.environ.get("MANIFEST_DIGEST", "")
+    force_sync = os.environ.get("FORCE_SYNC", "false").lower() == "true"
+    sync_manifest = load_sync_manifest()
+
+    if (
+        not force_sync
+        and sync_manifest
+        and sync_manifest.is_up_to_date(sync_type, digest, dispatched=True)
+    ):
+        write_output("up_to_date", "true")
+        print(f"✅ Already synced {sync_type} at manifest {digest[:12]}; nothing to do")
+        return
+    write_output("up_to_date", "false")
+    if not digest:
+        print("ℹ️  No manifest digest in dispatch; running full comparison")
 
 
 def install_python_deps(_: argparse.Namespace) -> None:
@@ -51,17 +111,72 @@ def install_python_deps(_: argparse.Namespace) -> None:
     subprocess.run(["pip3", "install", "pyyaml"], check=True)
 
 
-def _copy_directory(source: Path, destination: Path) -> None:
-    destination.mkdir(parents=True, exist_ok=True)
-    for file in sorted(source.iterdir()):
-        if file.is_file():
-            shutil.copy(file, destination / file.name)
-            print(f"✅ Copied {file.name}")
+def plan_sync_files(source_root: Path, sync_type: str) -> dict[str, Path]:
+    """Map destination paths to source files for the manual sync sections."""
+    plan: dict[str, Path] = {}
+
+    def add_directory(source: Path, destination: str) -> None:
+        if source.exists():
+            for file in sorted(source.iterdir()):
+                if file.is_file():
+                    plan[f"{destination}/{file.name}"] = file
+
+    if sync_type in {"all", "workflows"}:
+        print("🔄 Processing workflows section...")
+        print("⚠️  Skipping workflow files due to GitHub App permission limitations")
+
+    if sync_type in {"all", "instructions"}:
+        print("🔄 Processing instructions section...")
+        copilot_instructions = source_root / ".github" / "copilot-instructions.md"
+        if copilot_instructions.is_file():
+            plan[".github/copilot-instructions.md"] = copilot_instructions
+        add_directory(source_root / ".github" / "instructions", ".github/instructions")
+
+    if sync_type in {"all", "prompts"}:
+        print("🔄 Processing prompts section...")
+        add_directory(source_root / ".github" / "prompts", ".github/prompts")
+
+    if sync_type in {"all", "scripts", "github-scripts"}:
+        print("🔄 Processing scripts section...")
+        add_directory(source_root / "scripts", "scripts")
+        add_directory(source_root / ".github" / "scripts", ".github/scripts")
+
+    if sync_type in {"all", "linters"}:
+        print("🔄 Processing linters section...")
+        linters_root = source_root / ".github" / "linters"
+        if linters_root.exists():
+            for file in sorted(linters_root.iterdir()):
+                if not file.is_file():
+                    continue
+                filename = file.name
+                if filename in ROOT_LINTER_FILES or filename.startswith("super-linter-"):
+                    plan[filename] = file
+                else:
+                    plan[f".github/linters/{filename}"] = file
+
+    if sync_type in {"all", "labels"}:
+        print("🔄 Processing labels section...")
+        for source, destination in (
+            (source_root / "labels.json", "labels.json"),
+            (source_root / "labels.md", "labels.md"),
+            (source_root / "scripts" / "sync-github-labels.py", "scripts/sync-github-labels.py"),
+        ):
+            if source.is_file():
+                plan[destination] = source
+
+    return plan
 
 
 def sync_files(_: argparse.Namespace) -> None:
+    """Copy changed files from the ghcommon checkout into this repository.
+
+    The files this repository's ``sync_paths`` select for ``SYNC_TYPE`` are
+    compared against the cached receiver manifest first; if their digest is
+    unchanged nothing is read or written.
+    """
     sync_type = os.environ.get("SYNC_TYPE", "all")
     verbose_logging = os.environ.get("SYNC_VERBOSE", "true").lower() == "true"
+    force_sync = os.environ.get("FORCE_SYNC", "false").lower() == "true"
     pat_token = os.environ.get("PAT_TOKEN")
     repo_owner = os.environ.get("GITHUB_REPOSITORY_OWNER", "")
     repo_name = os.environ.get("GITHUB_REPOSITORY_NAME", "")
@@ -75,12 +190,22 @@ def sync_files(_: argparse.Namespace) -> None:
         for path in sorted(source_root.iterdir()):
             print(f"- {path.name}")
 
+    sync_manifest = load_sync_manifest()
+    digest, dispatch_digest = (
+        sync_manifest.receiver_digests(source_root, sync_type) if sync_manifest else ("", "")
+    )
+    if not force_sync and sync_manifest and sync_manifest.is_up_to_date(sync_type, digest):
+        shutil.rmtree(source_root, ignore_errors=True)
+        print(f"✅ Manifest {digest[:12]} unchanged for {sync_type}; skipping sync")
+        return
+
     command = [
         "python3",
         ".github/scripts/sync-receiver-sync-files.py",
         sync_type,
     ]
-    result = subprocess.run(command, check=False)
+    env = {**os.environ, "SYNC_SOURCE_DIGEST": digest, "SYNC_DISPATCH_DIGEST": dispatch_digest}
+    result = subprocess.run(command, check=False, env=env)
     if result.returncode == 0:
         shutil.rmtree(source_root, ignore_errors=True)
         print("✅ Sync operation completed")
@@ -95,93 +220,39 @@ def sync_files(_: argparse.Namespace) -> None:
     (Path(".github/scripts")).mkdir(parents=True, exist_ok=True)
     (Path(".github/linters")).mkdir(parents=True, exist_ok=True)
 
-    if sync_type in {"all", "workflows"}:
-        print("🔄 Processing workflows section...")
-        print("⚠️  Skipping workflow files due to GitHub App permission limitations")
-
-    if sync_type in {"all", "instructions"}:
-        print("🔄 Processing instructions section...")
-        instructions_root = source_root / ".github" / "instructions"
-        copilot_instructions = source_root / ".github" / "copilot-instructions.md"
-        if copilot_instructions.is_file():
-            shutil.copy(
-                copilot_instructions,
-                Path(".github") / "copilot-instructions.md",
-            )
-            print("✅ Copied copilot-instructions.md")
-        if instructions_root.exists():
-            _copy_directory(instructions_root, Path(".github/instructions"))
-
-    if sync_type in {"all", "prompts"}:
-        print("🔄 Processing prompts section...")
-        prompts_root = source_root / ".github" / "prompts"
-        if prompts_root.exists():
-            _copy_directory(prompts_root, Path(".github/prompts"))
-
-    if sync_type in {"all", "scripts", "github-scripts"}:
-        print("🔄 Processing scripts section...")
-        scripts_root = source_root / "scripts"
-        github_scripts_root = source_root / ".github" / "scripts"
-        if scripts_root.exists():
-            _copy_directory(scripts_root, Path("scripts"))
-        if github_scripts_root.exists():
-            _copy_directory(github_scripts_root, Path(".github/scripts"))
-
-    if sync_type in {"all", "linters"}:
-        print("🔄 Processing linters section...")
-        linters_root = source_root / ".github" / "linters"
-        if linters_root.exists():
-            for file in sorted(linters_root.iterdir()):
-                if not file.is_file():
-                    continue
-                filename = file.name
-                if filename in {
-                    "rustfmt.toml",
-                    "clippy.toml",
-                    ".markdownlint.json",
-                    ".yaml-lint.yml",
-                } or filename.startswith("super-linter-"):
-                    shutil.copy(file, Path(".") / filename)
-                else:
-                    shutil.copy(file, Path(".github/linters") / filename)
-                print(f"✅ Copied {filename}")
-            print("✅ Linter configuration files available in root directory")
-
-    if sync_type in {"all", "labels"}:
-        print("🔄 Processing labels section...")
-        labels_json = source_root / "labels.json"
-        labels_md = source_root / "labels.md"
-        sync_script = source_root / "scripts" / "sync-github-labels.py"
-        if labels_json.is_file():
-            shutil.copy(labels_json, Path("labels.json"))
-            print("✅ Copied labels.json")
-        if labels_md.is_file():
-            shutil.copy(labels_md, Path("labels.md"))
-            print("✅ Copied labels.md")
-        if sync_script.is_file():
-            shutil.copy(sync_script, Path("scripts") / "sync-github-labels.py")
-            print("✅ Copied sync-github-labels.py")
-
-        if sync_type in {"labels", "all"} and repo_owner and repo_name:
-            print("🏷️  Attempting to sync GitHub repository labels...")
-            env = os.environ.copy()
-            if pat_token:
-                env["GITHUB_TOKEN"] = pat_token
-            result = subprocess.run(
-                [
-                    "python3",
-                    "scripts/sync-github-labels.py",
-                    repo_owner,
-                    repo_name,
-                ],
-                env=env,
-                check=False,
-            )
-            if result.returncode == 0:
-                print("✅ Successfully synced GitHub repository labels")
-            else:
-                print("⚠️  GitHub label sync failed, but file sync completed")
-                print("💡 This may be due to insufficient token permissions")
+    plan = plan_sync_files(source_root, sync_type)
+    if sync_manifest is None:
+        for destination, source in plan.items():
+            shutil.copy2(source, destination)
+            print(f"✅ Copied {destination}")
+    else:
+        delta = sync_manifest.DeltaSync(source_root, force=force_sync)
+        for destination, source in plan.items():
+            if delta.copy(source, Path(destination)):
+                print(f"✅ Copied {destination}")
+        print(f"📊 {len(delta.copied)} files copied, {len(delta.unchanged)} unchanged")
+        delta.save(sync_type, digest, dispatch_digest)
+
+    if sync_type in {"labels", "all"} and repo_owner and repo_name:
+        print("🏷️  Attempting to sync GitHub repository labels...")
+        env = os.environ.copy()
+        if pat_token:
+            env["GITHUB_TOKEN"] = pat_token
+        result = subprocess.run(
+            [
+                "python3",
+                "scripts/sync-github-labels.py",
+                repo_owner,
+                repo_name,
+            ],
+            env=env,
+            check=False,
+        )
+        if result.returncode == 0:
+            print("✅ Successfully synced GitHub repository labels")
+        else:
+            print("⚠️  GitHub label sync failed, but file sync completed")
+            print("💡 This may be due to insufficient token permissions")
 
     shutil.rmtree(source_root, ignore_errors=True)
     print("✅ Sync operation completed")
@@ -192,8 +263,20 @@ def check_changes(_: argparse.Namespace) -> None:
     print("🔍 Checking for changes...")
     print(f"🔧 Force sync enabled: {force_sync}")
 
-    diff_result = subprocess.run(["git", "diff", "--quiet"], check=False)
-    has_changes = diff_result.returncode != 0
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "--untracked-files=all"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    changed = [
+        line[3:].split(" -> ")[-1].strip('"')
+        for line in (status.stdout or "").splitlines()
+        if line.strip()
+    ]
+    # The receiver manifest records the source digest, which moves on every
+    # ghcommon change; it is only committed alongside real file changes.
+    has_changes = any(path != RECEIVER_MANIFEST for path in changed)
 
     if not has_changes and not force_sync:
         write_output("has_changes", "false")
@@ -215,11 +298,104 @@ def check_changes(_: argparse.Namespace) -> None:
     subprocess.run(["git", "diff", "--stat"], check=False)
 
 
+def synced_paths() -> tuple[list[str], list[str]]:
+    """Return the paths the sync wrote and removed, relative to ``HEAD``."""
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "-z", "--untracked-files=all"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    written: list[str] = []
+    removed: list[str] = []
+    entries = iter((status.stdout or "").split("\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        state, path = entry[:2], entry[3:]
+        if state[0] in "RC":
+            next(entries, None)  # the rename source follows the new path
+        (removed if "D" in state else written).append(path)
+    return written, removed
+
+
 def commit_and_push(_: argparse.Namespace) -> None:
+    """Commit the synced files onto the target branch and push them.
+
+    The commit is built with the tree patcher from the remote branch tip plus
+    the paths the sync wrote or removed, so nothing is staged, pulled or
+    rebased; a rejected push only needs a fetch and a rebuild.
+    """
     source_repo = os.environ.get("SOURCE_REPO", "")
     source_sha = os.environ.get("SOURCE_SHA", "")
     sync_type = os.environ.get("SYNC_TYPE", "")
+    branch = os.environ.get("TARGET_BRANCH") or "main"
+    commit_message = (
+        "sync: update files from ghcommon\n\n"
+        f"Source: {source_repo}\n"
+        f"SHA: {source_sha}\n"
+        f"Sync type: {sync_type}"
+    )
+
+    git_tree_patcher = load_tree_patcher()
+    if git_tree_patcher is None:
+        commit_worktree_and_push(commit_message, branch)
+        return
+
+    written, removed = synced_paths()
+    print(f"🌳 Building sync commit onto {branch}: {len(written)} written, {len(removed)} removed")
+    for attempt in range(1, 4):
+        fetch_result = subprocess.run(
+            [
+                "git",
+                "fetch",
+                "--quiet",
+                "origin",
+                f"+refs/heads/{branch}:refs/remotes/origin/{branch}",
+            ],
+            check=False,
+        )
+        if fetch_result.returncode != 0:
+            print(f"❌ Unable to fetch origin/{branch}")
+            raise SystemExit(1)
+
+        patcher = git_tree_patcher.TreePatcher(".", base=f"refs/remotes/origin/{branch}")
+        for path in written:
+            patcher.add_file(path, path)
+        for path in removed:
+            patcher.delete(path)
+        try:
+            commit = patcher.commit(
+                commit_message,
+                author_name="GitHub Action",
+                author_email="action@github.com",
+            )
+        except git_tree_patcher.TreePatchError as exc:
+            print(f"❌ {exc}")
+            raise SystemExit(1) from exc
 
+        if commit is None:
+            print(f"ℹ️  origin/{branch} already has the synced files")
+            return
+
+        print("⬆️  Pushing changes to remote...")
+        push_result = subprocess.run(
+            ["git", "push", "origin", f"{commit}:refs/heads/{branch}"],
+            check=False,
+        )
+        if push_result.returncode == 0:
+            print(f"✅ Successfully pushed {commit}")
+            return
+
+        print(f"⚠️  Push attempt {attempt} failed, rebuilding on the latest {branch}...")
+        time.sleep(2)
+
+    print("❌ Failed to push after 3 attempts")
+    raise SystemExit(1)
+
+
+def commit_worktree_and_push(commit_message: str, branch: str) -> None:
+    """Commit the working tree and push it, for receivers without the tree patcher."""
     subprocess.run(
         ["git", "config", "--local", "user.email", "action@github.com"],
         check=True,
@@ -227,10 +403,10 @@ def commit_and_push(_: argparse.Namespace) -> None:
     subprocess.run(["git", "config", "--local", "user.name", "GitHub Action"], check=True)
 
     print("🔄 Pulling latest changes from remote...")
-    pull_result = subprocess.run(["git", "pull", "origin", "main"], check=False)
+    pull_result = subprocess.run(["git", "pull", "origin", branch], check=False)
     if pull_result.returncode != 0:
         print("⚠️  Pull failed, attempting rebase...")
-        rebase_result = subprocess.run(["git", "pull", "--rebase", "origin", "main"], check=False)
+        rebase_result = subprocess.run(["git", "pull", "--rebase", "origin", branch], check=False)
         if rebase_result.returncode != 0:
             print("❌ Rebase failed, attempting merge strategy...")
             merge_result = subprocess.run(
@@ -240,7 +416,7 @@ def commit_and_push(_: argparse.Namespace) -> None:
                     "--no-rebase",
                     "--strategy-option=ours",
                     "origin",
-                    "main",
+                    branch,
                 ],
                 check=False,
             )
@@ -249,12 +425,6 @@ def commit_and_push(_: argparse.Namespace) -> None:
                 raise SystemExit(1)
 
     subprocess.run(["git", "add", "."], check=True)
-    commit_message = (
-        "sync: update files from ghcommon\n\n"
-        f"Source: {source_repo}\n"
-        f"SHA: {source_sha}\n"
-        f"Sync type: {sync_type}"
-    )
     subprocess.run(["git", "commit", "-m", commit_message], check=True)
 
     print("⬆️  Pushing changes to remote...")
@@ -264,9 +434,9 @@ def commit_and_push(_: argparse.Namespace) -> None:
             print("✅ Successfully pushed changes")
             break
         print(f"⚠️  Push attempt {attempt} failed, pulling latest changes and retrying...")
-        rebase_pull = subprocess.run(["git", "pull", "--rebase", "origin", "main"], check=False)
+        rebase_pull = subprocess.run(["git", "pull", "--rebase", "origin", branch], check=False)
         if rebase_pull.returncode != 0:
-            subprocess.run(["git", "pull", "origin", "main"], check=False)
+            subprocess.run(["git", "pull", "origin", branch], check=False)
         if attempt == 3:
             print("❌ Failed to push after 3 attempts")
             raise SystemExit(1)
@@ -312,6 +482,7 @@ def build_parser() -> argparse.ArgumentParser:
 
     commands = {
         "set-parameters": set_parameters,
+        "check-manifest": check_manifest,
         "install-python-deps": install_python_deps,
         "sync-files": sync_files,
         "check-changes": check_changes,
@@ -321,6 +492,11 @@ def build_parser() -> argparse.ArgumentParser:
 
     for command, handler in commands.items():
         subparsers.add_parser(command).set_defaults(handler=handler)
+    try:
+        import helper_batch
+    except ImportError:  # receiver without the batch helper yet
+        return parser
+    helper_batch.add_batch_commands(subparsers, build_parser)
     return parser
 
 
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: .github/workflows/scripts/workflow_common.py
-# version: 1.0.1
+# version: 1.1.0
 # guid: 6310ec6e-4513-4e0e-9f9b-5a100a305266
 
 """Shared helpers for GitHub workflow scripts."""
@@ -10,9 +10,9 @@ from __future__ import annotations
 import json
 import os
 from collections.abc import Iterable
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
-from uuid import uuid4
 
 _CONFIG_CACHE: dict[str, Any] | None = None
 
@@ -39,7 +39,8 @@ def write_output(name: str, value: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("a", encoding="utf-8") as handle:
         if "\n" in rendered_value:
-            delimiter = uuid4().hex
+            # Same randomness as uuid4().hex without importing uuid/platform.
+            delimiter = os.urandom(16).hex()
             handle.write(f"{name}<<{delimiter}\n{rendered_value}\n{delimiter}\n")
         else:
             handle.write(f"{name}={rendered_value}\n")
@@ -122,6 +123,30 @@ def registry_enabled(registry: str) -> bool:
     return bool(registries.get(registry, False))
 
 
+def parse_datetime(value: Any) -> datetime | None:
+    """Parse a GitHub API timestamp into an aware datetime (UTC if naive).
+
+    Accepts ISO 8601 strings (a trailing ``Z`` included) and datetimes;
+    anything else, or an unparsable string, gives None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
 def build_release_summary(context: dict[str, Any]) -> str:
     """Generate a Markdown summary for release job results."""
     components = context.get("components", {})
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# file: .github/workflows/scripts/workflow_metrics_store.py
+# version: 1.2.1
+# guid: f2ee6626-cb99-421b-b6ab-060356294c4a
+
+"""Persistent SQLite store for workflow run metrics.
+
+``automation_workflow.collect_workflow_metrics`` aggregates a list of raw run
+payloads in memory, which means every report re-downloads every run. This
+store keeps normalized runs on disk instead:
+
+* one compact ``runs`` row per run (integer epoch timestamps, interned repo
+  and workflow ids), upserted by ``(repo, run id)`` so re-ingesting is safe;
+* a per-repository watermark so :func:`sync_repository` only asks the API for
+  runs created since the last sync (via the ``created`` qualifier);
+* :meth:`MetricsStore.metrics` answers rolling-window questions with indexed
+  ``GROUP BY`` queries and returns the usual :class:`WorkflowMetrics`,
+  including duration percentile sketches.
+
+The watermark is the creation time of the oldest run that was still in
+progress at the last sync (or the newest run otherwise), so runs that finish
+later are picked up again and their rows updated. Runs stuck in the queue for
+more than a day no longer hold it back.
+
+When a sync fetches its full page budget, older runs in the window may not
+have been returned (the API lists newest first). The watermark then stays
+put and the store records a backfill cursor: the creation time of the oldest
+run fetched. Later syncs fetch the ``watermark..cursor`` range, moving the
+cursor down, and only advance the watermark once a fetch of that range comes
+back short.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import automation_workflow
+import workflow_common
+from automation_workflow import WorkflowMetrics, WorkflowRun, WorkflowSummary
+
+DEFAULT_LOOKBACK_DAYS = 90
+DEFAULT_SYNC_PAGES = 10
+# Runs still queued this long after the newest run stop holding the watermark back.
+PENDING_HORIZON_SECONDS = 24 * 60 * 60
+FAILED_CONCLUSIONS = ("failure", "timed_out", "cancelled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    watermark INTEGER,
+    backfill INTEGER
+);
+CREATE TABLE IF NOT EXISTS workflows (
+    id INTEGER PRIMARY KEY,
+    repo_id INTEGER NOT NULL REFERENCES repos(id),
+    name TEXT NOT NULL,
+    UNIQUE (repo_id, name)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    repo_id INTEGER NOT NULL,
+    run_id INTEGER NOT NULL,
+    workflow_id INTEGER NOT NULL REFERENCES workflows(id),
+    created_at INTEGER,
+    started_at INTEGER,
+    completed_at INTEGER,
+    sort_at INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    status TEXT NOT NULL,
+    conclusion TEXT NOT NULL,
+    cache_hit INTEGER,
+    PRIMARY KEY (repo_id, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_by_workflow ON runs (workflow_id, sort_at);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (sort_at);
+"""
+
+
+def _epoch(value: datetime | None) -> int | None:
+    return int(value.timestamp()) if value is not None else None
+
+
+def _from_epoch(value: int | None) -> datetime | None:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+
+def _run_id(data: Mapping[str, Any]) -> int:
+    """Return the API run id, or a stable negative id for payloads without one."""
+    run_id = data.get("id")
+    if isinstance(run_id, int):
+        return run_id
+    encoded = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return -int.from_bytes(hashlib.sha256(encoded).digest()[:7], "big")
+
+
+class MetricsStore:
+    """SQLite-backed workflow run history."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open (and create if needed) the store at ``path``; ``:memory:`` works."""
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(repos)")}
+        if "backfill" not in columns:  # stores created before backfill cursors
+            self._conn.execute("ALTER TABLE repos ADD COLUMN backfill INTEGER")
+        self._repo_ids: dict[str, int] = {}
+        self._workflow_ids: dict[tuple[int, str], int] = {}
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self._conn.close()
+
+    def __enter__(self) -> MetricsStore:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def _repo_id(self, repo: str) -> int:
+        repo_id = self._repo_ids.get(repo)
+        if repo_id is None:
+            self._conn.execute("INSERT OR IGNORE INTO repos (name) VALUES (?)", (repo,))
+            (repo_id,) = self._conn.execute(
+                "SELECT id FROM repos WHERE name = ?", (repo,)
+            ).fetchone()
+            self._repo_ids[repo] = repo_id
+        return repo_id
+
+    def _workflow_id(self, repo_id: int, name: str) -> int:
+        key = (repo_id, name)
+        workflow_id = self._workflow_ids.get(key)
+        if workflow_id is None:
+            self._conn.execute("INSERT OR IGNORE INTO workflows (repo_id, name) VALUES (?, ?)", key)
+            (workflow_id,) = self._conn.execute(
+                "SELECT id FROM workflows WHERE repo_id = ? AND name = ?", key
+            ).fetchone()
+            self._workflow_ids[key] = workflow_id
+        return workflow_id
+
+    def watermark(self, repo: str) -> datetime | None:
+        """Return the creation time from which the next sync should fetch."""
+        row = self._conn.execute("SELECT watermark FROM repos WHERE name = ?", (repo,)).fetchone()
+        return _from_epoch(row[0]) if row else None
+
+    def backfill(self, repo: str) -> datetime | None:
+        """Return the upper end of the created range a truncated sync left unfetched."""
+        row = self._conn.execute("SELECT backfill FROM repos WHERE name = ?", (repo,)).fetchone()
+        return _from_epoch(row[0]) if row else None
+
+    def ingest(
+        self,
+        repo: str,
+        runs_data: Iterable[Mapping[str, Any]],
+        *,
+        now: datetime | None = None,
+        unfetched: tuple[datetime, datetime] | None = None,
+    ) -> int:
+        """Upsert raw workflow run payloads for ``repo`` and advance its watermark.
+
+        Args:
+            unfetched: ``(since, until)`` creation range that is still
+                incomplete after a truncated fetch. The watermark is set to
+                ``since`` and the backfill cursor to ``until`` instead of
+                advancing.
+
+        Returns:
+            The number of payloads written.
+        """
+        fallback = _epoch(now or datetime.now(timezone.utc))
+        with self._conn:
+            repo_id = self._repo_id(repo)
+            rows = []
+            for data in runs_data:
+                run = WorkflowRun.from_dict(data)
+                created_at = _epoch(workflow_common.parse_datetime(data.get("created_at")))
+                started_at = _epoch(run.started_at)
+                completed_at = _epoch(run.completed_at)
+                rows.append(
+                    (
+                        repo_id,
+                        _run_id(data),
+                        self._workflow_id(repo_id, run.workflow),
+                        created_at,
+                        started_at,
+                        completed_at,
+                        started_at or completed_at or created_at or fallback,
+                        run.duration_seconds,
+                        run.status,
+                        run.conclusion,
+                        None if run.cache_hit is None else int(run.cache_hit),
+                    )
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            if unfetched is not None:
+                self._conn.execute(
+                    "UPDATE repos SET watermark = ?, backfill = ? WHERE id = ?",
+                    (_epoch(unfetched[0]), _epoch(unfetched[1]), repo_id),
+                )
+                return len(rows)
+            self._conn.execute(
+                """
+                WITH newest AS (SELECT MAX(created_at) AS value FROM runs WHERE repo_id = :repo)
+                UPDATE repos SET watermark = COALESCE(
+                    (SELECT MIN(created_at) FROM runs
+                     WHERE repo_id = :repo AND status != 'completed'
+                       AND created_at >= (SELECT value FROM newest) - :horizon),
+                    (SELECT value FROM newest),
+                    watermark
+                ), backfill = NULL WHERE id = :repo
+                """,
+                {"repo": repo_id, "horizon": PENDING_HORIZON_SECONDS},
+            )
+        return len(rows)
+
+    def prune(self, before: datetime) -> int:
+        """Delete runs that started before ``before``; returns the number removed."""
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM runs WHERE sort_at < ?", (_epoch(before),))
+        return cursor.rowcount
+
+    def metrics(
+        self,
+        *,
+        repos: Sequence[str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        group_by_repo: bool = False,
+    ) -> WorkflowMetrics:
+        """Aggregate stored runs in ``[since, until)`` into :class:`WorkflowMetrics`.
+
+        Workflows are keyed by name (merging repositories) unless
+        ``group_by_repo`` is set, in which case keys are ``"owner/repo:name"``.
+        ``WorkflowMetrics.runs`` is left empty; the point of the store is not
+        to materialize every run.
+        """
+        clauses = ["r.sort_at >= ?", "r.sort_at < ?"]
+        params: list[Any] = [_epoch(since) if since else -(2**62), _epoch(until) or 2**62]
+        if repos is not None:
+            clauses.append(f"p.name IN ({', '.join('?' * len(repos))})")
+            params.extend(repos)
+        where = " AND ".join(clauses)
+        key = "p.name || ':' || w.name" if group_by_repo else "w.name"
+        failed = f"r.conclusion IN ({', '.join(repr(item) for item in FAILED_CONCLUSIONS)})"
+        rows = self._conn.execute(
+            f"""
+            SELECT {key}, group_concat(DISTINCT w.id), COUNT(*),
+                   SUM(r.conclusion = 'success'), SUM({failed}), SUM(r.duration),
+                   SUM(r.cache_hit), COUNT(r.cache_hit),
+                   MIN(r.started_at), MIN(r.completed_at),
+                   MAX(r.started_at), MAX(r.completed_at)
+            FROM runs r
+            JOIN workflows w ON w.id = r.workflow_id
+            JOIN repos p ON p.id = r.repo_id
+            WHERE {where}
+            GROUP BY 1
+            ORDER BY 1
+            """,
+            params,
+        ).fetchall()
+
+        summaries: dict[str, WorkflowSummary] = {}
+        total_runs = total_successes = 0
+        total_duration = 0.0
+        bounds: list[int] = []
+        for name, ids, runs, successes, failures, duration, hits, known, *times in rows:
+            workflow_ids = [int(item) for item in ids.split(",")]
+            last_run, streak = self._tail(name, workflow_ids, params[:2])
+            sketches = automation_workflow.build_duration_sketches(
+                self._durations(workflow_ids, params[:2])
+            )
+            summaries[name] = WorkflowSummary(
+                name=name,
+                runs=runs,
+                successes=successes,
+                failures=failures,
+                average_duration=duration / runs,
+                cache_hit_rate=hits / known if known else None,
+                consecutive_failures=streak,
+                last_run=last_run,
+                duration_sketch=sketches[0],
+                baseline_sketch=sketches[1],
+                recent_sketch=sketches[2],
+            )
+            total_runs += runs
+            total_successes += successes
+            total_duration += duration
+            bounds.extend(value for value in times if value is not None)
+        return WorkflowMetrics(
+            total_runs=total_runs,
+            success_rate=total_successes / total_runs if total_runs else 0.0,
+            average_duration=total_duration / total_runs if total_runs else 0.0,
+            workflows=summaries,
+            start_time=_from_epoch(min(bounds)) if bounds else None,
+            end_time=_from_epoch(max(bounds)) if bounds else None,
+            runs=(),
+        )
+
+    def _durations(self, workflow_ids: list[int], window: list[Any]) -> list[float]:
+        """Return run durations in the window, oldest first."""
+        rows = self._conn.execute(
+            f"""
+            SELECT duration FROM runs
+            WHERE workflow_id IN ({", ".join("?" * len(workflow_ids))})
+              AND sort_at >= ? AND sort_at < ?
+            ORDER BY sort_at, run_id
+            """,
+            [*workflow_ids, *window],
+        )
+        return [duration for (duration,) in rows]
+
+    def _tail(
+        self, name: str, workflow_ids: list[int], window: list[Any]
+    ) -> tuple[WorkflowRun | None, int]:
+        """Return the latest run and the trailing failure streak.
+
+        Walks the ``runs_by_workflow`` index newest-first and stops at the
+        first run that did not fail, so only the streak itself is read.
+        """
+        cursor = self._conn.execute(
+            f"""
+            SELECT started_at, completed_at, duration, status, conclusion, cache_hit
+            FROM runs
+            WHERE workflow_id IN ({", ".join("?" * len(workflow_ids))})
+              AND sort_at >= ? AND sort_at < ?
+            ORDER BY sort_at DESC, run_id DESC
+            """,
+            [*workflow_ids, *window],
+        )
+        last_run: WorkflowRun | None = None
+        streak = 0
+        for started_at, completed_at, duration, status, conclusion, cache_hit in cursor:
+            run = WorkflowRun(
+                workflow=name,
+                status=status,
+                conclusion=conclusion,
+                started_at=_from_epoch(started_at),
+                completed_at=_from_epoch(completed_at),
+                duration_seconds=duration,
+                cache_hit=None if cache_hit is None else bool(cache_hit),
+            )
+            if last_run is None:
+                last_run = run
+            if not run.failed:
+                break
+            streak += 1
+        cursor.close()
+        return last_run, streak
+
+
+def _format_created(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _created_filter(since: datetime, until: datetime | None = None) -> str:
+    if until is None:
+        return ">=" + _format_created(since)
+    return f"{_format_created(since)}..{_format_created(until)}"
+
+
+def sync_repository(
+    store: MetricsStore,
+    repo: str,
+    *,
+    token: str,
+    per_page: int = 100,
+    pages: int = DEFAULT_SYNC_PAGES,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    base_url: str = automation_workflow.DEFAULT_GITHUB_API_URL,
+    session: Any = None,
+    workers: int = automation_workflow.DEFAULT_FETCH_WORKERS,
+    now: datetime | None = None,
+) -> int:
+    """Fetch runs created since ``repo``'s watermark and ingest them.
+
+    The first sync of a repository reaches back ``lookback_days``. A sync
+    fetches at most ``pages * per_page`` runs (newest first); when that budget
+    is used up, the older part of the window is recorded as a backfill range
+    and fetched by the following syncs before the watermark moves on.
+
+    Returns:
+        The number of runs ingested.
+    """
+    current = now or datetime.now(timezone.utc)
+    since = store.watermark(repo) or current - timedelta(days=lookback_days)
+    until = store.backfill(repo)
+    runs = automation_workflow.fetch_recent_workflow_runs(
+        repo,
+        token=token,
+        per_page=per_page,
+        pages=pages,
+        base_url=base_url,
+        session=session,
+        created=_created_filter(since, until),
+        workers=workers,
+    )
+    if len(runs) >= pages * per_page:
+        created = [
+            value
+            for value in (
+                workflow_common.parse_datetime(run.get("created_at")) for run in runs
+            )
+            if value is not None
+        ]
+        oldest = min(created, default=None)
+        # Stop backfilling if the cursor cannot move (a full budget of runs in one second).
+        if oldest is not None and oldest > since and (until is None or oldest < until):
+            return store.ingest(repo, runs, now=current, unfetched=(since, oldest))
+    return store.ingest(repo, runs, now=current)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# file: scripts/benchmarks/cache_chunks_benchmark.py
+# version: 1.0.0
+# guid: b0583782-1b35-464d-9261-e916ce5c7cef
+
+"""Benchmark chunk-store cache packs against a tar.gz of the whole cache.
+
+Two synthetic caches are generated, deterministic per seed:
+
+* ``go``: a ``GOMODCACHE`` with ``cache/download/<module>/@v/<version>.zip``,
+  ``.mod`` and ``.info`` files plus the extracted, read-only
+  ``<module>@<version>/`` source trees;
+* ``cargo``: a ``CARGO_HOME/registry`` with ``.crate`` files, their extracted
+  ``src/`` trees and the sparse index cache.
+
+A "nearby" key is then made by adding a few module versions / crates and
+appending to some index files, the way a dependency bump changes a cache.
+Each case is timed for:
+
+* ``tar.gz pack`` / ``tar.gz unpack``: :func:`archive_builder.build_archive`
+  and extraction of the full tree, what a key miss re-uploads today;
+* ``cold pack``: :func:`cache_chunks.pack` into an empty store;
+* ``nearby pack``: packing the changed tree on top of the first manifest;
+* ``fresh unpack``: restoring the changed tree into an empty directory;
+* ``nearby unpack``: restoring the changed tree over the old one.
+
+Byte counts compare the full archive with the chunks the nearby pack added
+and the bytes the nearby unpack wrote. The optional ``--output`` file uses the
+``customSmallerIsBetter`` format read by github-action-benchmark.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / ".github" / "workflows" / "scripts"))
+
+import archive_builder  # noqa: E402
+import cache_chunks  # noqa: E402
+
+WORDS = ["func", "return", "struct", "impl", "err", "nil", "self", "ctx", "value", "map"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark chunk-store cache packs.")
+    parser.add_argument(
+        "--packages", type=int, default=150, help="Modules / crates per cache (default: 150)."
+    )
+    parser.add_argument(
+        "--changed", type=int, default=3, help="Packages added for the nearby key (default: 3)."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for synthetic files.")
+    parser.add_argument("--output", help="Optional path to write benchmark JSON results.")
+    return parser.parse_args()
+
+
+def source_text(rng: random.Random, size: int) -> bytes:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    lines = [" ".join(words[index : index + 12]) for index in range(0, len(words), 12)]
+    return "\n".join(lines).encode()[:size]
+
+
+def blob(rng: random.Random, size: int) -> bytes:
+    return rng.getrandbits(8 * size).to_bytes(size, "little")
+
+
+def write_go_module(root: Path, rng: random.Random, index: int) -> None:
+    module = f"github.com/org{index % 17}/module{index}"
+    version = f"v1.{index % 9}.{index}"
+    download = root / "cache" / "download" / module / "@v"
+    download.mkdir(parents=True, exist_ok=True)
+    files = [source_text(rng, rng.randint(2_000, 40_000)) for _ in range(rng.randint(5, 25))]
+    (download / f"{version}.zip").write_bytes(blob(rng, sum(map(len, files)) // 3))
+    (download / f"{version}.mod").write_text(f"module {module}\n\ngo 1.22\n", encoding="utf-8")
+    (download / f"{version}.info").write_text(
+        json.dumps({"Version": version, "Time": "2024-01-01T00:00:00Z"}), encoding="utf-8"
+    )
+    source = root / f"{module}@{version}"
+    for number, text in enumerate(files):
+        path = source / f"pkg{number % 3}" / f"file{number}.go"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text)
+    for directory in sorted(source.rglob("*"), reverse=True):
+        if directory.is_dir():
+            directory.chmod(0o555)
+    source.chmod(0o555)
+
+
+def write_crate(root: Path, rng: random.Random, index: int) -> None:
+    registry = "index.crates.io-6f17d22bba15001f"
+    name = f"crate{index}"
+    version = f"0.{index % 7}.{index}"
+    files = [source_text(rng, rng.randint(2_000, 40_000)) for _ in range(rng.randint(5, 25))]
+    cache = root / "cache" / registry
+    cache.mkdir(parents=True, exist_ok=True)
+    (cache / f"{name}-{version}.crate").write_bytes(blob(rng, sum(map(len, files)) // 3))
+    source = root / "src" / registry / f"{name}-{version}"
+    for number, text in enumerate(files):
+        path = source / "src" / f"module{number}.rs"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text)
+    entry = root / "index" / registry / ".cache" / name[:2] / name[2:4] / name
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        json.dumps({"name": name, "vers": f"0.{minor}.0", "deps": [], "cksum": "0" * 64})
+        for minor in range(rng.randint(5, 60))
+    ]
+    entry.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def nearby_change(root: Path, kind: str, rng: random.Random, packages: int, changed: int) -> None:
+    writer = write_go_module if kind == "go" else write_crate
+    for index in range(packages, packages + changed):
+        writer(root, rng, index)
+    if kind == "cargo":
+        entries = sorted((root / "index").rglob("crate*"))
+        for entry in entries[: changed * 3]:
+            with entry.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps({"name": entry.name, "vers": "9.9.9"}) + "\n")
+
+
+def make_writable(root: Path) -> None:
+    for directory in [root, *root.rglob("*")]:
+        if directory.is_dir() and not directory.is_symlink():
+            directory.chmod(0o755)
+
+
+def remove(root: Path) -> None:
+    if root.exists():
+        make_writable(root)
+        shutil.rmtree(root)
+
+
+def tree_bytes(root: Path) -> int:
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+def best_time(
+    func: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None
+) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(max(repeat, 1)):
+        if setup:
+            setup()
+        gc.collect()
+        begin = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - begin)
+    return best, result
+
+
+def run_case(
+    scratch: Path, kind: str, packages: int, changed: int, repeat: int, seed: int
+) -> list[dict[str, Any]]:
+    writer = write_go_module if kind == "go" else write_crate
+    rng = random.Random(seed)
+    old = scratch / f"{kind}-old"
+    for index in range(packages):
+        writer(old, rng, index)
+    new = scratch / f"{kind}-new"
+    shutil.copytree(old, new, symlinks=True)
+    make_writable(new)
+    nearby_change(new, kind, rng, packages, changed)
+    cache = scratch / kind  # the path recorded in manifests
+    store_dir = scratch / f"{kind}-store"
+    archive = scratch / f"{kind}.tar.gz"
+
+    def place(tree: Path | None) -> Callable[[], None]:
+        def setup() -> None:
+            remove(cache)
+            if tree is not None:
+                shutil.copytree(tree, cache, symlinks=True)
+
+        return setup
+
+    def reset_store() -> None:
+        place(old)()
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+    def pack(key: str, restore_keys: tuple[str, ...] = ()) -> cache_chunks.PackStats:
+        return cache_chunks.pack(
+            cache_chunks.ChunkStore(store_dir), key, [str(cache)], restore_keys
+        )
+
+    def unpack() -> cache_chunks.UnpackStats:
+        return cache_chunks.unpack(cache_chunks.ChunkStore(store_dir), f"{kind}-new")
+
+    def tar_unpack() -> None:
+        with tarfile.open(archive, "r:gz") as handle:
+            handle.extractall(cache)
+
+    timings: dict[str, float] = {}
+    timings["tar.gz pack"], _ = best_time(
+        lambda: archive_builder.build_archive([(new, kind)], archive), repeat
+    )
+    timings["tar.gz unpack"], _ = best_time(tar_unpack, repeat, place(None))
+    timings["cold pack"], cold = best_time(lambda: pack(f"{kind}-old"), repeat, reset_store)
+
+    def repack_old() -> None:
+        shutil.rmtree(store_dir, ignore_errors=True)
+        place(old)()
+        pack(f"{kind}-old")
+        place(new)()
+
+    timings["nearby pack"], nearby = best_time(
+        lambda: pack(f"{kind}-new", (f"{kind}-",)), repeat, repack_old
+    )
+    timings["fresh unpack"], fresh = best_time(unpack, repeat, place(None))
+    timings["nearby unpack"], incremental = best_time(unpack, repeat, place(old))
+    remove(cache)
+
+    sizes = {
+        "tar.gz archive": archive.stat().st_size,
+        "nearby new chunks": nearby.new_bytes,
+        "nearby unpack writes": incremental.written_bytes,
+    }
+    total = tree_bytes(new)
+    print(
+        f"{kind}: {packages + changed} packages, {total / 1e6:.1f} MB, "
+        f"{cold.chunks} chunks cold, {nearby.reused_files}/{nearby.files} files reused, "
+        f"{incremental.written_files}/{fresh.files} files rewritten"
+    )
+    for label, elapsed in timings.items():
+        print(f"  {label:>22}  {elapsed:>8.3f}s  {total / elapsed / 1e6:>7.1f} MB/s")
+    for label, size in sizes.items():
+        print(f"  {label:>22}  {size / 1e6:>8.2f} MB")
+    results = [
+        {"name": f"{kind} {label}", "unit": "seconds", "value": elapsed}
+        for label, elapsed in timings.items()
+    ]
+    results.extend(
+        {"name": f"{kind} {label}", "unit": "bytes", "value": size} for label, size in sizes.items()
+    )
+    return results
+
+
+def run_benchmarks(packages: int, changed: int, repeat: int, seed: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    scratch = Path(tempfile.mkdtemp(prefix="cache-chunks-"))
+    try:
+        for kind in ("go", "cargo"):
+            results.extend(run_case(scratch, kind, packages, changed, repeat, seed))
+    finally:
+        remove(scratch)
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    results = run_benchmarks(args.packages, args.changed, args.repeat, args.seed)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as handle:
+            json.dump(
+                [{**item, "value": round(item["value"], 6)} for item in results], handle, indent=2
+            )
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# file: scripts/benchmarks/go_coverage_benchmark.py
+# version: 1.0.0
+# guid: 26c7a34c-b728-4848-9ed5-87d3abe09174
+
+"""Benchmark the native Go coverage profile parser.
+
+A synthetic ``-coverprofile`` (``--lines`` blocks spread over packages and
+files, deterministic per seed) is written to a scratch directory and timed
+through:
+
+* ``parse+total``: :meth:`CoverageProfile.from_files` plus ``totals()``, what
+  ``ci_workflow.py go-test`` does instead of ``go tool cover -func``;
+* ``per-package``: ``by_package()`` on the parsed profile;
+* ``merge shards``: ``--shards`` profiles over the same blocks, merged.
+
+``go tool cover -func`` itself cannot be timed on synthetic data, because it
+parses the Go sources named in the profile. The optional ``--output`` file
+uses the ``customSmallerIsBetter`` format read by github-action-benchmark.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / ".github" / "workflows" / "scripts"))
+
+import go_coverage  # noqa: E402
+
+FILES_PER_PACKAGE = 20
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Go coverage profile parsing.")
+    parser.add_argument(
+        "--lines", type=int, default=500_000, help="Blocks per profile (default: 500000)."
+    )
+    parser.add_argument("--shards", type=int, default=4, help="Profiles to merge (default: 4).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for synthetic blocks.")
+    parser.add_argument("--output", help="Optional path to write benchmark JSON results.")
+    return parser.parse_args()
+
+
+def write_profile(path: Path, lines: int, seed: int, hit_rate: float) -> None:
+    """Write ``lines`` blocks; the block layout is the same for every seed."""
+    rng = random.Random(seed)
+    blocks_per_file = 250
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("mode: set\n")
+        for index in range(lines):
+            file_index, block = divmod(index, blocks_per_file)
+            package, file_number = divmod(file_index, FILES_PER_PACKAGE)
+            start = block * 3 + 1
+            handle.write(
+                f"example.com/mod/pkg{package}/file{file_number}.go:"
+                f"{start}.2,{start + 2}.16 {1 + block % 4} {int(rng.random() < hit_rate)}\n"
+            )
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        begin = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - begin)
+    return best, result
+
+
+def run_benchmarks(lines: int, shards: int, repeat: int, seed: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="go-coverage-") as scratch:
+        root = Path(scratch)
+        single = root / "coverage.out"
+        write_profile(single, lines, seed, hit_rate=0.7)
+        shard_paths = []
+        for shard in range(shards):
+            path = root / f"shard-{shard}.out"
+            write_profile(path, lines, seed + shard + 1, hit_rate=0.3)
+            shard_paths.append(path)
+
+        def parse_total() -> go_coverage.CoverageTotals:
+            return go_coverage.CoverageProfile.from_files([single]).totals()
+
+        profile = go_coverage.CoverageProfile.from_files([single])
+        cases: dict[str, Callable[[], Any]] = {
+            "parse+total": parse_total,
+            "per-package": profile.by_package,
+            f"merge {shards} shards": lambda: go_coverage.CoverageProfile.from_files(
+                shard_paths
+            ).totals(),
+        }
+        print(f"{'case':>16}  {'time':>9}  result")
+        for label, func in cases.items():
+            elapsed, result = best_time(func, repeat)
+            detail = (
+                f"{result.percent:.1f}% of {result.statements} statements"
+                if isinstance(result, go_coverage.CoverageTotals)
+                else f"{len(result)} packages"
+            )
+            results.append({"name": f"{label} {lines} lines", "unit": "seconds", "value": elapsed})
+            print(f"{label:>16}  {elapsed:>8.3f}s  {detail}")
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    results = run_benchmarks(args.lines, args.shards, args.repeat, args.seed)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as handle:
+            json.dump(
+                [{**item, "value": round(item["value"], 6)} for item in results], handle, indent=2
+            )
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
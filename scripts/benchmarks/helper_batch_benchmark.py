@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# file: scripts/benchmarks/helper_batch_benchmark.py
+# version: 1.0.0
+# guid: 918ebffe-f2cc-4f4e-8f20-7b1b37d8ff0c
+
+"""Benchmark separate, batched and served workflow-helper invocations.
+
+Runs the same ``--commands`` ``ci_workflow.py`` subcommands three ways:
+
+* ``separate``: one ``python3 ci_workflow.py <command>`` process each (today's
+  workflows);
+* ``batch``: a single ``ci_workflow.py batch`` process;
+* ``served``: one ``python3 -S helper_client.py`` process per command
+  against a running ``ci_workflow.py serve``.
+
+Each mode reports the best wall-clock time of ``--repeat`` runs and must write
+a ``GITHUB_OUTPUT`` identical to the separate invocations. The optional
+``--output`` file uses the ``customSmallerIsBetter`` format read by
+github-action-benchmark, like ``measure_command.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / ".github" / "workflows" / "scripts"
+HELPER = SCRIPTS_DIR / "ci_workflow.py"
+CLIENT = SCRIPTS_DIR / "helper_client.py"
+COMMAND_CYCLE = ("debug-filter", "determine-execution", "generate-matrices")
+REPOSITORY_CONFIG = {
+    "languages": {"versions": {"go": ["1.24"], "python": ["3.12", "3.13"], "node": ["22"]}},
+    "build": {"platforms": {"os": ["ubuntu-latest", "macos-latest"]}},
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark batched helper invocations.")
+    parser.add_argument(
+        "--commands", type=int, default=30, help="Subcommands per run (default: 30)."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per mode (default: 3).")
+    parser.add_argument("--output", help="Optional path to write benchmark JSON results.")
+    return parser.parse_args()
+
+
+def run_separate(commands: list[str], env: dict[str, str], cwd: Path) -> None:
+    for command in commands:
+        subprocess.run(
+            [sys.executable, str(HELPER), command],
+            env=env,
+            cwd=cwd,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+
+def run_batch(commands: list[str], env: dict[str, str], cwd: Path) -> None:
+    subprocess.run(
+        [sys.executable, str(HELPER), "batch"],
+        input="\n".join(commands) + "\n",
+        text=True,
+        env=env,
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+
+
+def run_served(commands: list[str], env: dict[str, str], cwd: Path) -> None:
+    socket_path = cwd / "helper.sock"
+    server = subprocess.Popen(
+        [sys.executable, str(HELPER), "serve", "--socket", str(socket_path)], env=env, cwd=cwd
+    )
+    try:
+        for command in commands:
+            subprocess.run(
+                [sys.executable, "-S", str(CLIENT), str(socket_path), command],
+                env=env,
+                cwd=cwd,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+        subprocess.run(
+            [sys.executable, "-S", str(CLIENT), str(socket_path), "--stop"], env=env, check=True
+        )
+        server.wait(timeout=30)
+    finally:
+        if server.poll() is None:
+            server.kill()
+
+
+def best_time(
+    mode: Callable[[list[str], dict[str, str], Path], None],
+    commands: list[str],
+    env: dict[str, str],
+    cwd: Path,
+    repeat: int,
+) -> tuple[float, str]:
+    best = float("inf")
+    outputs = ""
+    for _ in range(max(repeat, 1)):
+        output = cwd / "github_output"
+        output.unlink(missing_ok=True)
+        begin = time.perf_counter()
+        mode(commands, {**env, "GITHUB_OUTPUT": str(output)}, cwd)
+        best = min(best, time.perf_counter() - begin)
+        outputs = output.read_text(encoding="utf-8")
+    return best, outputs
+
+
+def run_benchmarks(count: int, repeat: int) -> list[dict[str, Any]]:
+    commands = [COMMAND_CYCLE[index % len(COMMAND_CYCLE)] for index in range(count)]
+    env = {
+        **os.environ,
+        "REPOSITORY_CONFIG": json.dumps(REPOSITORY_CONFIG),
+        "GITHUB_HEAD_COMMIT_MESSAGE": "feat: benchmark",
+        "CI_GO_FILES": "true",
+        "CI_PYTHON_FILES": "true",
+    }
+    modes = {"separate": run_separate, "batch": run_batch, "served": run_served}
+    results: list[dict[str, Any]] = []
+    baseline: str | None = None
+    with tempfile.TemporaryDirectory(prefix="helper-batch-") as scratch:
+        cwd = Path(scratch)
+        print(f"{'mode':>10}  {'total':>9}  {'per command':>12}")
+        for label, mode in modes.items():
+            elapsed, outputs = best_time(mode, commands, env, cwd, repeat)
+            if baseline is None:
+                baseline = outputs
+            elif outputs != baseline:
+                raise SystemExit(f"{label} GITHUB_OUTPUT differs from separate invocations")
+            results.append(
+                {"name": f"{label} {count} commands", "unit": "seconds", "value": elapsed}
+            )
+            print(f"{label:>10}  {elapsed:>8.3f}s  {elapsed / count * 1000:>10.1f}ms")
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    results = run_benchmarks(args.commands, args.repeat)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as handle:
+            json.dump(
+                [{**item, "value": round(item["value"], 6)} for item in results], handle, indent=2
+            )
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
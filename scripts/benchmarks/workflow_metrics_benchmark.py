@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# file: scripts/benchmarks/workflow_metrics_benchmark.py
+# version: 1.0.0
+# guid: 08fe6367-0d1b-4cf9-8bca-509bfd08a92a
+
+"""Benchmark the dataclass and columnar workflow metrics aggregation paths.
+
+Synthetic workflow run payloads (deterministic per seed) are aggregated with
+``collect_workflow_metrics`` and ``collect_workflow_metrics_columnar``. Each
+size reports the best wall-clock time of ``--repeat`` runs per path (and, with
+``--memory``, the peak traced allocation) and checks that both paths serialize
+to identical metrics.
+
+The optional ``--output`` file uses the ``customSmallerIsBetter`` format read
+by github-action-benchmark, like ``measure_command.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / ".github" / "workflows" / "scripts"))
+
+import automation_workflow  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+WORKFLOWS = ("CI", "Docs", "Release", "Lint", "Security", "Nightly", "Deploy", "Benchmarks")
+CONCLUSIONS = ("success",) * 8 + ("failure", "cancelled", "skipped", "timed_out")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark workflow metrics aggregation.")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated run counts (default: 10000,100000,1000000).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per path (default: 3).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for synthetic runs.")
+    parser.add_argument(
+        "--skip-dataclass-above",
+        type=int,
+        default=0,
+        help="Only time the columnar path for sizes above this count (0 = never skip).",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also report peak traced memory per path (slow; runs each path once more).",
+    )
+    parser.add_argument("--output", help="Optional path to write benchmark JSON results.")
+    return parser.parse_args()
+
+
+def synthetic_runs(count: int, seed: int) -> list[dict[str, Any]]:
+    """Return ``count`` workflow run payloads shaped like the REST API's."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    runs: list[dict[str, Any]] = []
+    for run_id in range(count):
+        started = start + timedelta(seconds=rng.randrange(90 * 24 * 3600))
+        finished = started + timedelta(seconds=int(rng.lognormvariate(5, 0.8)))
+        run: dict[str, Any] = {
+            "id": run_id,
+            "name": rng.choice(WORKFLOWS),
+            "status": "completed",
+            "conclusion": rng.choice(CONCLUSIONS),
+            "run_started_at": started.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updated_at": finished.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        if rng.random() < 0.5:
+            run["cache_hit"] = rng.random() < 0.7
+        runs.append(run)
+    return runs
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        begin = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - begin)
+    return best, result
+
+
+def peak_memory_mib(func: Callable[[], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(
+    sizes: Sequence[int], repeat: int, seed: int, skip_above: int, memory: bool
+) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    paths: dict[str, Callable[[list[dict[str, Any]]], Any]] = {
+        "dataclass": automation_workflow.collect_workflow_metrics,
+        "columnar": automation_workflow.collect_workflow_metrics_columnar,
+    }
+    print(f"{'runs':>10}  {'path':>10}  {'time':>10}  {'peak MiB':>9}")
+    for size in sizes:
+        runs = synthetic_runs(size, seed)
+        outputs: dict[str, Any] = {}
+        for label, func in paths.items():
+            if label == "dataclass" and skip_above and size > skip_above:
+                continue
+            elapsed, metrics = best_time(lambda func=func, runs=runs: func(runs), repeat)
+            outputs[label] = metrics.to_dict()
+            peak = peak_memory_mib(lambda func=func, runs=runs: func(runs)) if memory else None
+            results.append({"name": f"{label} {size} runs", "unit": "seconds", "value": elapsed})
+            peak_text = f"{peak:>9.1f}" if peak is not None else f"{'-':>9}"
+            print(f"{size:>10}  {label:>10}  {elapsed:>9.3f}s  {peak_text}")
+        if len(outputs) == 2 and outputs["dataclass"] != outputs["columnar"]:
+            raise SystemExit(f"columnar metrics differ from dataclass metrics at {size} runs")
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    results = run_benchmarks(sizes, args.repeat, args.seed, args.skip_dataclass_above, args.memory)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as handle:
+            json.dump(
+                [{**item, "value": round(item["value"], 6)} for item in results], handle, indent=2
+            )
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
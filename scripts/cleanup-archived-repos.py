@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/cleanup-archived-repos.py
-# version: 1.0.1
+# version: 1.1.1
 # guid: f1a2b3c4-d5e6-7890-abcd-ef1234567890
 
 """GitHub Repository Cleanup Script
@@ -8,14 +8,14 @@
 Automatically detects archived or read-only repositories in the local file system
 and optionally removes their local directories to free up disk space.
 
-Featu                self.logger.info(f"Archived: {repo_info.get('isArchived', 'Unknown')}")
-                self.logger.info(f"Private: {repo_info.get('isPrivate', 'Unknown')}")
-                self.logger.info(f"Visibility: {repo_info.get('visibility', 'Unknown')}")s:
+Features:
 - Scans a specified directory for Git repositories
 - Uses GitHub CLI to check repository status (archived, disabled, read-only)
 - Provides interactive and non-interactive modes
 - Generates detailed reports of actions taken
 - Includes dry-run mode for safety
+- Optional two-phase mode that prefetches remotes in parallel and resolves
+  repository status with batched GraphQL queries
 - Comprehensive logging and error handling
 """
 
@@ -25,24 +25,46 @@ import logging
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+# Maximum number of aliased repository lookups per GraphQL query
+GRAPHQL_BATCH_SIZE = 50
+
+# Fields requested for every repository in a batched lookup
+GRAPHQL_REPOSITORY_FIELDS = "isArchived isDisabled isPrivate visibility pushedAt updatedAt"
+
 
 class RepositoryCleanup:
     """Main class for repository cleanup operations."""
 
-    def __init__(self, base_path: str, dry_run: bool = True, interactive: bool = True):
+    def __init__(
+        self,
+        base_path: str,
+        dry_run: bool = True,
+        interactive: bool = True,
+        two_phase: bool = False,
+        workers: int = 8,
+        batch_size: int = GRAPHQL_BATCH_SIZE,
+    ):
         """Initialize the repository cleanup tool.
 
         Args:
             base_path: Base directory containing repositories
             dry_run: If True, only show what would be done without making changes
             interactive: If True, prompt for confirmation before each action
+            two_phase: If True, prefetch remotes and repository status for all
+                clones before making any decisions
+            workers: Number of parallel workers used to read git remotes
+            batch_size: Number of repositories resolved per GraphQL query
         """
         self.base_path = Path(base_path).expanduser().resolve()
         self.dry_run = dry_run
         self.interactive = interactive
+        self.two_phase = two_phase
+        self.workers = max(1, workers)
+        self.batch_size = max(1, min(batch_size, GRAPHQL_BATCH_SIZE))
         self.log_file = (
             Path.home() / "logs" / f"repo-cleanup-{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         )
@@ -185,6 +207,84 @@ class RepositoryCleanup:
             self.logger.warning(f"Failed to get info for {owner}/{repo}: {stderr}")
             return None
 
+    def _collect_remote_urls(self, repositories: list[Path]) -> dict[Path, str | None]:
+        """Read the origin remote URL of every repository in parallel.
+
+        Args:
+            repositories: List of repository paths
+
+        Returns:
+            Mapping of repository path to remote URL (None when missing)
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            urls = list(executor.map(self._get_remote_url, repositories))
+        return dict(zip(repositories, urls))
+
+    def _build_batch_query(self, slugs: list[tuple[str, str]]) -> str:
+        """Build a GraphQL query with one aliased repository lookup per slug.
+
+        Args:
+            slugs: List of (owner, repo_name) tuples
+
+        Returns:
+            GraphQL query string
+        """
+        lookups = []
+        for index, (owner, repo) in enumerate(slugs):
+            lookups.append(
+                f"r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) "
+                f"{{ {GRAPHQL_REPOSITORY_FIELDS} }}"
+            )
+        return "query {\n  " + "\n  ".join(lookups) + "\n}"
+
+    def _get_repository_info_batch(
+        self, slugs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], dict | None]:
+        """Resolve repository information for many repositories at once.
+
+        Repositories are looked up with aliased ``repository(owner, name)``
+        fields, ``self.batch_size`` per GraphQL query. Repositories that cannot
+        be resolved (deleted, renamed, no access) map to None. When a whole
+        query fails, its repositories are looked up one by one with
+        ``gh repo view`` instead.
+
+        Args:
+            slugs: List of (owner, repo_name) tuples
+
+        Returns:
+            Mapping of (owner, repo_name) to repository information or None
+        """
+        results: dict[tuple[str, str], dict | None] = {}
+        unique_slugs = list(dict.fromkeys(slugs))
+
+        for start in range(0, len(unique_slugs), self.batch_size):
+            batch = unique_slugs[start : start + self.batch_size]
+            query = self._build_batch_query(batch)
+            # gh exits non-zero when any alias fails to resolve but still
+            # prints the partial response, so parse stdout regardless.
+            success, stdout, stderr = self._run_command(
+                ["gh", "api", "graphql", "-f", f"query={query}"]
+            )
+            data: dict = {}
+            if stdout:
+                try:
+                    data = json.loads(stdout).get("data") or {}
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"Failed to parse GraphQL response: {e}")
+            if not data and not success:
+                self.logger.warning(f"Batched repository lookup failed: {stderr}")
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    infos = executor.map(lambda slug: self._get_repository_info(*slug), batch)
+                    results.update(zip(batch, infos))
+                continue
+
+            for index, slug in enumerate(batch):
+                results[slug] = data.get(f"r{index}")
+                if results[slug] is None:
+                    self.logger.warning(f"Failed to get info for {slug[0]}/{slug[1]}")
+
+        return results
+
     def _should_remove_repository(self, repo_info: dict, repo_path: Path) -> tuple[bool, str]:
         """Determine if a repository should be removed based on its status.
 
@@ -198,8 +298,11 @@ class RepositoryCleanup:
         if repo_info.get("isArchived", False):
             return True, "Repository is archived"
 
-        # Note: GitHub API doesn't have a 'disabled' field in the standard repo view response
-        # We can check visibility instead for private/disabled repositories
+        if repo_info.get("isDisabled", False):
+            return True, "Repository is disabled"
+
+        # Only the batched GraphQL lookup reports isDisabled; `gh repo view` has no
+        # such field, so long-untouched private repositories are treated as abandoned
         visibility = repo_info.get("visibility", "")
         if visibility == "private" and repo_info.get("isPrivate", False):
             # Additional check - if repo hasn't been updated in a very long time and is private,
@@ -350,36 +453,99 @@ class RepositoryCleanup:
                     self.stats["errors"] += 1
                     continue
 
-                # Display repository status
-                self.logger.info(f"Archived: {repo_info.get('archived', 'Unknown')}")
-                self.logger.info(f"Disabled: {repo_info.get('disabled', 'Unknown')}")
-                self.logger.info(f"Visibility: {repo_info.get('visibility', 'Unknown')}")
-                self.logger.info(f"Last updated: {repo_info.get('updatedAt', 'Unknown')}")
-
-                # Determine if repository should be removed
-                should_remove, reason = self._should_remove_repository(repo_info, repo_path)
-
-                if should_remove:
-                    self.stats["archived_repos"] += 1
-                    self.logger.warning(f"CLEANUP CANDIDATE: {reason}")
-
-                    if self._confirm_action(
-                        f"Remove repository '{repo_path.name}'? Reason: {reason}"
-                    ):
-                        if self._remove_repository(repo_path):
-                            self.stats["removed_repos"] += 1
-                        else:
-                            self.stats["errors"] += 1
-                    else:
-                        self.logger.info(f"Skipped removal of {repo_path.name}")
-                        self.stats["skipped"] += 1
-                else:
-                    self.logger.info(f"KEEP: {reason}")
+                self._apply_decision(repo_path, repo_info)
+
+            except Exception as e:
+                self.logger.error(f"Error processing {repo_path.name}: {e}")
+                self.stats["errors"] += 1
+
+    def process_repositories_two_phase(self, repositories: list[Path]) -> None:
+        """Process repositories with all remote lookups done up front.
+
+        Phase one reads every git remote in parallel and resolves repository
+        status with batched GraphQL queries. Phase two runs the decision and
+        confirmation step over the prefetched results, so only the prompts
+        are sequential.
+
+        Args:
+            repositories: List of repository paths to process
+        """
+        self.stats["total_repos"] = len(repositories)
+
+        self.logger.info(f"Prefetching remotes for {len(repositories)} repositories")
+        remote_urls = self._collect_remote_urls(repositories)
+
+        github_slugs: dict[Path, tuple[str, str]] = {}
+        for repo_path in repositories:
+            remote_url = remote_urls.get(repo_path)
+            if not remote_url:
+                self.logger.warning(f"No remote URL found for {repo_path.name}")
+                self.stats["skipped"] += 1
+                continue
+
+            github_info = self._parse_github_url(remote_url)
+            if not github_info:
+                self.logger.info(f"Not a GitHub repository: {remote_url}")
+                self.stats["skipped"] += 1
+                continue
+
+            github_slugs[repo_path] = github_info
+
+        self.logger.info(f"Resolving status for {len(github_slugs)} GitHub repositories")
+        repo_infos = self._get_repository_info_batch(list(github_slugs.values()))
+
+        for repo_path, (owner, repo_name) in github_slugs.items():
+            self.logger.info(f"\n{'=' * 60}")
+            self.logger.info(f"Processing: {repo_path.name}")
+            self.logger.info(f"{'=' * 60}")
+            self.logger.info(f"GitHub repository: {owner}/{repo_name}")
+
+            try:
+                repo_info = repo_infos.get((owner, repo_name))
+                if not repo_info:
+                    self.logger.error(
+                        f"Failed to get repository information for {owner}/{repo_name}"
+                    )
+                    self.stats["errors"] += 1
+                    continue
+
+                self._apply_decision(repo_path, repo_info)
 
             except Exception as e:
                 self.logger.error(f"Error processing {repo_path.name}: {e}")
                 self.stats["errors"] += 1
 
+    def _apply_decision(self, repo_path: Path, repo_info: dict) -> None:
+        """Decide whether to remove a repository and act on the decision.
+
+        Args:
+            repo_path: Local path to the repository
+            repo_info: Repository information from GitHub API
+        """
+        # Display repository status
+        self.logger.info(f"Archived: {repo_info.get('isArchived', 'Unknown')}")
+        self.logger.info(f"Disabled: {repo_info.get('isDisabled', 'Unknown')}")
+        self.logger.info(f"Visibility: {repo_info.get('visibility', 'Unknown')}")
+        self.logger.info(f"Last updated: {repo_info.get('updatedAt', 'Unknown')}")
+
+        # Determine if repository should be removed
+        should_remove, reason = self._should_remove_repository(repo_info, repo_path)
+
+        if should_remove:
+            self.stats["archived_repos"] += 1
+            self.logger.warning(f"CLEANUP CANDIDATE: {reason}")
+
+            if self._confirm_action(f"Remove repository '{repo_path.name}'? Reason: {reason}"):
+                if self._remove_repository(repo_path):
+                    self.stats["removed_repos"] += 1
+                else:
+                    self.stats["errors"] += 1
+            else:
+                self.logger.info(f"Skipped removal of {repo_path.name}")
+                self.stats["skipped"] += 1
+        else:
+            self.logger.info(f"KEEP: {reason}")
+
     def generate_report(self) -> None:
         """Generate a summary report of the cleanup operation."""
         self.logger.info(f"\n{'=' * 60}")
@@ -405,6 +571,7 @@ class RepositoryCleanup:
         self.logger.info(f"Base path: {self.base_path}")
         self.logger.info(f"Dry run: {self.dry_run}")
         self.logger.info(f"Interactive: {self.interactive}")
+        self.logger.info(f"Two-phase: {self.two_phase}")
 
         # Check if gh CLI is available
         success, stdout, stderr = self._run_command(["gh", "--version"])
@@ -421,7 +588,10 @@ class RepositoryCleanup:
             return
 
         # Process repositories
-        self.process_repositories(repositories)
+        if self.two_phase:
+            self.process_repositories_two_phase(repositories)
+        else:
+            self.process_repositories(repositories)
 
         # Generate report
         self.generate_report()
@@ -445,6 +615,9 @@ Examples:
 
   # Custom path
   python cleanup-archived-repos.py --path ~/my-repos
+
+  # Prefetch remotes and status for all clones, then decide
+  python cleanup-archived-repos.py --two-phase --workers 16
         """,
     )
 
@@ -482,6 +655,26 @@ Examples:
         help="Run without confirmation prompts",
     )
 
+    parser.add_argument(
+        "--two-phase",
+        action="store_true",
+        help="Prefetch remotes in parallel and resolve status with batched GraphQL queries",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Parallel workers for reading git remotes in two-phase mode (default: 8)",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=GRAPHQL_BATCH_SIZE,
+        help=f"Repositories per GraphQL query in two-phase mode (max/default: {GRAPHQL_BATCH_SIZE})",
+    )
+
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
 
     args = parser.parse_args()
@@ -491,7 +684,12 @@ Examples:
 
     # Create and run cleanup tool
     cleanup = RepositoryCleanup(
-        base_path=args.path, dry_run=args.dry_run, interactive=args.interactive
+        base_path=args.path,
+        dry_run=args.dry_run,
+        interactive=args.interactive,
+        two_phase=args.two_phase,
+        workers=args.workers,
+        batch_size=args.batch_size,
     )
 
     try:
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/fix_markdown_headers.py
-# version: 1.0.4
+# version: 1.1.0
 # guid: 2f6a7b8c-1d2e-4f3a-9b5c-6d7e8f9a0b1c
 
 """Find and fix markdown header metadata that uses heading syntax instead of comments.
@@ -11,9 +11,15 @@ It converts those headers to HTML comments, bumps the version patch, removes
 markdownlint MD025 disable markers, and can optionally create a branch, commit,
 push, and open a PR for each affected repository.
 
+Repositories are processed in parallel through the shared fleet codemod runner
+(``.github/workflows/scripts/fleet_codemod.py``), which prunes ``.git``,
+``node_modules`` and ``target`` while walking and rewrites files on a process
+pool.
+
 Usage:
     python scripts/fix_markdown_headers.py --apply   # apply fixes and open PRs
     python scripts/fix_markdown_headers.py           # dry run (report only)
+    python scripts/fix_markdown_headers.py --workers 16
 """
 
 from __future__ import annotations
@@ -23,10 +29,16 @@ import datetime as dt
 import json
 import re
 import subprocess
+import sys
 from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".github" / "workflows" / "scripts"))
+
+from fleet_codemod import Codemod, FileChange, run_codemod  # noqa: E402
+from fleet_codemod import iter_repos as iter_fleet_repos  # noqa: E402
+
 BASE_DIR = Path.home() / "repos" / "github.com" / "jdfalk"
 HEADER_KEYS = ("file", "version", "guid")
 MDLINT_DISABLE_PATTERN = re.compile(r"markdownlint-(disable|enable).*MD025", re.IGNORECASE)
@@ -97,10 +109,22 @@ def normalize_header(lines: list[str]) -> tuple[list[str], bool]:
     return output, changed
 
 
+def fix_markdown_file(relpath: str, text: str) -> str | None:
+    """Codemod transform: return the normalized markdown, or None if unchanged."""
+    new_lines, changed = normalize_header(text.splitlines(keepends=True))
+    return "".join(new_lines) if changed else None
+
+
+MARKDOWN_HEADER_CODEMOD = Codemod(
+    name="markdown-headers",
+    transform=fix_markdown_file,
+    patterns=("*.md",),
+    commit_message="docs(markdown): normalize metadata headers",
+)
+
+
 def iter_repos(base_dir: Path) -> Iterable[Path]:
-    for child in sorted(base_dir.iterdir()):
-        if child.is_dir() and (child / ".git").exists():
-            yield child
+    return iter_fleet_repos([base_dir])
 
 
 def run(cmd: list[str], cwd: Path, *, check: bool = True) -> subprocess.CompletedProcess:
@@ -120,82 +144,119 @@ def run_precommit_if_present(repo: Path) -> None:
         print(f"[WARN] pre-commit failed in {repo.name}: {message}")
 
 
-def process_repo(repo: Path, apply: bool) -> RepoResult:
-    issues: list[FileIssue] = []
-    for md_file in repo.rglob("*.md"):
-        if ".git" in md_file.parts or "node_modules" in md_file.parts or "target" in md_file.parts:
-            continue
-        content = md_file.read_text(encoding="utf-8").splitlines(keepends=True)
-        new_content, changed = normalize_header(content)
-        if changed:
-            issues.append(
-                FileIssue(
-                    path=md_file,
-                    original_header=content[:6],
-                    new_header=new_content[:6],
-                )
-            )
-            if apply:
-                md_file.write_text("".join(new_content), encoding="utf-8")
-
-    result = RepoResult(repo_path=repo, issues=issues)
-    if apply and issues:
-        base_branch = run(["git", "rev-parse", "--abbrev-ref", "HEAD"], repo).stdout.strip()
-        branch_name = (
-            f"fix/markdown-headers-{dt.datetime.now(dt.timezone.utc).strftime('%Y%m%d%H%M%S')}"
+def _issues(repo: Path, changes: list[FileChange]) -> list[FileIssue]:
+    return [
+        FileIssue(
+            path=repo / change.path,
+            original_header=list(change.head_before),
+            new_header=list(change.head_after),
         )
-        created_branch = False
-        try:
-            run(["git", "checkout", "-b", branch_name], repo)
-            created_branch = True
-            run(["git", "add"] + [str(i.path.relative_to(repo)) for i in issues], repo)
-            run_precommit_if_present(repo)
-            run(["git", "commit", "-m", "docs(markdown): normalize metadata headers"], repo)
-            run(["git", "push", "-u", "origin", branch_name], repo)
-
-            pr_body = (
-                "Normalize markdown metadata headers to HTML comments and remove MD025 disables."
-            )
-            pr_title = "docs: normalize markdown headers"
-            pr = run(
-                [
-                    "gh",
-                    "pr",
-                    "create",
-                    "--title",
-                    pr_title,
-                    "--body",
-                    pr_body,
-                    "--base",
-                    base_branch,
-                ],
-                repo,
-            )
-            result.branch = branch_name
-            result.base_branch = base_branch
-            result.pr_url = pr.stdout.strip()
-        except subprocess.CalledProcessError as err:
-            stdout = err.stdout.strip() if err.stdout else ""
-            stderr = err.stderr.strip() if err.stderr else ""
-            message = stdout or stderr or str(err)
-            print(f"[WARN] failed to commit/push in {repo.name}: {message}")
-        finally:
-            if created_branch:
-                run(["git", "checkout", base_branch], repo, check=False)
+        for change in changes
+    ]
+
+
+def publish_repo(repo: Path, changes: list[FileChange]) -> RepoResult:
+    """Commit ``changes`` on a new branch, push it, and open a PR."""
+    result = RepoResult(repo_path=repo, issues=_issues(repo, changes))
+    base_branch = run(["git", "rev-parse", "--abbrev-ref", "HEAD"], repo).stdout.strip()
+    branch_name = (
+        f"fix/markdown-headers-{dt.datetime.now(dt.timezone.utc).strftime('%Y%m%d%H%M%S')}"
+    )
+    created_branch = False
+    try:
+        run(["git", "checkout", "-b", branch_name], repo)
+        created_branch = True
+        run(["git", "add", "--"] + [change.path for change in changes], repo)
+        run_precommit_if_present(repo)
+        run(["git", "commit", "-m", MARKDOWN_HEADER_CODEMOD.commit_message], repo)
+        run(["git", "push", "-u", "origin", branch_name], repo)
+
+        pr_body = "Normalize markdown metadata headers to HTML comments and remove MD025 disables."
+        pr_title = "docs: normalize markdown headers"
+        pr = run(
+            [
+                "gh",
+                "pr",
+                "create",
+                "--title",
+                pr_title,
+                "--body",
+                pr_body,
+                "--base",
+                base_branch,
+            ],
+            repo,
+        )
+        result.branch = branch_name
+        result.base_branch = base_branch
+        result.pr_url = pr.stdout.strip()
+    except subprocess.CalledProcessError as err:
+        stdout = err.stdout.strip() if err.stdout else ""
+        stderr = err.stderr.strip() if err.stderr else ""
+        message = stdout or stderr or str(err)
+        print(f"[WARN] failed to commit/push in {repo.name}: {message}")
+    finally:
+        if created_branch:
+            run(["git", "checkout", base_branch], repo, check=False)
     return result
 
 
+def process_repos(
+    repos: Iterable[Path],
+    apply: bool,
+    workers: int = 4,
+    processes: int | None = None,
+) -> list[RepoResult]:
+    """Fix markdown headers in ``repos`` concurrently."""
+    results: list[RepoResult] = []
+    for fleet_result in run_codemod(
+        repos,
+        MARKDOWN_HEADER_CODEMOD,
+        apply=apply,
+        finalize=publish_repo,
+        workers=workers,
+        processes=processes,
+    ):
+        if fleet_result.error:
+            print(f"[WARN] failed to process {fleet_result.repo.name}: {fleet_result.error}")
+        if isinstance(fleet_result.outcome, RepoResult):
+            results.append(fleet_result.outcome)
+            continue
+        repo = fleet_result.repo
+        results.append(RepoResult(repo_path=repo, issues=_issues(repo, fleet_result.changes)))
+    return results
+
+
+def process_repo(repo: Path, apply: bool) -> RepoResult:
+    return process_repos([repo], apply, workers=1, processes=1)[0]
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Fix markdown metadata headers across repos.")
     parser.add_argument("--base-dir", type=Path, default=BASE_DIR, help="Root containing repos")
     parser.add_argument(
         "--apply", action="store_true", help="Apply fixes, commit, push, and open PRs"
     )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Repositories processed concurrently"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Processes used to rewrite files (default: CPU count)",
+    )
     args = parser.parse_args()
 
     summary: list[dict] = []
-    for repo in iter_repos(args.base_dir):
-        result = process_repo(repo, apply=args.apply)
+    results = process_repos(
+        iter_repos(args.base_dir),
+        apply=args.apply,
+        workers=args.workers,
+        processes=args.processes,
+    )
+    for result in results:
+        repo = result.repo_path
         if result.issues:
             summary.append(
                 {
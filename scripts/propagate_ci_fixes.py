@@ -1,17 +1,30 @@
 #!/usr/bin/env python3
 # file: scripts/propagat    # Source linter configs are now in root directory\n    source_linters = GHCOMMON_PATH_ci_fixes.py
-# version: 1.0.0
+# version: 1.1.1
 # guid: 8a7b6c5d-4e3f-2a1b-9c8d-7e6f5a4b3c2d
 
 """Copy fixed CI workflow and Super Linter configs from ghcommon to all repositories.
 
 This script addresses the systematic CI failures caused by incorrect Super Linter
 configuration file references across all repositories.
+
+With --commit-branch the fixes are committed directly onto a branch of each
+target repository with the tree patcher, leaving working trees untouched. The
+branch must not be the one checked out there.
 """
 
+from __future__ import annotations
+
+import argparse
 import shutil
+import subprocess
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".github" / "workflows" / "scripts"))
+
+from git_tree_patcher import TreePatcher, TreePatchError  # noqa: E402
+
 # Source repository (ghcommon)
 GHCOMMON_PATH = Path(__file__).parent.parent.resolve()
 
@@ -75,6 +88,24 @@ def copy_super_linter_configs(target_repo: Path):
     return configs_copied
 
 
+def bump_version_header(content: str) -> tuple[str, str] | None:
+    """Increment the patch version in a '# version:' header.
+
+    Returns:
+        Tuple of (updated content, new version) or None if no header is found
+    """
+    lines = content.split("\n")
+    for i, line in enumerate(lines):
+        if line.startswith("# version:"):
+            # Extract version and increment patch
+            version_str = line.split(": ")[1]
+            major, minor, patch = map(int, version_str.split("."))
+            new_version = f"{major}.{minor}.{patch + 1}"
+            lines[i] = f"# version: {new_version}"
+            return "\n".join(lines), new_version
+    return None
+
+
 def increment_version_in_ci(target_repo: Path):
     """Increment the version in the CI workflow file header."""
     ci_file = target_repo / ".github/workflows/ci.yml"
@@ -86,22 +117,14 @@ def increment_version_in_ci(target_repo: Path):
         with open(ci_file) as f:
             content = f.read()
 
-        # Look for version line and increment patch version
-        lines = content.split("\n")
-        for i, line in enumerate(lines):
-            if line.startswith("# version:"):
-                # Extract version and increment patch
-                version_str = line.split(": ")[1]
-                major, minor, patch = map(int, version_str.split("."))
-                new_version = f"{major}.{minor}.{patch + 1}"
-                lines[i] = f"# version: {new_version}"
-
-                # Write back to file
-                with open(ci_file, "w") as f:
-                    f.write("\n".join(lines))
+        bumped = bump_version_header(content)
+        if bumped:
+            new_content, new_version = bumped
+            with open(ci_file, "w") as f:
+                f.write(new_content)
 
-                print(f"✅ Incremented CI workflow version to {new_version} in {target_repo.name}")
-                return True
+            print(f"✅ Incremented CI workflow version to {new_version} in {target_repo.name}")
+            return True
 
         print(f"⚠️ No version header found in CI workflow for {target_repo.name}")
         return False
@@ -111,8 +134,86 @@ def increment_version_in_ci(target_repo: Path):
         return False
 
 
+def _git_output(target_repo: Path, *args: str) -> str | None:
+    """Return the stripped output of a git command, or None if it fails."""
+    result = subprocess.run(
+        ["git", *args], cwd=target_repo, capture_output=True, text=True, check=False
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def commit_ci_fixes(target_repo: Path, branch: str) -> bool:
+    """Commit the CI workflow and linter configs onto a branch without a checkout.
+
+    The commit is built on top of refs/heads/<branch> (or HEAD when the
+    branch does not exist yet) with the tree patcher, and the ref is only
+    moved if nobody else moved it meanwhile. The checked-out branch is
+    refused, since moving it would leave the index and working tree behind.
+    """
+    ref = f"refs/heads/{branch}"
+    if _git_output(target_repo, "symbolic-ref", "--quiet", "HEAD") == ref:
+        print(f"❌ {branch} is checked out in {target_repo.name}; use another --commit-branch")
+        return False
+    old = _git_output(target_repo, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    base = old or "HEAD"
+    patcher = TreePatcher(target_repo, base=base)
+
+    source_ci = GHCOMMON_PATH / ".github/workflows/ci.yml"
+    if not source_ci.exists():
+        print("❌ Source CI workflow not found in ghcommon")
+        return False
+    ci_content = source_ci.read_text()
+    bumped = bump_version_header(ci_content)
+    if bumped:
+        ci_content = bumped[0]
+    patcher.add_bytes(".github/workflows/ci.yml", ci_content.encode())
+
+    configs_found = 0
+    for config_file in ["super-linter-ci.env", "super-linter-pr.env"]:
+        source_config = GHCOMMON_PATH / config_file
+        if source_config.exists():
+            patcher.add_file(config_file, source_config)
+            configs_found += 1
+        else:
+            print(f"❌ {config_file} not found in ghcommon")
+
+    # Only add .eslintrc.yml if the target does not have one yet
+    source_eslint = GHCOMMON_PATH / ".eslintrc.yml"
+    has_eslint = (
+        subprocess.run(
+            ["git", "cat-file", "-e", f"{base}:.eslintrc.yml"],
+            cwd=target_repo,
+            capture_output=True,
+            check=False,
+        ).returncode
+        == 0
+    )
+    if source_eslint.exists() and not has_eslint:
+        patcher.add_file(".eslintrc.yml", source_eslint)
+
+    try:
+        commit = patcher.commit("ci: propagate CI workflow and Super Linter config fixes")
+        if commit is None:
+            print(f"ℹ️ {target_repo.name} already up to date")
+            return configs_found >= 2
+        patcher.update_ref(ref, commit, old or "0" * 40)
+    except TreePatchError as e:
+        print(f"❌ Error committing fixes in {target_repo.name}: {e}")
+        return False
+
+    print(f"✅ Committed {commit[:12]} to {branch} in {target_repo.name}")
+    return configs_found >= 2
+
+
 def main():
     """Main function to propagate CI fixes to all repositories."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--commit-branch",
+        help="Commit the fixes onto this branch (no checkout) instead of copying files",
+    )
+    args = parser.parse_args()
+
     print("🚀 Propagating CI fixes from ghcommon to all repositories...")
     print()
 
@@ -134,6 +235,12 @@ def main():
             print(f"⚠️ Repository not found: {repo_path}")
             continue
 
+        if args.commit_branch:
+            if commit_ci_fixes(repo_path, args.commit_branch):
+                success_count += 1
+            print()
+            continue
+
         # Copy CI workflow
         ci_copied = copy_ci_workflow(repo_path)
 
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/repo-audit.py
-# version: 1.1.1
+# version: 1.3.3
 # guid: a1b2c3d4-e5f6-7a8b-9c0d-1e2f3a4b5c6d
 
 """Repository Audit Script
@@ -13,15 +13,27 @@ This script audits all repositories in the workspace to compare:
 4. Version mismatches
 
 Generates a comprehensive comparison chart and identifies repositories that need updates.
+Results are held in a columnar table (repo x file) and can also be exported as
+CSV or JSON lines for day-to-day diffing.
 """
 
+from __future__ import annotations
+
 import argparse
+import csv
 import json
 import os
-import re
+import sys
+from array import array
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".github" / "workflows" / "scripts"))
+
+from header_metadata import HeaderIndex, is_well_formed_guid  # noqa: E402
+
 
 @dataclass
 class FileInfo:
@@ -44,12 +56,131 @@ class RepoInfo:
     is_git_repo: bool = False
 
 
+EXPORT_COLUMNS = ["repo", "file", "exists", "version", "guid", "size"]
+
+
+class AuditTable:
+    """Columnar audit results with one row per (repo, file) pair.
+
+    Row ``r * len(files) + f`` holds file ``f`` of repository ``r``. Versions
+    and GUIDs are interned, existence flags live in a bytearray and sizes in a
+    signed 64-bit array, so 150+ repos stay small and cheap to walk.
+    """
+
+    def __init__(self, files: list[str]):
+        self.files = list(files)
+        self.repos: list[str] = []
+        self.paths: list[str] = []
+        self.is_git_repo = bytearray()
+        self.exists = bytearray()
+        self.sizes = array("q")
+        self.versions: list[str | None] = []
+        self.guids: list[str | None] = []
+
+    def append_repo(
+        self,
+        name: str,
+        path: str,
+        is_git_repo: bool,
+        cells: list[tuple[bool, int, str | None, str | None]],
+    ) -> None:
+        """Append a repository row given (exists, size, version, guid) per file."""
+        self.repos.append(name)
+        self.paths.append(path)
+        self.is_git_repo.append(int(is_git_repo))
+        for exists, size, version, guid in cells:
+            self.exists.append(int(exists))
+            self.sizes.append(size)
+            self.versions.append(sys.intern(version) if version else None)
+            self.guids.append(sys.intern(guid) if guid else None)
+
+    @classmethod
+    def from_repo_infos(cls, files: list[str], repos: Iterable[RepoInfo]) -> AuditTable:
+        """Build a table from RepoInfo objects; files a repo lacks are missing."""
+        repos = list(repos)
+        columns = list(dict.fromkeys([*files, *(name for repo in repos for name in repo.files)]))
+        table = cls(columns)
+        for repo in repos:
+            cells = []
+            for file_name in columns:
+                info = repo.files.get(file_name)
+                if info is None:
+                    cells.append((False, 0, None, None))
+                else:
+                    cells.append((info.exists, info.size, info.version, info.guid))
+            table.append_repo(repo.name, repo.path, repo.is_git_repo, cells)
+        return table
+
+    def cell(self, repo_index: int, file_index: int) -> tuple[bool, int, str | None, str | None]:
+        """Return (exists, size, version, guid) for a repo/file pair."""
+        row = repo_index * len(self.files) + file_index
+        return bool(self.exists[row]), self.sizes[row], self.versions[row], self.guids[row]
+
+    def iter_records(self):
+        """Yield export records ordered by repository then file."""
+        for repo_index, repo_name in enumerate(self.repos):
+            for file_index, file_name in enumerate(self.files):
+                exists, size, version, guid = self.cell(repo_index, file_index)
+                yield {
+                    "repo": repo_name,
+                    "file": file_name,
+                    "exists": exists,
+                    "version": version,
+                    "guid": guid,
+                    "size": size,
+                }
+
+    def to_repo_infos(self) -> dict[str, RepoInfo]:
+        """Materialize the table as RepoInfo objects for the detailed report."""
+        repos = {}
+        for repo_index, repo_name in enumerate(self.repos):
+            files = {}
+            for file_index, file_name in enumerate(self.files):
+                exists, size, version, guid = self.cell(repo_index, file_index)
+                files[file_name] = FileInfo(
+                    path=str(Path(self.paths[repo_index]) / file_name),
+                    version=version,
+                    guid=guid,
+                    exists=exists,
+                    size=size,
+                )
+            repos[repo_name] = RepoInfo(
+                name=repo_name,
+                path=self.paths[repo_index],
+                files=files,
+                is_git_repo=bool(self.is_git_repo[repo_index]),
+            )
+        return repos
+
+    def write_csv(self, output_path: Path) -> None:
+        """Export the table as CSV."""
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            for record in self.iter_records():
+                writer.writerow(record)
+
+    def write_jsonl(self, output_path: Path) -> None:
+        """Export the table as JSON lines."""
+        with open(output_path, "w", encoding="utf-8") as f:
+            for record in self.iter_records():
+                f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
 class RepoAuditor:
     """Audits repositories for file consistency and versions."""
 
-    def __init__(self, base_path: str):
+    def __init__(
+        self,
+        base_path: str,
+        header_index: HeaderIndex | None = None,
+        workers: int = 8,
+    ):
         self.base_path = Path(base_path)
+        self.header_index = header_index or HeaderIndex()
+        self.workers = max(1, workers)
         self.repos: dict[str, RepoInfo] = {}
+        self.table: AuditTable | None = None
         self.reference_repo = "ghcommon"  # Use ghcommon as the reference
 
         # Files to audit (relative to repo root)
@@ -74,132 +205,123 @@ class RepoAuditor:
             ".github/instructions/r.instructions.md",
         ]
 
+    @staticmethod
+    def _audited_guid(guid: str | None) -> str | None:
+        """Keep only well-formed GUIDs; anything else counts as no GUID."""
+        return guid if is_well_formed_guid(guid) else None
+
     def extract_version_and_guid(self, file_path: Path) -> tuple[str | None, str | None]:
         """Extract version and GUID from file headers."""
         if not file_path.exists():
             return None, None
 
         try:
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read(1000)  # Read first 1KB to find headers
-
-            # Look for version patterns
-            version_patterns = [
-                r"version:\s*([0-9]+\.[0-9]+\.[0-9]+)",
-                r"<!-- version:\s*([0-9]+\.[0-9]+\.[0-9]+)\s*-->",
-                r"# version:\s*([0-9]+\.[0-9]+\.[0-9]+)",
-                r"// version:\s*([0-9]+\.[0-9]+\.[0-9]+)",
-            ]
-
-            # Look for GUID patterns
-            guid_patterns = [
-                r"guid:\s*([a-f0-9-]{36})",
-                r"<!-- guid:\s*([a-f0-9-]{36})\s*-->",
-                r"# guid:\s*([a-f0-9-]{36})",
-                r"// guid:\s*([a-f0-9-]{36})",
-            ]
-
-            version = None
-            guid = None
-
-            for pattern in version_patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    version = match.group(1)
-                    break
-
-            for pattern in guid_patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    guid = match.group(1)
-                    break
-
-            return version, guid
+            metadata = self.header_index.lookup(file_path)
+            return metadata.version, self._audited_guid(metadata.guid)
 
         except Exception as e:
             print(f"Error reading {file_path}: {e}")
             return None, None
 
-    def scan_repository(self, repo_path: Path) -> RepoInfo:
-        """Scan a single repository for audit files."""
-        repo_name = repo_path.name
-        repo_info = RepoInfo(
-            name=repo_name,
-            path=str(repo_path),
-            files={},
-            is_git_repo=(repo_path / ".git").exists(),
-        )
+    def _scan_files(
+        self, repo_path: Path
+    ) -> tuple[bool, list[tuple[bool, int, str | None, str | None]]]:
+        """Scan audit files with a single stat per file.
 
+        Returns:
+            Tuple of (is_git_repo, [(exists, size, version, guid), ...])
+        """
+        cells = []
         for audit_file in self.audit_files:
             file_path = repo_path / audit_file
-            version, guid = self.extract_version_and_guid(file_path)
-
-            repo_info.files[audit_file] = FileInfo(
-                path=str(file_path),
-                version=version,
-                guid=guid,
-                exists=file_path.exists(),
-                size=file_path.stat().st_size if file_path.exists() else 0,
-            )
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                cells.append((False, 0, None, None))
+                continue
+
+            try:
+                metadata = self.header_index.lookup(file_path, stat_result)
+                version, guid = metadata.version, self._audited_guid(metadata.guid)
+            except Exception as e:
+                print(f"Error reading {file_path}: {e}")
+                version, guid = None, None
+            cells.append((True, stat_result.st_size, version, guid))
+
+        return os.path.exists(repo_path / ".git"), cells
 
-        return repo_info
+    def scan_repository(self, repo_path: Path) -> RepoInfo:
+        """Scan a single repository for audit files."""
+        is_git_repo, cells = self._scan_files(repo_path)
+        table = AuditTable(self.audit_files)
+        table.append_repo(repo_path.name, str(repo_path), is_git_repo, cells)
+        return table.to_repo_infos()[repo_path.name]
+
+    def _list_repositories(self) -> list[Path]:
+        """Return repository directories under the base path, sorted by name."""
+        skip_dirs = {
+            "ubuntu-autoinstall-webhook.bfg-report",
+            "subtitle-manager.old",
+        }
+        repositories = []
+        with os.scandir(self.base_path) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or entry.name in skip_dirs:
+                    continue
+                if entry.is_dir():
+                    repositories.append(Path(entry.path))
+        return sorted(repositories, key=lambda path: path.name)
 
     def scan_all_repositories(self) -> None:
-        """Scan all repositories in the base path."""
+        """Scan all repositories in the base path concurrently."""
         print(f"Scanning repositories in {self.base_path}...")
 
-        for item in self.base_path.iterdir():
-            if item.is_dir() and not item.name.startswith("."):
-                # Skip certain directories
-                skip_dirs = {
-                    "ubuntu-autoinstall-webhook.bfg-report",
-                    "subtitle-manager.old",
-                }
-                if item.name in skip_dirs:
-                    continue
+        repositories = self._list_repositories()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self._scan_files, repositories))
 
-                print(f"  Scanning {item.name}...")
-                repo_info = self.scan_repository(item)
-                self.repos[item.name] = repo_info
+        table = AuditTable(self.audit_files)
+        for repo_path, (is_git_repo, cells) in zip(repositories, results):
+            table.append_repo(repo_path.name, str(repo_path), is_git_repo, cells)
+
+        print(f"  Scanned {len(repositories)} repositories")
+        self.table = table
+        self.repos = table.to_repo_infos()
 
     def generate_comparison_chart(self) -> str:
-        """Generate a comparison chart showing file versions across repositories."""
-        if not self.repos:
+        """Generate a comparison chart showing file versions across repositories.
+
+        Uses the scanned table, or ``self.repos`` when only that is filled in.
+        """
+        table = self.table
+        if not table or not table.repos:
+            table = AuditTable.from_repo_infos(self.audit_files, self.repos.values())
+        if not table.repos:
             return "No repositories found to compare."
 
-        # Get all unique files across all repos
-        all_files = set()
-        for repo in self.repos.values():
-            all_files.update(repo.files.keys())
-
-        all_files = sorted(all_files)
-        repo_names = sorted(self.repos.keys())
+        repo_order = sorted(range(len(table.repos)), key=lambda index: table.repos[index])
+        file_order = sorted(range(len(table.files)), key=lambda index: table.files[index])
 
         # Create header
         chart = []
-        header = ["File"] + repo_names
+        header = ["File"] + [table.repos[index] for index in repo_order]
         chart.append(header)
 
         # Add separator
-        chart.append(["-" * 50] + ["-" * 20] * len(repo_names))
+        chart.append(["-" * 50] + ["-" * 20] * len(repo_order))
 
         # Add file rows
-        for file_name in all_files:
-            row = [file_name.split("/")[-1]]  # Just filename for readability
-
-            for repo_name in repo_names:
-                repo = self.repos[repo_name]
-                if file_name in repo.files:
-                    file_info = repo.files[file_name]
-                    if file_info.exists:
-                        if file_info.version:
-                            row.append(f"v{file_info.version}")
-                        else:
-                            row.append("no-version")
-                    else:
-                        row.append("missing")
-                else:
+        for file_index in file_order:
+            row = [table.files[file_index].split("/")[-1]]  # Just filename for readability
+
+            for repo_index in repo_order:
+                exists, _size, version, _guid = table.cell(repo_index, file_index)
+                if not exists:
                     row.append("missing")
+                elif version:
+                    row.append(f"v{version}")
+                else:
+                    row.append("no-version")
 
             chart.append(row)
 
@@ -312,14 +434,44 @@ def main():
         help="Output format",
     )
 
+    parser.add_argument(
+        "--header-index",
+        help="Optional JSON file caching header metadata between runs",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of repositories scanned concurrently",
+    )
+    parser.add_argument(
+        "--export",
+        action="append",
+        choices=["csv", "jsonl"],
+        default=[],
+        help="Also export the repo x file table (repeatable)",
+    )
+
     args = parser.parse_args()
 
-    auditor = RepoAuditor(args.base_path)
+    header_index = HeaderIndex(args.header_index)
+    auditor = RepoAuditor(args.base_path, header_index=header_index, workers=args.workers)
     auditor.scan_all_repositories()
+    header_index.save()
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True)
 
+    if "csv" in args.export:
+        csv_file = output_dir / "repo-audit.csv"
+        auditor.table.write_csv(csv_file)
+        print(f"CSV export saved to: {csv_file}")
+
+    if "jsonl" in args.export:
+        jsonl_file = output_dir / "repo-audit.jsonl"
+        auditor.table.write_jsonl(jsonl_file)
+        print(f"JSON lines export saved to: {jsonl_file}")
+
     if args.format in ["table", "both"]:
         chart = auditor.generate_comparison_chart()
         print("\n" + "=" * 80)
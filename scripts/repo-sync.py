@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/repo-sync.py
-# version: 1.1.0
+# version: 1.2.0
 # guid: 9a8b7c6d-5e4f-3d2c-1b0a-9c8b7a6d5e4f
 
 """Repository Synchronization Tool
@@ -18,13 +18,16 @@ for all shared files and propagates them to target repositories.
 import argparse
 import hashlib
 import json
-import re
 import shutil
 import sys
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".github" / "workflows" / "scripts"))
+
+from header_metadata import read_header  # noqa: E402
+
 
 @dataclass
 class SyncOperation:
@@ -84,6 +87,7 @@ class RepoSynchronizer:
         self.source_repo = source_repo
         self.dry_run = dry_run
         self.operations: list[SyncOperation] = []
+        self.source_sizes: dict[str, int] = {}
 
         # Validate source repository
         self.source_path = self.base_path / source_repo
@@ -99,26 +103,24 @@ class RepoSynchronizer:
 
         for file_path in self.TRACKED_FILES:
             full_path = self.source_path / file_path
-            if full_path.exists():
-                try:
-                    content = full_path.read_text(encoding="utf-8")
-                    version, guid = self._extract_version_and_guid(content)
-                    content_hash = hashlib.md5(content.encode()).hexdigest()
-                    source_files[file_path] = (version, guid, content_hash)
-                except Exception as e:
-                    print(f"Warning: Could not load {file_path} from source: {e}")
+            try:
+                stat_result = full_path.stat()
+            except FileNotFoundError:
+                continue
+            try:
+                version, guid = self._extract_version_and_guid(full_path, stat_result)
+                content_hash = hashlib.md5(full_path.read_bytes()).hexdigest()
+                source_files[file_path] = (version, guid, content_hash)
+                self.source_sizes[file_path] = stat_result.st_size
+            except Exception as e:
+                print(f"Warning: Could not load {file_path} from source: {e}")
 
         return source_files
 
-    def _extract_version_and_guid(self, content: str) -> tuple[str, str]:
-        """Extract version and GUID from file content"""
-        version_match = re.search(r"version:\s*([^\s]+)", content)
-        guid_match = re.search(r"guid:\s*([^\s]+)", content)
-
-        version = version_match.group(1) if version_match else "no-version"
-        guid = guid_match.group(1) if guid_match else "no-guid"
-
-        return version, guid
+    def _extract_version_and_guid(self, full_path: Path, stat_result=None) -> tuple[str, str]:
+        """Extract version and GUID from the file header"""
+        metadata = read_header(full_path, stat_result=stat_result)
+        return metadata.version or "no-version", metadata.guid or "no-guid"
 
     def _get_repositories(self) -> list[Path]:
         """Get list of Git repositories to synchronize"""
@@ -134,18 +136,20 @@ class RepoSynchronizer:
         """Analyze target file status"""
         full_path = repo_path / file_path
 
-        if not full_path.exists():
+        try:
+            stat_result = full_path.stat()
+        except FileNotFoundError:
             return "missing", "no-version", "no-guid", False
 
         try:
-            content = full_path.read_text(encoding="utf-8")
-            version, guid = self._extract_version_and_guid(content)
-            content_hash = hashlib.md5(content.encode()).hexdigest()
+            version, guid = self._extract_version_and_guid(full_path, stat_result)
 
-            # Check if content matches source
+            # Only hash the full file when the size matches the source
             source_info = self.source_files.get(file_path)
-            if source_info and source_info[2] == content_hash:
-                return "current", version, guid, True
+            if source_info and self.source_sizes.get(file_path) == stat_result.st_size:
+                content_hash = hashlib.md5(full_path.read_bytes()).hexdigest()
+                if source_info[2] == content_hash:
+                    return "current", version, guid, True
 
             return "outdated", version, guid, False
 
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/submit_codex_jobs.py
-# version: 1.0.0
+# version: 1.1.2
 # guid: 9c1d77e9-84a6-4b9b-9e02-d8f6c5bfa519
 """Submit codex jobs described in a JSON file.
 
@@ -11,34 +11,148 @@ Each job object must include:
 - priority: job priority (passed through)
 - repeat (optional): if true, submit even if uuid was submitted before
 
+Job files may be a JSON array or JSON lines (one job per line); both are
+streamed rather than loaded whole.
+
 The script maintains a local ledger of submitted UUIDs in
-``.codex_submitted_jobs.json`` to prevent accidental duplicates.
+``.codex_submitted_jobs.jsonl`` to prevent accidental duplicates. Every
+successful submission is appended and fsync'd immediately, so a crash never
+causes completed jobs to be re-submitted. The journal is compacted on load and
+a legacy ``.codex_submitted_jobs.json`` array is migrated automatically.
+
+With ``--workers N`` jobs are submitted concurrently, while jobs for the same
+repository are still submitted one at a time and in file order.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import subprocess
 import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-LEDGER_PATH = Path(".codex_submitted_jobs.json")
+LEDGER_PATH = Path(".codex_submitted_jobs.jsonl")
+LEGACY_LEDGER_PATH = Path(".codex_submitted_jobs.json")
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _fsync_directory(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def load_ledger(path: Path = LEDGER_PATH, legacy_path: Path = LEGACY_LEDGER_PATH) -> set[str]:
+    """Load and compact the set of previously submitted job UUIDs.
+
+    Journal lines that cannot be parsed (for example a write torn by a crash)
+    are dropped. The compacted journal replaces the old one atomically.
+    """
+    ledger: set[str] = set()
+    if legacy_path.exists():
+        with legacy_path.open("r", encoding="utf-8") as handle:
+            ledger.update(json.load(handle))
+
+    lines = 0
+    if path.exists():
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                lines += 1
+                try:
+                    ledger.add(json.loads(line)["uuid"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+
+    if lines != len(ledger) or legacy_path.exists():
+        save_ledger(ledger, path)
+        if legacy_path.exists():
+            legacy_path.unlink()
+    return ledger
+
+
+def save_ledger(ledger: set[str], path: Path = LEDGER_PATH) -> None:
+    """Atomically write a compacted journal of submitted job UUIDs."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        for job_id in sorted(ledger):
+            handle.write(json.dumps({"uuid": job_id}) + "\n")
+        handle.flush()
+        os.fsync(handle.fileno())
+    tmp_path.replace(path)
+    _fsync_directory(path.resolve().parent)
+
+
+class LedgerJournal:
+    """Append-only, fsync'd journal of submitted job UUIDs."""
 
+    def __init__(self, path: Path = LEDGER_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._handle = path.open("a", encoding="utf-8")
 
-def load_ledger() -> set[str]:
-    """Load the set of previously submitted job UUIDs."""
-    if LEDGER_PATH.exists():
-        with LEDGER_PATH.open("r", encoding="utf-8") as handle:
-            return set(json.load(handle))
-    return set()
+    def append(self, job_id: str) -> None:
+        """Durably record a submitted job."""
+        record = {"uuid": job_id, "submitted_at": datetime.now(timezone.utc).isoformat()}
+        with self._lock:
+            self._handle.write(json.dumps(record) + "\n")
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
 
+    def close(self) -> None:
+        """Close the journal file."""
+        self._handle.close()
 
-def save_ledger(ledger: set[str]) -> None:
-    """Persist the ledger of submitted job UUIDs."""
-    with LEDGER_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(sorted(ledger), handle, indent=2)
+
+def iter_jobs(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream jobs from a JSON array or JSON-lines file."""
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as handle:
+        first = handle.read(1)
+        while first.isspace():
+            first = handle.read(1)
+        handle.seek(0)
+
+        if first != "[":
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        buffer = handle.read(STREAM_CHUNK_SIZE)
+        position = buffer.index("[") + 1
+        eof = False
+        while True:
+            while True:
+                stripped = buffer[position:].lstrip(" \t\r\n,")
+                position = len(buffer) - len(stripped)
+                if stripped.startswith("]"):
+                    return
+                try:
+                    job, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    break
+                yield job
+                position = end
+            if eof:
+                raise ValueError(f"Malformed job array in {path}")
+            chunk = handle.read(STREAM_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
 
 
 def submit_job(job: dict[str, Any]) -> None:
@@ -62,31 +176,123 @@ def submit_job(job: dict[str, Any]) -> None:
     subprocess.run(cmd, check=True)
 
 
-def process_jobs(jobs: list[dict[str, Any]], ledger: set[str]) -> None:
-    """Process and submit all jobs."""
-    for job in jobs:
+class RepoSerialPool:
+    """Thread pool that runs at most one task per repository at a time.
+
+    Tasks for a busy repository wait in a per-repo FIFO queue instead of
+    occupying a worker. ``max_pending`` bounds queued tasks so streamed job
+    files are never buffered whole.
+    """
+
+    def __init__(self, workers: int, max_pending: int | None = None) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._queues: dict[str, deque[Callable[[], None]]] = {}
+        self._slots = threading.BoundedSemaphore(max_pending or workers * 4)
+
+    def submit(self, repo: str, task: Callable[[], None]) -> None:
+        """Queue a task for a repository, blocking while the pool is full."""
+        self._slots.acquire()
+        with self._lock:
+            queue = self._queues.get(repo)
+            if queue is not None:
+                queue.append(task)
+                return
+            self._queues[repo] = deque()
+        self._executor.submit(self._run, repo, task)
+
+    def _run(self, repo: str, task: Callable[[], None]) -> None:
+        try:
+            task()
+        finally:
+            self._slots.release()
+            with self._lock:
+                queue = self._queues[repo]
+                next_task = queue.popleft() if queue else None
+                if next_task is None:
+                    del self._queues[repo]
+                    if not self._queues:
+                        self._idle.notify_all()
+            if next_task is not None:
+                self._executor.submit(self._run, repo, next_task)
+
+    def wait(self) -> None:
+        """Block until every queued task has finished."""
+        with self._idle:
+            self._idle.wait_for(lambda: not self._queues)
+        self._executor.shutdown(wait=True)
+
+
+def process_jobs(
+    jobs: Iterator[dict[str, Any]] | list[dict[str, Any]],
+    ledger: set[str],
+    journal: LedgerJournal | None = None,
+    workers: int = 1,
+) -> int:
+    """Process and submit all jobs.
+
+    Returns:
+        Number of jobs that failed to submit.
+    """
+    failures: list[str] = []
+    claimed: set[str] = set()
+    lock = threading.Lock()
+
+    def run(job: dict[str, Any]) -> None:
         job_id = job["uuid"]
-        repeat = bool(job.get("repeat", False))
-        if job_id in ledger and not repeat:
-            print(f"Skipping {job_id}: already submitted", file=sys.stderr)
-            continue
-        submit_job(job)
-        ledger.add(job_id)
+        try:
+            submit_job(job)
+        except Exception as exc:  # malformed jobs too; a pooled error would be lost
+            print(f"Failed to submit {job_id}: {exc!r}", file=sys.stderr)
+            with lock:
+                failures.append(job_id)
+            return
+        with lock:
+            ledger.add(job_id)
+        if journal is not None:
+            journal.append(job_id)
+
+    pool = RepoSerialPool(workers) if workers > 1 else None
+    try:
+        for job in jobs:
+            job_id = job["uuid"]
+            repeat = bool(job.get("repeat", False))
+            if (job_id in ledger or job_id in claimed) and not repeat:
+                print(f"Skipping {job_id}: already submitted", file=sys.stderr)
+                continue
+            claimed.add(job_id)
+            if pool is None:
+                run(job)
+            else:
+                # A job without a repo still goes through run(), which
+                # reports it as a failure exactly as in serial mode.
+                pool.submit(job.get("repo", ""), lambda job=job: run(job))
+    finally:
+        if pool is not None:
+            pool.wait()
+    return len(failures)
 
 
 def main() -> int:
     """Program entry point."""
     parser = argparse.ArgumentParser(description="Submit codex jobs from a JSON file.")
-    parser.add_argument("path", type=Path, help="Path to JSON job file.")
+    parser.add_argument("path", type=Path, help="Path to JSON or JSON-lines job file.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of concurrent submissions; jobs for one repo stay serial (default: 1)",
+    )
     args = parser.parse_args()
 
-    with args.path.open("r", encoding="utf-8") as handle:
-        jobs: list[dict[str, Any]] = json.load(handle)
-
     ledger = load_ledger()
-    process_jobs(jobs, ledger)
-    save_ledger(ledger)
-    return 0
+    journal = LedgerJournal()
+    try:
+        failures = process_jobs(iter_jobs(args.path), ledger, journal, max(1, args.workers))
+    finally:
+        journal.close()
+    return 1 if failures else 0
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/sync-gitignore.py
-# version: 1.0.0
+# version: 1.1.0
 # guid: 7b2c0e3d-9f81-4a5e-8c2b-1d4f6e9a3c10
 
 """Append (or replace) a managed block of standard ignore patterns in every
@@ -13,15 +13,27 @@ Usage:
     scripts/sync-gitignore.py --dry-run       # preview changes
     scripts/sync-gitignore.py --root PATH ... # override search roots
     scripts/sync-gitignore.py --commit        # also git add/commit per repo
+    scripts/sync-gitignore.py --workers 16    # repos processed concurrently
+
+Repositories are updated in parallel through the shared fleet codemod runner.
 """
 
 from __future__ import annotations
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".github" / "workflows" / "scripts"))
+
+from fleet_codemod import (  # noqa: E402
+    Codemod,
+    FileChange,
+    commit_changes,
+    iter_repos,
+    run_codemod,
+)
+
 DEFAULT_ROOTS = [
     Path.home() / "repos" / "github.com" / "jdfalk",
 ]
@@ -53,90 +65,51 @@ MANAGED_PATTERNS = [
 ]
 
 
-def find_gitignores(roots: list[Path]) -> list[Path]:
-    found: list[Path] = []
-    for root in roots:
-        if not root.is_dir():
-            continue
-        for entry in sorted(root.iterdir()):
-            if not entry.is_dir():
-                continue
-            if not (entry / ".git").exists():
-                continue
-            gi = entry / ".gitignore"
-            if gi.exists():
-                found.append(gi)
-            else:
-                found.append(gi)  # we'll create it
-    return found
-
-
 def build_block() -> str:
     body = "\n".join(MANAGED_PATTERNS)
     return f"\n{BEGIN_MARKER}\n{body}\n{END_MARKER}\n"
 
 
-def update_file(path: Path, block: str, dry_run: bool) -> tuple[bool, str]:
-    """Returns (changed, action). action in {created, replaced, appended, unchanged}."""
+def render_gitignore(original: str | None, block: str) -> tuple[str, str]:
+    """Return (new_content, action). action in {created, replaced, appended, unchanged}."""
     new_block = block.strip("\n") + "\n"
-    if not path.exists():
-        new_content = new_block
-        action = "created"
+    if original is None:
+        return new_block, "created"
+    if BEGIN_MARKER in original and END_MARKER in original:
+        pre, _, rest = original.partition(BEGIN_MARKER)
+        _, _, post = rest.partition(END_MARKER)
+        pre = pre.rstrip("\n")
+        post = post.lstrip("\n")
+        new_content = (pre + "\n\n" if pre else "") + new_block + ("\n" + post if post else "")
+        action = "replaced"
     else:
-        original = path.read_text(encoding="utf-8")
-        if BEGIN_MARKER in original and END_MARKER in original:
-            pre, _, rest = original.partition(BEGIN_MARKER)
-            _, _, post = rest.partition(END_MARKER)
-            pre = pre.rstrip("\n")
-            post = post.lstrip("\n")
-            new_content = (pre + "\n\n" if pre else "") + new_block + ("\n" + post if post else "")
-            action = "replaced"
-        else:
-            sep = "" if original.endswith("\n") else "\n"
-            new_content = original + sep + "\n" + new_block
-            action = "appended"
-
-        if new_content == original:
-            return False, "unchanged"
-
-    if not dry_run:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(new_content, encoding="utf-8")
-    return True, action
-
-
-def maybe_commit(repo: Path, dry_run: bool) -> None:
-    try:
-        subprocess.run(
-            ["git", "-C", str(repo), "add", ".gitignore"],
-            check=True,
-            capture_output=True,
-        )
-        # Skip commit if nothing staged
-        result = subprocess.run(
-            ["git", "-C", str(repo), "diff", "--cached", "--quiet"],
-        )
-        if result.returncode == 0:
-            return
-        if dry_run:
-            print(f"  (dry-run) would commit in {repo}")
-            return
-        subprocess.run(
-            [
-                "git",
-                "-C",
-                str(repo),
-                "commit",
-                "-m",
-                "chore(gitignore): sync managed ignore block\n\n"
-                "Co-authored-by: Copilot <223556219+Copilot@users.noreply.github.com>",
-            ],
-            check=True,
-            capture_output=True,
-        )
-        print(f"  committed in {repo}")
-    except subprocess.CalledProcessError as exc:
-        print(f"  ! git error in {repo}: {exc.stderr.decode().strip()}", file=sys.stderr)
+        sep = "" if original.endswith("\n") else "\n"
+        new_content = original + sep + "\n" + new_block
+        action = "appended"
+    if new_content == original:
+        return original, "unchanged"
+    return new_content, action
+
+
+def gitignore_transform(relpath: str, text: str) -> str:
+    """Codemod transform: install or refresh the managed ignore block."""
+    return render_gitignore(text or None, build_block())[0]
+
+
+GITIGNORE_CODEMOD = Codemod(
+    name="sync-gitignore",
+    transform=gitignore_transform,
+    paths=(".gitignore",),
+    commit_message=(
+        "chore(gitignore): sync managed ignore block\n\n"
+        "Co-authored-by: Copilot <223556219+Copilot@users.noreply.github.com>"
+    ),
+)
+
+
+def commit_repo(repo: Path, changes: list[FileChange]) -> str | None:
+    """Commit the updated .gitignore (one add + commit per repo)."""
+    return commit_changes(repo, changes, GITIGNORE_CODEMOD.commit_message)
 
 
 def main() -> int:
@@ -150,24 +123,45 @@ def main() -> int:
     )
     p.add_argument("--dry-run", action="store_true", help="Show changes without writing")
     p.add_argument("--commit", action="store_true", help="git add + commit each updated repo")
+    p.add_argument("--workers", type=int, default=8, help="Repositories processed concurrently")
     args = p.parse_args()
 
     roots = args.root if args.root else DEFAULT_ROOTS
-    block = build_block()
-    files = find_gitignores(roots)
+    repos = list(iter_repos(roots))
 
-    if not files:
+    if not repos:
         print("No git repos found under:", *roots, file=sys.stderr)
         return 1
 
+    # Classify before the run so the summary reports what each file needed.
+    block = build_block()
+    actions: dict[Path, str] = {}
+    for repo in repos:
+        gitignore = repo / ".gitignore"
+        original = gitignore.read_text(encoding="utf-8") if gitignore.exists() else ""
+        actions[repo] = render_gitignore(original or None, block)[1]
+
+    results = run_codemod(
+        repos,
+        GITIGNORE_CODEMOD,
+        apply=not args.dry_run,
+        finalize=commit_repo if args.commit else None,
+        workers=args.workers,
+        processes=1,
+    )
+
     summary: dict[str, int] = {"created": 0, "replaced": 0, "appended": 0, "unchanged": 0}
-    for gi in files:
-        changed, action = update_file(gi, block, args.dry_run)
+    for result in results:
+        action = actions[result.repo]
         summary[action] += 1
-        marker = "*" if changed else " "
-        print(f"{marker} {action:9s} {gi}")
-        if changed and args.commit:
-            maybe_commit(gi.parent, args.dry_run)
+        marker = "*" if result.changes else " "
+        print(f"{marker} {action:9s} {result.repo / '.gitignore'}")
+        if result.error:
+            print(f"  ! git error in {result.repo}: {result.error}", file=sys.stderr)
+        elif result.outcome:
+            print(f"  committed in {result.repo}")
+        elif result.changes and args.commit and args.dry_run:
+            print(f"  (dry-run) would commit in {result.repo}")
 
     print()
     print("Summary:", ", ".join(f"{k}={v}" for k, v in summary.items()))
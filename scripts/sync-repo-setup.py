@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/sync-repo-setup.py
-# version: 1.0.1
+# version: 1.1.0
 # guid: f1a2b3c4-d5e6-f7a8-b9c0-d1e2f3a4b5c6
 
 """Sync repository setup files from ghcommon to other repositories.
@@ -20,11 +20,16 @@ import argparse
 import logging
 import re
 import shutil
+import sys
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".github" / "workflows" / "scripts"))
+
+from header_metadata import parse_header, read_header  # noqa: E402
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -32,20 +37,7 @@ logger = logging.getLogger(__name__)
 
 def extract_version_from_content(content: str) -> str | None:
     """Extract version from file content."""
-    # Look for version patterns in various comment formats
-    patterns = [
-        r"<!-- version: ([\d.]+) -->",  # HTML/Markdown comments
-        r"# version: ([\d.]+)",  # Shell/Python comments
-        r"// version: ([\d.]+)",  # JavaScript/Go comments
-        r"/\* version: ([\d.]+) \*/",  # CSS comments
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, content)
-        if match:
-            return match.group(1)
-
-    return None
+    return parse_header(content).version
 
 
 def compare_versions(version1: str, version2: str) -> int:
@@ -153,24 +145,7 @@ logger = logging.getLogger(__name__)
 def extract_version_from_file(file_path: Path) -> str:
     """Extract version from file header comments."""
     try:
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
-
-        # Look for version in various comment formats
-        patterns = [
-            r"<!-- version: ([^\s]+) -->",  # HTML comments
-            r"# version: ([^\s]+)",  # Shell/Python comments
-            r"// version: ([^\s]+)",  # JavaScript/Go comments
-            r"/\* version: ([^\s]+) \*/",  # CSS/C comments
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, content)
-            if match:
-                return match.group(1)
-
-        return "0.0.0"  # Default if no version found
-
+        return read_header(file_path).version or "0.0.0"
     except Exception:
         return "0.0.0"
 
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/update-repository-automation.py
-# version: 1.2.0
+# version: 1.3.0
 # guid: 7f8a9b0c-1d2e-3f4a-5b6c-7d8e9f0a1b2c
 
 """Repository Automation Update Script
@@ -12,15 +12,26 @@ Usage:
     python scripts/update-repository-automation.py --repo owner/repo-name
     python scripts/update-repository-automation.py --config repos.txt --dry-run
     python scripts/update-repository-automation.py --config repos.txt --force-update
+    python scripts/update-repository-automation.py --config repos.txt --single-commit --workers 8
+
+With --single-commit every planned add/update/delete for a repository is staged
+and applied as one commit through the Git Data API (tree -> commit -> ref
+update) instead of one Contents API commit per file. --workers updates several
+repositories concurrently. GITHUB_API_URL (or --api-url) overrides the API
+endpoint, e.g. for a local test server.
 """
 
 import argparse
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+DEFAULT_API_URL = "https://api.github.com"
+
 
 class RepositoryAutomationUpdater:
     """Updates repositories to use the new unified automation system."""
@@ -31,19 +42,20 @@ class RepositoryAutomationUpdater:
         dry_run: bool = False,
         enable_cleanup: bool = True,
         force_update: bool = False,
+        single_commit: bool = False,
+        api_url: str | None = None,
     ):
         self.token = token
         self.dry_run = dry_run
         self.enable_cleanup = enable_cleanup
         self.force_update = force_update
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Authorization": f"token {token}",
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "ghcommon-automation-updater",
-            }
-        )
+        self.single_commit = single_commit
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+        # One session (and keep-alive pool) per worker thread; the current
+        # repository's staged changes also live here in single-commit mode.
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._remote_cache: dict[str, str] = {}
 
         # Define patterns for old automation files that should be cleaned up
         self.old_automation_patterns = [
@@ -61,9 +73,48 @@ class RepositoryAutomationUpdater:
             "unified-automation",  # Old unified automation workflow to be replaced
         ]
 
+    @property
+    def session(self) -> requests.Session:
+        """Return this thread's authenticated session."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(
+                {
+                    "Authorization": f"token {self.token}",
+                    "Accept": "application/vnd.github.v3+json",
+                    "User-Agent": "ghcommon-automation-updater",
+                }
+            )
+            self._local.session = session
+        return session
+
     def update_repository(self, repo: str) -> bool:
         """Update a single repository to use the new automation system."""
+        if not self.single_commit or self.dry_run:
+            return self._plan_repository(repo)
+
+        self._local.staged = []
+        self._local.repo_info = None
+        try:
+            planned = self._plan_repository(repo)
+            staged = self._local.staged
+            if not staged:
+                return planned
+            if not planned:
+                print(f"❌ Not committing partial changes to {repo}")
+                return False
+            return self._commit_staged_changes(repo, self._get_default_branch(repo), staged)
+        except Exception as e:
+            print(f"❌ Error updating {repo}: {e}")
+            return False
+        finally:
+            self._local.staged = None
+
+    def _plan_repository(self, repo: str) -> bool:
+        """Run the add/update/cleanup logic for ``repo``."""
         print(f"🔄 Updating repository: {repo}")
+        self._local.repo_info = None
 
         try:
             # Check if repository exists and we have access
@@ -115,23 +166,30 @@ class RepositoryAutomationUpdater:
             print(f"❌ Error updating {repo}: {e}")
             return False
 
+    def _get_repository_info(self, repo: str) -> dict | None:
+        """Fetch ``/repos/{repo}`` once per update; None if inaccessible."""
+        cached = getattr(self._local, "repo_info", None)
+        if cached is not None and cached[0] == repo:
+            return cached[1]
+        response = self.session.get(f"{self.api_url}/repos/{repo}")
+        info = response.json() if response.status_code == 200 else None
+        self._local.repo_info = (repo, info)
+        return info
+
     def _check_repository_access(self, repo: str) -> bool:
         """Check if we have access to the repository."""
-        response = self.session.get(f"https://api.github.com/repos/{repo}")
-        return response.status_code == 200
+        return self._get_repository_info(repo) is not None
 
     def _get_default_branch(self, repo: str) -> str:
         """Get the default branch for the repository."""
-        response = self.session.get(f"https://api.github.com/repos/{repo}")
-        if response.status_code == 200:
-            return response.json().get("default_branch", "main")
+        info = self._get_repository_info(repo)
+        if info:
+            return info.get("default_branch", "main")
         return "main"
 
     def _get_workflow_files(self, repo: str) -> list[dict]:
         """Get all workflow files in the repository."""
-        response = self.session.get(
-            f"https://api.github.com/repos/{repo}/contents/.github/workflows"
-        )
+        response = self.session.get(f"{self.api_url}/repos/{repo}/contents/.github/workflows")
 
         if response.status_code == 404:
             return []
@@ -166,7 +224,7 @@ class RepositoryAutomationUpdater:
         has_config = False
         try:
             config_response = self.session.get(
-                f"https://api.github.com/repos/{repo}/contents/.github/unified-automation-config.json"
+                f"{self.api_url}/repos/{repo}/contents/.github/unified-automation-config.json"
             )
             has_config = config_response.status_code == 200
         except Exception:
@@ -225,7 +283,7 @@ class RepositoryAutomationUpdater:
         """Update existing unified automation configuration."""
         # Check if configuration file exists
         config_response = self.session.get(
-            f"https://api.github.com/repos/{repo}/contents/.github/unified-automation-config.json"
+            f"{self.api_url}/repos/{repo}/contents/.github/unified-automation-config.json"
         )
 
         if config_response.status_code == 404:
@@ -354,15 +412,24 @@ class RepositoryAutomationUpdater:
 
         # Fallback to remote template
         try:
-            response = requests.get(
+            return self._fetch_remote(
                 "https://raw.githubusercontent.com/jdfalk/ghcommon/main/examples/workflows/unified-automation-complete.yml"
             )
-            response.raise_for_status()
-            return response.text
         except Exception:
             # Fallback to a basic template
             return self._get_basic_workflow_template(default_branch)
 
+    def _fetch_remote(self, url: str) -> str:
+        """Download ``url`` once and reuse it for every repository."""
+        with self._cache_lock:
+            if url in self._remote_cache:
+                return self._remote_cache[url]
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        with self._cache_lock:
+            self._remote_cache[url] = response.text
+        return response.text
+
     def _get_basic_workflow_template(self, default_branch: str) -> str:
         """Get a basic workflow template as fallback."""
         return f"""name: Unified Automation
@@ -408,11 +475,9 @@ jobs:
     def _get_default_configuration(self) -> str:
         """Get the default configuration."""
         try:
-            response = requests.get(
+            return self._fetch_remote(
                 "https://raw.githubusercontent.com/jdfalk/ghcommon/main/.github/unified-automation-config.json"
             )
-            response.raise_for_status()
-            return response.text
         except Exception:
             # Fallback to a minimal configuration
             return json.dumps(
@@ -438,8 +503,11 @@ jobs:
         """Create a file in the repository. If file exists, delete it first."""
         import base64
 
+        if self._stage(repo, path, content, message):
+            return True
+
         # Check if file already exists and delete it first
-        existing_response = self.session.get(f"https://api.github.com/repos/{repo}/contents/{path}")
+        existing_response = self.session.get(f"{self.api_url}/repos/{repo}/contents/{path}")
 
         if existing_response.status_code == 200:
             # File exists, delete it first
@@ -450,7 +518,7 @@ jobs:
                 "branch": default_branch,
             }
             delete_response = self.session.delete(
-                f"https://api.github.com/repos/{repo}/contents/{path}",
+                f"{self.api_url}/repos/{repo}/contents/{path}",
                 json=delete_data,
             )
             if delete_response.status_code != 200:
@@ -464,9 +532,7 @@ jobs:
             "branch": default_branch,
         }
 
-        response = self.session.put(
-            f"https://api.github.com/repos/{repo}/contents/{path}", json=data
-        )
+        response = self.session.put(f"{self.api_url}/repos/{repo}/contents/{path}", json=data)
 
         if response.status_code == 201:
             print(f"✅ Created {path} in {repo}")
@@ -486,6 +552,9 @@ jobs:
         """Update a file in the repository."""
         import base64
 
+        if self._stage(repo, path, content, message):
+            return True
+
         data = {
             "message": message,
             "content": base64.b64encode(content.encode()).decode(),
@@ -493,9 +562,7 @@ jobs:
             "branch": default_branch,
         }
 
-        response = self.session.put(
-            f"https://api.github.com/repos/{repo}/contents/{path}", json=data
-        )
+        response = self.session.put(f"{self.api_url}/repos/{repo}/contents/{path}", json=data)
 
         if response.status_code == 200:
             print(f"✅ Updated {path} in {repo}")
@@ -507,17 +574,93 @@ jobs:
         self, repo: str, path: str, sha: str, message: str, default_branch: str
     ) -> bool:
         """Remove a file from the repository."""
+        if self._stage(repo, path, None, message):
+            return True
         data = {"message": message, "sha": sha, "branch": default_branch}
 
-        response = self.session.delete(
-            f"https://api.github.com/repos/{repo}/contents/{path}", json=data
-        )
+        response = self.session.delete(f"{self.api_url}/repos/{repo}/contents/{path}", json=data)
 
         if response.status_code == 200:
             return True
         print(f"❌ Failed to remove {path} from {repo}: {response.text}")
         return False
 
+    def _stage(self, repo: str, path: str, content: str | None, message: str) -> bool:
+        """Record a change for the single commit; False when not staging."""
+        staged = getattr(self._local, "staged", None)
+        if staged is None:
+            return False
+        staged.append((path, content, message))
+        action = "remove" if content is None else "write"
+        print(f"📝 Staged {action} of {path} in {repo}")
+        return True
+
+    def _commit_staged_changes(
+        self, repo: str, branch: str, staged: list[tuple[str, str | None, str]]
+    ) -> bool:
+        """Apply staged changes as one commit via the Git Data API.
+
+        File contents are sent inline in the tree request (GitHub creates the
+        blobs), so a commit costs four calls however many files change. If the
+        branch moves underneath us the ref update is rejected as a
+        non-fast-forward and the commit is rebuilt on the new head once.
+        """
+        # Later changes to the same path win.
+        changes = {path: content for path, content, _ in staged}
+        tree_entries = [
+            {"path": path, "mode": "100644", "type": "blob", "sha": None}
+            if content is None
+            else {"path": path, "mode": "100644", "type": "blob", "content": content}
+            for path, content in sorted(changes.items())
+        ]
+        summaries = list(dict.fromkeys(message for _, _, message in staged))
+        message = "Update unified automation"
+        if len(summaries) == 1:
+            message = summaries[0]
+        else:
+            message += "\n\n" + "\n".join(f"- {summary}" for summary in summaries)
+
+        git_url = f"{self.api_url}/repos/{repo}/git"
+        for attempt in range(2):
+            ref = self.session.get(f"{git_url}/ref/heads/{branch}")
+            if ref.status_code != 200:
+                print(f"❌ Failed to read {branch} in {repo}: {ref.text}")
+                return False
+            head_sha = ref.json()["object"]["sha"]
+            head = self.session.get(f"{git_url}/commits/{head_sha}")
+            if head.status_code != 200:
+                print(f"❌ Failed to read commit {head_sha} in {repo}: {head.text}")
+                return False
+            tree = self.session.post(
+                f"{git_url}/trees",
+                json={"base_tree": head.json()["tree"]["sha"], "tree": tree_entries},
+            )
+            if tree.status_code != 201:
+                print(f"❌ Failed to create tree in {repo}: {tree.text}")
+                return False
+            if tree.json()["sha"] == head.json()["tree"]["sha"]:
+                print(f"✅ {repo} is already up to date")
+                return True
+            commit = self.session.post(
+                f"{git_url}/commits",
+                json={"message": message, "tree": tree.json()["sha"], "parents": [head_sha]},
+            )
+            if commit.status_code != 201:
+                print(f"❌ Failed to create commit in {repo}: {commit.text}")
+                return False
+            update = self.session.patch(
+                f"{git_url}/refs/heads/{branch}",
+                json={"sha": commit.json()["sha"], "force": False},
+            )
+            if update.status_code == 200:
+                print(f"✅ Committed {len(changes)} file changes to {repo} in one commit")
+                return True
+            if update.status_code != 422 or attempt:
+                break
+            print(f"🔁 {branch} moved in {repo}; rebuilding commit")
+        print(f"❌ Failed to update {branch} in {repo}: {update.text}")
+        return False
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -540,6 +683,18 @@ def main():
         action="store_true",
         help="Force update even if new automation already exists",
     )
+    parser.add_argument(
+        "--single-commit",
+        action="store_true",
+        help="Apply all changes to a repository as one commit via the Git Data API",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of repositories to update concurrently (default: 1)",
+    )
+    parser.add_argument("--api-url", help="GitHub API URL (or set GITHUB_API_URL env var)")
     parser.add_argument("--token", help="GitHub token (or set GITHUB_TOKEN env var)")
 
     args = parser.parse_args()
@@ -575,14 +730,23 @@ def main():
         print("💪 FORCE UPDATE MODE - Will update workflows even if they already exist")
 
     updater = RepositoryAutomationUpdater(
-        token, args.dry_run, not args.no_cleanup, args.force_update
+        token,
+        args.dry_run,
+        not args.no_cleanup,
+        args.force_update,
+        single_commit=args.single_commit,
+        api_url=args.api_url,
     )
 
     success_count = 0
-    for repo in repositories:
-        if updater.update_repository(repo):
-            success_count += 1
-        print()  # Empty line between repositories
+    if args.workers > 1:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            success_count = sum(executor.map(updater.update_repository, repositories))
+    else:
+        for repo in repositories:
+            if updater.update_repository(repo):
+                success_count += 1
+            print()  # Empty line between repositories
 
     print(f"📊 Summary: {success_count}/{len(repositories)} repositories updated successfully")
 
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/update_instructions_ignore_blocks.py
-# version: 1.0.1
+# version: 1.1.0
 # guid: 7f3c9a3e-1b2c-4d5e-8f90-abc123def456
 
 """Batch-update .github/instructions/*.instructions.md files across repositories to:
@@ -12,14 +12,22 @@
 Safety:
 - Skips files already wrapped (detects 'prettier-ignore-start' near frontmatter)
 - Preserves content and spacing
+
+Repositories are processed in parallel with the shared fleet codemod runner.
 """
 
 from __future__ import annotations
 
+import argparse
 import os
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".github" / "workflows" / "scripts"))
+
+from fleet_codemod import Codemod, run_codemod  # noqa: E402
+
 WORKSPACE_REPOS = [
     "subtitle-manager",
     "gcommon",
@@ -96,31 +104,45 @@ def wrap_frontmatter(text: str) -> tuple[str, bool]:
     return "\n".join(new_lines) + ("\n" if text.endswith("\n") else ""), True
 
 
-def process_file(path: Path) -> bool:
-    txt = path.read_text(encoding="utf-8")
-    changed_any = False
-    new_txt, fm_changed = wrap_frontmatter(txt)
-    if fm_changed:
-        changed_any = True
-    new_txt, ver_changed = bump_version_header(new_txt)
-    if ver_changed:
-        changed_any = True
-    if changed_any:
-        path.write_text(new_txt, encoding="utf-8")
-    return changed_any
+def update_instructions_text(relpath: str, text: str) -> str | None:
+    """Codemod transform: wrap frontmatter and bump the version header.
+
+    The version is only bumped when the frontmatter was actually wrapped, so
+    re-running the script is a no-op.
+    """
+    new_txt, fm_changed = wrap_frontmatter(text)
+    if not fm_changed:
+        return None
+    new_txt, _ = bump_version_header(new_txt)
+    return new_txt
+
+
+INSTRUCTIONS_CODEMOD = Codemod(
+    name="instructions-ignore-blocks",
+    transform=update_instructions_text,
+    patterns=("*.instructions.md",),
+    roots=(".github/instructions",),
+)
 
 
 def main() -> None:
-    total = 0
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Repositories processed concurrently"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing files")
+    args = parser.parse_args()
+
+    repos = [ROOT / repo for repo in WORKSPACE_REPOS if (ROOT / repo / ".github").is_dir()]
+    results = run_codemod(repos, INSTRUCTIONS_CODEMOD, apply=not args.dry_run, workers=args.workers)
     changed = 0
-    for repo in WORKSPACE_REPOS:
-        base = ROOT / repo
-        for path in base.rglob(".github/instructions/*.instructions.md"):
-            total += 1
-            if process_file(path):
-                changed += 1
-                print(f"UPDATED: {path}")
-    print(f"Done. {changed}/{total} files updated.")
+    for result in results:
+        if result.error:
+            print(f"ERROR: {result.repo}: {result.error}")
+        for change in result.changes:
+            changed += 1
+            print(f"UPDATED: {result.repo / change.path}")
+    print(f"Done. {changed} files updated.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+"""Tests for repository maintenance scripts under scripts/ and .github/scripts/.
+
+These scripts are run by path (several have hyphenated names), so tests load
+them with :func:`load_script` instead of importing them. Scripts that call the
+GitHub API are tested against a stand-in served by :func:`serve_locally`.
+"""
+
+import importlib.util
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import ModuleType
+from typing import Any, TypeVar
+
+Backend = TypeVar("Backend")
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def load_script(relative_path: str) -> ModuleType:
+    """Import the script at ``relative_path`` (from the repository root) as a module."""
+    path = REPO_ROOT / relative_path
+    name = path.stem.replace("-", "_")
+    module = sys.modules.get(name)
+    if module is not None and getattr(module, "__file__", None) == str(path):
+        return module
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextmanager
+def serve_locally(handler: type[BaseHTTPRequestHandler], backend: Backend) -> Iterator[Backend]:
+    """Serve ``handler`` on a local port while the context is open.
+
+    Handlers reach ``backend`` as ``self.server.backend``; its ``url``
+    attribute is set to the server's base URL.
+    """
+    server: Any = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.backend = backend
+    backend.url = f"http://127.0.0.1:{server.server_address[1]}"  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield backend
+    finally:
+        server.shutdown()
+        server.server_close()
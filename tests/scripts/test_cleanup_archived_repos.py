@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_cleanup_archived_repos.py
+# version: 1.0.0
+# guid: b52a12cf-e6c6-47be-84a7-0d4044f73920
+
+"""Tests for batched repository lookups in cleanup-archived-repos."""
+
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests.scripts import load_script
+
+cleanup_archived_repos = load_script("scripts/cleanup-archived-repos.py")
+
+ACTIVE = {"isArchived": False, "isDisabled": False, "visibility": "public"}
+ARCHIVED = {"isArchived": True, "isDisabled": False, "visibility": "public"}
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_ALIAS = re.compile(rf"(r\d+): repository\(owner: ({_STRING}), name: ({_STRING})\)")
+
+
+class FakeGh:
+    """Stand-in for ``gh`` that answers GraphQL aliases and ``repo view``."""
+
+    def __init__(self, repos: dict[str, dict], graphql: bool = True) -> None:
+        self.repos = repos
+        self.graphql = graphql
+        self.calls: list[list[str]] = []
+
+    def __call__(self, cmd, **kwargs) -> subprocess.CompletedProcess:
+        self.calls.append(cmd)
+        if cmd[:3] == ["gh", "api", "graphql"]:
+            if not self.graphql:
+                return subprocess.CompletedProcess(cmd, 1, "", "GraphQL unavailable")
+            data = {}
+            for alias, owner, name in _ALIAS.findall(cmd[-1]):
+                data[alias] = self.repos.get(f"{json.loads(owner)}/{json.loads(name)}")
+            status = 0 if all(data.values()) else 1  # gh fails on unresolved aliases
+            return subprocess.CompletedProcess(cmd, status, json.dumps({"data": data}), "")
+        if cmd[:3] == ["gh", "repo", "view"]:
+            info = self.repos.get(cmd[3])
+            if info is None:
+                return subprocess.CompletedProcess(cmd, 1, "", "not found")
+            return subprocess.CompletedProcess(cmd, 0, json.dumps(info), "")
+        return self.real_run(cmd, **kwargs)
+
+
+@pytest.fixture
+def cleanup(tmp_path: Path, monkeypatch):
+    """A non-interactive dry-run cleanup rooted at ``tmp_path/repos``."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "home").mkdir()
+    return cleanup_archived_repos.RepositoryCleanup(
+        str(tmp_path / "repos"), dry_run=True, interactive=False, two_phase=True, batch_size=2
+    )
+
+
+def _fake_gh(monkeypatch, repos: dict[str, dict], graphql: bool = True) -> FakeGh:
+    fake = FakeGh(repos, graphql)
+    fake.real_run = subprocess.run
+    monkeypatch.setattr(cleanup_archived_repos.subprocess, "run", fake)
+    return fake
+
+
+def _graphql_calls(fake: FakeGh) -> list[list[str]]:
+    return [cmd for cmd in fake.calls if cmd[:3] == ["gh", "api", "graphql"]]
+
+
+def test_build_batch_query_aliases_each_slug(cleanup) -> None:
+    """Each slug gets an ``r<index>`` alias with quoted owner and name."""
+    query = cleanup._build_batch_query([("octo", "one"), ("octo", 'we"ird')])
+
+    assert _ALIAS.findall(query) == [
+        ("r0", '"octo"', '"one"'),
+        ("r1", '"octo"', '"we\\"ird"'),
+    ]
+    assert query.count(cleanup_archived_repos.GRAPHQL_REPOSITORY_FIELDS) == 2
+
+
+def test_batch_lookup_maps_aliases_back_to_slugs(cleanup, monkeypatch) -> None:
+    """Aliases resolve to their own slug across batches; unknown repos are None."""
+    fake = _fake_gh(monkeypatch, {"octo/one": ACTIVE, "octo/three": ARCHIVED})
+    slugs = [("octo", "one"), ("octo", "gone"), ("octo", "one"), ("octo", "three")]
+
+    results = cleanup._get_repository_info_batch(slugs)
+
+    assert results == {
+        ("octo", "one"): ACTIVE,
+        ("octo", "gone"): None,
+        ("octo", "three"): ARCHIVED,
+    }
+    assert len(_graphql_calls(fake)) == 2  # three unique slugs, two per query
+    assert not [cmd for cmd in fake.calls if cmd[:3] == ["gh", "repo", "view"]]
+
+
+def test_batch_lookup_falls_back_per_repository(cleanup, monkeypatch) -> None:
+    """A failed query is retried with one ``gh repo view`` per repository."""
+    fake = _fake_gh(monkeypatch, {"octo/one": ACTIVE, "octo/two": ARCHIVED}, graphql=False)
+
+    results = cleanup._get_repository_info_batch([("octo", "one"), ("octo", "two")])
+
+    assert results == {("octo", "one"): ACTIVE, ("octo", "two"): ARCHIVED}
+    views = sorted(cmd[3] for cmd in fake.calls if cmd[:3] == ["gh", "repo", "view"])
+    assert views == ["octo/one", "octo/two"]
+
+
+def _clone(root: Path, name: str, remote: str | None) -> Path:
+    path = root / name
+    path.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    if remote:
+        subprocess.run(["git", "remote", "add", "origin", remote], cwd=path, check=True)
+    return path
+
+
+def test_two_phase_decides_from_batched_results(cleanup, monkeypatch) -> None:
+    """Two-phase mode acts on each clone's own lookup result."""
+    root = cleanup.base_path
+    repositories = [
+        _clone(root, "active", "https://github.com/octo/active.git"),
+        _clone(root, "archived", "git@github.com:octo/archived.git"),
+        _clone(root, "gone", "https://github.com/octo/gone.git"),
+        _clone(root, "elsewhere", "https://gitlab.com/octo/elsewhere.git"),
+        _clone(root, "local", None),
+    ]
+    fake = _fake_gh(monkeypatch, {"octo/active": ACTIVE, "octo/archived": ARCHIVED})
+
+    cleanup.process_repositories_two_phase(repositories)
+
+    assert cleanup.stats == {
+        "total_repos": 5,
+        "archived_repos": 1,
+        "removed_repos": 1,
+        "errors": 1,
+        "skipped": 2,
+    }
+    assert len(_graphql_calls(fake)) == 2
+    assert all(path.exists() for path in repositories)  # dry run
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_intelligent_sync_to_repos.py
+# version: 1.0.0
+# guid: d8fbb709-d86e-43eb-b8e5-3f8d8e1ea90e
+
+"""Tests for the efficient (blobless) sync mode."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+from tests.scripts import load_script
+
+intelligent_sync = load_script("scripts/intelligent_sync_to_repos.py")
+
+INSTRUCTION = ".github/instructions/go.instructions.md"
+LINK = ".vscode/copilot/go.instructions.md"
+OLD_FILE = ".github/commit-messages.md"
+
+
+def _git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=ci", "-c", "user.email=ci@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def _write(root: Path, files: dict[str, str]) -> None:
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+def _source(tmp_path: Path) -> Path:
+    source = tmp_path / "source"
+    _write(source, {INSTRUCTION: "go rules v2\n", "AGENTS.md": "agents v2\n"})
+    return source
+
+
+def _target(tmp_path: Path) -> tuple[Path, Path]:
+    """Return (bare remote, work clone) with one commit holding an old file."""
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    _git(tmp_path, "init", "-q", "--bare", "-b", "main", str(remote))
+    _git(tmp_path, "clone", "-q", str(remote), str(work))
+    _write(work, {"README.md": "demo\n", OLD_FILE: "old\n", "AGENTS.md": "agents v1\n"})
+    _git(work, "add", "-A")
+    _git(work, "commit", "-qm", "initial")
+    _git(work, "push", "-q", "origin", "HEAD:main")
+    return remote, work
+
+
+def _apply_source(work: Path, source: Path) -> None:
+    """Commit the synced state in work, as a merged sync PR would."""
+    _write(work, {name: (source / name).read_text() for name in (INSTRUCTION, "AGENTS.md")})
+    (work / LINK).parent.mkdir(parents=True, exist_ok=True)
+    (work / LINK).symlink_to("../../.github/instructions/go.instructions.md")
+    _git(work, "rm", "-q", OLD_FILE)
+    _git(work, "add", "-A")
+    _git(work, "commit", "-qm", "sync")
+
+
+def _sync(remote: Path, source: Path) -> list[str]:
+    summary: list[str] = []
+    intelligent_sync.sync_to_repo_efficient(
+        "o/demo", "sync/ghcommon", f"file://{remote}", summary, False, str(source), False
+    )
+    return summary
+
+
+def test_plan_sync_changes_compares_blob_ids(tmp_path: Path) -> None:
+    """Only files, old paths and symlinks that differ from the tree are planned."""
+    source = _source(tmp_path)
+    blob = intelligent_sync.git_blob_id
+    tree = {
+        INSTRUCTION: ("100644", blob(b"go rules v2\n")),
+        "AGENTS.md": ("100644", blob(b"agents v1\n")),
+        OLD_FILE: ("100644", blob(b"old\n")),
+        LINK: ("120000", blob(b"../../.github/instructions/go.instructions.md")),
+        ".vscode/copilot/stale.instructions.md": ("100644", blob(b"x")),
+    }
+
+    writes, removes, symlinks = intelligent_sync.plan_sync_changes(tree, str(source))
+
+    assert (writes, removes, symlinks) == (["AGENTS.md"], [OLD_FILE], [])
+    tree[INSTRUCTION] = ("120000", tree[INSTRUCTION][1])  # a symlink is rewritten as a file
+    del tree[LINK]
+    assert intelligent_sync.plan_sync_changes(tree, str(source)) == (
+        [INSTRUCTION, "AGENTS.md"],
+        [OLD_FILE],
+        ["go.instructions.md"],
+    )
+
+
+def test_stale_sync_branch_is_replaced_by_default_branch_base(tmp_path: Path) -> None:
+    """A squash-merged leftover sync branch neither hides drift nor leaks history."""
+    source = _source(tmp_path)
+    remote, work = _target(tmp_path)
+    base = _git(work, "rev-parse", "HEAD")
+    _apply_source(work, source)
+    _git(work, "push", "-q", "origin", "HEAD:sync/ghcommon")
+    _git(work, "reset", "-q", "--hard", base)
+    _apply_source(work, source)  # the squash merge on main
+    _write(work, {"AGENTS.md": "edited on main\n"})
+    _git(work, "commit", "-qam", "drift")
+    _git(work, "push", "-q", "origin", "HEAD:main")
+    main = _git(work, "rev-parse", "HEAD")
+
+    summary = _sync(remote, source)
+
+    assert summary[0].startswith("[OK] o/demo: Synced 1 files, removed 0, linked 0")
+    _git(work, "fetch", "-q", "origin")
+    assert _git(work, "rev-parse", "origin/sync/ghcommon^") == main
+    assert _git(work, "show", "origin/sync/ghcommon:AGENTS.md") == "agents v2"
+
+
+def test_current_sync_branch_is_reused_and_noops_are_skipped(tmp_path: Path) -> None:
+    """A sync branch containing main is the base; an up-to-date main is skipped."""
+    source = _source(tmp_path)
+    remote, work = _target(tmp_path)
+    _apply_source(work, source)
+    _git(work, "push", "-q", "origin", "HEAD:sync/ghcommon")
+    branch_tip = _git(work, "rev-parse", "HEAD")
+
+    assert _sync(remote, source) == ["[SKIP] o/demo: Sync branch sync/ghcommon already up to date"]
+    assert _git(work, "ls-remote", "origin", "sync/ghcommon").split()[0] == branch_tip
+
+    _git(work, "push", "-q", "origin", "HEAD:main")
+    assert _sync(remote, source) == ["[SKIP] o/demo: No changes needed"]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_monitor_rollout.py
+# version: 1.0.0
+# guid: bb179740-b2ce-4532-90b5-70a310d0f129
+
+"""Tests for rollout run classification and watch mode."""
+
+from __future__ import annotations
+
+import datetime as dt
+import itertools
+import random
+from urllib.parse import parse_qs, urlsplit
+
+from tests.scripts import load_script
+
+monitor_rollout = load_script(".github/scripts/monitor-rollout.py")
+
+CUTOFF = dt.datetime(2026, 1, 10, tzinfo=dt.timezone.utc)
+_IDS = itertools.count()
+NAMES = ["Security", "Release", "Sync Receiver", "Repo Sync", "Security Release", "CI", None]
+
+
+def _run(name: str | None, day: int | None, key: str = "created_at", **extra) -> dict:
+    run = {"name": name, "id": next(_IDS), **extra}
+    if day is not None:
+        run[key] = f"2026-01-{day:02d}T12:00:00Z"
+    return run
+
+
+def _pick_latest_per_workflow(runs: list[dict]) -> dict:
+    pick = monitor_rollout.pick_latest
+    return {
+        "security": pick(runs, ["security"], CUTOFF),
+        "release": pick(runs, ["release"], CUTOFF),
+        "sync_receiver": pick(runs, ["sync", "receiver"], CUTOFF)
+        or pick(runs, ["repo", "sync"], CUTOFF),
+    }
+
+
+def test_classify_runs_matches_pick_latest() -> None:
+    """One classify_runs pass picks what three pick_latest scans would."""
+    rng = random.Random(7)
+    for _ in range(500):
+        runs = [
+            _run(
+                rng.choice(NAMES),
+                rng.choice([None, 5, 9, 10, 11, 20]),
+                rng.choice(["created_at", "run_started_at"]),
+            )
+            for _ in range(rng.randint(0, 12))
+        ]
+        assert monitor_rollout.classify_runs(runs, CUTOFF) == _pick_latest_per_workflow(runs)
+
+
+class _Untouchable(dict):
+    def get(self, *args):
+        raise AssertionError("run inspected after every workflow was found")
+
+
+def test_classify_runs_stops_once_every_workflow_is_found() -> None:
+    """Runs after the last needed match are never parsed."""
+    runs = [
+        _run("Security Release", 12),
+        _run("CI", 12),
+        _run("Sync Receiver", 11),
+        _Untouchable(),
+    ]
+
+    latest = monitor_rollout.classify_runs(runs, CUTOFF)
+
+    assert latest["security"] is latest["release"] is runs[0]
+    assert latest["sync_receiver"] is runs[2]
+
+
+def test_sync_receiver_run_beats_newer_repo_sync() -> None:
+    """A sync receiver run wins over a newer repo sync; repo sync is the fallback."""
+    repo_sync = _run("Repo Sync", 15)
+    receiver = _run("Sync Receiver", 11)
+    stale_receiver = _run("Sync Receiver", 5)
+
+    assert monitor_rollout.classify_runs([repo_sync, receiver], CUTOFF)["sync_receiver"] is receiver
+    only_repo_sync = monitor_rollout.classify_runs([repo_sync, stale_receiver], CUTOFF)
+    assert only_repo_sync["sync_receiver"] is repo_sync
+
+
+class StubClient:
+    """Serves canned run lists per repository, one list per poll."""
+
+    def __init__(self, polls: dict[str, list[list[dict]]]) -> None:
+        self.polls = polls
+        self.paths: list[str] = []
+        self.requests = 0
+        self.not_modified = 0
+
+    def get_json(self, path: str) -> tuple[int, dict]:
+        self.paths.append(path)
+        repo = urlsplit(path).path.removeprefix("/repos/").removesuffix("/actions/runs")
+        runs = self.polls[repo]
+        return 200, {"workflow_runs": runs.pop(0) if len(runs) > 1 else runs[0]}
+
+
+def _runs(status: str, conclusion: str | None) -> list[dict]:
+    now = monitor_rollout.now_utc().strftime("%Y-%m-%dT%H:%M:%SZ")
+    return [
+        {"name": name, "created_at": now, "status": status, "conclusion": conclusion}
+        for name in ("Security", "Release", "Sync Receiver")
+    ]
+
+
+def test_watch_rollout_only_repolls_pending_repositories(monkeypatch) -> None:
+    """Finished repos are polled once; pending ones until they finish."""
+    monkeypatch.setattr(monitor_rollout.time, "sleep", lambda seconds: None)
+    client = StubClient(
+        {
+            "octo/done": [_runs("completed", "success")],
+            "octo/busy": [
+                _runs("in_progress", None),
+                _runs("queued", None),
+                _runs("completed", "failure"),
+            ],
+        }
+    )
+
+    results = monitor_rollout.watch_rollout(
+        ["octo/done", "octo/busy"], 10, 24, client, workers=2, interval=0, max_wait=60
+    )
+
+    polled = [urlsplit(path).path.split("/")[3] for path in client.paths]
+    assert sorted(polled) == ["busy", "busy", "busy", "done"]
+    assert len({parse_qs(urlsplit(path).query)["created"][0] for path in client.paths}) == 1
+    assert [result["repo"] for result in results] == ["octo/done", "octo/busy"]
+    assert results[0]["release"]["status"] == "success"
+    assert results[1]["release"]["status"] == "failure"
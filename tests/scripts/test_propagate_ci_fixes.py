@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_propagate_ci_fixes.py
+# version: 1.0.0
+# guid: 5b0d8e0a-7c43-4f6e-9a51-2d8f3c6e1b47
+
+"""Tests for committing CI fixes onto a branch with the tree patcher."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests.scripts import load_script
+
+propagate_ci_fixes = load_script("scripts/propagate_ci_fixes.py")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=ci", "-c", "user.email=ci@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repos(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A ghcommon source with the fixed files and a target repository on main."""
+    source = tmp_path / "ghcommon"
+    (source / ".github" / "workflows").mkdir(parents=True)
+    (source / ".github" / "workflows" / "ci.yml").write_text(
+        "# version: 1.0.0\nname: CI\n", encoding="utf-8"
+    )
+    for name in ("super-linter-ci.env", "super-linter-pr.env"):
+        (source / name).write_text(f"{name}\n", encoding="utf-8")
+    monkeypatch.setattr(propagate_ci_fixes, "GHCOMMON_PATH", source)
+    for variable in ("GIT_AUTHOR", "GIT_COMMITTER"):
+        monkeypatch.setenv(f"{variable}_NAME", "ci")
+        monkeypatch.setenv(f"{variable}_EMAIL", "ci@example.com")
+
+    target = tmp_path / "target"
+    target.mkdir()
+    _git(target, "init", "-q", "-b", "main")
+    (target / "README.md").write_text("target\n", encoding="utf-8")
+    _git(target, "add", ".")
+    _git(target, "commit", "-qm", "init")
+    return target
+
+
+def test_commit_creates_branch_from_head(repos: Path) -> None:
+    """A new branch starts at HEAD and the working tree is left alone."""
+    assert propagate_ci_fixes.commit_ci_fixes(repos, "ci-fixes")
+
+    assert _git(repos, "show", "ci-fixes:.github/workflows/ci.yml").startswith("# version: 1.0.1")
+    assert _git(repos, "rev-parse", "ci-fixes^") == _git(repos, "rev-parse", "main")
+    assert _git(repos, "status", "--porcelain") == ""
+
+
+def test_commit_builds_on_existing_branch(repos: Path) -> None:
+    """Commits already on the branch are kept."""
+    _git(repos, "branch", "ci-fixes")
+    _git(repos, "checkout", "-q", "ci-fixes")
+    (repos / "NOTES.md").write_text("keep me\n", encoding="utf-8")
+    _git(repos, "add", ".")
+    _git(repos, "commit", "-qm", "notes")
+    tip = _git(repos, "rev-parse", "HEAD")
+    _git(repos, "checkout", "-q", "main")
+
+    assert propagate_ci_fixes.commit_ci_fixes(repos, "ci-fixes")
+    assert _git(repos, "rev-parse", "ci-fixes^") == tip
+    assert _git(repos, "show", "ci-fixes:NOTES.md") == "keep me"
+
+
+def test_checked_out_branch_is_refused(repos: Path) -> None:
+    """Moving the checked-out branch would strand the index, so it is refused."""
+    head = _git(repos, "rev-parse", "main")
+
+    assert not propagate_ci_fixes.commit_ci_fixes(repos, "main")
+    assert _git(repos, "rev-parse", "main") == head
+    assert _git(repos, "status", "--porcelain") == ""
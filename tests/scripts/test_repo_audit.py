@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_repo_audit.py
+# version: 1.2.0
+# guid: 78aa77e5-ff53-45ff-b158-c45d7829e7f1
+
+"""Tests for the columnar repository audit table and its exports."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.scripts import load_script
+
+repo_audit = load_script("scripts/repo-audit.py")
+
+AUDIT_FILES = ["AGENTS.md", ".github/instructions/python.instructions.md"]
+GUID_A = "0f1e2d3c-4b5a-4968-8776-655443322110"
+GUID_B = "a1b2c3d4-e5f6-4a7b-8c9d-0e1f2a3b4c5d"
+
+AGENTS = f"<!-- file: AGENTS.md -->\n<!-- version: 1.2.0 -->\n<!-- guid: {GUID_A} -->\n\n# Agents\n"
+PYTHON = f"# file: python.instructions.md\n# version: 2.0.1\n# guid: {GUID_B}\n"
+NO_HEADER = "# Agents\n\nversion: 9\n"
+
+
+def _repo(base: Path, name: str, files: dict[str, str], git: bool = True) -> Path:
+    repo = base / name
+    repo.mkdir(parents=True)
+    if git:
+        (repo / ".git").mkdir()
+    for relative, text in files.items():
+        path = repo / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return repo
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    """Three repositories: fully managed, header-less, and not yet cloned with git."""
+    base = tmp_path / "repos"
+    _repo(base, "ghcommon", {"AGENTS.md": AGENTS, AUDIT_FILES[1]: PYTHON})
+    _repo(base, "beta", {"AGENTS.md": NO_HEADER})
+    _repo(base, "alpha", {AUDIT_FILES[1]: PYTHON}, git=False)
+    (base / ".cache").mkdir()
+    return base
+
+
+class SmallAuditor(repo_audit.RepoAuditor):
+    """Audits only ``AUDIT_FILES``."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.audit_files = list(AUDIT_FILES)
+
+
+def test_audit_table_rows_and_cells() -> None:
+    """Rows are laid out repo-major and strings are interned."""
+    table = repo_audit.AuditTable(AUDIT_FILES)
+    version = "".join(["1.", "0.0"])
+    table.append_repo("one", "/r/one", True, [(True, 10, version, GUID_A), (False, 0, None, None)])
+    table.append_repo("two", "/r/two", False, [(False, 0, None, None), (True, 3, "", None)])
+
+    assert table.cell(0, 0) == (True, 10, "1.0.0", GUID_A)
+    assert table.cell(1, 1) == (True, 3, None, None)
+    assert table.versions[0] is sys.intern("1.0.0")
+    assert list(table.exists) == [1, 0, 0, 1]
+    assert list(table.sizes) == [10, 0, 0, 3]
+    infos = table.to_repo_infos()
+    assert infos["two"].is_git_repo is False
+    assert infos["one"].files["AGENTS.md"] == repo_audit.FileInfo(
+        path=str(Path("/r/one") / "AGENTS.md"),
+        version="1.0.0",
+        guid=GUID_A,
+        exists=True,
+        size=10,
+    )
+
+
+def test_scan_files_reads_headers_with_one_stat(workspace: Path) -> None:
+    """Each audit file yields (exists, size, version, guid); missing files are empty."""
+    auditor = SmallAuditor(str(workspace), workers=2)
+
+    assert auditor._scan_files(workspace / "ghcommon") == (
+        True,
+        [
+            (True, len(AGENTS.encode()), "1.2.0", GUID_A),
+            (True, len(PYTHON.encode()), "2.0.1", GUID_B),
+        ],
+    )
+    assert auditor._scan_files(workspace / "beta") == (
+        True,
+        [(True, len(NO_HEADER.encode()), None, None), (False, 0, None, None)],
+    )
+    assert auditor._scan_files(workspace / "alpha")[0] is False
+
+
+def test_scan_all_repositories_builds_sorted_table(workspace: Path) -> None:
+    """Hidden directories are skipped and repositories are ordered by name."""
+    auditor = SmallAuditor(str(workspace), workers=2)
+
+    auditor.scan_all_repositories()
+
+    assert auditor.table.repos == ["alpha", "beta", "ghcommon"]
+    assert list(auditor.table.is_git_repo) == [0, 1, 1]
+    report = auditor.generate_detailed_report()
+    assert report["summary"]["repos_needing_updates"] == 2
+    assert report["repositories"]["beta"]["missing_files"] == [AUDIT_FILES[1]]
+    assert report["repositories"]["beta"]["outdated_files"] == [
+        {"file": "AGENTS.md", "current": None, "expected": "1.2.0"}
+    ]
+
+
+def test_comparison_chart_from_repo_infos(workspace: Path) -> None:
+    """Callers that only fill ``repos`` get the same chart as a scan."""
+    scanned = SmallAuditor(str(workspace), workers=2)
+    scanned.scan_all_repositories()
+
+    auditor = SmallAuditor(str(workspace))
+    assert auditor.generate_comparison_chart() == "No repositories found to compare."
+    auditor.repos = {path.name: auditor.scan_repository(path) for path in auditor._list_repositories()}
+
+    chart = auditor.generate_comparison_chart()
+    assert chart == scanned.generate_comparison_chart()
+    assert "v1.2.0" in chart
+    assert "missing" in chart
+
+
+def test_export_csv_and_jsonl(workspace: Path, tmp_path: Path, monkeypatch) -> None:
+    """``--export csv --export jsonl`` writes one record per repo and file."""
+    monkeypatch.setattr(repo_audit, "RepoAuditor", SmallAuditor)
+    output = tmp_path / "out"
+    argv = ["repo-audit.py", "--base-path", str(workspace), "--output-dir", str(output)]
+    argv += ["--format", "table", "--export", "csv", "--export", "jsonl"]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    repo_audit.main()
+
+    agents, python, no_header = (len(text.encode()) for text in (AGENTS, PYTHON, NO_HEADER))
+    python_file = AUDIT_FILES[1]
+    assert (output / "repo-audit.csv").read_bytes().decode() == (
+        "repo,file,exists,version,guid,size\r\n"
+        "alpha,AGENTS.md,False,,,0\r\n"
+        f"alpha,{python_file},True,2.0.1,{GUID_B},{python}\r\n"
+        f"beta,AGENTS.md,True,,,{no_header}\r\n"
+        f"beta,{python_file},False,,,0\r\n"
+        f"ghcommon,AGENTS.md,True,1.2.0,{GUID_A},{agents}\r\n"
+        f"ghcommon,{python_file},True,2.0.1,{GUID_B},{python}\r\n"
+    )
+    lines = (output / "repo-audit.jsonl").read_text(encoding="utf-8").splitlines()
+    assert lines[0] == (
+        '{"exists": false, "file": "AGENTS.md", "guid": null, "repo": "alpha", '
+        '"size": 0, "version": null}'
+    )
+    assert [json.loads(line) for line in lines] == [
+        {
+            "repo": repo,
+            "file": name,
+            "exists": exists,
+            "version": version,
+            "guid": guid,
+            "size": size,
+        }
+        for repo, name, exists, version, guid, size in [
+            ("alpha", "AGENTS.md", False, None, None, 0),
+            ("alpha", python_file, True, "2.0.1", GUID_B, python),
+            ("beta", "AGENTS.md", True, None, None, no_header),
+            ("beta", python_file, False, None, None, 0),
+            ("ghcommon", "AGENTS.md", True, "1.2.0", GUID_A, agents),
+            ("ghcommon", python_file, True, "2.0.1", GUID_B, python),
+        ]
+    ]
+    assert (output / "repo-comparison-chart.txt").exists()
+    assert not (output / "repo-audit-report.json").exists()
+
+
+def test_scan_files_drops_malformed_guids(tmp_path: Path) -> None:
+    """Non-hexadecimal GUID tokens are reported as missing GUIDs."""
+    repo = _repo(tmp_path, "gamma", {"AGENTS.md": "# version: 1.0.0\n# guid: ts123456-not-hex\n"})
+    auditor = SmallAuditor(str(tmp_path))
+
+    assert auditor._scan_files(repo)[1][0][2:] == ("1.0.0", None)
+    assert auditor.extract_version_and_guid(repo / "AGENTS.md") == ("1.0.0", None)
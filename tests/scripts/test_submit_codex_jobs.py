@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_submit_codex_jobs.py
+# version: 1.1.0
+# guid: 4231029b-b18d-4a95-8ff6-d7087ba6b7c9
+
+"""Tests for codex job streaming, the submission ledger and concurrent submission."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from tests.scripts import load_script
+
+submit_codex_jobs = load_script("scripts/submit_codex_jobs.py")
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_submission_counts_unexpected_errors(tmp_path: Path, monkeypatch, workers: int) -> None:
+    """Malformed jobs are failures in both modes, never lost or fatal."""
+    submitted: list[str] = []
+
+    def fake_run(cmd, check=False, **kwargs):
+        if "boom" in cmd:
+            raise subprocess.CalledProcessError(1, cmd)
+        submitted.append(cmd[cmd.index("--uuid") + 1])
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(submit_codex_jobs.subprocess, "run", fake_run)
+    jobs = [
+        {"uuid": "a", "repo": "o/one", "instructions": "do it"},
+        {"uuid": "b", "repo": "o/two"},  # no instructions
+        {"uuid": "c", "repo": "o/two", "instructions": "boom"},
+        {"uuid": "d", "repo": "o/one", "instructions": "again"},
+        {"uuid": "e", "instructions": "no repo"},
+    ]
+    journal = submit_codex_jobs.LedgerJournal(tmp_path / "ledger.jsonl")
+    ledger: set[str] = set()
+    try:
+        failures = submit_codex_jobs.process_jobs(iter(jobs), ledger, journal, workers=workers)
+    finally:
+        journal.close()
+
+    assert failures == 3
+    assert sorted(submitted) == ["a", "d"]
+    assert ledger == {"a", "d"}
+    assert submit_codex_jobs.load_ledger(tmp_path / "ledger.jsonl", tmp_path / "none") == {"a", "d"}
+
+
+def test_iter_jobs_streams_arrays_across_chunk_boundaries(tmp_path: Path, monkeypatch) -> None:
+    """Array jobs split over many small reads decode exactly; JSON lines too."""
+    jobs = [
+        {"uuid": f"job-{index}", "repo": "o/r", "instructions": "use ], { and \\" * index}
+        for index in range(6)
+    ]
+    array_path = tmp_path / "jobs.json"
+    array_path.write_text("  \n" + json.dumps(jobs, indent=2), encoding="utf-8")
+    lines_path = tmp_path / "jobs.jsonl"
+    lines_path.write_text("".join(json.dumps(job) + "\n\n" for job in jobs), encoding="utf-8")
+    monkeypatch.setattr(submit_codex_jobs, "STREAM_CHUNK_SIZE", 7)
+
+    stream = submit_codex_jobs.iter_jobs(array_path)
+    assert next(stream) == jobs[0]
+    assert [jobs[0], *stream] == jobs
+    assert list(submit_codex_jobs.iter_jobs(lines_path)) == jobs
+    (tmp_path / "empty.json").write_text("[ ]", encoding="utf-8")
+    assert list(submit_codex_jobs.iter_jobs(tmp_path / "empty.json")) == []
+
+    array_path.write_text(json.dumps(jobs)[:-20], encoding="utf-8")
+    with pytest.raises(ValueError, match="Malformed job array"):
+        list(submit_codex_jobs.iter_jobs(array_path))
+
+
+def test_load_ledger_compacts_the_journal(tmp_path: Path) -> None:
+    """Duplicate and torn journal lines are dropped by an atomic rewrite."""
+    path = tmp_path / "ledger.jsonl"
+    journal = submit_codex_jobs.LedgerJournal(path)
+    for job_id in ("b", "a", "b"):
+        journal.append(job_id)
+    journal.close()
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"uuid": "c"')  # torn by a crash
+
+    assert submit_codex_jobs.load_ledger(path, tmp_path / "legacy.json") == {"a", "b"}
+    assert path.read_text(encoding="utf-8") == '{"uuid": "a"}\n{"uuid": "b"}\n'
+    assert not path.with_name(path.name + ".tmp").exists()
+
+    before = path.stat().st_mtime_ns
+    assert submit_codex_jobs.load_ledger(path, tmp_path / "legacy.json") == {"a", "b"}
+    assert path.stat().st_mtime_ns == before  # already compact; not rewritten
+
+
+def test_load_ledger_migrates_the_legacy_array(tmp_path: Path) -> None:
+    """A legacy JSON array is merged into the journal and then removed."""
+    path = tmp_path / "ledger.jsonl"
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps(["old-1", "old-2"]), encoding="utf-8")
+    path.write_text('{"uuid": "new"}\n', encoding="utf-8")
+
+    assert submit_codex_jobs.load_ledger(path, legacy) == {"old-1", "old-2", "new"}
+    assert not legacy.exists()
+    assert submit_codex_jobs.load_ledger(path, legacy) == {"old-1", "old-2", "new"}
+
+
+def test_workers_keep_each_repository_serial(monkeypatch) -> None:
+    """Repos run side by side, but one repo's jobs run one at a time, in order."""
+    lock = threading.Lock()
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    order: dict[str, list[str]] = {}
+    other_started = threading.Event()
+
+    def fake_run(cmd, check=False, **kwargs):
+        repo, job_id = cmd[cmd.index("--repo") + 1], cmd[cmd.index("--uuid") + 1]
+        with lock:
+            active[repo] = active.get(repo, 0) + 1
+            peak[repo] = max(peak.get(repo, 0), active[repo])
+            order.setdefault(repo, []).append(job_id)
+        if repo == "o/other":
+            other_started.set()
+        elif job_id == "busy-0":
+            assert other_started.wait(5), "other repo never ran alongside"
+        time.sleep(0.01)
+        with lock:
+            active[repo] -= 1
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(submit_codex_jobs.subprocess, "run", fake_run)
+    jobs = [{"uuid": f"busy-{index}", "repo": "o/busy", "instructions": "x"} for index in range(5)]
+    jobs.insert(2, {"uuid": "other-0", "repo": "o/other", "instructions": "x"})
+
+    assert submit_codex_jobs.process_jobs(iter(jobs), set(), workers=4) == 0
+    assert peak == {"o/busy": 1, "o/other": 1}
+    assert order["o/busy"] == [f"busy-{index}" for index in range(5)]
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_sync_dispatch_events.py
+# version: 1.0.1
+# guid: 96c9092a-0b27-43c6-8f25-30e18bfa5136
+
+"""Tests for concurrent repository dispatches against a local HTTP stand-in."""
+
+from __future__ import annotations
+
+import json
+import threading
+from email.message import Message
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from tests.scripts import load_script, serve_locally
+
+sync_dispatch_events = load_script(".github/scripts/sync-dispatch-events.py")
+
+SECONDARY_LIMIT = "You have exceeded a secondary rate limit. Please wait a few minutes."
+
+
+class FakeGitHub:
+    """Dispatches endpoint that replays scripted responses per repository."""
+
+    def __init__(self) -> None:
+        self.responses: dict[str, list[tuple[int, dict[str, str], str]]] = {}
+        self.requests: list[tuple[str, Any]] = []
+        self.clients: set[int] = set()
+        self.hold = 0.0
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def handle(self, path: str, body: Any, port: int) -> tuple[int, dict[str, str], str]:
+        repo = path.removeprefix("/repos/").removesuffix("/dispatches")
+        with self.lock:
+            self.requests.append((repo, body))
+            self.clients.add(port)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            scripted = self.responses.get(repo, [])
+            response = scripted.pop(0) if scripted else (204, {}, "")
+        threading.Event().wait(self.hold)
+        with self.lock:
+            self.in_flight -= 1
+        return response
+
+    def attempts(self, repo: str) -> int:
+        return sum(1 for name, _ in self.requests if name == repo)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status, headers, text = self.server.backend.handle(self.path, body, self.client_address[1])
+        data = text.encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def github() -> FakeGitHub:
+    """A FakeGitHub dispatches endpoint served by ``_Handler``."""
+    with serve_locally(_Handler, FakeGitHub()) as fake:
+        yield fake
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record backoff delays instead of sleeping through them."""
+    delays: list[float] = []
+    monkeypatch.setattr(sync_dispatch_events.time, "sleep", delays.append)
+    return delays
+
+
+def _client(github: FakeGitHub) -> Any:
+    return sync_dispatch_events.DispatchClient("token", api_url=github.url, timeout=5)
+
+
+def _headers(**values: str) -> Message:
+    headers = Message()
+    for name, value in values.items():
+        headers[name.replace("_", "-")] = value
+    return headers
+
+
+def test_is_retryable() -> None:
+    """5xx, 429 and rate-limited 403s are retried; other client errors are not."""
+    retryable = sync_dispatch_events._is_retryable
+
+    assert retryable(502, _headers(), "")
+    assert retryable(429, _headers(), "")
+    assert retryable(403, _headers(Retry_After="3"), "")
+    assert retryable(403, _headers(X_RateLimit_Remaining="0"), "")
+    assert retryable(403, _headers(), SECONDARY_LIMIT)
+    assert not retryable(403, _headers(X_RateLimit_Remaining="12"), "Resource not accessible")
+    assert not retryable(404, _headers(), "Not Found")
+    assert not retryable(422, _headers(), "")
+
+
+def test_retry_delay_honours_retry_after(monkeypatch) -> None:
+    """Backoff is full-jitter exponential, floored by Retry-After and capped."""
+    monkeypatch.setattr(sync_dispatch_events.random, "uniform", lambda low, high: high)
+    delay = sync_dispatch_events._retry_delay
+
+    assert [delay(attempt) for attempt in range(7)] == [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+    monkeypatch.setattr(sync_dispatch_events.random, "uniform", lambda low, high: low)
+    assert delay(0, _headers(Retry_After="7")) == 7.0
+    assert delay(0, _headers(Retry_After="600")) == 30.0
+    assert delay(0, _headers(Retry_After="soon")) == 0.0
+
+
+def test_server_error_is_retried_until_success(github: FakeGitHub, sleeps: list[float]) -> None:
+    """A 502 is retried once with backoff and then succeeds."""
+    github.responses["octo/one"] = [(502, {}, "Bad Gateway")]
+
+    result = sync_dispatch_events.dispatch_event(
+        "octo/one", "sync", {"sha": "abc"}, _client(github)
+    )
+
+    assert (result.ok, result.status, result.attempts, result.error) == (True, 204, 2, None)
+    assert len(sleeps) == 1
+    payload = {"event_type": "sync", "client_payload": {"sha": "abc"}}
+    assert github.requests == [("octo/one", payload), ("octo/one", payload)]
+
+
+def test_secondary_rate_limit_waits_for_retry_after(
+    github: FakeGitHub, sleeps: list[float]
+) -> None:
+    """A secondary-rate-limit 403 backs off for at least Retry-After seconds."""
+    github.responses["octo/one"] = [(403, {"Retry-After": "5"}, SECONDARY_LIMIT)]
+
+    result = sync_dispatch_events.dispatch_event("octo/one", "sync", {}, _client(github))
+
+    assert (result.ok, result.attempts) == (True, 2)
+    assert sleeps == [5.0]
+
+
+def test_not_found_is_not_retried(github: FakeGitHub, sleeps: list[float]) -> None:
+    """A 404 fails immediately without backing off."""
+    github.responses["octo/gone"] = [(404, {}, '{"message": "Not Found"}')]
+
+    result = sync_dispatch_events.dispatch_event("octo/gone", "sync", {}, _client(github))
+
+    assert (result.ok, result.status, result.attempts) == (False, 404, 1)
+    assert result.error == "HTTP 404"
+    assert sleeps == []
+    assert github.attempts("octo/gone") == 1
+
+
+def test_persistent_failure_stops_after_max_attempts(
+    github: FakeGitHub, sleeps: list[float]
+) -> None:
+    """Retries stop at ``max_attempts`` and report the last status."""
+    github.responses["octo/down"] = [(503, {}, "")] * 5
+
+    result = sync_dispatch_events.dispatch_event(
+        "octo/down", "sync", {}, _client(github), max_attempts=3
+    )
+
+    assert (result.ok, result.status, result.attempts) == (False, 503, 3)
+    assert len(sleeps) == 2
+
+
+def test_dispatch_all_bounds_concurrency(github: FakeGitHub, sleeps: list[float]) -> None:
+    """At most ``workers`` requests are in flight, each over a reused connection."""
+    github.hold = 0.05
+    repos = [f"octo/repo-{index}" for index in range(8)]
+    github.responses["octo/repo-3"] = [(404, {}, "")]
+
+    results = sync_dispatch_events.dispatch_all(repos, "sync", {}, _client(github), workers=3)
+
+    assert [result.repo for result in results] == repos
+    assert [result.ok for result in results] == [index != 3 for index in range(8)]
+    assert github.peak == 3
+    assert len(github.clients) <= 3
+
+
+def test_write_results(tmp_path: Path) -> None:
+    """The results file lists every repository with counts and elapsed time."""
+    result_type = sync_dispatch_events.DispatchResult
+    results = [
+        result_type("octo/one", True, 204, 1, 12.5),
+        result_type("octo/gone", False, 404, 1, 3.0, "HTTP 404"),
+    ]
+    path = tmp_path / "dispatch-results.json"
+
+    sync_dispatch_events.write_results(path, results, 20.04)
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "elapsed_ms": 20.0,
+        "successful": 1,
+        "failed": 1,
+        "results": [
+            {
+                "repo": "octo/one",
+                "ok": True,
+                "status": 204,
+                "attempts": 1,
+                "latency_ms": 12.5,
+                "error": None,
+            },
+            {
+                "repo": "octo/gone",
+                "ok": False,
+                "status": 404,
+                "attempts": 1,
+                "latency_ms": 3.0,
+                "error": "HTTP 404",
+            },
+        ],
+    }
+    assert path.read_text(encoding="utf-8").endswith("}\n")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_sync_release_build_artifacts.py
+# version: 1.0.0
+# guid: 5e0be2a9-45ad-44fa-9c39-27f9e3de2767
+
+"""Tests for batched Rust release builds against stubbed toolchains."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.scripts import load_script
+
+build_artifacts = load_script(".github/scripts/sync-release-build-artifacts.py")
+build_go_release = load_script(".github/workflows/scripts/build_go_release.py")
+
+TARGETS = ["x86_64-unknown-linux-gnu", "aarch64-apple-darwin", "x86_64-pc-windows-gnu"]
+
+CARGO_TOML = """\
+[package]
+name = "demo-crate"
+version = "0.4.2"
+
+[[bin]]
+name = "demo"
+path = "src/main.rs"
+"""
+
+# One script stands in for rustup, cargo and go; it dispatches on its own name.
+STUB = """\
+#!{python}
+import json, os, sys
+from pathlib import Path
+
+tool, args = Path(sys.argv[0]).name, sys.argv[1:]
+with open(os.environ["STUB_LOG"], "a", encoding="utf-8") as log:
+    log.write(json.dumps([tool, *args]) + "\\n")
+if tool == "go":
+    Path(args[args.index("-o") + 1]).write_bytes(b"go binary")
+elif tool == "cargo":
+    targets = [args[i + 1] for i, arg in enumerate(args) if arg == "--target"]
+    if set(os.environ.get("STUB_BROKEN", "").split()) & set(targets):
+        sys.exit(101)
+    for target in targets:
+        name = "demo.exe" if "windows" in target else "demo"
+        binary = Path("target", target, "release", name)
+        binary.parent.mkdir(parents=True, exist_ok=True)
+        binary.write_bytes(target.encode())
+"""
+
+
+@pytest.fixture
+def toolchain(tmp_path: Path, monkeypatch) -> Path:
+    """Put stub ``rustup``/``cargo``/``go`` on PATH and work in a crate checkout."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for tool in ("rustup", "cargo", "go"):
+        stub = bin_dir / tool
+        stub.write_text(STUB.format(python=sys.executable), encoding="utf-8")
+        stub.chmod(0o755)
+    work = tmp_path / "crate"
+    work.mkdir()
+    (work / "Cargo.toml").write_text(CARGO_TOML, encoding="utf-8")
+    monkeypatch.chdir(work)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("STUB_LOG", str(tmp_path / "calls.jsonl"))
+    return tmp_path / "calls.jsonl"
+
+
+def _calls(log: Path, tool: str) -> list[list[str]]:
+    lines = log.read_text(encoding="utf-8").splitlines() if log.exists() else []
+    return [call[1:] for call in map(json.loads, lines) if call[0] == tool]
+
+
+def test_read_cargo_manifest(tmp_path: Path) -> None:
+    """Cargo.toml is parsed with tomllib; missing or broken files give ``{}``."""
+    good = tmp_path / "Cargo.toml"
+    good.write_text(CARGO_TOML, encoding="utf-8")
+    broken = tmp_path / "Broken.toml"
+    broken.write_text("[package\nname =", encoding="utf-8")
+
+    manifest = build_artifacts.read_cargo_manifest(good)
+
+    assert manifest["package"] == {"name": "demo-crate", "version": "0.4.2"}
+    assert build_artifacts.read_cargo_manifest(broken) == {}
+    assert build_artifacts.read_cargo_manifest(tmp_path / "missing.toml") == {}
+
+
+def test_rust_binary_name() -> None:
+    """The first named ``[[bin]]`` wins, then the package name, then ``unknown``."""
+    name = build_artifacts.rust_binary_name
+
+    assert name({"package": {"name": "pkg"}, "bin": [{"path": "x"}, {"name": "tool"}]}) == "tool"
+    assert name({"package": {"name": "pkg"}, "bin": []}) == "pkg"
+    assert name({}) == "unknown"
+
+
+def test_batch_build_uses_one_rustup_and_one_cargo_call(toolchain: Path) -> None:
+    """All targets install and build in one call each, then get archived."""
+    assert build_artifacts.build_rust_artifacts_batch(TARGETS)
+
+    targets = [arg for target in TARGETS for arg in ("--target", target)]
+    assert _calls(toolchain, "rustup") == [["target", "add", *TARGETS]]
+    assert _calls(toolchain, "cargo") == [["build", "--release", *targets]]
+
+    releases = Path("releases")
+    manifest = json.loads((releases / "build-manifest.json").read_text(encoding="utf-8"))
+    assert manifest["binary_name"] == "demo"
+    assert manifest["version"] == "0.4.2"
+    assert manifest["successful_builds"] == TARGETS
+    assert manifest["failed_builds"] == []
+    assert (manifest["total_platforms"], manifest["successful_count"]) == (3, 3)
+    assert manifest["platforms"]["x86_64-pc-windows-gnu"]["binary"] == (
+        "demo-x86_64-pc-windows-gnu.zip"
+    )
+    for info in manifest["platforms"].values():
+        archive = releases / info["binary"]
+        digest = hashlib.sha256(archive.read_bytes()).hexdigest()
+        assert (releases / info["checksum"]).read_text(encoding="utf-8") == (
+            f"{digest}  {info['binary']}\n"
+        )
+        assert info["size"] == archive.stat().st_size
+
+
+def test_batch_build_retries_targets_after_a_failed_invocation(
+    toolchain: Path, monkeypatch
+) -> None:
+    """One broken target fails only itself once the build is retried per target."""
+    monkeypatch.setenv("STUB_BROKEN", "aarch64-apple-darwin")
+
+    assert build_artifacts.build_rust_artifacts_batch(TARGETS)
+
+    cargo = _calls(toolchain, "cargo")
+    assert len(cargo) == 1 + len(TARGETS)
+    assert [call[-1] for call in cargo[1:]] == TARGETS
+    manifest = json.loads(Path("releases/build-manifest.json").read_text(encoding="utf-8"))
+    assert manifest["successful_builds"] == ["x86_64-unknown-linux-gnu", "x86_64-pc-windows-gnu"]
+    assert manifest["failed_builds"] == ["aarch64-apple-darwin"]
+    assert sorted(manifest["platforms"]) == sorted(manifest["successful_builds"])
+    assert not list(Path("releases").glob("*aarch64-apple-darwin*"))
+
+
+def test_manifest_matches_go_release_manifest(toolchain: Path) -> None:
+    """Rust and Go builds describe their outputs with the same manifest shape."""
+    build_artifacts.build_rust_artifacts_batch(TARGETS)
+    build_go_release.build_all_platforms(Path("go-releases"), "demo", version="0.4.2")
+
+    rust = json.loads(Path("releases/build-manifest.json").read_text(encoding="utf-8"))
+    go = json.loads(Path("go-releases/build-manifest.json").read_text(encoding="utf-8"))
+
+    assert list(rust) == list(go)
+    assert {key: type(value) for key, value in rust.items()} == {
+        key: type(value) for key, value in go.items()
+    }
+    (go_platform, *_) = go["platforms"].values()
+    for platform in rust["platforms"].values():
+        assert {key: type(value) for key, value in platform.items()} == {
+            key: type(value) for key, value in go_platform.items()
+        }
+
+
+def test_create_archive_returns_path_and_checksum(tmp_path: Path) -> None:
+    """``create_archive`` reports the written archive, or None when it fails."""
+    binary = tmp_path / "demo"
+    binary.write_bytes(b"binary")
+
+    result = build_artifacts.create_archive(binary, tmp_path / "demo.tar.gz")
+
+    assert result.path == tmp_path / "demo.tar.gz"
+    assert result.sha256 == hashlib.sha256(result.path.read_bytes()).hexdigest()
+    assert build_artifacts.create_archive(tmp_path / "missing", tmp_path / "x.zip") is None
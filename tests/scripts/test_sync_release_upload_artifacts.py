@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_sync_release_upload_artifacts.py
+# version: 1.0.0
+# guid: 967bfae8-6f15-4608-a183-345d04ccf4a1
+
+"""Tests for the release artifact upload entry point."""
+
+from __future__ import annotations
+
+import pytest
+
+from tests.scripts import load_script
+
+sync_release_upload_artifacts = load_script(".github/scripts/sync-release-upload-artifacts.py")
+
+
+@pytest.mark.parametrize(("failures", "status"), [(0, 0), (2, 1)])
+def test_main_exit_status_reflects_failed_uploads(monkeypatch, failures: int, status: int) -> None:
+    """Failed uploads fail the step instead of exiting successfully."""
+    monkeypatch.setattr(
+        sync_release_upload_artifacts, "upload_artifacts", lambda release_id, path: failures
+    )
+    monkeypatch.setattr("sys.argv", ["sync-release-upload-artifacts.py", "42", "dist"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        sync_release_upload_artifacts.main()
+
+    assert exit_info.value.code == status
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# file: tests/scripts/test_update_repository_automation.py
+# version: 1.0.1
+# guid: 032de803-93f0-40b2-874d-839c39d65be4
+
+"""Tests for single-commit repository automation updates against a local API."""
+
+from __future__ import annotations
+
+import base64
+import json
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from tests.scripts import load_script, serve_locally
+
+update_repository_automation = load_script("scripts/update-repository-automation.py")
+
+REPO = "/repos/octo/demo"
+RAW_BASE = "https://raw.githubusercontent.com/jdfalk/ghcommon/main"
+REUSABLE = "jdfalk/ghcommon/.github/workflows/reusable-unified-automation.yml"
+
+
+class FakeGitHub:
+    """Just enough of the REST and Git Data APIs for one repository."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str, Any]] = []
+        self.workflows: list[dict] = []
+        self.config: dict | None = None
+        self.raw = ""
+        self.head = "head-1"
+        self.moves = 0
+
+    def handle(self, method: str, path: str, body: Any) -> tuple[int, Any]:
+        self.requests.append((method, path, body))
+        if (method, path) == ("GET", REPO):
+            return 200, {"default_branch": "main"}
+        if path == f"{REPO}/contents/.github/workflows":
+            return 200, self.workflows
+        if path == f"{REPO}/contents/.github/unified-automation-config.json":
+            return (200, self.config) if self.config else (404, {})
+        if path.startswith("/raw/"):
+            return 200, self.raw
+        if path == f"{REPO}/git/ref/heads/main":
+            return 200, {"object": {"sha": self.head}}
+        if path.startswith(f"{REPO}/git/commits/"):
+            return 200, {"tree": {"sha": f"tree-{path.rsplit('/', 1)[1]}"}}
+        if path == f"{REPO}/git/trees":
+            return 201, {"sha": f"tree-new-{len(self.requests)}"}
+        if path == f"{REPO}/git/commits":
+            return 201, {"sha": f"commit-{len(self.requests)}"}
+        if (method, path) == ("PATCH", f"{REPO}/git/refs/heads/main"):
+            if self.moves:
+                self.moves -= 1
+                self.head = f"head-moved-{len(self.requests)}"
+                return 422, {"message": "Update is not a fast forward"}
+            self.head = body["sha"]
+            return 200, {"object": {"sha": body["sha"]}}
+        return 404, {"message": "Not Found"}
+
+    def git_calls(self) -> list[tuple[str, str]]:
+        return [
+            (method, path.removeprefix(f"{REPO}/git/"))
+            for method, path, _ in self.requests
+            if path.startswith(f"{REPO}/git/")
+        ]
+
+    def bodies(self, method: str, suffix: str) -> list[Any]:
+        return [
+            body for verb, path, body in self.requests if verb == method and path.endswith(suffix)
+        ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        status, payload = self.server.backend.handle(self.command, self.path, body)
+        data = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond  # noqa: N815
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def github() -> FakeGitHub:
+    """A FakeGitHub repository served by ``_Handler``."""
+    with serve_locally(_Handler, FakeGitHub()) as fake:
+        yield fake
+
+
+def _updater(github: FakeGitHub, tmp_path: Path, monkeypatch) -> Any:
+    monkeypatch.chdir(tmp_path)  # no local workflow template
+    updater = update_repository_automation.RepositoryAutomationUpdater(
+        "token", single_commit=True, api_url=github.url
+    )
+    updater._remote_cache.update(
+        {
+            f"{RAW_BASE}/examples/workflows/unified-automation-complete.yml": "name: Unified\n",
+            f"{RAW_BASE}/.github/unified-automation-config.json": '{"issue_management": {}}',
+        }
+    )
+    return updater
+
+
+def _labeler(github: FakeGitHub) -> dict:
+    return {
+        "name": "labeler.yml",
+        "path": ".github/workflows/labeler.yml",
+        "sha": "labeler-sha",
+        "download_url": f"{github.url}/raw/labeler.yml",
+    }
+
+
+COMMIT_SEQUENCE = [
+    ("GET", "ref/heads/main"),
+    ("GET", "commits/head-1"),
+    ("POST", "trees"),
+    ("POST", "commits"),
+    ("PATCH", "refs/heads/main"),
+]
+
+
+def test_single_commit_builds_one_commit(github: FakeGitHub, tmp_path: Path, monkeypatch) -> None:
+    """Every planned change lands in one tree, one commit and one ref update."""
+    github.workflows = [_labeler(github)]
+    updater = _updater(github, tmp_path, monkeypatch)
+
+    assert updater.update_repository("octo/demo")
+
+    assert github.git_calls() == COMMIT_SEQUENCE
+    (tree,) = github.bodies("POST", "/git/trees")
+    assert tree["base_tree"] == "tree-head-1"
+    assert tree["tree"] == [
+        {
+            "path": ".github/unified-automation-config.json",
+            "mode": "100644",
+            "type": "blob",
+            "content": '{"issue_management": {}}',
+        },
+        {"path": ".github/workflows/labeler.yml", "mode": "100644", "type": "blob", "sha": None},
+        {
+            "path": ".github/workflows/unified-automation.yml",
+            "mode": "100644",
+            "type": "blob",
+            "content": "name: Unified\n",
+        },
+    ]
+    (commit,) = github.bodies("POST", "/git/commits")
+    assert commit["parents"] == ["head-1"]
+    assert commit["message"].startswith("Update unified automation\n\n- Remove redundant")
+    assert github.bodies("PATCH", "/refs/heads/main") == [{"sha": github.head, "force": False}]
+    assert not [method for method, _, _ in github.requests if method in ("PUT", "DELETE")]
+
+
+@pytest.mark.parametrize(("moves", "expected"), [(1, True), (2, False)])
+def test_single_commit_rebuilds_once_on_moved_branch(
+    github: FakeGitHub, tmp_path: Path, monkeypatch, moves: int, expected: bool
+) -> None:
+    """A 422 ref update rebuilds the commit on the new head, but only once."""
+    github.workflows = [_labeler(github)]
+    github.moves = moves
+    updater = _updater(github, tmp_path, monkeypatch)
+
+    assert updater.update_repository("octo/demo") is expected
+
+    calls = github.git_calls()
+    assert calls[:5] == COMMIT_SEQUENCE
+    moved_head = calls[6][1].removeprefix("commits/")
+    assert moved_head.startswith("head-moved-")
+    assert calls[5:] == [
+        ("GET", "ref/heads/main"),
+        ("GET", f"commits/{moved_head}"),
+        ("POST", "trees"),
+        ("POST", "commits"),
+        ("PATCH", "refs/heads/main"),
+    ]
+    parents = [body["parents"] for body in github.bodies("POST", "/git/commits")]
+    assert parents == [["head-1"], [moved_head]]
+
+
+def test_partial_plan_does_not_commit(github: FakeGitHub, tmp_path: Path, monkeypatch) -> None:
+    """A failed step leaves the repository untouched even with changes staged."""
+    github.raw = f"uses: {REUSABLE}@main\n"
+    github.workflows = [
+        _labeler(github),
+        {
+            "name": "unified-automation.yml",
+            "path": ".github/workflows/unified-automation.yml",
+            "sha": "unified-sha",
+            "download_url": f"{github.url}/raw/unified-automation.yml",
+        },
+    ]
+    github.config = {"content": base64.b64encode(b"not json").decode(), "sha": "config-sha"}
+    updater = _updater(github, tmp_path, monkeypatch)
+
+    assert updater.update_repository("octo/demo") is False
+
+    assert github.git_calls() == []
+    assert not [method for method, _, _ in github.requests if method != "GET"]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_archive_builder.py
+# version: 1.0.0
+# guid: cdcea4bc-403e-4b33-a45c-b2052008d191
+
+"""Unit tests for the reproducible archive builder."""
+
+from __future__ import annotations
+
+import gzip
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import archive_builder
+import pytest
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Create a small tree with a binary, an executable and a symlink."""
+    root = tmp_path / "src"
+    (root / "bin").mkdir(parents=True)
+    (root / "data.bin").write_bytes(os.urandom(300_000) + b"tail" * 200_000)
+    tool = root / "bin" / "tool"
+    tool.write_text("#!/bin/sh\necho hi\n", encoding="utf-8")
+    tool.chmod(0o775)
+    (root / "link").symlink_to("bin/tool")
+    return root
+
+
+@pytest.mark.parametrize("suffix", [".tar.gz", ".zip"])
+def test_archives_are_reproducible(source: Path, tmp_path: Path, suffix: str) -> None:
+    """Digests ignore mtimes and worker counts."""
+    first = archive_builder.build_archive([(source, "pkg")], tmp_path / f"a{suffix}", workers=1)
+    os.utime(source / "data.bin", (1_000_000, 1_000_000))
+    second = archive_builder.build_archive([(source, "pkg")], tmp_path / f"b{suffix}", workers=4)
+    assert first.sha256 == second.sha256
+    assert first.size == second.size == (tmp_path / f"a{suffix}").stat().st_size
+
+
+def test_parallel_gzip_round_trips(source: Path, tmp_path: Path, monkeypatch) -> None:
+    """Block-parallel gzip output is a valid tar.gz with normalized metadata."""
+    monkeypatch.setattr(archive_builder, "GZIP_BLOCK_SIZE", 64 * 1024)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    result = archive_builder.build_archive([(source, "pkg")], tmp_path / "out.tgz", workers=3)
+
+    assert gzip.decompress(result.path.read_bytes())
+    with tarfile.open(result.path) as archive:
+        members = {member.name: member for member in archive.getmembers()}
+        assert list(members) == ["pkg", "pkg/bin", "pkg/bin/tool", "pkg/data.bin", "pkg/link"]
+        assert {member.mtime for member in members.values()} == {1700000000}
+        assert {member.uid for member in members.values()} == {0}
+        assert members["pkg/bin/tool"].mode == 0o755
+        assert members["pkg/data.bin"].mode == 0o644
+        assert members["pkg/link"].issym() and members["pkg/link"].linkname == "bin/tool"
+        data = archive.extractfile("pkg/data.bin").read()
+    assert data == (source / "data.bin").read_bytes()
+
+
+def test_zip_preserves_modes_and_content(source: Path, tmp_path: Path) -> None:
+    """Zip entries carry unix modes and a fixed timestamp."""
+    result = archive_builder.build_archive([(source / "bin" / "tool", "tool")], tmp_path / "t.zip")
+    with zipfile.ZipFile(result.path) as archive:
+        (info,) = archive.infolist()
+        assert info.filename == "tool"
+        assert info.date_time == (1980, 1, 1, 0, 0, 0)
+        assert (info.external_attr >> 16) & 0o777 == 0o755
+        assert archive.read("tool") == (source / "bin" / "tool").read_bytes()
+
+
+def test_unsupported_format_and_missing_source(tmp_path: Path) -> None:
+    """Bad suffixes and missing inputs raise ArchiveError."""
+    with pytest.raises(archive_builder.ArchiveError):
+        archive_builder.build_archive([], tmp_path / "x.rar")
+    with pytest.raises(archive_builder.ArchiveError):
+        archive_builder.build_archive([(tmp_path / "missing", "m")], tmp_path / "x.zip")
+
+
+def test_zstd_tarball(source: Path, tmp_path: Path) -> None:
+    """zstd output is reproducible when the optional backend is installed."""
+    zstandard = pytest.importorskip("zstandard")
+    first = archive_builder.build_archive([(source, "pkg")], tmp_path / "a.tar.zst", workers=1)
+    second = archive_builder.build_archive([(source, "pkg")], tmp_path / "b.tar.zst", workers=2)
+    assert first.sha256 == second.sha256
+    with zstandard.open(first.path, "rb") as raw, tarfile.open(fileobj=raw, mode="r|") as archive:
+        assert "pkg/data.bin" in [member.name for member in archive]
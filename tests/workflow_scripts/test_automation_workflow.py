@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: tests/workflow_scripts/test_automation_workflow.py
-# version: 1.2.0
+# version: 1.4.0
 # guid: d9f5c8b3-2c4d-4e5f-9a7b-3c2d1f0e1a2b
 
 """Tests for automation_workflow helper module."""
@@ -8,6 +8,7 @@
 from __future__ import annotations
 
 import json
+import random
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -197,6 +198,84 @@ def test_detect_self_healing_actions_flags_failures() -> None:
     assert cache_action.severity == "medium"
 
 
+def test_collect_workflow_metrics_reports_duration_percentiles() -> None:
+    """Per-workflow summaries expose p50/p90/p99 from the duration sketch."""
+    runs = [
+        {"name": "CI", "conclusion": "success", "duration_seconds": seconds}
+        for seconds in range(1, 101)
+    ]
+
+    metrics = automation_workflow.collect_workflow_metrics(runs)
+    payload = metrics.to_dict()["workflows"]["CI"]
+
+    assert payload["p50_duration"] == pytest.approx(50.5, abs=1)
+    assert payload["p90_duration"] == pytest.approx(90.5, abs=1)
+    assert payload["p99_duration"] == pytest.approx(99.5, abs=1)
+    assert payload["duration_sketch"]["centroids"]
+
+
+def test_detect_self_healing_actions_flags_tail_latency_regression() -> None:
+    """A shift in recent tail duration produces a regression action."""
+    start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+    def run(index: int, seconds: float) -> dict[str, Any]:
+        started = start + timedelta(hours=index)
+        return {
+            "name": "CI",
+            "conclusion": "success",
+            "duration_seconds": seconds,
+            "run_started_at": started.isoformat(),
+        }
+
+    steady = [run(index, 300 + index % 7) for index in range(60)]
+    slow = steady + [run(60 + index, 900 if index % 3 else 320) for index in range(20)]
+
+    steady_actions = automation_workflow.detect_self_healing_actions(
+        automation_workflow.collect_workflow_metrics(steady)
+    )
+    slow_actions = automation_workflow.detect_self_healing_actions(
+        automation_workflow.collect_workflow_metrics(slow)
+    )
+
+    assert not [action for action in steady_actions if "tail-latency" in action.slug]
+    regression = next(action for action in slow_actions if "tail-latency" in action.slug)
+    assert regression.slug == "CI-tail-latency-regression"
+    assert regression.severity == "high"
+    assert "p90" in regression.description
+
+
+def test_columnar_metrics_match_dataclass_path() -> None:
+    """The columnar aggregation serializes identically to the dataclass path."""
+    rng = random.Random(11)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    runs: list[dict[str, Any]] = []
+    for index in range(3000):
+        started = start + timedelta(seconds=rng.randrange(10**7), microseconds=index)
+        run: dict[str, Any] = {"name": rng.choice(["CI", "Docs", None]), "workflow": "wf"}
+        if rng.random() < 0.9:
+            run["conclusion"] = rng.choice(["success", "failure", "cancelled", "skipped", None])
+        if rng.random() < 0.9:
+            offset = timezone(timedelta(hours=rng.choice([0, 2])))
+            run["run_started_at"] = started.astimezone(offset).isoformat().replace("+00:00", "Z")
+        if rng.random() < 0.8:
+            run["updated_at"] = (started + timedelta(seconds=rng.randrange(900))).isoformat()
+        if rng.random() < 0.2:
+            run["run_duration_ms"] = rng.randrange(10**6)
+        choice = rng.random()
+        if choice < 0.3:
+            run["cache"] = {"hit": rng.choice([True, False, "yes", None])}
+        elif choice < 0.5:
+            run["cache_hit"] = rng.choice([1, 0, "false"])
+        runs.append(run)
+
+    expected = automation_workflow.collect_workflow_metrics(runs).to_dict()
+    columns = automation_workflow.WorkflowRunColumns.from_dicts(runs)
+
+    assert len(columns) == len(runs)
+    assert automation_workflow.collect_workflow_metrics_columnar(columns).to_dict() == expected
+    assert automation_workflow.collect_workflow_metrics_columnar([]).total_runs == 0
+
+
 def test_filter_runs_by_lookback_filters_old_entries() -> None:
     """filter_runs_by_lookback drops runs older than the cutoff."""
     now = datetime(2024, 2, 10, tzinfo=timezone.utc)
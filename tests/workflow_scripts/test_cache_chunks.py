@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_cache_chunks.py
+# version: 1.1.0
+# guid: 82023dc1-2b60-4b3f-ab57-1450bcf46dc6
+
+"""Tests for the content-defined chunk cache store."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import random
+import stat
+from pathlib import Path
+
+import automation_workflow
+import cache_chunks
+
+
+def _random_bytes(size: int, seed: int = 0) -> bytes:
+    return random.Random(seed).getrandbits(8 * size).to_bytes(size, "little")
+
+
+def test_chunk_boundaries_survive_insertions() -> None:
+    """An insertion changes only the chunks next to it, whatever the read size."""
+    data = _random_bytes(4 * 1024 * 1024)
+    edited = data[:1_500_000] + b"inserted bytes" + data[1_500_000:]
+
+    chunks = list(cache_chunks.iter_chunks(io.BytesIO(data), read_size=1_000_000))
+    edited_chunks = list(cache_chunks.iter_chunks(io.BytesIO(edited)))
+
+    assert b"".join(chunks) == data
+    assert chunks == list(cache_chunks.iter_chunks(io.BytesIO(data)))
+    assert all(len(chunk) <= cache_chunks.MAX_CHUNK for chunk in chunks)
+    assert all(len(chunk) >= cache_chunks.MIN_CHUNK for chunk in chunks[:-1])
+    assert len(set(edited_chunks) - set(chunks)) <= 2
+    assert list(cache_chunks.iter_chunks(io.BytesIO(b""))) == []
+
+
+def _write_tree(root: Path) -> None:
+    (root / "pkg" / "mod").mkdir(parents=True)
+    (root / "pkg" / "mod" / "big.zip").write_bytes(_random_bytes(600_000, seed=1))
+    (root / "pkg" / "mod" / "go.mod").write_text("module example.com/demo\n", encoding="utf-8")
+    os.symlink("go.mod", root / "pkg" / "mod" / "link.mod")
+    (root / "pkg" / "mod").chmod(0o555)  # Go marks module directories read-only
+
+
+def test_pack_unpack_round_trip_and_incremental_restore(tmp_path: Path) -> None:
+    """Restores write only changed files; packs read only changed files."""
+    source = tmp_path / "cache"
+    _write_tree(source)
+    store = cache_chunks.ChunkStore(tmp_path / "store")
+
+    first = cache_chunks.pack(store, "go-linux-aaa", [str(source)])
+    (source / "pkg" / "mod").chmod(0o755)
+    big = source / "pkg" / "mod" / "big.zip"
+    big.write_bytes(big.read_bytes()[:300_000] + b"patch" + big.read_bytes()[300_000:])
+    second = cache_chunks.pack(store, "go-linux-bbb", [str(source)], ["go-linux-"])
+
+    assert (first.files, first.new_chunks) == (2, first.chunks)
+    assert (second.base_key, second.reused_files) == ("go-linux-aaa", 1)
+    assert 0 < second.new_bytes < big.stat().st_size
+
+    restored = tmp_path / "restored"
+    source.rename(restored)
+    cache_chunks.unpack(store, "go-linux-aaa")
+    assert (source / "pkg" / "mod" / "go.mod").read_text(encoding="utf-8").startswith("module")
+    assert os.readlink(source / "pkg" / "mod" / "link.mod") == "go.mod"
+    assert stat.S_IMODE((source / "pkg" / "mod").stat().st_mode) == 0o555
+
+    stats = cache_chunks.unpack(store, "go-linux-ccc", ["go-linux-"])
+    assert (stats.key, stats.exact) == ("go-linux-bbb", False)
+    assert (stats.written_files, stats.skipped_files) == (1, 1)
+    assert big.read_bytes() == (restored / "pkg" / "mod" / "big.zip").read_bytes()
+    assert cache_chunks.unpack(store, "go-linux-bbb").written_files == 0
+    assert cache_chunks.unpack(store, "rust-linux-aaa", ["rust-"]).key is None
+
+
+def test_pack_skips_new_key_for_unchanged_restore(tmp_path: Path) -> None:
+    """Restored content packed unchanged under a new key is not an exact hit later."""
+    source = tmp_path / "cache"
+    _write_tree(source)
+    store = cache_chunks.ChunkStore(tmp_path / "store")
+    cache_chunks.pack(store, "go-linux-aaa", [str(source)])
+    cache_chunks.unpack(store, "go-linux-bbb", ["go-linux-"])
+
+    unchanged = cache_chunks.pack(store, "go-linux-bbb", [str(source)], ["go-linux-"])
+    assert (unchanged.base_key, unchanged.saved) == ("go-linux-aaa", False)
+    assert store.keys() == ["go-linux-aaa"]
+
+    (source / "pkg" / "mod").chmod(0o755)
+    (source / "pkg" / "mod" / "go.sum").write_text("example.com/dep v1.0.0\n", encoding="utf-8")
+    built = cache_chunks.pack(store, "go-linux-bbb", [str(source)], ["go-linux-"])
+
+    assert (built.saved, sorted(store.keys())) == (True, ["go-linux-aaa", "go-linux-bbb"])
+    assert cache_chunks.unpack(store, "go-linux-bbb").exact
+
+
+def test_prune_keeps_chunks_of_newest_manifests(tmp_path: Path) -> None:
+    """Pruning drops old manifests and the chunks only they used."""
+    source = tmp_path / "file.bin"
+    store = cache_chunks.ChunkStore(tmp_path / "store")
+    source.write_bytes(_random_bytes(100_000, seed=2))
+    cache_chunks.pack(store, "old", [str(source)])
+    source.write_bytes(_random_bytes(100_000, seed=3))
+    os.utime(source, ns=(1, 1))
+    os.utime(store.manifest_path("old"), ns=(0, 0))
+    cache_chunks.pack(store, "new", [str(source)])
+
+    manifests, chunks = store.prune(1)
+
+    assert (manifests, chunks > 0) == (1, True)
+    assert store.keys() == ["new"]
+    source.unlink()
+    assert cache_chunks.unpack(store, "new").written_files == 1
+    assert source.read_bytes() == _random_bytes(100_000, seed=3)
+
+
+def test_cli_pack_and_unpack_write_outputs(tmp_path: Path, monkeypatch) -> None:
+    """The subcommands report hits, matched keys and new chunk counts."""
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    source = tmp_path / "registry"
+    (source / "cache").mkdir(parents=True)
+    (source / "cache" / "serde-1.0.crate").write_bytes(_random_bytes(50_000, seed=4))
+    store = str(tmp_path / "store")
+
+    assert (
+        automation_workflow.main(
+            [
+                "cache-pack",
+                "--store",
+                store,
+                "--key",
+                "cargo-1",
+                "--paths",
+                f"{source},",
+                "--keep",
+                "2",
+            ]
+        )
+        == 0
+    )
+    outputs = dict(line.split("=", 1) for line in output.read_text().splitlines())
+    assert (outputs["cache-new-bytes"], outputs["cache-saved"]) == ("50000", "true")
+
+    automation_workflow.main(
+        ["cache-unpack", "--store", store, "--key", "cargo-2", "--restore-keys", "other-\ncargo-"]
+    )
+    outputs = dict(line.split("=", 1) for line in output.read_text().splitlines())
+    assert outputs["cache-hit"] == "false"
+    assert outputs["cache-matched-key"] == "cargo-1"
+    assert outputs["cache-written-bytes"] == "0"
+    manifest = json.loads(cache_chunks.ChunkStore(store).manifest_path("cargo-1").read_text())
+    assert manifest["roots"] == [str(source)]
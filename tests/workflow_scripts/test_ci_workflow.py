@@ -1,6 +1,9 @@
 import argparse
 import json
+import random
 import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 
 import ci_workflow
@@ -10,6 +13,7 @@ import pytest
 @pytest.fixture(autouse=True)
 def reset_config_cache():
     ci_workflow._CONFIG_CACHE = None  # type: ignore[attr-defined]
+    ci_workflow._TREE_FILES.clear()
 
 
 def test_debug_filter_outputs(monkeypatch, capsys):
@@ -86,6 +90,61 @@ def test_wait_for_pr_automation_completed(monkeypatch, capsys):
     assert "✅ PR automation has completed" in captured
 
 
+def test_wait_for_pr_automation_filters_server_side_and_revalidates(monkeypatch, capsys):
+    monkeypatch.setenv("GITHUB_REPOSITORY", "owner/repo")
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("TARGET_SHA", "abc123")
+    monkeypatch.setenv("MAX_ATTEMPTS", "5")
+    monkeypatch.setenv("SLEEP_SECONDS", "1")
+    sleeps: list[float] = []
+    monkeypatch.setattr(ci_workflow.time, "sleep", sleeps.append)
+    calls: list[tuple[str, dict[str, Any], dict[str, str]]] = []
+    run = {"head_sha": "abc123", "name": "PR Automation", "workflow_id": 7}
+    statuses = iter(["in_progress", None, "completed"])
+
+    def fake_get(url: str, **kwargs):
+        calls.append((url, kwargs["params"], kwargs["headers"]))
+        if url.endswith("/workflows/7/runs"):
+            return DummyResponse(200, {"workflow_runs": []})
+        status = next(statuses)
+        if status is None:
+            return DummyResponse(304, {})
+        response = DummyResponse(200, {"workflow_runs": [{**run, "status": status}]})
+        response.headers = {"ETag": f'"{status}"'}
+        return response
+
+    monkeypatch.setattr(ci_workflow, "_http_get", fake_get)
+    ci_workflow.wait_for_pr_automation(argparse.Namespace())
+
+    polls = [call for call in calls if call[0].endswith("/actions/runs")]
+    assert len(polls) == 3
+    assert all(params["head_sha"] == "abc123" for _, params, _ in polls)
+    assert "If-None-Match" not in polls[0][2]
+    assert polls[1][2]["If-None-Match"] == '"in_progress"'
+    assert len(sleeps) == 2
+    assert "(unchanged)" in capsys.readouterr().out
+
+
+def test_wait_delay_backs_off_and_respects_expected_remaining():
+    rng = random.Random(0)
+    delays = [ci_workflow._wait_delay(poll, 5, rng=rng) for poll in range(6)]
+    assert delays[0] <= 5
+    assert delays[3] > delays[0]
+    assert max(delays) <= ci_workflow.MAX_WAIT_DELAY
+    assert ci_workflow._wait_delay(5, 5, expected_remaining=8, rng=rng) <= 8
+    assert ci_workflow._wait_delay(5, 5, expected_remaining=-30, rng=rng) == 5
+
+    now = ci_workflow.datetime(2024, 1, 1, 0, 10, tzinfo=ci_workflow.timezone.utc)
+    history = [
+        {"status": "completed", "run_started_at": "2024-01-01T00:00:00Z", "updated_at": end}
+        for end in ("2024-01-01T00:12:00Z", "2024-01-01T00:15:00Z", "2024-01-01T00:20:00Z")
+    ]
+    durations = ci_workflow._run_durations(history)
+    assert durations == [720.0, 900.0, 1200.0]
+    current = {"run_started_at": "2024-01-01T00:00:00Z"}
+    assert ci_workflow._expected_remaining(current, durations, now=now) == 300.0
+
+
 def test_load_super_linter_config(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
     (tmp_path / "super-linter-ci.env").write_text("FOO=bar\n", encoding="utf-8")
@@ -114,6 +173,14 @@ def test_go_setup_skips_without_go_mod(tmp_path, monkeypatch, capsys):
     assert "skipping Go step" in capsys.readouterr().out
 
 
+def _write_go_profile(path, covered, statements):
+    lines = ["mode: set"]
+    for index in range(statements):
+        hit = 1 if index < covered else 0
+        lines.append(f"example.com/test/pkg/file.go:{index + 1}.1,{index + 1}.20 1 {hit}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
 def test_go_test_runs_commands(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
     (tmp_path / "go.mod").write_text("module example.com/test\n", encoding="utf-8")
@@ -121,13 +188,14 @@ def test_go_test_runs_commands(tmp_path, monkeypatch):
 
     def fake_run(cmd, check=False, capture_output=False, text=False, **kwargs):
         commands.append((tuple(cmd), check, capture_output))
-        if "-func" in cmd:
-            return subprocess.CompletedProcess(cmd, 0, stdout="total: (statements) 75.0%\n")
+        if "test" in cmd:
+            _write_go_profile(tmp_path / "coverage.out", covered=3, statements=4)
         return subprocess.CompletedProcess(cmd, 0)
 
     monkeypatch.setenv("COVERAGE_THRESHOLD", "70")
     monkeypatch.delenv("REPOSITORY_CONFIG", raising=False)
     ci_workflow._CONFIG_CACHE = None  # type: ignore[attr-defined]
+    ci_workflow._TREE_FILES.clear()
     monkeypatch.setattr(ci_workflow.subprocess, "run", fake_run)
     monkeypatch.setattr(ci_workflow.shutil, "which", lambda name: "go")
 
@@ -135,6 +203,7 @@ def test_go_test_runs_commands(tmp_path, monkeypatch):
     go_commands = [cmd for cmd, *_ in commands if cmd and cmd[0] == "go"]
     assert any("test" in cmd for cmd in go_commands)
     assert any("tool" in cmd for cmd in go_commands)
+    assert not any("-func" in cmd for cmd in go_commands)
 
 
 def test_python_run_tests_skips_when_no_tests(tmp_path, monkeypatch, capsys):
@@ -234,13 +303,14 @@ def test_go_test_uses_config_threshold(tmp_path, monkeypatch):
     config = {"testing": {"coverage": {"threshold": 90}}}
     monkeypatch.setenv("REPOSITORY_CONFIG", json.dumps(config))
     ci_workflow._CONFIG_CACHE = None  # type: ignore[attr-defined]
+    ci_workflow._TREE_FILES.clear()
 
     commands = []
 
     def fake_run(cmd, check=False, capture_output=False, text=False, **kwargs):
         commands.append((tuple(cmd), capture_output))
-        if "-func" in cmd:
-            return subprocess.CompletedProcess(cmd, 0, stdout="total: (statements) 95.0%\n")
+        if "test" in cmd:
+            _write_go_profile(tmp_path / "coverage.out", covered=19, statements=20)
         return subprocess.CompletedProcess(cmd, 0)
 
     monkeypatch.setattr(ci_workflow.subprocess, "run", fake_run)
@@ -272,6 +342,7 @@ def test_generate_matrices_uses_repository_config(tmp_path, monkeypatch):
     monkeypatch.setenv("FALLBACK_NODE_VERSION", "22")
     monkeypatch.setenv("FALLBACK_COVERAGE_THRESHOLD", "80")
     ci_workflow._CONFIG_CACHE = None  # type: ignore[attr-defined]
+    ci_workflow._TREE_FILES.clear()
 
     ci_workflow.generate_matrices(argparse.Namespace())
 
@@ -330,3 +401,75 @@ def test_check_ci_status_failure(monkeypatch):
     monkeypatch.setenv("JOB_DOCS", "skipped")
     with pytest.raises(SystemExit):
         ci_workflow.check_ci_status(argparse.Namespace())
+
+
+def test_check_go_coverage_merges_shards_without_go_func(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_go_profile(tmp_path / "shard-1.out", covered=2, statements=4)
+    (tmp_path / "shard-2.out").write_text(
+        "mode: set\nexample.com/test/pkg/file.go:3.1,3.20 1 1\n", encoding="utf-8"
+    )
+    _write_go_profile(tmp_path / "base.out", covered=1, statements=4)
+    summary = tmp_path / "summary.md"
+    commands = []
+
+    def fake_run(cmd, check=False, **kwargs):
+        commands.append(tuple(cmd))
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(ci_workflow.subprocess, "run", fake_run)
+    monkeypatch.setattr(ci_workflow.shutil, "which", lambda name: "go")
+    monkeypatch.setenv("COVERAGE_FILE", "shard-*.out")
+    monkeypatch.setenv("COVERAGE_THRESHOLD", "75")
+    monkeypatch.setenv("BASE_COVERAGE_FILE", "base.out")
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary))
+
+    ci_workflow.check_go_coverage(argparse.Namespace())
+
+    assert commands == [("go", "tool", "cover", "-html=coverage.merged.out", "-o", "coverage.html")]
+    assert (
+        "example.com/test/pkg/file.go:3.1,3.20 1 1"
+        in (tmp_path / "coverage.merged.out").read_text()
+    )
+    text = summary.read_text()
+    assert "| `example.com/test/pkg` | 75.0% |" in text
+    assert "| `example.com/test/pkg` | 25.0% | 75.0% | +50.0 |" in text
+
+    monkeypatch.setenv("COVERAGE_THRESHOLD", "80")
+    with pytest.raises(SystemExit, match="below threshold"):
+        ci_workflow.check_go_coverage(argparse.Namespace())
+
+
+def test_urllib_get_headers_are_case_insensitive():
+    """ETag lookups work on the urllib fallback whatever the header case."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 - http.server API
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("etag", '"v1"')
+                self.end_headers()
+                return
+            body = b'{"workflow_runs": []}'
+            self.send_response(200)
+            self.send_header("etag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/runs"
+    try:
+        first = ci_workflow._urllib_get(url)
+        assert first.status_code == 200
+        assert first.headers.get("ETag") == '"v1"'
+        second = ci_workflow._urllib_get(url, headers={"If-None-Match": '"v1"'})
+        assert second.status_code == 304
+        assert second.headers.get("ETag") == '"v1"'
+    finally:
+        server.shutdown()
+        server.server_close()
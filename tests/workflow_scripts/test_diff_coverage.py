@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_diff_coverage.py
+# version: 1.0.0
+# guid: 1deb801f-2436-46c0-a4dd-94acc1625b2b
+
+"""Tests for diff coverage over lcov and Go profiles."""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+from pathlib import Path
+
+import ci_workflow
+import diff_coverage
+import pytest
+
+DIFF = """\
+diff --git a/src/lib.rs b/src/lib.rs
+--- a/src/lib.rs
++++ b/src/lib.rs
+@@ -3,0 +4,3 @@ fn a() {
++added
+@@ -10 +13 @@ fn b() {
+@@ -20,2 +23,0 @@ fn c() {
+diff --git a/old.rs b/old.rs
+--- a/old.rs
++++ /dev/null
+@@ -1,2 +0,0 @@
+diff --git a/x.go b/y.go
+--- a/x.go
++++ b/y.go
+@@ -1 +1,2 @@
+"""
+
+
+def test_parse_diff_reads_new_side_ranges() -> None:
+    """Zero-length hunks and deleted files contribute no lines."""
+    assert diff_coverage.parse_diff(DIFF.splitlines()) == {
+        "src/lib.rs": [(4, 6), (13, 13)],
+        "y.go": [(1, 2)],
+    }
+    quoted = ['+++ "b/dir/tab\\there.rs"', "@@ -0,0 +1 @@"]
+    assert diff_coverage.parse_diff(quoted) == {"dir/tab\there.rs": [(1, 1)]}
+
+
+def test_read_lcov_filters_and_merges_records(tmp_path: Path) -> None:
+    """Absolute paths are made relative; repeated records are OR-ed."""
+    lcov = [
+        f"SF:{tmp_path / 'src' / 'lib.rs'}\n",
+        "DA:4,0\n",
+        "DA:5,3\n",
+        "end_of_record\n",
+        "SF:src/lib.rs\n",
+        "DA:4,1,abc\n",
+        "DA:6,0\n",
+        "end_of_record\n",
+        "SF:src/other.rs\n",
+        "DA:1,1\n",
+        "end_of_record\n",
+    ]
+    coverage = diff_coverage.read_lcov(lcov, {}, only={"src/lib.rs"}, root=tmp_path)
+
+    assert list(coverage) == ["src/lib.rs"]
+    bitmap = coverage["src/lib.rs"]
+    assert [bitmap.state(line) for line in (3, 4, 5, 6, 900)] == [None, True, True, False, None]
+
+
+def test_read_go_profile_maps_import_paths_through_go_mod(tmp_path: Path) -> None:
+    """Nested modules win over their parent; a line is covered if any block ran."""
+    (tmp_path / "go.mod").write_text("module example.com/root\n", encoding="utf-8")
+    (tmp_path / "tools").mkdir()
+    (tmp_path / "tools" / "go.mod").write_text("module example.com/root/tools\n", encoding="utf-8")
+    profile = tmp_path / "coverage.out"
+    profile.write_text(
+        "mode: set\n"
+        "example.com/root/pkg/a.go:3.20,4.12 2 1\n"
+        "example.com/root/pkg/a.go:4.12,6.3 1 0\n"
+        "example.com/root/pkg/a.go:8.1,8.10 0 0\n"
+        "example.com/root/tools/cmd/t.go:1.1,2.2 1 0\n",
+        encoding="utf-8",
+    )
+
+    coverage = diff_coverage.read_coverage([profile], root=tmp_path)
+
+    assert sorted(coverage) == ["pkg/a.go", "tools/cmd/t.go"]
+    bitmap = coverage["pkg/a.go"]
+    assert [bitmap.state(line) for line in range(3, 9)] == [True, True, False, False, None, None]
+
+
+def test_diff_report_and_formatting() -> None:
+    """Only changed, instrumented lines count."""
+    bitmap = diff_coverage.LineBitmap()
+    bitmap.mark_range(1, 3, True)
+    bitmap.mark_range(4, 6, False)
+    bitmap.mark(5, True)  # also in a block that ran
+    bitmap.mark(9, False)
+    bitmap.mark(10, True)
+
+    report = diff_coverage.diff_report(
+        {"a.rs": bitmap, "b.rs": diff_coverage.LineBitmap()},
+        {"a.rs": [(3, 6), (9, 12)], "b.rs": [(1, 1)], "c.rs": [(1, 1)]},
+    )
+
+    assert [(f.path, f.covered, f.uncovered) for f in report.files] == [
+        ("a.rs", [3, 5, 10], [4, 6, 9])
+    ]
+    assert report.percent == pytest.approx(50.0)
+    assert diff_coverage.format_ranges([1, 2, 3, 7, 9, 10]) == "1-3, 7, 9-10"
+    assert diff_coverage.diff_report({}, {"a.rs": [(1, 2)]}).percent is None
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=ci", "-c", "user.email=ci@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_ci_diff_coverage_gates_on_changed_lines(tmp_path: Path, monkeypatch) -> None:
+    """The gate ignores unchanged, uncovered code."""
+    monkeypatch.chdir(tmp_path)
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "lib.rs").write_text("".join(f"line {n}\n" for n in range(1, 11)))
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-qm", "base")
+    (tmp_path / "lib.rs").write_text(
+        "".join(f"line {n}{' changed' if n in (3, 4) else ''}\n" for n in range(1, 11))
+    )
+    _git(tmp_path, "commit", "-qam", "change")
+    # Lines 1-10 instrumented; only 3 and 4 changed, and 4 is uncovered.
+    records = "".join(f"DA:{n},{0 if n in (4, 7, 8, 9) else 1}\n" for n in range(1, 11))
+    (tmp_path / "lcov.info").write_text(f"SF:lib.rs\n{records}end_of_record\n")
+
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    monkeypatch.setenv("DIFF_BASE", "HEAD~1")
+    monkeypatch.delenv("COVERAGE_FILES", raising=False)
+    monkeypatch.delenv("REPOSITORY_CONFIG", raising=False)
+    ci_workflow._CONFIG_CACHE = None  # type: ignore[attr-defined]
+    monkeypatch.setenv("DIFF_COVERAGE_THRESHOLD", "50")
+
+    ci_workflow.check_diff_coverage(argparse.Namespace())
+    assert output.read_text().splitlines() == [
+        "diff-lines=2",
+        "diff-covered-lines=1",
+        "diff-percent=50.00",
+    ]
+
+    monkeypatch.setenv("DIFF_COVERAGE_THRESHOLD", "80")
+    with pytest.raises(SystemExit, match="below threshold"):
+        ci_workflow.check_diff_coverage(argparse.Namespace())
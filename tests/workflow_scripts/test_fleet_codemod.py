@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_fleet_codemod.py
+# version: 1.0.0
+# guid: 098affec-0480-4a7c-80bf-14fd831fbbb2
+
+"""Unit tests for the fleet codemod runner."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import fleet_codemod
+import pytest
+
+
+def upper_transform(relpath: str, text: str) -> str | None:
+    """Upper-case files that contain a marker."""
+    return text.upper() if "fixme" in text else None
+
+
+def create_transform(relpath: str, text: str) -> str:
+    """Append a managed line, creating the file when needed."""
+    return text if "managed" in text else text + "managed\n"
+
+
+UPPER = fleet_codemod.Codemod(name="upper", transform=upper_transform, patterns=("*.md",))
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def _make_repo(path: Path) -> Path:
+    path.mkdir(parents=True)
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.name", "t")
+    _git(path, "config", "user.email", "t@example.com")
+    (path / "README.md").write_text("fixme\r\n", encoding="utf-8", newline="")
+    (path / "docs").mkdir()
+    (path / "docs" / "ok.md").write_text("fine\n", encoding="utf-8")
+    (path / "docs" / "notes.txt").write_text("fixme\n", encoding="utf-8")
+    for pruned in ("node_modules/pkg", "target/doc"):
+        (path / pruned).mkdir(parents=True)
+        (path / pruned / "x.md").write_text("fixme\n", encoding="utf-8")
+    _git(path, "add", "-A")
+    _git(path, "commit", "-qm", "init")
+    return path
+
+
+def test_walk_files_prunes_and_matches(tmp_path: Path) -> None:
+    """Pruned directories are skipped and patterns match names or paths."""
+    repo = _make_repo(tmp_path / "repo")
+    assert fleet_codemod.walk_files(repo, UPPER) == ["README.md", "docs/ok.md"]
+
+    scoped = fleet_codemod.Codemod(
+        name="scoped", transform=upper_transform, patterns=("docs/*.txt",), roots=("docs",)
+    )
+    assert fleet_codemod.walk_files(repo, scoped) == ["docs/notes.txt"]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_run_codemod_dry_run_reports_without_writing(tmp_path: Path, processes: int) -> None:
+    """Dry runs report changes but leave files untouched."""
+    repos = [_make_repo(tmp_path / "a"), _make_repo(tmp_path / "b")]
+    results = fleet_codemod.run_codemod(repos, UPPER, processes=processes, workers=2)
+
+    assert [result.repo for result in results] == repos
+    for result in results:
+        assert [change.path for change in result.changes] == ["README.md"]
+        assert result.changes[0].head_after == ("FIXME\r\n",)
+        assert (result.repo / "README.md").read_bytes() == b"fixme\r\n"
+
+
+def test_run_codemod_applies_and_commits_once_per_repo(tmp_path: Path) -> None:
+    """Applied changes preserve line endings and land in a single commit."""
+    repo = _make_repo(tmp_path / "repo")
+    codemod = fleet_codemod.Codemod(
+        name="upper",
+        transform=upper_transform,
+        patterns=("*.md", "*.txt"),
+        commit_message="chore: upper",
+    )
+
+    def finalize(path: Path, changes: list[fleet_codemod.FileChange]) -> str | None:
+        return fleet_codemod.commit_changes(path, changes, codemod.commit_message)
+
+    (result,) = fleet_codemod.run_codemod(
+        [repo], codemod, apply=True, finalize=finalize, processes=1
+    )
+
+    assert result.error is None
+    assert (repo / "README.md").read_bytes() == b"FIXME\r\n"
+    assert result.outcome == _git(repo, "rev-parse", "HEAD")
+    assert _git(repo, "log", "-1", "--name-only", "--format=%s").splitlines() == [
+        "chore: upper",
+        "",
+        "README.md",
+        "docs/notes.txt",
+    ]
+    assert _git(repo, "status", "--porcelain") == ""
+
+
+def test_explicit_paths_are_created(tmp_path: Path) -> None:
+    """Explicit paths reach the transform even when missing."""
+    repo = _make_repo(tmp_path / "repo")
+    codemod = fleet_codemod.Codemod(
+        name="create", transform=create_transform, paths=(".config/managed.txt",)
+    )
+    (result,) = fleet_codemod.run_codemod([repo], codemod, apply=True, processes=1)
+
+    assert result.changes[0].created is True
+    assert (repo / ".config" / "managed.txt").read_text(encoding="utf-8") == "managed\n"
+    (second,) = fleet_codemod.run_codemod([repo], codemod, apply=True, processes=1)
+    assert second.changes == []
+
+
+def test_git_errors_are_reported_per_repo(tmp_path: Path) -> None:
+    """A failing finalize step is captured on that repository's result."""
+    repo = _make_repo(tmp_path / "repo")
+
+    def finalize(path: Path, changes: list[fleet_codemod.FileChange]) -> None:
+        subprocess.run(["git", "no-such-command"], cwd=path, check=True, capture_output=True)
+
+    (result,) = fleet_codemod.run_codemod([repo], UPPER, apply=True, finalize=finalize, processes=1)
+    assert "no-such-command" in result.error
+    assert result.outcome is None
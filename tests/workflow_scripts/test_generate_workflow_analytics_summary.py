@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_generate_workflow_analytics_summary.py
+# version: 1.0.0
+# guid: 66797fb4-b256-40cd-a2c3-9d3f60d60677
+
+"""Tests for the workflow analytics summary renderer."""
+
+from __future__ import annotations
+
+import generate_workflow_analytics_summary as summary
+
+
+def test_top_workflows_include_duration_percentiles() -> None:
+    """The workflow table shows p50/p90/p99 and tolerates older reports."""
+    lines = summary.format_top_workflows(
+        {
+            "CI": {
+                "runs": 10,
+                "success_rate": 0.9,
+                "average_duration": 120.0,
+                "p50_duration": 100.0,
+                "p90_duration": 240.0,
+                "p99_duration": 600.25,
+                "cache_hit_rate": 0.5,
+            },
+            "Docs": {"runs": 2, "success_rate": 1.0, "average_duration": 30.0},
+        }
+    )
+
+    assert "| P50 | P90 | P99 |" in lines[0]
+    assert lines[2] == "| CI | 10 | 90.0% | 120.0 s | 100.0 s | 240.0 s | 600.2 s | 50.0% |"
+    assert lines[3] == "| Docs | 2 | 100.0% | 30.0 s | N/A | N/A | N/A | N/A |"
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_git_tree_patcher.py
+# version: 1.0.0
+# guid: 5e0b8d21-7a4c-4c3e-9f61-2d8a7e4b1c90
+
+"""Unit tests for the git tree patcher."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import git_tree_patcher
+import pytest
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """Create a repository with a single commit."""
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+    _git(repo_dir, "init", "-q", "-b", "main")
+    (repo_dir / "keep.txt").write_text("keep\n", encoding="utf-8")
+    (repo_dir / "old").mkdir()
+    (repo_dir / "old" / "a.md").write_text("a\n", encoding="utf-8")
+    (repo_dir / "old" / "b.md").write_text("b\n", encoding="utf-8")
+    _git(repo_dir, "add", "-A")
+    _git(repo_dir, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", "init")
+    return repo_dir
+
+
+def test_commit_applies_files_symlinks_and_deletes(repo: Path, tmp_path: Path) -> None:
+    """Queued changes land in a new commit without touching the work tree."""
+    source = tmp_path / "source.txt"
+    source.write_text("from disk\n", encoding="utf-8")
+
+    patcher = git_tree_patcher.TreePatcher(repo)
+    patcher.add_file("nested/dir/source.txt", source)
+    patcher.add_bytes("inline.txt", b"inline\n")
+    patcher.add_symlink("link.md", "keep.txt")
+    patcher.delete("old")
+    commit = patcher.commit("sync", author_name="Bot", author_email="bot@example.com")
+
+    assert commit is not None
+    files = _git(repo, "ls-tree", "-r", "--name-only", commit).splitlines()
+    assert sorted(files) == ["inline.txt", "keep.txt", "link.md", "nested/dir/source.txt"]
+    assert _git(repo, "show", f"{commit}:nested/dir/source.txt") == "from disk"
+    assert _git(repo, "ls-tree", commit, "link.md").startswith("120000")
+    assert _git(repo, "log", "-1", "--format=%an %s", commit) == "Bot sync"
+    assert _git(repo, "rev-parse", f"{commit}^") == _git(repo, "rev-parse", "HEAD")
+    # Work tree and HEAD are untouched.
+    assert (repo / "old" / "a.md").exists()
+    assert _git(repo, "status", "--porcelain") == ""
+
+
+def test_commit_returns_none_when_tree_unchanged(repo: Path) -> None:
+    """Re-writing identical content yields no commit."""
+    patcher = git_tree_patcher.TreePatcher(repo)
+    patcher.add_bytes("keep.txt", b"keep\n")
+    assert patcher.commit("noop") is None
+
+
+def test_root_commit_and_update_ref_in_bare_repo(tmp_path: Path) -> None:
+    """The patcher works in a bare repository without any base commit."""
+    bare = tmp_path / "bare.git"
+    _git(tmp_path, "init", "-q", "--bare", str(bare))
+
+    patcher = git_tree_patcher.TreePatcher(bare, base=None)
+    patcher.add_bytes("README.md", b"hello\n")
+    commit = patcher.commit("root", author_name="Bot", author_email="bot@example.com")
+    patcher.update_ref("refs/heads/main", commit)
+
+    assert _git(bare, "show", "main:README.md") == "hello"
+
+
+def test_git_failures_raise_tree_patch_error(tmp_path: Path) -> None:
+    """Plumbing failures surface as TreePatchError."""
+    patcher = git_tree_patcher.TreePatcher(tmp_path, base="HEAD")
+    with pytest.raises(git_tree_patcher.TreePatchError):
+        patcher.commit("broken")
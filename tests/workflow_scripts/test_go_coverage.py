@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_go_coverage.py
+# version: 1.0.1
+# guid: 1f02ab2e-f911-49af-8641-7cd5814ab6e4
+
+"""Tests for the native Go coverage profile parser."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import go_coverage
+import pytest
+
+SHARD_ONE = """mode: set
+example.com/m/a/a.go:3.20,4.12 1 1
+example.com/m/a/a.go:4.12,6.3 1 1
+example.com/m/a/a.go:7.2,7.10 2 0
+example.com/m/b/b.go:3.20,5.3 3 0
+"""
+SHARD_TWO = """mode: set
+example.com/m/a/a.go:3.20,4.12 1 0
+example.com/m/a/a.go:4.12,6.3 1 0
+example.com/m/a/a.go:7.2,7.10 2 1
+example.com/m/b/b.go:3.20,5.3 3 0
+"""
+
+
+def test_totals_by_file_and_package() -> None:
+    """Statements are summed per file and per package directory."""
+    profile = go_coverage.CoverageProfile().add_lines(SHARD_ONE.splitlines())
+
+    assert profile.mode == "set"
+    assert profile.totals() == go_coverage.CoverageTotals(2, 7)
+    assert profile.by_file() == {
+        "example.com/m/a/a.go": go_coverage.CoverageTotals(2, 4),
+        "example.com/m/b/b.go": go_coverage.CoverageTotals(0, 3),
+    }
+    assert profile.by_package()["example.com/m/a"].percent == pytest.approx(50.0)
+    assert go_coverage.CoverageProfile().totals().percent == 0.0
+
+
+def test_merge_set_and_count_profiles(tmp_path: Path) -> None:
+    """Set-mode blocks are OR-ed, count-mode blocks are added."""
+    (tmp_path / "one.out").write_text(SHARD_ONE, encoding="utf-8")
+    (tmp_path / "two.out").write_text(SHARD_TWO, encoding="utf-8")
+    merged = go_coverage.CoverageProfile.from_files(
+        go_coverage.expand_profiles([str(tmp_path / "*.out")])
+    )
+    assert len(merged) == 4
+    assert merged.totals() == go_coverage.CoverageTotals(4, 7)
+
+    merged.write(tmp_path / "merged.txt")
+    again = go_coverage.CoverageProfile.from_files([tmp_path / "merged.txt"])
+    assert again.by_file() == merged.by_file()
+
+    counts = go_coverage.CoverageProfile().add_lines(
+        ["mode: count", "p/f.go:1.1,2.2 1 2", "p/f.go:1.1,2.2 1 3"]
+    )
+    assert counts._hits == {"p/f.go:1.1,2.2": 5}
+
+
+def test_incompatible_or_malformed_profiles_are_rejected() -> None:
+    """Mixing modes or garbage lines raises CoverageError."""
+    profile = go_coverage.CoverageProfile().add_lines(SHARD_ONE.splitlines())
+    with pytest.raises(go_coverage.CoverageError, match="cannot merge"):
+        profile.add_lines(["mode: count", "p/f.go:1.1,2.2 1 2"])
+    with pytest.raises(go_coverage.CoverageError, match=":2: malformed"):
+        go_coverage.CoverageProfile().add_lines(["mode: set", "not a block"])
+    with pytest.raises(go_coverage.CoverageError, match="expected 'mode"):
+        go_coverage.CoverageProfile().add_lines(["p/f.go:1.1,2.2 1 2"])
+
+
+def test_coverage_delta_per_package() -> None:
+    """Packages present on one side only count as 0% on the other."""
+    base = go_coverage.CoverageProfile().add_lines(SHARD_ONE.splitlines())
+    head = go_coverage.CoverageProfile().add_lines(SHARD_TWO.splitlines())
+    head.add_lines(["mode: set", "example.com/m/c/c.go:1.1,2.2 4 1"])
+
+    deltas = {delta.package: delta for delta in go_coverage.coverage_delta(base, head)}
+    assert deltas["example.com/m/a"].delta == pytest.approx(0.0)
+    assert deltas["example.com/m/c"].base is None
+    assert deltas["example.com/m/c"].delta == pytest.approx(100.0)
+
+    table = go_coverage.format_delta_markdown(list(deltas.values()))
+    assert "| `example.com/m/c` | — | 100.0% | +100.0 |" in table
+    assert "example.com/m/a" not in table
+
+
+def test_file_names_with_spaces_fall_back_to_per_line_parsing() -> None:
+    """GOPATH-mode paths may contain spaces; the fast path must not misalign fields."""
+    profile = go_coverage.CoverageProfile().add_lines(
+        [
+            "mode: count",
+            "_/home/u/my dir/a.go:1.1,2.2 3 1",
+            "",
+            "_/home/u/my dir/a.go:3.1,4.2 2 0",
+            "example.com/m/b.go:1.1,2.2 1 4",
+        ]
+    )
+
+    assert profile.by_file() == {
+        "_/home/u/my dir/a.go": go_coverage.CoverageTotals(3, 5),
+        "example.com/m/b.go": go_coverage.CoverageTotals(1, 1),
+    }
+    assert profile._hits == {"_/home/u/my dir/a.go:1.1,2.2": 1, "example.com/m/b.go:1.1,2.2": 4}
+    with pytest.raises(go_coverage.CoverageError, match=":3: malformed"):
+        go_coverage.CoverageProfile().add_lines(
+            ["mode: set", "my dir/a.go:1.1,2.2 3 1", "my dir/a.go:1.1,2.2 x 1"]
+        )
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_header_metadata.py
+# version: 1.2.0
+# guid: a0d13eea-c323-4f75-b263-a91da092d57a
+
+"""Unit tests for header_metadata helpers."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import header_metadata
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_header_cache() -> None:
+    """Reset the process-wide header cache around every test."""
+    header_metadata.reset_header_cache()
+    yield
+    header_metadata.reset_header_cache()
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        (
+            "#!/usr/bin/env python3\n# file: a.py\n# version: 1.2.3\n# guid: 0b5a4c1e-3f2d-4e6a-9b8c-7d1e2f3a4b5c\n",
+            ("a.py", "1.2.3", "0b5a4c1e-3f2d-4e6a-9b8c-7d1e2f3a4b5c"),
+        ),
+        (
+            "<!-- file: a.md -->\n<!-- version: 2.0.0 -->\n<!-- guid: d4e5f6a7-b8c9-4d0e-8f1a-2b3c4d5e6f70 -->\n",
+            ("a.md", "2.0.0", "d4e5f6a7-b8c9-4d0e-8f1a-2b3c4d5e6f70"),
+        ),
+        (
+            "// version: 0.1.0-rc.1\n// guid: 0B5A4C1E-3F2D-4E6A-9B8C-7D1E2F3A4B5C\n",
+            (None, "0.1.0-rc.1", "0B5A4C1E-3F2D-4E6A-9B8C-7D1E2F3A4B5C"),
+        ),
+        ("/* version: 3.4.5 */\n", (None, "3.4.5", None)),
+        ("no header here\n", (None, None, None)),
+        ("# version: latest\n# guid: ts123456-not-hex\n", (None, None, "ts123456-not-hex")),
+    ],
+)
+def test_parse_header_comment_styles(text: str, expected: tuple) -> None:
+    """parse_header understands every supported comment style."""
+    metadata = header_metadata.parse_header(text)
+    assert (metadata.file, metadata.version, metadata.guid) == expected
+
+
+def test_is_well_formed_guid() -> None:
+    """Only 36-character hexadecimal GUIDs are well formed."""
+    assert header_metadata.is_well_formed_guid("0B5A4C1E-3F2D-4E6A-9B8C-7D1E2F3A4B5C")
+    assert not header_metadata.is_well_formed_guid("ts123456-not-hex")
+    assert not header_metadata.is_well_formed_guid(None)
+
+
+def test_parse_header_first_occurrence_wins() -> None:
+    """Body keys never override the header comment."""
+    text = "# version: 1.0.0\nversion: 2\nupdates: []\n"
+    assert header_metadata.parse_header(text).version == "1.0.0"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "version: 2\nupdates:\n  - package-ecosystem: pip\n",
+        "version: '3.8'\nservices:\n  web:\n    image: nginx\n",
+        "name: build\nfile: Dockerfile\nguid: " + "0" * 36 + "\n",
+    ],
+)
+def test_parse_header_ignores_plain_yaml_keys(text: str) -> None:
+    """YAML keys without a comment marker are not header fields."""
+    assert header_metadata.parse_header(text) == header_metadata.HeaderMetadata()
+
+
+def test_parse_header_ignores_text_past_prefix() -> None:
+    """Only the bounded prefix is scanned."""
+    text = "x" * header_metadata.HEADER_READ_BYTES + "\n# version: 9.9.9\n"
+    assert header_metadata.parse_header(text).version is None
+
+
+def test_read_header_memoizes_on_size_and_mtime(tmp_path: Path) -> None:
+    """Unchanged files are served from cache; modified files are re-read."""
+    target = tmp_path / "file.md"
+    target.write_text("<!-- version: 1.0.0 -->\n", encoding="utf-8")
+    assert header_metadata.read_header(target).version == "1.0.0"
+
+    stat_result = target.stat()
+    target.write_text("<!-- version: 1.0.1 -->\n", encoding="utf-8")
+    os.utime(target, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    assert header_metadata.read_header(target).version == "1.0.0"
+
+    os.utime(target, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+    assert header_metadata.read_header(target).version == "1.0.1"
+
+
+def test_header_index_persists_entries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A saved index answers lookups without reopening unchanged files."""
+    target = tmp_path / "file.py"
+    target.write_text(
+        "# version: 1.2.3\n# guid: 0b5a4c1e-3f2d-4e6a-9b8c-7d1e2f3a4b5c\n", encoding="utf-8"
+    )
+    index_path = tmp_path / "cache" / "headers.json"
+
+    index = header_metadata.HeaderIndex(index_path)
+    assert index.lookup(target).guid == "0b5a4c1e-3f2d-4e6a-9b8c-7d1e2f3a4b5c"
+    index.save()
+    assert index_path.exists()
+
+    def fail_read(path: Path) -> str:
+        raise AssertionError(f"unexpected read of {path}")
+
+    monkeypatch.setattr(header_metadata, "_read_prefix", fail_read)
+    reloaded = header_metadata.HeaderIndex(index_path)
+    assert reloaded.lookup(target) == header_metadata.HeaderMetadata(
+        version="1.2.3", guid="0b5a4c1e-3f2d-4e6a-9b8c-7d1e2f3a4b5c"
+    )
+
+
+def test_read_header_missing_file_raises(tmp_path: Path) -> None:
+    """Missing files surface as OSError for the caller to handle."""
+    with pytest.raises(OSError):
+        header_metadata.read_header(tmp_path / "missing.md")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_helper_batch.py
+# version: 1.1.0
+# guid: 910869fe-0566-450b-b156-22f3d86365c7
+
+"""Tests for batched and served workflow-helper subcommands."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import ci_workflow
+import helper_batch
+import helper_client
+import pytest
+
+SCRIPTS_DIR = Path(ci_workflow.__file__).resolve().parent
+CONFIG = '{"languages": {"versions": {"python": ["3.12", "3.13"]}}}'
+
+
+@pytest.fixture(autouse=True)
+def reset_ci_state():
+    ci_workflow._CONFIG_CACHE = None  # type: ignore[attr-defined]
+    ci_workflow._TREE_FILES.clear()
+
+
+def test_parse_batch_handles_assignments_quotes_and_comments() -> None:
+    """Leading NAME=value tokens become per-line environment overrides."""
+    commands = helper_batch.parse_batch(
+        "# setup\n\nCI_GO_FILES=true A='x y' determine-execution\ngenerate-matrices  # ok\n"
+    )
+    assert [c.argv for c in commands] == [("determine-execution",), ("generate-matrices",)]
+    assert commands[0].env == {"CI_GO_FILES": "true", "A": "x y"}
+    assert str(commands[0]) == "CI_GO_FILES=true A='x y' determine-execution"
+
+    with pytest.raises(ValueError):
+        helper_batch.parse_batch("ONLY=assignment\n")
+
+
+def test_run_batch_matches_separate_invocations(tmp_path: Path, monkeypatch) -> None:
+    """A batch writes the same outputs and leaks no per-line environment."""
+    monkeypatch.setenv("REPOSITORY_CONFIG", CONFIG)
+    monkeypatch.setenv("GITHUB_HEAD_COMMIT_MESSAGE", "feat: x")
+    monkeypatch.delenv("CI_PYTHON_FILES", raising=False)
+    separate = tmp_path / "separate.txt"
+    batched = tmp_path / "batched.txt"
+
+    monkeypatch.setenv("GITHUB_OUTPUT", str(separate))
+    monkeypatch.setenv("CI_PYTHON_FILES", "true")
+    assert helper_batch.run_command(ci_workflow.build_parser, ["determine-execution"]) == 0
+    monkeypatch.delenv("CI_PYTHON_FILES")
+    assert helper_batch.run_command(ci_workflow.build_parser, ["generate-matrices"]) == 0
+
+    monkeypatch.setenv("GITHUB_OUTPUT", str(batched))
+    commands = helper_batch.parse_batch(
+        "CI_PYTHON_FILES=true determine-execution\ngenerate-matrices\n"
+    )
+    assert helper_batch.run_batch(ci_workflow.build_parser, commands) == 0
+
+    assert batched.read_text() == separate.read_text()
+    assert "should_test_python=true" in batched.read_text().splitlines()
+    assert '"python-version":"3.13"' in batched.read_text()
+    assert "CI_PYTHON_FILES" not in os.environ
+
+
+def test_run_batch_stops_at_first_failure_unless_keep_going(tmp_path: Path, monkeypatch) -> None:
+    """Failing commands stop the batch; --keep-going runs the rest."""
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "out.txt"))
+    commands = helper_batch.parse_batch(
+        "JOB_GO=failure check-ci-status\nbatch nested\ngenerate-matrices\n"
+    )
+
+    assert helper_batch.run_batch(ci_workflow.build_parser, commands) == 1
+    assert not (tmp_path / "out.txt").exists()
+
+    assert helper_batch.run_batch(ci_workflow.build_parser, commands, keep_going=True) == 1
+    assert "go-matrix=" in (tmp_path / "out.txt").read_text()
+
+
+def test_repository_config_is_reparsed_when_it_changes(monkeypatch) -> None:
+    """The config cache is keyed on the raw REPOSITORY_CONFIG value."""
+    monkeypatch.setenv("REPOSITORY_CONFIG", '{"a": 1}')
+    first = ci_workflow.get_repository_config()
+    assert ci_workflow.get_repository_config() is first
+    monkeypatch.setenv("REPOSITORY_CONFIG", '{"a": 2}')
+    assert ci_workflow.get_repository_config() == {"a": 2}
+
+
+@pytest.mark.skipif(not hasattr(os, "dup2") or sys.platform == "win32", reason="Unix sockets")
+def test_served_commands_match_separate_invocations(tmp_path: Path) -> None:
+    """Clients forward their environment and output streams to the server."""
+    socket_path = tmp_path / "helper.sock"
+    env = {**os.environ, "REPOSITORY_CONFIG": CONFIG, "CI_GO_FILES": "true"}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            str(SCRIPTS_DIR / "ci_workflow.py"),
+            "serve",
+            "--socket",
+            str(socket_path),
+        ],
+        env=env,
+        cwd=tmp_path,
+    )
+    try:
+        for mode in ("separate", "served"):
+            for argv in (["debug-filter"], ["generate-matrices"]):
+                step_env = {**env, "GITHUB_OUTPUT": str(tmp_path / mode)}
+                if mode == "separate":
+                    command = [sys.executable, str(SCRIPTS_DIR / "ci_workflow.py"), *argv]
+                else:
+                    command = [
+                        sys.executable,
+                        "-S",
+                        str(SCRIPTS_DIR / "helper_client.py"),
+                        str(socket_path),
+                        *argv,
+                    ]
+                result = subprocess.run(
+                    command, env=step_env, cwd=tmp_path, capture_output=True, text=True, check=True
+                )
+                if argv == ["debug-filter"]:
+                    assert "Go files changed: true" in result.stdout
+
+        assert (tmp_path / "served").read_text() == (tmp_path / "separate").read_text()
+        assert helper_client.call(str(socket_path), stop=True) == 0
+        assert server.wait(timeout=10) == 0
+        assert not socket_path.exists()
+    finally:
+        if server.poll() is None:
+            server.kill()
+
+
+@pytest.mark.skipif(not hasattr(os, "dup2") or sys.platform == "win32", reason="Unix sockets")
+def test_served_commands_see_files_created_by_earlier_steps(tmp_path: Path) -> None:
+    """The file walk is redone per command, not cached for the server's lifetime."""
+    socket_path = tmp_path / "helper.sock"
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake_go = bin_dir / "go"
+    fake_go.write_text("#!/bin/sh\necho fake go $*\n", encoding="utf-8")
+    fake_go.chmod(0o755)
+    env = {**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}"}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            str(SCRIPTS_DIR / "ci_workflow.py"),
+            "serve",
+            "--socket",
+            str(socket_path),
+        ],
+        env=env,
+        cwd=workspace,
+    )
+    client = [sys.executable, "-S", str(SCRIPTS_DIR / "helper_client.py"), str(socket_path)]
+    try:
+        first = subprocess.run(
+            [*client, "run-benchmarks"], env=env, cwd=workspace, capture_output=True, text=True
+        )
+        (workspace / "bench_test.go").write_text("func BenchmarkX(b *B) {}\n", encoding="utf-8")
+        second = subprocess.run(
+            [*client, "run-benchmarks"], env=env, cwd=workspace, capture_output=True, text=True
+        )
+
+        assert "No benchmarks found" in first.stdout
+        assert "fake go test -bench=." in second.stdout
+        assert helper_client.call(str(socket_path), stop=True) == 0
+        assert server.wait(timeout=10) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: tests/workflow_scripts/test_publish_to_github_packages.py
-# version: 1.0.0
+# version: 1.1.0
 # guid: 6e77a1f8-5c76-41a8-9e3c-9f89cb237a9f
 
 """Tests for publish_to_github_packages workflow helper."""
@@ -67,7 +67,7 @@ def test_publish_github_package_creates_tarball(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
 ) -> None:
-    """publish_github_package bundles artifacts and uploads via gh api."""
+    """publish_github_package bundles artifacts and uploads the tarball."""
     artifacts_dir = tmp_path / "artifacts"
     artifacts_dir.mkdir()
     (artifacts_dir / "file.txt").write_text("example", encoding="utf-8")
@@ -91,7 +91,7 @@ def test_publish_github_package_creates_tarball(
 
     monkeypatch.setattr(
         pkg,
-        "_run_gh_api",
+        "_upload_package",
         fake_run,
     )  # pylint: disable=protected-access
 
@@ -154,3 +154,33 @@ def test_main_skips_when_registry_disabled(
         pkg.main()
 
     assert excinfo.value.code == 0
+
+
+def test_publish_github_package_skips_unchanged_digest(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """A matching previous digest skips the upload entirely."""
+    artifacts_dir = tmp_path / "artifacts"
+    artifacts_dir.mkdir()
+    (artifacts_dir / "file.txt").write_text("example", encoding="utf-8")
+    output_path = tmp_path / "output.txt"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output_path))
+
+    uploads: list[Path] = []
+    monkeypatch.setattr(pkg, "_upload_package", lambda *args: uploads.append(args[3]))
+
+    kwargs: dict[str, Any] = {
+        "repository": "owner/repo",
+        "language": "go",
+        "tag": "v1.0.0",
+        "branch": "main",
+        "is_stable": False,
+        "artifacts_dir": artifacts_dir,
+    }
+    pkg.publish_github_package(**kwargs)
+    digest = output_path.read_text(encoding="utf-8").strip().split("=", 1)[1]
+    assert digest.startswith("sha256:")
+
+    pkg.publish_github_package(**kwargs, previous_digest=digest)
+    assert len(uploads) == 1
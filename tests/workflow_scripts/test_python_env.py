@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_python_env.py
+# version: 1.1.1
+# guid: 34f6a1aa-9fdd-452c-b0c8-ac56d26784b7
+
+"""Tests for hash-keyed Python environment provisioning."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import subprocess
+import tarfile
+from pathlib import Path
+
+import ci_workflow
+import pytest
+import python_env
+
+
+def test_environment_key_tracks_manifests(tmp_path: Path) -> None:
+    """The key changes with manifest contents and extra packages only."""
+    (tmp_path / "requirements.txt").write_text("requests==2.32.0\n", encoding="utf-8")
+    (tmp_path / "README.md").write_text("docs\n", encoding="utf-8")
+    first = python_env.environment_key(tmp_path, ["pytest"])
+
+    (tmp_path / "README.md").write_text("more docs\n", encoding="utf-8")
+    assert python_env.environment_key(tmp_path, ["pytest"]) == first
+    assert python_env.environment_key(tmp_path, ["pytest", "pytest-cov"]) != first
+    (tmp_path / "requirements.txt").write_text("requests==2.32.3\n", encoding="utf-8")
+    assert python_env.environment_key(tmp_path, ["pytest"]) != first
+    assert first.startswith(f"{python_env.sys.implementation.cache_tag}-")
+
+
+def test_frozen_requirements_keep_urls_and_drop_editables() -> None:
+    """Direct references keep their URL and are left out of the wheelhouse."""
+    freeze = "# comment\n-e git+https://x/y#egg=proj\nidna==3.7\nlib @ file:///tmp/lib\n"
+
+    pins = python_env.frozen_requirements(freeze)
+    assert pins == ["idna==3.7", "lib @ file:///tmp/lib"]
+    assert [python_env.is_direct_reference(pin) for pin in pins] == [False, True]
+
+
+def test_pack_unpack_and_prune(tmp_path: Path) -> None:
+    """Archives round-trip, reject unsafe members and prune per interpreter."""
+    wheels = tmp_path / "wheels"
+    wheels.mkdir()
+    (wheels / "idna-3.7-py3-none-any.whl").write_bytes(b"wheel")
+    requirements = tmp_path / "pins.txt"
+    requirements.write_text("idna==3.7\n", encoding="utf-8")
+    cache = tmp_path / "cache"
+    archive = python_env.archive_path(cache, "cpython-312-new")
+
+    assert python_env.pack_wheelhouse(wheels, requirements, archive) == 1
+    restored = python_env.unpack_wheelhouse(archive, tmp_path / "out")
+    assert restored.read_text(encoding="utf-8") == "idna==3.7\n"
+    assert (restored.parent / "wheelhouse" / "idna-3.7-py3-none-any.whl").read_bytes() == b"wheel"
+
+    evil = tmp_path / "evil.tar.gz"
+    with tarfile.open(evil, "w:gz") as handle:
+        info = tarfile.TarInfo("../escape.txt")
+        info.size = 1
+        handle.addfile(info, io.BytesIO(b"x"))
+    with pytest.raises(tarfile.TarError):
+        python_env.unpack_wheelhouse(evil, tmp_path / "evil")
+    assert not (tmp_path / "escape.txt").exists()
+
+    for key in ("cpython-312-old", "cpython-311-other"):
+        python_env.archive_path(cache, key).write_bytes(b"")
+    removed = python_env.prune(cache, "cpython-312-new")
+    assert [path.name for path in removed] == ["cpython-312-old.tar.gz"]
+    assert sorted(path.name for path in cache.iterdir()) == [
+        "cpython-311-other.tar.gz",
+        "cpython-312-new.tar.gz",
+    ]
+
+
+def test_ci_python_install_packs_then_restores(tmp_path: Path, monkeypatch) -> None:
+    """A miss resolves once and packs wheels; a hit installs offline from them."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "requirements.txt").write_text("idna\n", encoding="utf-8")
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'demo'\n", encoding="utf-8")
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    monkeypatch.setenv("PYTHON_ENV_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("PYTHON_WHEEL_DIR", str(tmp_path / "local-wheels"))
+    commands: list[list[str]] = []
+    requirement_files: dict[str, str] = {}
+
+    def fake_run(cmd, check=False, **kwargs):
+        commands.append(list(cmd[3:]))  # drop "python -m pip"
+        if "-r" in cmd:
+            path = Path(cmd[cmd.index("-r") + 1])
+            requirement_files[cmd[3]] = path.read_text(encoding="utf-8")
+        if cmd[3] == "freeze":
+            stdout = "idna==3.7\nlib @ git+https://example.com/lib@abc\n"
+            return subprocess.CompletedProcess(cmd, 0, stdout=stdout)
+        if cmd[3] == "wheel":
+            wheels = Path(cmd[cmd.index("--wheel-dir") + 1])
+            wheels.mkdir(parents=True, exist_ok=True)
+            (wheels / "idna-3.7-py3-none-any.whl").write_bytes(b"wheel")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(ci_workflow.subprocess, "run", fake_run)
+    offline = ["--no-index", "--find-links", str(tmp_path / "local-wheels")]
+
+    ci_workflow.python_install(argparse.Namespace())
+
+    assert commands[0] == [
+        "install",
+        *offline,
+        "-r",
+        "requirements.txt",
+        "-e",
+        ".",
+        "pytest",
+        "pytest-cov",
+    ]
+    assert [command[0] for command in commands] == ["install", "freeze", "wheel"]
+    # The direct reference is not rebuilt from the index under its bare name.
+    assert requirement_files["wheel"] == "idna==3.7\n"
+    assert "python-env-cache-hit=false" in output.read_text().splitlines()
+
+    commands.clear()
+    ci_workflow.python_install(argparse.Namespace())
+
+    assert commands[0][:3] == ["install", "--no-index", "--find-links"]
+    assert commands[0][3].endswith("wheelhouse")
+    assert requirement_files["install"] == "idna==3.7\nlib @ git+https://example.com/lib@abc\n"
+    assert commands[1] == ["install", *offline, "--no-deps", "-e", "."]
+    assert output.read_text().splitlines()[-1] == "python-env-cache-hit=true"
+
+
+def test_ci_python_install_skips_packing_without_cache_dir(tmp_path: Path, monkeypatch) -> None:
+    """Without a persisted cache directory only the combined install runs."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "requirements.txt").write_text("idna\n", encoding="utf-8")
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    monkeypatch.delenv("PYTHON_ENV_CACHE_DIR", raising=False)
+    monkeypatch.delenv("PYTHON_WHEEL_DIR", raising=False)
+    commands: list[list[str]] = []
+
+    def fake_run(cmd, check=False, **kwargs):
+        commands.append(list(cmd[3:]))
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(ci_workflow.subprocess, "run", fake_run)
+
+    ci_workflow.python_install(argparse.Namespace())
+
+    assert commands == [["install", "-r", "requirements.txt", "pytest", "pytest-cov"]]
+    outputs = dict(line.split("=", 1) for line in output.read_text().splitlines())
+    assert outputs["python-env-cache-hit"] == "false"
+    assert outputs["python-env-key"].startswith(python_env.sys.implementation.cache_tag)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_python_test_impact.py
+# version: 1.0.0
+# guid: 33dace4e-f324-47fc-b345-ec2239da3c21
+
+"""Tests for Python test-impact selection and sharding."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+from pathlib import Path
+
+import ci_workflow
+import pytest
+import python_test_impact
+
+TREE = {
+    "pkg/__init__.py": "",
+    "pkg/core.py": "VALUE = 1\n",
+    "pkg/util.py": "from .core import VALUE\n",
+    "other.py": "import json\n",
+    "tests/__init__.py": "",
+    "tests/conftest.py": "import sys\n",
+    "tests/test_util.py": "from pkg import util\n",
+    "tests/test_other.py": "import other\n",
+}
+
+
+def _write_tree(root: Path) -> list[str]:
+    for name, text in TREE.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return python_test_impact.walk_python_files(root)
+
+
+def test_module_names_and_relative_imports() -> None:
+    """Files resolve from their package root and from each directory above it."""
+    files = set(TREE) | {"scripts/tool.py"}
+
+    assert python_test_impact.module_names("pkg/util.py", files) == ["pkg.util"]
+    assert python_test_impact.module_names("pkg/__init__.py", files) == ["pkg"]
+    assert python_test_impact.module_names("scripts/tool.py", files) == [
+        "tool",
+        "scripts.tool",
+    ]
+    source = "from . import core\nfrom ..base import thing\nimport os.path\n"
+    assert python_test_impact.parse_imports(source, "pkg.sub.mod", False) == [
+        "os.path",
+        "pkg.base",
+        "pkg.base.thing",
+        "pkg.sub",
+        "pkg.sub.core",
+    ]
+    assert python_test_impact.parse_imports("def (", "broken", False) == []
+
+
+def test_select_tests_follows_transitive_imports(tmp_path: Path) -> None:
+    """Tests are selected through imports, package __init__ files and conftest."""
+    files = _write_tree(tmp_path)
+    graph = python_test_impact.build_graph(files, tmp_path)
+
+    assert python_test_impact.select_tests(graph, ["pkg/core.py"]) == ["tests/test_util.py"]
+    assert python_test_impact.select_tests(graph, ["other.py"]) == ["tests/test_other.py"]
+    assert python_test_impact.select_tests(graph, ["tests/conftest.py"]) == [
+        "tests/test_other.py",
+        "tests/test_util.py",
+    ]
+    assert python_test_impact.select_tests(graph, ["README.md"]) == []
+
+
+def test_build_graph_reuses_cached_parses(tmp_path: Path) -> None:
+    """Only files whose contents changed are parsed again."""
+    files = _write_tree(tmp_path)
+    cache = tmp_path / ".cache" / "graph.json"
+
+    first = python_test_impact.build_graph(files, tmp_path, cache)
+    (tmp_path / "other.py").write_text("import pkg.core\n", encoding="utf-8")
+    second = python_test_impact.build_graph(files, tmp_path, cache)
+
+    assert (first.parsed, first.cached) == (len(files), 0)
+    assert (second.parsed, second.cached) == (1, len(files) - 1)
+    assert python_test_impact.select_tests(second, ["pkg/core.py"]) == [
+        "tests/test_other.py",
+        "tests/test_util.py",
+    ]
+
+
+def test_needs_full_run(tmp_path: Path) -> None:
+    """Deleted files and non-Python, non-doc changes disable selection."""
+    _write_tree(tmp_path)
+    (tmp_path / "README.md").write_text("docs\n", encoding="utf-8")
+    (tmp_path / "pyproject.toml").write_text("[project]\n", encoding="utf-8")
+
+    assert python_test_impact.needs_full_run(["pkg/core.py", "README.md"], tmp_path) is None
+    assert python_test_impact.needs_full_run(["pyproject.toml"], tmp_path) == "pyproject.toml"
+    assert python_test_impact.needs_full_run(["pkg/gone.py"], tmp_path) == "pkg/gone.py"
+
+
+def test_junit_durations_and_balanced_shards(tmp_path: Path) -> None:
+    """Durations come from JUnit XML; shards balance the recorded time."""
+    tests = ["tests/test_a.py", "tests/test_b.py", "tests/test_c.py", "tests/test_d.py"]
+    report = tmp_path / "junit.xml"
+    report.write_text(
+        '<testsuites><testsuite name="pytest">'
+        '<testcase classname="tests.test_a" name="one" time="6.0"/>'
+        '<testcase classname="tests.test_a.TestGroup" name="two" time="2.0"/>'
+        '<testcase classname="tests.test_b" name="one" time="5.0"/>'
+        '<testcase file="tests/test_c.py" classname="x" name="one" time="3.0"/>'
+        "</testsuite></testsuites>",
+        encoding="utf-8",
+    )
+
+    durations = python_test_impact.junit_durations([report], tests)
+    shards = python_test_impact.shard_tests(tests, 2, durations)
+
+    assert durations == {"tests/test_a.py": 8.0, "tests/test_b.py": 5.0, "tests/test_c.py": 3.0}
+    # test_d has no history and counts as the median (5s).
+    assert shards == [
+        ["tests/test_a.py", "tests/test_c.py"],
+        ["tests/test_b.py", "tests/test_d.py"],
+    ]
+    assert sorted(sum(shards, [])) == tests
+    assert python_test_impact.shard_tests(tests[:1], 3) == [["tests/test_a.py"], [], []]
+    assert python_test_impact.parse_shard("2/4") == (2, 4)
+    with pytest.raises(ValueError):
+        python_test_impact.parse_shard("5/4")
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=ci", "-c", "user.email=ci@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_ci_python_run_tests_selects_and_shards(tmp_path: Path, monkeypatch) -> None:
+    """python-run-tests passes only affected tests of its shard to pytest."""
+    monkeypatch.chdir(tmp_path)
+    _write_tree(tmp_path)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-qm", "base")
+    (tmp_path / "pkg" / "core.py").write_text("VALUE = 2\n", encoding="utf-8")
+    _git(tmp_path, "commit", "-qam", "change")
+    commands = []
+    real_run = subprocess.run
+
+    def fake_run(cmd, check=False, **kwargs):
+        if cmd[0] == "git":
+            return real_run(cmd, check=check, **kwargs)
+        commands.append(list(cmd))
+        return subprocess.CompletedProcess(cmd, 0)
+
+    output = tmp_path / "output.txt"
+    monkeypatch.setattr(ci_workflow.subprocess, "run", fake_run)
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    monkeypatch.setenv("DIFF_BASE", "HEAD~1")
+    monkeypatch.setenv("PYTHON_TEST_IMPACT", "true")
+    monkeypatch.delenv("PYTHON_TEST_SHARD", raising=False)
+    monkeypatch.delenv("REPOSITORY_CONFIG", raising=False)
+    ci_workflow._CONFIG_CACHE = None  # type: ignore[attr-defined]
+
+    ci_workflow.python_run_tests(argparse.Namespace())
+
+    assert commands[0][-2:] == ["tests/test_util.py", "--junitxml=pytest-junit.xml"]
+    assert "python-test-mode=impact" in output.read_text().splitlines()
+    assert (tmp_path / python_test_impact.DEFAULT_CACHE).is_file()
+
+    commands.clear()
+    monkeypatch.setenv("PYTHON_TEST_IMPACT", "false")
+    monkeypatch.setenv("PYTHON_TEST_SHARD", "2/2")
+    ci_workflow.python_run_tests(argparse.Namespace())
+    assert commands[0][-2:] == ["tests/test_util.py", "--junitxml=pytest-junit.xml"]
+
+    monkeypatch.setenv("PYTHON_TEST_SHARDS", "2")
+    ci_workflow.generate_matrices(argparse.Namespace())
+    outputs = dict(line.split("=", 1) for line in output.read_text().splitlines())
+    assert json.loads(outputs["python-shard-matrix"]) == {
+        "include": [{"shard": "1/2"}, {"shard": "2/2"}]
+    }
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_quantile_sketch.py
+# version: 1.0.0
+# guid: 9d10cbbf-5703-4eed-8c34-6523e6a6e828
+
+"""Tests for the t-digest quantile sketch."""
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+from quantile_sketch import TDigest
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def test_small_inputs_are_exact() -> None:
+    """With few values every centroid is a single point."""
+    digest = TDigest().update(range(1, 11))
+    assert digest.quantile(0.5) == 5.5
+    assert digest.quantile(0.0) == 1
+    assert digest.quantile(1.0) == 10
+    assert TDigest().quantile(0.5) is None
+
+
+def test_tail_quantiles_are_accurate_with_bounded_size() -> None:
+    """Skewed data keeps p50/p90/p99 within a few percent."""
+    rng = random.Random(3)
+    values = [rng.lognormvariate(5, 1) for _ in range(50_000)]
+    digest = TDigest().update(values)
+
+    assert len(digest.centroids()) < 200
+    for q in (0.5, 0.9, 0.99):
+        assert digest.quantile(q) == pytest.approx(_exact(values, q), rel=0.03)
+
+
+def test_merge_and_round_trip() -> None:
+    """Digests merge across partitions and survive JSON serialisation."""
+    rng = random.Random(5)
+    parts = [[rng.uniform(0, 100) for _ in range(5_000)] for _ in range(4)]
+    merged = TDigest.merged(TDigest().update(part) for part in parts)
+    values = [value for part in parts for value in part]
+
+    assert len(merged) == len(values)
+    assert merged.quantile(0.9) == pytest.approx(_exact(values, 0.9), rel=0.02)
+    restored = TDigest.from_dict(json.loads(json.dumps(merged.to_dict())))
+    assert restored.quantile(0.9) == merged.quantile(0.9)
+    assert (restored.min, restored.max) == (merged.min, merged.max)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_release_asset_uploader.py
+# version: 1.0.0
+# guid: 15b2c395-21a4-48fb-af25-6048b3a63aa0
+
+"""Tests for the release asset uploader against a local HTTP stand-in."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import release_asset_uploader as uploader
+
+
+class FakeGitHub:
+    """In-memory release API with injectable upload failures."""
+
+    def __init__(self) -> None:
+        self.assets: dict[str, dict[str, Any]] = {}
+        self.packages: dict[str, bytes] = {}
+        self.fail_uploads: dict[str, int] = {}
+        self.uploads: list[str] = []
+        self.deleted: list[int] = []
+        self.next_id = 100
+        self.lock = threading.Lock()
+
+    def add_asset(self, name: str, data: bytes, state: str = "uploaded") -> None:
+        """Attach an asset as if it had been uploaded earlier."""
+        self.next_id += 1
+        self.assets[name] = {
+            "id": self.next_id,
+            "name": name,
+            "size": len(data),
+            "state": state,
+            "digest": f"sha256:{hashlib.sha256(data).hexdigest()}",
+        }
+
+
+def _make_handler(fake: FakeGitHub) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_: Any) -> None:
+            return
+
+        def _reply(self, status: int, payload: Any = None) -> None:
+            body = json.dumps(payload).encode() if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length", "0")))
+
+        def do_GET(self) -> None:
+            path = urlsplit(self.path).path
+            if path == "/repos/o/r/releases/tags/v1.0.0":
+                self._reply(200, {"id": 7})
+            elif path == "/repos/o/r/releases/7/assets":
+                with fake.lock:
+                    self._reply(200, list(fake.assets.values()))
+            else:
+                self._reply(404, {"message": "Not Found"})
+
+        def do_POST(self) -> None:
+            parts = urlsplit(self.path)
+            name = parse_qs(parts.query)["name"][0]
+            data = self._body()
+            with fake.lock:
+                if fake.fail_uploads.get(name, 0) > 0:
+                    fake.fail_uploads[name] -= 1
+                    fake.add_asset(name, data[: len(data) // 2], state="starter")
+                    self._reply(502, {"message": "Bad Gateway"})
+                    return
+                if name in fake.assets:
+                    self._reply(422, {"message": "already_exists"})
+                    return
+                fake.uploads.append(name)
+                fake.add_asset(name, data)
+            self._reply(201, fake.assets[name])
+
+        def do_PUT(self) -> None:
+            data = self._body()
+            with fake.lock:
+                fake.packages[urlsplit(self.path).path] = data
+            self._reply(201, {})
+
+        def do_DELETE(self) -> None:
+            asset_id = int(self.path.rsplit("/", 1)[-1])
+            with fake.lock:
+                for name, asset in list(fake.assets.items()):
+                    if asset["id"] == asset_id:
+                        del fake.assets[name]
+                        fake.deleted.append(asset_id)
+            self._reply(204)
+
+    return Handler
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[FakeGitHub, uploader.GitHubClient]]:
+    """Run the fake API and return it with a client pointed at it."""
+    fake = FakeGitHub()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(fake))
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield fake, uploader.GitHubClient("token", api_url=url, uploads_url=url)
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry immediately in tests."""
+    monkeypatch.setattr(uploader, "_retry_delay", lambda attempt: 0)
+
+
+def _write(path: Path, data: bytes) -> Path:
+    path.write_bytes(data)
+    return path
+
+
+def test_upload_skips_matching_and_retries_failures(
+    server: tuple[FakeGitHub, uploader.GitHubClient], tmp_path: Path
+) -> None:
+    """Existing assets are skipped, partial uploads are replaced and retried."""
+    fake, client = server
+    done = _write(tmp_path / "done.tar.gz", b"done" * 100)
+    fresh = _write(tmp_path / "fresh.zip", b"fresh" * 100)
+    flaky = _write(tmp_path / "flaky.whl", b"flaky" * 100)
+    fake.add_asset("done.tar.gz", done.read_bytes())
+    fake.fail_uploads["flaky.whl"] = 1
+
+    results = uploader.upload_release_assets(
+        client, "o/r", "v1.0.0", [done, fresh, flaky], workers=3
+    )
+
+    assert [(r.name, r.status) for r in results] == [
+        ("done.tar.gz", "skipped"),
+        ("fresh.zip", "uploaded"),
+        ("flaky.whl", "uploaded"),
+    ]
+    assert sorted(fake.uploads) == ["flaky.whl", "fresh.zip"]
+    assert fake.assets["flaky.whl"]["size"] == flaky.stat().st_size
+    assert len(fake.deleted) == 1
+
+
+def test_upload_refuses_to_overwrite_without_clobber(
+    server: tuple[FakeGitHub, uploader.GitHubClient], tmp_path: Path
+) -> None:
+    """A complete asset with different content is replaced only with clobber."""
+    fake, client = server
+    artifact = _write(tmp_path / "app.tgz", b"new content")
+    fake.add_asset("app.tgz", b"old content")
+
+    (result,) = uploader.upload_release_assets(client, "o/r", "v1.0.0", [artifact])
+    assert result.status == "failed"
+
+    (result,) = uploader.upload_release_assets(client, "o/r", "v1.0.0", [artifact], clobber=True)
+    assert result.status == "uploaded"
+    assert fake.assets["app.tgz"]["size"] == len(b"new content")
+
+
+def test_missing_release_raises(
+    server: tuple[FakeGitHub, uploader.GitHubClient], tmp_path: Path
+) -> None:
+    """Unknown releases surface as UploadError."""
+    _, client = server
+    artifact = _write(tmp_path / "a.zip", b"a")
+    with pytest.raises(uploader.UploadError):
+        uploader.upload_release_assets(client, "o/r", "v9.9.9", [artifact])
+
+
+def test_upload_generic_package_streams_file(
+    server: tuple[FakeGitHub, uploader.GitHubClient], tmp_path: Path
+) -> None:
+    """Generic packages are PUT to the packages endpoint."""
+    fake, client = server
+    tarball = _write(tmp_path / "pkg-1.0.0.tar.gz", b"x" * 5000)
+
+    result = uploader.upload_generic_package(client, "o/r", "pkg", "1.0.0", tarball)
+
+    assert result.status == "uploaded"
+    assert fake.packages["/repos/o/r/packages/generic/pkg/1.0.0/pkg-1.0.0.tar.gz"] == b"x" * 5000
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_startup_profile.py
+# version: 1.0.0
+# guid: d05a2777-bb46-4a77-8f62-dc6c7b97f971
+
+"""Startup budgets for the workflow helper CLIs."""
+
+from __future__ import annotations
+
+import pytest
+import startup_profile
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1300 |      32000 | site
+import time:       200 |        200 |     _json
+import time:       900 |       1100 |   json.decoder
+import time:      1500 |       2600 | json
+import time:       400 |        400 | workflow_common
+"""
+
+
+def test_parse_importtime_and_drop_interpreter_startup() -> None:
+    """Records keep depth; everything up to ``site`` is excluded."""
+    records = startup_profile.parse_importtime(IMPORTTIME)
+    assert [(r.module, r.depth) for r in records][:3] == [("_io", 1), ("site", 0), ("_json", 2)]
+
+    helper = startup_profile.helper_imports(records)
+    assert [r.module for r in helper] == ["_json", "json.decoder", "json", "workflow_common"]
+    profile = startup_profile.StartupProfile(startup_profile.STARTUP_CHECKS[0], helper, 0)
+    assert profile.import_ms == pytest.approx(3.0)
+
+
+def test_forbidden_imports_match_packages_not_prefixes() -> None:
+    """Submodules count as the package; similarly named modules do not."""
+    modules = ["jwt.algorithms", "yamlish", "requests"]
+    assert startup_profile.forbidden_imports(modules, ("jwt", "yaml", "requests")) == [
+        "jwt",
+        "requests",
+    ]
+
+
+@pytest.mark.parametrize(
+    "check", startup_profile.STARTUP_CHECKS, ids=[c.name for c in startup_profile.STARTUP_CHECKS]
+)
+def test_helper_subcommand_stays_within_startup_budget(check, tmp_path) -> None:
+    """Each helper subcommand avoids heavy imports and stays within budget."""
+    startup_profile.prepare_fixtures(tmp_path)
+    profile = startup_profile.profile_check(check, tmp_path, repeat=2)
+    assert profile.records, "no -X importtime output captured"
+    assert profile.violations == []
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_sync_manifest.py
+# version: 1.3.0
+# guid: 84bc3bdc-8353-4e96-ac7e-630b3ce110c1
+
+"""Tests for the sync manifest and delta copier."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import sync_manifest
+
+
+def _source(root: Path) -> Path:
+    (root / ".github" / "scripts").mkdir(parents=True)
+    (root / ".github" / "scripts" / "helper.py").write_text(
+        "#!/usr/bin/env python3\n# version: 1.2.3\n# guid: 3e7f377c-00dc-4022-87ca-6933994ecab2\nprint('helper')\n",
+        encoding="utf-8",
+    )
+    (root / ".github" / "prompts").mkdir(parents=True)
+    (root / ".github" / "prompts" / "prompt.md").write_text("Prompt", encoding="utf-8")
+    (root / "labels.json").write_text("{}", encoding="utf-8")
+    (root / "docs").mkdir()
+    (root / "docs" / "guide.md").write_text("synced via sync_paths", encoding="utf-8")
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    return root
+
+
+def test_hash_files_records_hashes_and_headers(tmp_path: Path) -> None:
+    """Entries carry sha256 plus header version/guid, for the requested paths only."""
+    root = _source(tmp_path / "source")
+    assert sync_manifest.collect_files(root) == [
+        ".github/prompts/prompt.md",
+        ".github/scripts/helper.py",
+        "docs/guide.md",
+        "labels.json",
+    ]
+
+    files = sync_manifest.hash_files(root, [".github/scripts/helper.py"])
+    assert list(files) == [".github/scripts/helper.py"]
+    helper = files[".github/scripts/helper.py"]
+    assert helper["version"] == "1.2.3"
+    assert helper["guid"] == "3e7f377c-00dc-4022-87ca-6933994ecab2"
+    assert len(helper["sha256"]) == 64
+
+
+def test_source_digest_covers_only_its_sections(tmp_path: Path) -> None:
+    """A section digest moves only when a file in its sections changes."""
+    root = _source(tmp_path / "source")
+    sync_types = ("all", "prompts", "github-scripts")
+    before = {sync_type: sync_manifest.source_digest(root, sync_type) for sync_type in sync_types}
+
+    (root / ".github" / "prompts" / "prompt.md").write_text("Changed", encoding="utf-8")
+    after = {sync_type: sync_manifest.source_digest(root, sync_type) for sync_type in sync_types}
+    assert after["prompts"] != before["prompts"]
+    assert after["all"] != before["all"]
+    assert after["github-scripts"] == before["github-scripts"]
+
+    # Files outside every section only count for receivers that list them.
+    (root / "docs" / "guide.md").write_text("Changed", encoding="utf-8")
+    changed = {sync_type: sync_manifest.source_digest(root, sync_type) for sync_type in sync_types}
+    assert changed == after
+    assert sync_manifest.source_digest(tmp_path / "missing", "all") == ""
+
+
+def test_synced_paths_follow_receiver_sync_paths() -> None:
+    """Only listed files, listed directories and mirrored directories are selected."""
+    paths = [
+        ".github/prompts/prompt.md",
+        ".github/scripts/a.py",
+        ".github/scripts/b.py",
+        ".github/workflows/ci.yml",
+        ".github/workflows/scripts/helper.py",
+        "docs/guide.md",
+        "labels.json",
+        "README.md",
+    ]
+    sync_paths = [".github/scripts/a.py", ".github/workflows/ci.yml", "docs/guide.md"]
+
+    assert sync_manifest.synced_paths(paths, "all", sync_paths) == [
+        ".github/scripts/a.py",
+        ".github/scripts/b.py",
+        ".github/workflows/ci.yml",
+        "docs/guide.md",
+    ]
+    assert sync_manifest.synced_paths(paths, "prompts", sync_paths) == []
+    assert sync_manifest.synced_paths(paths, "prompts", [".github/prompts/"]) == [
+        ".github/prompts/prompt.md"
+    ]
+    assert "README.md" not in sync_manifest.synced_paths(paths, "all", None)
+
+
+def test_receiver_digests_ignore_unselected_files(tmp_path: Path) -> None:
+    """Changes to files a receiver does not sync leave its digest unchanged."""
+    source = _source(tmp_path / "source")
+    target = tmp_path / "target"
+    (target / ".github").mkdir(parents=True)
+    (target / ".github" / "workflow-config.yaml").write_text(
+        "sync:\n  sync_paths:\n    - labels.json\n    - docs/guide.md\n", encoding="utf-8"
+    )
+
+    synced, dispatch = sync_manifest.receiver_digests(source, "all", target)
+    assert synced
+    # docs/guide.md is outside the sections, so the dispatch digest is no proxy.
+    assert dispatch == ""
+
+    (source / ".github" / "prompts" / "prompt.md").write_text("Changed", encoding="utf-8")
+    assert sync_manifest.receiver_digests(source, "all", target)[0] == synced
+    (source / "docs" / "guide.md").write_text("Changed", encoding="utf-8")
+    assert sync_manifest.receiver_digests(source, "all", target)[0] != synced
+
+    synced, dispatch = sync_manifest.receiver_digests(source, "labels", target)
+    assert dispatch == sync_manifest.source_digest(source, "labels")
+    assert synced
+
+
+def test_delta_sync_only_writes_changed_files(tmp_path: Path) -> None:
+    """Unchanged files are skipped, stale mirrored files are removed."""
+    source = _source(tmp_path / "source")
+    target = tmp_path / "target"
+    target.mkdir()
+
+    delta = sync_manifest.DeltaSync(source, target)
+    assert delta.mirror_directory(source / ".github" / "scripts", target / ".github" / "scripts")
+    delta.copy(source / "labels.json", target / "labels.json")
+    delta.save("all", "digest-1")
+    assert sorted(delta.copied) == [".github/scripts/helper.py", "labels.json"]
+
+    (target / ".github" / "scripts" / "stale.py").write_text("old", encoding="utf-8")
+    (source / "labels.json").write_text('{"new": true}', encoding="utf-8")
+    delta = sync_manifest.DeltaSync(source, target)
+    changed = delta.mirror_directory(source / ".github" / "scripts", target / ".github" / "scripts")
+    delta.copy(source / "labels.json", target / "labels.json")
+
+    assert changed == [(target / ".github" / "scripts" / "stale.py").as_posix()]
+    assert delta.unchanged == [".github/scripts/helper.py"]
+    assert delta.copied == ["labels.json"]
+    assert not (target / ".github" / "scripts" / "stale.py").exists()
+    assert (target / "labels.json").read_text(encoding="utf-8") == '{"new": true}'
+
+
+def test_is_up_to_date_tracks_digest_and_receiver_config(tmp_path: Path) -> None:
+    """A matching digest is only trusted while the receiver config is unchanged."""
+    source = _source(tmp_path / "source")
+    target = tmp_path / "target"
+    (target / ".github").mkdir(parents=True)
+    (target / ".github" / "workflow-config.yaml").write_text("sync: {}\n", encoding="utf-8")
+
+    delta = sync_manifest.DeltaSync(source, target)
+    delta.copy(source / "labels.json", target / "labels.json")
+    delta.save("labels", "digest-1")
+
+    assert sync_manifest.is_up_to_date("labels", "digest-1", target)
+    assert not sync_manifest.is_up_to_date("labels", "digest-2", target)
+    assert not sync_manifest.is_up_to_date("all", "digest-1", target)
+    assert not sync_manifest.is_up_to_date("labels", "", target)
+    assert not sync_manifest.is_up_to_date("labels", "digest-1", target, dispatched=True)
+
+    delta.save("labels", "digest-1", "section-1")
+    assert sync_manifest.is_up_to_date("labels", "section-1", target, dispatched=True)
+    assert sync_manifest.is_up_to_date("labels", "digest-1", target)
+
+    (target / ".github" / "workflow-config.yaml").write_text("sync: {a: 1}\n", encoding="utf-8")
+    assert not sync_manifest.is_up_to_date("labels", "digest-1", target)
@@ -1,8 +1,13 @@
 import argparse
+import shutil
 import subprocess
+import sys
 
+import sync_manifest
 import sync_receiver
 
+from tests.workflow_scripts import SCRIPT_DIR
+
 
 def test_set_parameters_repo_dispatch(tmp_path, monkeypatch):
     output_path = tmp_path / "output.txt"
@@ -76,8 +81,9 @@ def test_check_changes_detects_changes(tmp_path, monkeypatch):
     monkeypatch.setenv("FORCE_SYNC", "false")
 
     def fake_run(cmd, check=False, **kwargs):
-        if cmd == ["git", "diff", "--quiet"]:
-            return subprocess.CompletedProcess(cmd, 1)
+        if cmd[:2] == ["git", "status"] and kwargs.get("capture_output"):
+            stdout = " M .github/sync-receiver-manifest.json\n?? scripts/new.py\n"
+            return subprocess.CompletedProcess(cmd, 0, stdout=stdout)
         return subprocess.CompletedProcess(cmd, 0)
 
     monkeypatch.setattr(sync_receiver.subprocess, "run", fake_run)
@@ -85,7 +91,145 @@ def test_check_changes_detects_changes(tmp_path, monkeypatch):
     assert "has_changes=true" in output_path.read_text()
 
 
-def test_commit_and_push_success(monkeypatch):
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=ci", "-c", "user.email=ci@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def _write_source(root, prompt="Prompt", readme="ghcommon"):
+    (root / ".github" / "prompts").mkdir(parents=True)
+    (root / ".github" / "prompts" / "prompt.md").write_text(prompt, encoding="utf-8")
+    (root / "README.md").write_text(readme, encoding="utf-8")
+
+
+def test_unsynced_source_change_skips_sync(tmp_path, monkeypatch, capsys):
+    """A source change outside the synced files leaves nothing to do."""
+    work = tmp_path / "work"
+    work.mkdir()
+    _git(work, "init", "-q")
+    output_path = tmp_path / "output.txt"
+    monkeypatch.chdir(work)
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output_path))
+    monkeypatch.setenv("SYNC_TYPE", "all")
+    monkeypatch.setenv("SYNC_VERBOSE", "false")
+    monkeypatch.setenv("FORCE_SYNC", "false")
+    monkeypatch.delenv("GITHUB_REPOSITORY_OWNER", raising=False)
+
+    _write_source(work / "ghcommon-source")
+    sync_receiver.sync_files(argparse.Namespace())
+    sync_receiver.check_changes(argparse.Namespace())
+    assert "has_changes=true" in output_path.read_text()
+    _git(work, "add", ".")
+    _git(work, "commit", "-qm", "sync")
+
+    _write_source(work / "ghcommon-source", readme="unrelated change")
+    output_path.write_text("")
+    sync_receiver.sync_files(argparse.Namespace())
+    assert "unchanged for all; skipping sync" in capsys.readouterr().out
+    sync_receiver.check_changes(argparse.Namespace())
+    assert _git(work, "status", "--porcelain") == ""
+    assert "has_changes=false" in output_path.read_text()
+
+    _write_source(work / "ghcommon-source", prompt="New prompt", readme="unrelated change")
+    output_path.write_text("")
+    sync_receiver.sync_files(argparse.Namespace())
+    sync_receiver.check_changes(argparse.Namespace())
+    assert "has_changes=true" in output_path.read_text()
+
+
+def test_sync_runs_without_sibling_modules(tmp_path, monkeypatch):
+    """A receiver missing sync_manifest/helper_batch still syncs every file."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(sys.modules, "sync_manifest", None)
+    monkeypatch.setitem(sys.modules, "helper_batch", None)
+    output_path = tmp_path / "output.txt"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output_path))
+    monkeypatch.setenv("SYNC_TYPE", "prompts")
+    monkeypatch.setenv("MANIFEST_DIGEST", "abc")
+    monkeypatch.setenv("SYNC_VERBOSE", "false")
+    monkeypatch.setenv("FORCE_SYNC", "false")
+    monkeypatch.setattr(
+        sync_receiver.subprocess, "run", lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 1)
+    )
+
+    parser = sync_receiver.build_parser()
+    assert parser.parse_args(["check-manifest"]).handler is sync_receiver.check_manifest
+    sync_receiver.check_manifest(argparse.Namespace())
+    assert "up_to_date=false" in output_path.read_text()
+    _write_source(tmp_path / "ghcommon-source")
+    sync_receiver.sync_files(argparse.Namespace())
+    assert (tmp_path / ".github" / "prompts" / "prompt.md").read_text() == "Prompt"
+    assert not (tmp_path / sync_receiver.RECEIVER_MANIFEST).exists()
+
+
+def test_sync_script_copies_without_manifest_helpers(tmp_path):
+    """The synced script runs in a receiver that only has .github/scripts."""
+    script = SCRIPT_DIR.parents[1] / "scripts" / "sync-receiver-sync-files.py"
+    (tmp_path / ".github" / "scripts").mkdir(parents=True)
+    shutil.copy2(script, tmp_path / ".github" / "scripts" / script.name)
+    (tmp_path / ".github" / "workflow-config.yaml").write_text(
+        "sync:\n  sync_paths:\n    - .github/prompts/\n", encoding="utf-8"
+    )
+    _write_source(tmp_path / "ghcommon-source")
+
+    result = subprocess.run(
+        [sys.executable, f".github/scripts/{script.name}", "prompts"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert (tmp_path / ".github" / "prompts" / "prompt.md").read_text() == "Prompt"
+    assert not (tmp_path / sync_receiver.RECEIVER_MANIFEST).exists()
+
+
+def test_commit_and_push_builds_commit_without_staging(tmp_path, monkeypatch):
+    remote = tmp_path / "remote.git"
+    _git(tmp_path, "init", "-q", "--bare", "-b", "main", str(remote))
+    work = tmp_path / "work"
+    _git(tmp_path, "clone", "-q", str(remote), str(work))
+    (work / "README.md").write_text("hello\n", encoding="utf-8")
+    (work / "old.txt").write_text("old\n", encoding="utf-8")
+    _git(work, "add", ".")
+    _git(work, "commit", "-qm", "init")
+    _git(work, "push", "-q", "origin", "main")
+
+    # Another commit lands on the remote after this checkout.
+    other = tmp_path / "other"
+    _git(tmp_path, "clone", "-q", str(remote), str(other))
+    (other / "CHANGELOG.md").write_text("later\n", encoding="utf-8")
+    _git(other, "add", ".")
+    _git(other, "commit", "-qm", "later")
+    _git(other, "push", "-q", "origin", "main")
+
+    (work / ".github" / "prompts").mkdir(parents=True)
+    (work / ".github" / "prompts" / "prompt.md").write_text("Prompt", encoding="utf-8")
+    (work / "old.txt").unlink()
+    monkeypatch.chdir(work)
+    monkeypatch.setenv("SOURCE_REPO", "upstream/repo")
+    monkeypatch.setenv("SOURCE_SHA", "abc123")
+    monkeypatch.setenv("SYNC_TYPE", "prompts")
+    monkeypatch.setenv("TARGET_BRANCH", "main")
+
+    sync_receiver.commit_and_push(argparse.Namespace())
+    assert _git(remote, "show", "main:.github/prompts/prompt.md") == "Prompt"
+    assert _git(remote, "show", "main:CHANGELOG.md") == "later\n"
+    assert "old.txt" not in _git(remote, "ls-tree", "-r", "--name-only", "main")
+    assert "Sync type: prompts" in _git(remote, "log", "-1", "--format=%B", "main")
+    assert _git(work, "diff", "--cached", "--name-only") == ""
+
+    sync_receiver.commit_and_push(argparse.Namespace())
+    assert _git(remote, "rev-list", "--count", "main") == "3\n"
+
+
+def test_commit_and_push_without_tree_patcher(monkeypatch):
+    monkeypatch.setitem(sys.modules, "git_tree_patcher", None)
     commands = []
 
     def fake_run(cmd, check=False, **kwargs):
@@ -124,3 +268,59 @@ def test_write_summary_with_changes(tmp_path, monkeypatch):
     content = summary_path.read_text()
     assert "Sync Receiver Summary" in content
     assert "- `file.txt`" in content
+
+
+def test_sync_files_skips_when_manifest_unchanged(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    source_root = tmp_path / "ghcommon-source"
+    (source_root / ".github" / "prompts").mkdir(parents=True)
+    (source_root / ".github" / "prompts" / "prompt.md").write_text("Prompt", encoding="utf-8")
+    calls = []
+
+    def fake_run(cmd, check=False, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 1)
+
+    monkeypatch.setenv("SYNC_TYPE", "prompts")
+    monkeypatch.setenv("SYNC_VERBOSE", "false")
+    monkeypatch.setattr(sync_receiver.subprocess, "run", fake_run)
+
+    sync_receiver.sync_files(argparse.Namespace())
+    assert (tmp_path / ".github" / "prompts" / "prompt.md").read_text() == "Prompt"
+    assert (tmp_path / ".github" / "sync-receiver-manifest.json").is_file()
+    assert len(calls) == 1
+
+    (source_root / ".github" / "prompts").mkdir(parents=True)
+    (source_root / ".github" / "prompts" / "prompt.md").write_text("Prompt", encoding="utf-8")
+    calls.clear()
+    sync_receiver.sync_files(argparse.Namespace())
+    assert calls == []
+    assert "unchanged for prompts; skipping sync" in capsys.readouterr().out
+    assert not source_root.exists()
+
+
+def test_check_manifest_outputs_up_to_date(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_path = tmp_path / "output.txt"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output_path))
+    monkeypatch.setenv("SYNC_TYPE", "prompts")
+    monkeypatch.setenv("MANIFEST_DIGEST", "abc")
+    monkeypatch.setenv("FORCE_SYNC", "false")
+
+    sync_receiver.check_manifest(argparse.Namespace())
+    assert "up_to_date=false" in output_path.read_text()
+
+    sync_manifest.DeltaSync(tmp_path / "missing").save("prompts", "abc")
+    output_path.write_text("")
+    sync_receiver.check_manifest(argparse.Namespace())
+    assert "up_to_date=false" in output_path.read_text()
+
+    sync_manifest.DeltaSync(tmp_path / "missing").save("prompts", "synced", "abc")
+    output_path.write_text("")
+    sync_receiver.check_manifest(argparse.Namespace())
+    assert "up_to_date=true" in output_path.read_text()
+
+    monkeypatch.setenv("FORCE_SYNC", "true")
+    output_path.write_text("")
+    sync_receiver.check_manifest(argparse.Namespace())
+    assert "up_to_date=false" in output_path.read_text()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: tests/workflow_scripts/test_workflow_common.py
-# version: 1.0.0
+# version: 1.1.0
 # guid: 4dcbebd7-74dd-4c5f-9442-7ad2c49ea5a6
 
 """Unit tests for workflow_common helpers."""
@@ -8,6 +8,7 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
@@ -46,6 +47,16 @@ def test_format_summary_table() -> None:
     assert "| Status | ok |" in table
 
 
+def test_parse_datetime_normalises_to_utc() -> None:
+    """parse_datetime accepts API timestamps and naive datetimes."""
+    expected = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    assert workflow_common.parse_datetime("2024-05-01T12:30:00Z") == expected
+    assert workflow_common.parse_datetime(datetime(2024, 5, 1, 12, 30)) == expected
+    assert workflow_common.parse_datetime("not a date") is None
+    assert workflow_common.parse_datetime("") is None
+    assert workflow_common.parse_datetime(17) is None
+
+
 def test_registry_enabled_uses_config(monkeypatch: pytest.MonkeyPatch) -> None:
     """registry_enabled reflects configuration flags."""
     config = {
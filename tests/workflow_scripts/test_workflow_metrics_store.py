@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# file: tests/workflow_scripts/test_workflow_metrics_store.py
+# version: 1.2.1
+# guid: 4b098591-e503-4245-a9ed-d4d7fc39e745
+
+"""Tests for the SQLite workflow metrics store."""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import automation_workflow
+import pytest
+import workflow_metrics_store
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+CONCLUSIONS = ("success", "success", "success", "failure", "cancelled", "skipped")
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _run(run_id: int, name: str, offset_hours: int, **extra: Any) -> dict[str, Any]:
+    started = BASE + timedelta(hours=offset_hours)
+    payload = {
+        "id": run_id,
+        "name": name,
+        "status": "completed",
+        "conclusion": "success",
+        "created_at": _iso(started),
+        "run_started_at": _iso(started),
+        "updated_at": _iso(started + timedelta(seconds=90)),
+    }
+    payload.update(extra)
+    return payload
+
+
+class StubResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.status_code = 200
+        self._payload = payload
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+class StubSession:
+    """Serves pages of workflow runs, newest first, and records request parameters."""
+
+    def __init__(self, runs: list[dict[str, Any]]) -> None:
+        self.runs = runs
+        self.params: list[dict[str, Any]] = []
+
+    def get(self, url: str, **kwargs: Any) -> StubResponse:
+        params = kwargs["params"]
+        self.params.append(params)
+        runs = sorted(self.runs, key=lambda run: run["created_at"], reverse=True)
+        if "created" in params:
+            since, _, until = params["created"].removeprefix(">=").partition("..")
+            runs = [run for run in runs if since <= run["created_at"] <= (until or "~")]
+        start = (params["page"] - 1) * params["per_page"]
+        page = runs[start : start + params["per_page"]]
+        return StubResponse({"total_count": len(runs), "workflow_runs": page})
+
+
+def test_store_metrics_match_in_memory_aggregation() -> None:
+    """Rolling-window queries agree with collect_workflow_metrics."""
+    rng = random.Random(7)
+    offsets = rng.sample(range(24 * 60), 400)
+    runs = [
+        _run(
+            index,
+            rng.choice(["CI", "Docs", "Release"]),
+            offsets[index],
+            conclusion=rng.choice(CONCLUSIONS),
+            duration_seconds=rng.randrange(10, 900),
+            **({"cache": {"hit": rng.random() < 0.6}} if rng.random() < 0.5 else {}),
+        )
+        for index in range(1, 400)
+    ]
+    since = BASE + timedelta(days=20)
+    expected = automation_workflow.collect_workflow_metrics(
+        automation_workflow.filter_runs_by_lookback(runs, 40, now=since + timedelta(days=40))
+    )
+
+    with workflow_metrics_store.MetricsStore(":memory:") as store:
+        assert store.ingest("o/r", runs) == len(runs)
+        actual = store.metrics(repos=["o/r"], since=since)
+
+    assert actual.total_runs == expected.total_runs
+    assert actual.success_rate == pytest.approx(expected.success_rate)
+    assert actual.average_duration == pytest.approx(expected.average_duration)
+    assert actual.start_time == expected.start_time
+    assert actual.end_time == expected.end_time
+    actual_workflows = actual.to_dict()["workflows"]
+    expected_workflows = expected.to_dict()["workflows"]
+    assert sorted(actual_workflows) == sorted(expected_workflows)
+    for name, summary in expected_workflows.items():
+        assert actual_workflows[name].pop("last_run") == summary.pop("last_run")
+        assert actual_workflows[name].pop("duration_sketch") == summary.pop("duration_sketch")
+        assert actual_workflows[name] == pytest.approx(summary)
+
+
+def test_group_by_repo_keeps_repositories_apart(tmp_path: Path) -> None:
+    """Workflows with the same name in different repos can be split or merged."""
+    with workflow_metrics_store.MetricsStore(tmp_path / "metrics.sqlite") as store:
+        store.ingest("o/a", [_run(1, "CI", 0), _run(2, "CI", 1, conclusion="failure")])
+        store.ingest("o/b", [_run(1, "CI", 2, conclusion="failure")])
+
+        merged = store.metrics()
+        split = store.metrics(group_by_repo=True)
+
+    assert merged.workflows["CI"].runs == 3
+    assert merged.workflows["CI"].consecutive_failures == 2
+    assert sorted(split.workflows) == ["o/a:CI", "o/b:CI"]
+    assert split.workflows["o/b:CI"].consecutive_failures == 1
+
+
+def test_sync_repository_is_incremental_and_refreshes_pending_runs() -> None:
+    """Later syncs only request runs created since the watermark."""
+    runs = [_run(index, "CI", index) for index in range(1, 251)]
+    runs[-1].update(status="in_progress", conclusion=None)
+    session = StubSession(runs)
+    now = BASE + timedelta(days=30)
+
+    with workflow_metrics_store.MetricsStore(":memory:") as store:
+        ingested = workflow_metrics_store.sync_repository(
+            store, "o/r", token="t", session=session, per_page=100, workers=3, now=now
+        )
+        assert ingested == 250
+        assert sorted(params["page"] for params in session.params) == [1, 2, 3]
+        assert session.params[0]["created"] == ">=" + _iso(now - timedelta(days=90))
+        assert store.watermark("o/r") == BASE + timedelta(hours=250)
+
+        runs[-1].update(status="completed", conclusion="failure")
+        runs.append(_run(251, "CI", 251, conclusion="failure"))
+        session.params.clear()
+        ingested = workflow_metrics_store.sync_repository(
+            store, "o/r", token="t", session=session, per_page=100, now=now
+        )
+        metrics = store.metrics()
+
+    assert ingested == 2
+    assert session.params == [
+        {"per_page": 100, "page": 1, "created": ">=" + _iso(BASE + timedelta(hours=250))}
+    ]
+    assert metrics.total_runs == 251
+    assert metrics.workflows["CI"].consecutive_failures == 2
+
+
+def test_collect_metrics_cli_uses_store(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """--store ingests the input file and reports from the stored history."""
+    store_path = tmp_path / "store" / "metrics.sqlite"
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    first.write_text('[{"id": 1, "name": "CI", "conclusion": "success"}]', encoding="utf-8")
+    second.write_text('[{"id": 2, "name": "CI", "conclusion": "failure"}]', encoding="utf-8")
+
+    for path in (first, second):
+        argv = ["collect-metrics", "--input", str(path), "--store", str(store_path)]
+        assert automation_workflow.main(argv) == 0
+        capsys.readouterr()
+
+    output = tmp_path / "report.json"
+    argv = ["collect-metrics", "--input", str(second), "--store", str(store_path)]
+    assert automation_workflow.main([*argv, "--output", str(output)]) == 0
+    report = output.read_text(encoding="utf-8")
+    assert '"total_runs": 2' in report
+    assert '"consecutive_failures": 1' in report
+
+
+def test_collect_metrics_cli_sync_keeps_stdout_json(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Syncing a repository into the store reports progress on stderr only."""
+
+    def fake_sync(store: Any, repo: str, **kwargs: Any) -> int:
+        store.ingest(repo, [{"id": 1, "name": "CI", "conclusion": "success"}])
+        return 1
+
+    monkeypatch.setattr(workflow_metrics_store, "sync_repository", fake_sync)
+    store_path = tmp_path / "metrics.sqlite"
+    argv = ["collect-metrics", "--repo", "o/r", "--token", "t", "--store", str(store_path)]
+
+    assert automation_workflow.main(argv) == 0
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["metrics"]["total_runs"] == 1
+    assert "Ingested 1 workflow runs for o/r" in captured.err
+
+
+def test_truncated_sync_backfills_before_advancing_watermark() -> None:
+    """Runs beyond the page budget are fetched by later syncs, not skipped."""
+    runs = [_run(index, "CI", index) for index in range(1, 501)]
+    session = StubSession(runs)
+    now = BASE + timedelta(days=30)
+    since = now - timedelta(days=90)
+
+    with workflow_metrics_store.MetricsStore(":memory:") as store:
+
+        def sync() -> int:
+            return workflow_metrics_store.sync_repository(
+                store, "o/r", token="t", session=session, per_page=100, pages=2, now=now
+            )
+
+        assert sync() == 200
+        assert store.watermark("o/r") == since
+        assert store.backfill("o/r") == BASE + timedelta(hours=301)
+        session.params.clear()
+        assert sync() == 200
+        assert session.params[0]["created"] == f"{_iso(since)}..{_iso(BASE + timedelta(hours=301))}"
+        assert store.backfill("o/r") == BASE + timedelta(hours=102)
+        assert sync() == 102
+        assert store.watermark("o/r") == BASE + timedelta(hours=500)
+        assert store.backfill("o/r") is None
+        assert store.metrics().total_runs == 500
+
+        runs.append(_run(501, "CI", 501))
+        assert sync() == 2
+        assert store.metrics().total_runs == 501